@@ -10,5 +10,12 @@ from .abort import S3Aborter
 from .delete import S3Deleter
 from .list import S3Lister
 from .create import S3Creator
+from .copy import S3Copier
+from .verify import S3Verifier
+from .read import S3Reader
+from .snapshot import S3Snapshotter
+from .export import S3Exporter
+from .diff import S3Differ
+from .replicate import S3Replicator
 
-__all__ = ["S3Uploader", "S3Downloader", "S3Aborter", "S3Deleter", "S3Lister", "S3Creator"]
+__all__ = ["S3Uploader", "S3Downloader", "S3Aborter", "S3Deleter", "S3Lister", "S3Creator", "S3Copier", "S3Verifier", "S3Reader", "S3Snapshotter", "S3Exporter", "S3Differ", "S3Replicator"]
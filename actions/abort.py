@@ -3,10 +3,16 @@ Abort Multipart Upload Action for R2Py CLI.
 
 This module defines the S3Aborter class, which handles the aborting of multipart uploads
 from a Cloudflare R2 bucket using the S3-compatible API. It provides a method to abort a
-multipart upload by specifying the bucket name, object key, and upload ID.
+multipart upload by specifying the bucket name, object key, and upload ID, and
+methods to find stale uploads across all listing pages, estimate the bytes their
+parts occupy, and abort them concurrently.
 """
 
-from utils import S3Base, Colors, S3ActionError, Region
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from utils import S3Base, Colors, S3ActionError, Region, map_concurrent
+from utils.usage import format_size
 
 
 class S3Aborter(S3Base):
@@ -71,3 +77,143 @@ class S3Aborter(S3Base):
             raise S3ActionError(f"Failed to abort multipart upload: {e}") from e
         finally:
             self.logger.info("Finished aborting multipart upload.")
+
+    def find_stale_uploads(
+        self, bucket_name: str, older_than: timedelta, prefix: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Find multipart uploads initiated more than older_than ago.
+        Args:
+            bucket_name (str): Target bucket name.
+            older_than (timedelta): Minimum age of the uploads to return.
+            prefix (Optional[str]): Only consider uploads for keys with this prefix.
+        Returns:
+            List[dict]: Matching uploads as returned by ListMultipartUploads.
+        Raises:
+            S3ActionError: If listing multipart uploads fails.
+        """
+        cutoff = datetime.now(timezone.utc) - older_than
+        kwargs = {"Bucket": bucket_name}
+        if prefix:
+            kwargs["Prefix"] = prefix
+        stale = []
+        try:
+            paginator = self.s3.get_paginator("list_multipart_uploads")
+            for page in paginator.paginate(**kwargs):
+                for upload in page.get("Uploads", []):
+                    if upload["Initiated"] < cutoff:
+                        stale.append(upload)
+        except Exception as e:
+            raise S3ActionError(f"Error listing multipart uploads: {e}") from e
+        self.logger.info(
+            "Found %d multipart upload(s) older than %s in bucket '%s'.",
+            len(stale),
+            older_than,
+            bucket_name,
+        )
+        return stale
+
+    def reclaimable_bytes(
+        self, bucket_name: str, uploads: List[dict]
+    ) -> Dict[str, int]:
+        """
+        Sum the sizes of the parts already stored for each upload.
+        Parts are listed concurrently, one upload per worker.
+        Args:
+            bucket_name (str): Target bucket name.
+            uploads (List[dict]): Uploads from find_stale_uploads.
+        Returns:
+            Dict[str, int]: Bytes per upload ID; uploads whose parts could not be
+                listed are left out.
+        """
+
+        def parts_size(upload):
+            paginator = self.s3.get_paginator("list_parts")
+            return sum(
+                part["Size"]
+                for page in paginator.paginate(
+                    Bucket=bucket_name, Key=upload["Key"], UploadId=upload["UploadId"]
+                )
+                for part in page.get("Parts", [])
+            )
+
+        sizes = {}
+        for upload, size, error in map_concurrent(
+            self.concurrency, parts_size, uploads
+        ):
+            if error:
+                self.logger.warning(
+                    "Could not list parts of upload '%s': %s", upload["UploadId"], error
+                )
+            else:
+                sizes[upload["UploadId"]] = size
+        return sizes
+
+    def print_stale_uploads(
+        self, uploads: List[dict], sizes: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Print stale uploads as a table, with reclaimable bytes if known.
+        Args:
+            uploads (List[dict]): Uploads from find_stale_uploads.
+            sizes (Optional[Dict[str, int]]): Bytes per upload ID.
+        """
+        if not uploads:
+            print(self.colorize("No stale multipart uploads found.", "WARNING"))
+            return
+        print(
+            Colors.colorize_underline("%-40s %-25s %12s %s", "UNDERLINE")
+            % ("Upload ID", "Initiated", "Size", "Object Key")
+        )
+        for upload in uploads:
+            size = sizes.get(upload["UploadId"]) if sizes is not None else None
+            print(
+                f"{self.colorize(upload['UploadId'], 'OKBLUE'):<40} "
+                f"{upload['Initiated']:%Y-%m-%d %H:%M:%S %Z} "
+                f"{format_size(size) if size is not None else '-':>12} "
+                f"{self.colorize(upload['Key'], 'OKGREEN')}"
+            )
+        if sizes is not None:
+            print(
+                self.colorize(
+                    f"{len(uploads)} upload(s), {format_size(sum(sizes.values()))} "
+                    "reclaimable",
+                    "OKCYAN",
+                )
+            )
+
+    def abort_uploads(self, bucket_name: str, uploads: List[dict]) -> None:
+        """
+        Abort many multipart uploads concurrently.
+        Args:
+            bucket_name (str): Target bucket name.
+            uploads (List[dict]): Uploads from find_stale_uploads.
+        Raises:
+            S3ActionError: If any upload fails to abort.
+        """
+
+        def abort(upload):
+            self.s3.abort_multipart_upload(
+                Bucket=bucket_name, Key=upload["Key"], UploadId=upload["UploadId"]
+            )
+
+        aborted, failed = 0, 0
+        for upload, _, error in map_concurrent(self.concurrency, abort, uploads):
+            if error:
+                failed += 1
+                self.logger.error(
+                    "Failed to abort upload '%s' for '%s': %s",
+                    upload["UploadId"],
+                    upload["Key"],
+                    error,
+                )
+            else:
+                aborted += 1
+        print(
+            self.colorize(
+                f"Aborted {aborted} multipart upload(s) in bucket '{bucket_name}'",
+                "OKGREEN",
+            )
+        )
+        if failed:
+            raise S3ActionError(f"{failed} multipart upload(s) failed to abort.")
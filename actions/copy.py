@@ -0,0 +1,306 @@
+"""
+Copy Action for R2Py CLI.
+
+This module defines the S3Copier class, which copies and moves objects inside
+Cloudflare R2 using the S3-compatible API without downloading them. Small objects
+are copied with a single CopyObject request and large objects with parallel
+UploadPartCopy ranges. Whole prefixes are copied concurrently from a paginated
+listing, and moves finish by deleting the copied sources in batches.
+"""
+
+from typing import Iterable, List, Optional
+
+from utils import (
+    Colors,
+    Region,
+    S3ActionError,
+    S3Base,
+    TqdmProgress,
+    map_concurrent,
+)
+from utils.partcopy import DEFAULT_COPY_PART_SIZE, PartCopy
+from utils.scheduler import TransferScheduler
+
+DELETE_BATCH_SIZE = 1000
+
+
+class S3Copier(S3Base):
+    """Handles server-side copies and moves in a Cloudflare R2 bucket using the S3-compatible API."""
+
+    multipart_copy_threshold = DEFAULT_COPY_PART_SIZE
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: Region = Region.AUTO,
+    ):
+        """
+        Initialize the copier with S3 credentials and endpoint.
+        Args:
+            endpoint_url (str): S3-compatible endpoint URL.
+            access_key (str): Access key ID.
+            secret_key (str): Secret access key.
+            region (Region): AWS region or 'auto'.
+        """
+        super().__init__(endpoint_url, access_key, secret_key, region)
+        self.logger = S3Base.get_logger()
+        self.colorize = Colors.colorize
+
+    def copy_object(
+        self,
+        source_bucket: str,
+        source_key: str,
+        bucket_name: str,
+        object_key: Optional[str] = None,
+    ) -> None:
+        """
+        Copy an object server-side.
+        Args:
+            source_bucket (str): Source bucket name.
+            source_key (str): Source object key.
+            bucket_name (str): Destination bucket name.
+            object_key (Optional[str]): Destination key (defaults to source_key).
+        Raises:
+            S3ActionError: If the source is missing or the copy fails.
+        """
+        object_key = object_key or source_key
+        self._check_distinct(source_bucket, source_key, bucket_name, object_key)
+        try:
+            self._copy(source_bucket, source_key, bucket_name, object_key)
+        except Exception as e:
+            raise S3ActionError(f"Failed to copy object: {e}") from e
+        print(
+            self.colorize(
+                f"Copied '{source_bucket}/{source_key}' to '{bucket_name}/{object_key}'",
+                "OKGREEN",
+            )
+        )
+
+    def move_object(
+        self,
+        source_bucket: str,
+        source_key: str,
+        bucket_name: str,
+        object_key: Optional[str] = None,
+    ) -> None:
+        """
+        Move an object server-side: copy it, then delete the source.
+        Args:
+            source_bucket (str): Source bucket name.
+            source_key (str): Source object key.
+            bucket_name (str): Destination bucket name.
+            object_key (Optional[str]): Destination key (defaults to source_key).
+        Raises:
+            S3ActionError: If the copy or the delete fails.
+        """
+        object_key = object_key or source_key
+        self._check_distinct(source_bucket, source_key, bucket_name, object_key)
+        try:
+            self._copy(source_bucket, source_key, bucket_name, object_key)
+            self.s3.delete_object(Bucket=source_bucket, Key=source_key)
+        except Exception as e:
+            raise S3ActionError(f"Failed to move object: {e}") from e
+        print(
+            self.colorize(
+                f"Moved '{source_bucket}/{source_key}' to '{bucket_name}/{object_key}'",
+                "OKGREEN",
+            )
+        )
+
+    def copy_prefix(
+        self,
+        source_bucket: str,
+        prefix: str,
+        bucket_name: str,
+        destination_prefix: Optional[str] = None,
+        move: bool = False,
+    ) -> None:
+        """
+        Copy or move every object under a prefix server-side.
+        Objects are listed page by page and copied by a pool of workers; large
+        objects follow a few at a time under a TransferScheduler, whose connection
+        budget their parallel part copies share. A move
+        deletes the copied sources in batches once the copies are done; sources
+        that failed to copy are kept.
+        Args:
+            source_bucket (str): Source bucket name.
+            prefix (str): Source key prefix.
+            bucket_name (str): Destination bucket name.
+            destination_prefix (Optional[str]): Destination key prefix (defaults to prefix).
+            move (bool): Delete the sources after copying them.
+        Raises:
+            S3ActionError: If listing fails or any object fails to copy or delete.
+        """
+        if destination_prefix is None:
+            destination_prefix = prefix
+        if source_bucket == bucket_name and destination_prefix == prefix:
+            raise S3ActionError("Source and destination are the same.")
+        # Skip our own output when the destination lies inside the source prefix.
+        nested = source_bucket == bucket_name and destination_prefix.startswith(prefix)
+        large_objects = []
+
+        def small_objects():
+            paginator = self.s3.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=source_bucket, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    key = obj["Key"]
+                    if nested and key.startswith(destination_prefix):
+                        continue
+                    target = destination_prefix + key[len(prefix) :]
+                    if obj["Size"] > self.multipart_copy_threshold:
+                        large_objects.append((key, target))
+                    else:
+                        yield key, target
+
+        def copy(item):
+            key, target = item
+            self.s3.copy_object(
+                Bucket=bucket_name,
+                Key=target,
+                CopySource={"Bucket": source_bucket, "Key": key},
+            )
+
+        copied, failed = [], 0
+        try:
+            for (key, _), _, error in map_concurrent(
+                self.concurrency, copy, small_objects()
+            ):
+                if error:
+                    failed += 1
+                    self.logger.error("Failed to copy '%s': %s", key, error)
+                else:
+                    copied.append(key)
+        except Exception as e:
+            raise S3ActionError(f"Error listing objects: {e}") from e
+        scheduler = TransferScheduler(max_connections=self.concurrency.maximum)
+        for (key, target), _, error in scheduler.run(
+            lambda item: self._copy(
+                source_bucket,
+                item[0],
+                bucket_name,
+                item[1],
+                budget=scheduler.budget(item[1]),
+            ),
+            large_objects,
+        ):
+            if error:
+                failed += 1
+                self.logger.error("Failed to copy '%s': %s", key, error)
+            else:
+                copied.append(key)
+        if move:
+            failed += self._delete_keys(source_bucket, copied)
+        verb = "Moved" if move else "Copied"
+        print(
+            self.colorize(
+                f"{verb} {len(copied)} object(s) from '{source_bucket}/{prefix}' "
+                f"to '{bucket_name}/{destination_prefix}'",
+                "OKGREEN",
+            )
+        )
+        if failed:
+            raise S3ActionError(
+                f"{failed} object(s) failed to {'move' if move else 'copy'}."
+            )
+
+    def _copy(
+        self,
+        source_bucket: str,
+        source_key: str,
+        bucket_name: str,
+        object_key: str,
+        budget=None,
+    ) -> None:
+        """
+        Copy one object, choosing CopyObject or a parallel part copy by size.
+        A part copy takes a connection for each part from budget, if given.
+        """
+        head = self.s3.head_object(Bucket=source_bucket, Key=source_key)
+        source = {"Bucket": source_bucket, "Key": source_key}
+        if head["ContentLength"] <= self.multipart_copy_threshold:
+            self.logger.info("Copying '%s' with CopyObject.", source_key)
+            self.s3.copy_object(
+                Bucket=bucket_name,
+                Key=object_key,
+                CopySource=source,
+                CopySourceIfMatch=head["ETag"],
+            )
+            return
+        progress_callback = TqdmProgress(
+            object_key,
+            action="copy",
+            total_size=head["ContentLength"],
+            logger=self.logger,
+        )
+        try:
+            PartCopy(
+                self.s3,
+                source_bucket,
+                source_key,
+                bucket_name,
+                object_key,
+                head,
+                controller=self.concurrency,
+                part_size=self.multipart_copy_threshold,
+                callback=progress_callback,
+                logger=self.logger,
+                budget=budget,
+            ).run()
+        finally:
+            progress_callback.close()
+
+    def _delete_keys(self, bucket_name: str, keys: Iterable[str]) -> int:
+        """
+        Delete keys with batched DeleteObjects requests, several batches at once.
+        Args:
+            bucket_name (str): Bucket name.
+            keys (Iterable[str]): Object keys to delete.
+        Returns:
+            int: Number of keys that could not be deleted.
+        """
+
+        def batches():
+            batch: List[str] = []
+            for key in keys:
+                batch.append(key)
+                if len(batch) == DELETE_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        return sum(
+            failed
+            for _, failed, _ in map_concurrent(
+                self.concurrency,
+                lambda batch: self._delete_batch(bucket_name, batch),
+                batches(),
+            )
+        )
+
+    def _delete_batch(self, bucket_name: str, keys: List[str]) -> int:
+        """Delete up to 1,000 keys with one request and return the failure count."""
+        try:
+            response = self.s3.delete_objects(
+                Bucket=bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.error("Failed to delete %d object(s): %s", len(keys), e)
+            return len(keys)
+        errors = response.get("Errors", [])
+        for error in errors:
+            self.logger.error(
+                "Failed to delete '%s': %s", error.get("Key"), error.get("Message")
+            )
+        return len(errors)
+
+    @staticmethod
+    def _check_distinct(
+        source_bucket: str, source_key: str, bucket_name: str, object_key: str
+    ) -> None:
+        """Refuse to copy an object onto itself."""
+        if source_bucket == bucket_name and source_key == object_key:
+            raise S3ActionError("Source and destination are the same.")
@@ -0,0 +1,176 @@
+"""
+Diff Action for R2Py CLI.
+
+This module defines the S3Differ class, which compares the objects under two
+prefixes, in the same bucket or in different ones, such as a primary and its
+replica. Both listings arrive from list_objects_v2 already sorted by key, so they
+are merged page by page like a merge-join, holding one object of each side at a
+time however many objects there are. Every key found on one side only, or with a
+different size or ETag on each side, is written as one JSON line. The keyspace can
+be split into partitions at the first '/' level below the prefixes, so several
+ranges are listed and compared in parallel.
+"""
+
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from utils import Region, S3ActionError, S3Base
+from utils.listing import list_range, merge_listings
+
+# Pages of first-level names read per side to place partition boundaries.
+MAX_BOUNDARY_PAGES = 10
+STATUSES = ("added", "removed", "changed", "unchanged")
+
+
+def plan_partitions(names: List[str], partitions: int) -> List[Tuple]:
+    """
+    Split a keyspace into contiguous ranges of about as many first-level names.
+    Args:
+        names (List[str]): Sorted first-level names (objects and common prefixes).
+        partitions (int): Number of ranges wanted.
+    Returns:
+        List[Tuple]: (after, until) bounds: a range holds the keys greater than
+            after and not greater than until, where None means unbounded.
+    """
+    bounds = []
+    for i in range(1, partitions):
+        index = round(i * len(names) / partitions)
+        if 0 < index < len(names) and names[index] not in bounds:
+            bounds.append(names[index])
+    # Keys equal to a boundary sort before everything under it.
+    edges = [None] + bounds + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _side(obj: Optional[tuple]) -> Optional[dict]:
+    """Return the size and ETag of one side of a diff entry."""
+    if obj is None:
+        return None
+    return {"size": obj[1], "etag": obj[2]}
+
+
+class S3Differ(S3Base):
+    """Compares the objects under two prefixes of Cloudflare R2 buckets."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: Region = Region.AUTO,
+    ):
+        """
+        Initialize the differ with S3 credentials and endpoint.
+        Args:
+            endpoint_url (str): S3-compatible endpoint URL.
+            access_key (str): Access key ID.
+            secret_key (str): Secret access key.
+            region (Region): AWS region or 'auto'.
+        """
+        super().__init__(endpoint_url, access_key, secret_key, region)
+        self.logger = S3Base.get_logger()
+
+    def diff(
+        self,
+        source_bucket: str,
+        source_prefix: str,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        out=None,
+        partitions: int = 1,
+        include_unchanged: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Write the differences between two prefixes as JSON lines.
+        Each line has the status, the key relative to the prefixes, and the size
+        and ETag of the 'source' and 'target' objects where they exist. Keys only
+        under the target prefix are 'added', keys only under the source prefix are
+        'removed', and keys with another size or ETag are 'changed'. With several
+        partitions, the lines of different partitions are interleaved.
+        Args:
+            source_bucket (str): Source bucket name.
+            source_prefix (str): Source key prefix.
+            bucket_name (str): Target bucket name.
+            prefix (Optional[str]): Target key prefix (defaults to source_prefix).
+            out: Text stream to write to (defaults to stdout).
+            partitions (int): Number of key ranges compared in parallel.
+            include_unchanged (bool): Also write a line per identical object.
+        Returns:
+            Dict[str, int]: Number of objects per status.
+        Raises:
+            S3ActionError: If either listing fails.
+        """
+        if prefix is None:
+            prefix = source_prefix
+        if source_bucket == bucket_name and source_prefix == prefix:
+            raise S3ActionError("Source and target are the same.")
+        out = out or sys.stdout
+        sides = ((source_bucket, source_prefix), (bucket_name, prefix))
+        counts = {status: 0 for status in STATUSES}
+        lock = threading.Lock()
+
+        def compare(bounds):
+            local = {status: 0 for status in STATUSES}
+            after, until = bounds
+            listings = [
+                list_range(self.s3, bucket, side_prefix, after, until)
+                for bucket, side_prefix in sides
+            ]
+            for status, source, target in merge_listings(*listings):
+                local[status] += 1
+                if status == "unchanged" and not include_unchanged:
+                    continue
+                entry = {"status": status, "key": (source or target)[0]}
+                for name, obj in (("source", source), ("target", target)):
+                    if obj is not None:
+                        entry[name] = _side(obj)
+                with lock:
+                    out.write(json.dumps(entry) + "\n")
+            with lock:
+                for status, number in local.items():
+                    counts[status] += number
+
+        try:
+            ranges = self._partitions(sides, partitions) if partitions > 1 else None
+            if not ranges or len(ranges) == 1:
+                compare((None, None))
+            else:
+                with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                    for future in [pool.submit(compare, bounds) for bounds in ranges]:
+                        future.result()
+            out.flush()
+        except BrokenPipeError:
+            self.logger.warning("Output closed before the diff was complete.")
+        except Exception as e:
+            raise S3ActionError(f"Error listing objects: {e}") from e
+        self.logger.info(
+            "Compared '%s/%s' with '%s/%s': %d added, %d removed, %d changed, "
+            "%d unchanged.",
+            source_bucket,
+            source_prefix,
+            bucket_name,
+            prefix,
+            counts["added"],
+            counts["removed"],
+            counts["changed"],
+            counts["unchanged"],
+        )
+        return counts
+
+    def _partitions(self, sides: tuple, partitions: int) -> List[Tuple]:
+        """Place partition boundaries between the first-level names of both sides."""
+        names = set()
+        for bucket_name, prefix in sides:
+            paginator = self.s3.get_paginator("list_objects_v2")
+            pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix, Delimiter="/")
+            for number, page in enumerate(pages):
+                if number == MAX_BOUNDARY_PAGES:
+                    break
+                for obj in page.get("Contents", []):
+                    names.add(obj["Key"][len(prefix) :])
+                for common in page.get("CommonPrefixes", []):
+                    names.add(common["Prefix"][len(prefix) :])
+        return plan_partitions(sorted(names), partitions)
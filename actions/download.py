@@ -2,19 +2,42 @@
 Download Action for R2Py CLI.
 
 This module defines the S3Downloader class, which handles the downloading of files
-from a Cloudflare R2 bucket using the S3-compatible API. It provides a method to
-download a file by specifying the bucket name, object key, and filename.
+from a Cloudflare R2 bucket using the S3-compatible API. It provides methods to
+download an object, a byte range of one, or every object under a prefix.
 """
 
 import os
-from typing import Optional
+import sys
+from contextlib import nullcontext
+from typing import List, Optional
 
-from utils import Region, S3ActionError, S3Base, TqdmProgress
+from utils import Colors, Region, S3ActionError, S3Base, TqdmProgress, map_concurrent
+from utils.compression import DecompressingWriter, codec_from_head
+from utils.etagstore import ETagStore
+from utils.objectcache import ObjectCache
+from utils.multipart import DEFAULT_MAX_IN_FLIGHT
+from utils.pack import pack_key, read_index
+from utils.ranged import DEFAULT_PART_SIZE, RangedDownload, readinto
+from utils.scheduler import (
+    DEFAULT_MAX_FILES,
+    TransferOrder,
+    TransferScheduler,
+    order_transfers,
+)
+from utils.streaming import (
+    COPY_CHUNK_SIZE,
+    STDIO_PATH,
+    StreamDownload,
+    copy_body,
+    is_stdio,
+)
 
 
 class S3Downloader(S3Base):
     """Handles downloading files from a Cloudflare R2 bucket using the S3-compatible API."""
 
+    _etag_store = None
+
     def __init__(
         self,
         endpoint_url: str,
@@ -34,14 +57,37 @@ class S3Downloader(S3Base):
         self.logger = S3Base.get_logger()
 
     def download_file(
-        self, bucket_name: str, object_key: str, filename: Optional[str] = None
+        self,
+        bucket_name: str,
+        object_key: str,
+        filename: Optional[str] = None,
+        hedge: bool = False,
+        decompress: bool = False,
+        skip_unchanged: bool = False,
+        if_changed: bool = False,
+        cache: Optional[ObjectCache] = None,
+        scheduler: Optional[TransferScheduler] = None,
     ) -> None:
         """
         Download a file from the specified bucket.
+        Small objects are fetched with a single GetObject. Multi-part objects use
+        the ranged download engine, which preallocates the file, writes each part
+        at its offset and can hedge slow parts. A filename of '-' streams the
+        object to stdout through download_stream().
         Args:
             bucket_name (str): Source bucket name.
             object_key (str): S3 object key to download.
             filename (Optional[str]): Local file path to save (defaults to object_key basename).
+            hedge (bool): Hedge slow parts of large objects.
+            decompress (bool): Decode objects stored with gzip or zstd compression.
+            skip_unchanged (bool): Skip the download if the local file already has
+                the object's size and ETag.
+            if_changed (bool): Remember the object's ETag, and skip the download
+                with a single conditional GET if it is unchanged since the last one.
+            cache (Optional[ObjectCache]): Local object cache to serve the object
+                from, and to add it to after downloading.
+            scheduler (Optional[TransferScheduler]): Shared scheduler to take the
+                ranged GETs of a large object from.
         Raises:
             S3ActionError: If object key is missing, metadata fetch fails, or download fails.
         """
@@ -50,19 +96,113 @@ class S3Downloader(S3Base):
             raise S3ActionError("Object key not provided.")
         if not filename:
             filename = os.path.basename(object_key)
+        if_changed = if_changed and not is_stdio(filename)
+        response = None
         try:
-            head = self.s3.head_object(Bucket=bucket_name, Key=object_key)
+            remembered = self.etag_store().get(filename) if if_changed else None
+            if remembered:
+                response = self._get_if_changed(bucket_name, object_key, remembered)
+                if response is None:
+                    self.logger.info(
+                        "Skipping '%s': not modified since '%s' was downloaded.",
+                        object_key,
+                        filename,
+                    )
+                    return
+                head = response
+            else:
+                head = self.s3.head_object(Bucket=bucket_name, Key=object_key)
             total_size = head["ContentLength"]
+            etag = head.get("ETag")
         except Exception as e:
             raise S3ActionError(f"Could not get object metadata: {e}") from e
+        if response is not None and (
+            total_size > self.small_object_threshold
+            or (decompress and codec_from_head(head))
+        ):
+            # Only small bodies are taken from the conditional GET; larger objects
+            # are fetched by the parallel engines below.
+            response["Body"].close()
+            response = None
+        if (
+            skip_unchanged
+            and not is_stdio(filename)
+            and self.is_unchanged(filename, bucket_name, object_key, total_size, etag)
+        ):
+            self.logger.info("Skipping '%s': '%s' is unchanged.", object_key, filename)
+            return
+        if decompress:
+            codec = codec_from_head(head)
+            if codec:
+                self._download_decompressed(
+                    bucket_name, object_key, filename, total_size, etag, codec
+                )
+                if if_changed:
+                    self._remember(filename, head)
+                return
+            self.logger.warning(
+                "Object '%s' is not compressed. Downloading as-is.", object_key
+            )
+        if is_stdio(filename):
+            self.download_stream(
+                bucket_name, object_key, sys.stdout.buffer, total_size, etag
+            )
+            return
+        if cache is not None and etag:
+            entry = cache.entry_name(self.endpoint_url, bucket_name, object_key, etag)
+            if cache.fetch(entry, filename, total_size):
+                if response is not None:
+                    response["Body"].close()
+                if if_changed:
+                    self._remember(filename, head)
+                return
+        if total_size <= self.small_object_threshold:
+            try:
+                self._get_small(bucket_name, object_key, filename, response=response)
+            except Exception as e:
+                raise S3ActionError(f"Error downloading file: {e}") from e
+            self._keep(bucket_name, object_key, filename, head, if_changed, cache)
+            self.logger.info(
+                "File '%s' downloaded from '%s' to '%s'.",
+                object_key,
+                bucket_name,
+                filename,
+            )
+            return
         progress_callback = TqdmProgress(
             filename, action="download", total_size=total_size, logger=self.logger
         )
+        budget = scheduler.budget(filename) if scheduler else None
         try:
-            with open(filename, "wb") as f:
-                self.s3.download_fileobj(
-                    bucket_name, object_key, f, Callback=progress_callback
+            if total_size > DEFAULT_PART_SIZE and (hedge or hasattr(os, "pwrite")):
+                engine = RangedDownload(
+                    self.s3,
+                    bucket_name,
+                    object_key,
+                    total_size,
+                    etag=etag,
+                    controller=self.concurrency,
+                    hedge=hedge,
+                    callback=progress_callback,
+                    logger=self.logger,
+                    budget=budget,
                 )
+                if hasattr(os, "pwrite"):
+                    engine.run_to_file(filename)
+                else:
+                    with open(filename, "wb") as f:
+                        engine.run(f)
+            else:
+                # Below one part, the whole object counts as one part in flight.
+                with budget.part(total_size) if budget else nullcontext():
+                    with open(filename, "wb") as f:
+                        self.s3.download_fileobj(
+                            bucket_name,
+                            object_key,
+                            f,
+                            Callback=progress_callback,
+                            Config=self.transfer_config(),
+                        )
             self.logger.info(
                 "File '%s' downloaded from '%s' to '%s'.",
                 object_key,
@@ -71,5 +211,544 @@ class S3Downloader(S3Base):
             )
         except Exception as e:
             raise S3ActionError(f"Error downloading file: {e}") from e
+        else:
+            self._keep(bucket_name, object_key, filename, head, if_changed, cache)
+        finally:
+            progress_callback.close()
+
+    def download_range(
+        self,
+        bucket_name: str,
+        object_key: str,
+        filename: Optional[str],
+        byte_range: str,
+    ) -> None:
+        """
+        Download a byte range of an object with a single ranged GET.
+        No HEAD request is sent and no progress bar is shown.
+        Args:
+            bucket_name (str): Source bucket name.
+            object_key (str): S3 object key.
+            filename (Optional[str]): Local file path, or '-' for stdout (defaults
+                to object_key basename).
+            byte_range (str): HTTP Range value, e.g. 'bytes=0-1023'.
+        Raises:
+            S3ActionError: If the range cannot be downloaded.
+        """
+        if not object_key:
+            raise S3ActionError("Object key not provided.")
+        filename = filename or os.path.basename(object_key)
+        try:
+            body = self.s3.get_object(
+                Bucket=bucket_name, Key=object_key, Range=byte_range
+            )["Body"]
+            if is_stdio(filename):
+                written = copy_body(body, sys.stdout.buffer)
+            else:
+                with open(filename, "wb") as f:
+                    written = copy_body(body, f)
+        except BrokenPipeError:
+            self.logger.warning("Output closed before '%s' was complete.", object_key)
+            return
+        except Exception as e:
+            raise S3ActionError(f"Error downloading range: {e}") from e
+        self.logger.info(
+            "Downloaded %d bytes (%s) of '%s' from '%s' to '%s'.",
+            written,
+            byte_range,
+            object_key,
+            bucket_name,
+            filename,
+        )
+
+    def download_stream(
+        self,
+        bucket_name: str,
+        object_key: str,
+        out,
+        total_size: int,
+        etag: Optional[str] = None,
+    ) -> None:
+        """
+        Stream an object to a writable stream (e.g. stdout) in order.
+        Large objects are fetched as ranged GETs with a bounded read-ahead window.
+        A closed pipe on the reading side ends the download quietly.
+        Args:
+            bucket_name (str): Source bucket name.
+            object_key (str): S3 object key to download.
+            out: Binary stream to write to.
+            total_size (int): Object size in bytes.
+            etag (Optional[str]): ETag pinned on every ranged GET.
+        Raises:
+            S3ActionError: If the download fails.
+        """
+        progress_callback = None
+        try:
+            if total_size <= self.small_object_threshold:
+                body = self.s3.get_object(Bucket=bucket_name, Key=object_key)["Body"]
+                try:
+                    out.write(body.read())
+                finally:
+                    body.close()
+                out.flush()
+            else:
+                progress_callback = TqdmProgress(
+                    STDIO_PATH,
+                    action="download",
+                    total_size=total_size,
+                    logger=self.logger,
+                )
+                StreamDownload(
+                    self.s3,
+                    bucket_name,
+                    object_key,
+                    total_size,
+                    etag=etag,
+                    controller=self.concurrency,
+                    callback=progress_callback,
+                ).run(out)
+            self.logger.info(
+                "File '%s' streamed from '%s' to stdout.", object_key, bucket_name
+            )
+        except BrokenPipeError:
+            self.logger.warning("Output closed before '%s' was complete.", object_key)
+        except Exception as e:
+            raise S3ActionError(f"Error downloading file: {e}") from e
+        finally:
+            if progress_callback:
+                progress_callback.close()
+
+    def download_prefix(
+        self,
+        bucket_name: str,
+        prefix: str,
+        directory: Optional[str] = None,
+        hedge: bool = False,
+        decompress: bool = False,
+        skip_unchanged: bool = False,
+        if_changed: bool = False,
+        cache: Optional[ObjectCache] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        order: TransferOrder = TransferOrder.LARGEST,
+    ) -> None:
+        """
+        Download every object under a prefix into a local directory.
+        Small objects are fetched concurrently through the single-request fast path
+        using the sizes from the listing. Larger objects follow a few at a time in
+        the given order under one TransferScheduler, their ranged GETs sharing one
+        global byte and connection budget.
+        Args:
+            bucket_name (str): Source bucket name.
+            prefix (str): Key prefix to download.
+            directory (Optional[str]): Local destination directory (defaults to cwd).
+            hedge (bool): Hedge slow parts of large objects.
+            decompress (bool): Decode objects stored with gzip or zstd compression.
+            skip_unchanged (bool): Skip objects whose local file already has the
+                listed size and ETag.
+            if_changed (bool): Remember each object's ETag, and skip objects whose
+                listed ETag matches the one remembered for their local file.
+            cache (Optional[ObjectCache]): Local object cache to serve objects from,
+                and to add them to after downloading.
+            max_in_flight (int): Maximum bytes of ranged GETs in flight at once,
+                across all large objects.
+            order (TransferOrder): Start large objects largest or smallest first.
+        Raises:
+            S3ActionError: If listing fails or any object fails to download.
+        """
+        directory = directory or "."
+        large_objects = []
+        downloaded, skipped, failed = 0, 0, 0
+
+        def small_objects():
+            nonlocal failed
+            paginator = self.s3.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    if obj["Key"].endswith("/"):
+                        continue
+                    try:
+                        path = self.local_path_for(directory, prefix, obj["Key"])
+                    except S3ActionError:
+                        failed += 1
+                        continue
+                    if obj["Size"] <= self.small_object_threshold:
+                        yield obj["Key"], path, obj["Size"], obj.get("ETag")
+                    else:
+                        large_objects.append(
+                            (obj["Key"], path, obj["Size"], obj.get("ETag"))
+                        )
+
+        def unchanged(key, path, size, etag):
+            if etag is None:
+                return False
+            if if_changed and self.etag_store().get(path) == etag:
+                return True
+            return skip_unchanged and self.is_unchanged(
+                path, bucket_name, key, size, etag
+            )
+
+        # Cache entries hold the stored bytes, and whether a small object is
+        # compressed is only known after its GET, so decoding bypasses the cache.
+        small_cache = None if decompress else cache
+
+        def get(item):
+            if unchanged(*item):
+                return False
+            key, path, size, etag = item
+            if small_cache is not None and etag:
+                entry = small_cache.entry_name(
+                    self.endpoint_url, bucket_name, key, etag
+                )
+                if small_cache.fetch(entry, path, size):
+                    if if_changed:
+                        self._remember(path, {"ETag": etag})
+                    return True
+            response = self._get_small(bucket_name, key, path, decompress=decompress)
+            self._keep(bucket_name, key, path, response, if_changed, small_cache)
+            return True
+
+        try:
+            for (key, path, _, _), fetched, error in map_concurrent(
+                self.concurrency, get, small_objects()
+            ):
+                if error:
+                    failed += 1
+                    self.logger.error(
+                        "Failed to download '%s' to '%s': %s", key, path, error
+                    )
+                elif fetched:
+                    downloaded += 1
+                else:
+                    skipped += 1
+        except Exception as e:
+            raise S3ActionError(f"Error listing objects: {e}") from e
+        # Decompressed downloads buffer their own parts, so they run one at a time.
+        scheduler = TransferScheduler(
+            max_in_flight,
+            max_connections=self.concurrency.maximum,
+            max_files=1 if decompress else DEFAULT_MAX_FILES,
+        )
+
+        def get_large(item):
+            if unchanged(*item):
+                return False
+            key, path, _, _ = item
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.download_file(
+                bucket_name,
+                key,
+                path,
+                hedge=hedge,
+                decompress=decompress,
+                if_changed=if_changed,
+                cache=cache,
+                scheduler=scheduler,
+            )
+            return True
+
+        for (key, path, _, _), fetched, error in scheduler.run(
+            get_large, order_transfers(large_objects, order, lambda item: item[2])
+        ):
+            if error:
+                failed += 1
+                self.logger.error(
+                    "Failed to download '%s' to '%s': %s", key, path, error
+                )
+            elif fetched:
+                downloaded += 1
+            else:
+                skipped += 1
+        if large_objects:
+            self.logger.info(
+                "Downloaded large objects with at most %.2f MB in %d part(s) in "
+                "flight.",
+                scheduler.peak / (1024 * 1024),
+                scheduler.peak_connections,
+            )
+        summary = (
+            f"Downloaded {downloaded} object(s) from '{bucket_name}/{prefix}' "
+            f"to '{directory}'"
+        )
+        if skipped:
+            summary += f", skipped {skipped} unchanged"
+        print(Colors.colorize(summary, "OKGREEN"))
+        if failed:
+            raise S3ActionError(f"{failed} object(s) failed to download.")
+
+    def download_packed(
+        self,
+        bucket_name: str,
+        prefix: str,
+        directory: Optional[str] = None,
+        names: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Download files packed under a prefix by upload_packed().
+        Named files are fetched with one ranged GET each; without names, every shard
+        is streamed once and all its current files are written out, with shards
+        fetched concurrently.
+        Args:
+            bucket_name (str): Source bucket name.
+            prefix (str): Key prefix the files were packed under.
+            directory (Optional[str]): Local destination directory (defaults to cwd).
+            names (Optional[List[str]]): Relative paths of the files to fetch.
+        Raises:
+            S3ActionError: If the index is missing, a name is not packed, or any
+                file fails to download.
+        """
+        directory = directory or "."
+        try:
+            index = read_index(self.s3, bucket_name, prefix)
+        except Exception as e:
+            raise S3ActionError(f"Error reading pack index: {e}") from e
+        if index is None:
+            raise S3ActionError(f"No packed files under '{bucket_name}/{prefix}'")
+        if names:
+            missing = [name for name in names if name not in index.files]
+            if missing:
+                raise S3ActionError(f"Not packed: {', '.join(missing)}")
+            items = [(name, *index.locate(name)) for name in names]
+            work, fetch = items, self._get_packed_file
+        else:
+            work, fetch = list(index.by_shard().items()), self._get_shard
+        fetched, failed = 0, 0
+
+        def get(item):
+            return fetch(bucket_name, prefix, directory, item)
+
+        for item, count, error in map_concurrent(self.concurrency, get, work):
+            if error:
+                failed += 1
+                self.logger.error("Failed to download '%s': %s", item[0], error)
+            else:
+                fetched += count
+        print(
+            Colors.colorize(
+                f"Downloaded {fetched} packed file(s) from '{bucket_name}/{prefix}' "
+                f"to '{directory}'",
+                "OKGREEN",
+            )
+        )
+        if failed:
+            raise S3ActionError(f"{failed} packed download(s) failed.")
+
+    def _get_packed_file(
+        self, bucket_name: str, prefix: str, directory: str, item: tuple
+    ) -> int:
+        """Fetch one packed file with a ranged GET of its bytes in the shard."""
+        name, shard, offset, size = item
+        path = self.local_path_for(directory, "", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            if size:
+                body = self.s3.get_object(
+                    Bucket=bucket_name,
+                    Key=pack_key(prefix, shard),
+                    Range=f"bytes={offset}-{offset + size - 1}",
+                )["Body"]
+                copy_body(body, f)
+        return 1
+
+    def _get_shard(
+        self, bucket_name: str, prefix: str, directory: str, item: tuple
+    ) -> int:
+        """Stream one shard and write out each of its current files."""
+        shard, members = item
+        start = members[0][1]
+        end = members[-1][1] + members[-1][2]
+        paths = [self.local_path_for(directory, "", name) for name, _, _ in members]
+        body = None
+        if end > start:
+            body = self.s3.get_object(
+                Bucket=bucket_name,
+                Key=pack_key(prefix, shard),
+                Range=f"bytes={start}-{end - 1}",
+            )["Body"]
+        view = memoryview(bytearray(COPY_CHUNK_SIZE))
+        position = start
+        try:
+            for (name, offset, size), path in zip(members, paths):
+                # Skip tar headers, padding and files superseded by later packs.
+                _copy_exact(body, None, offset - position, view)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    _copy_exact(body, f, size, view)
+                position = offset + size
+        finally:
+            if body is not None:
+                body.close()
+        return len(members)
+
+    def _download_decompressed(
+        self,
+        bucket_name: str,
+        object_key: str,
+        filename: str,
+        total_size: int,
+        etag: Optional[str],
+        codec: str,
+    ) -> None:
+        """Stream a compressed object through the decoder into a file or stdout."""
+        progress_callback = TqdmProgress(
+            filename, action="download", total_size=total_size, logger=self.logger
+        )
+        engine = StreamDownload(
+            self.s3,
+            bucket_name,
+            object_key,
+            total_size,
+            etag=etag,
+            controller=self.concurrency,
+            callback=progress_callback,
+        )
+        try:
+            if is_stdio(filename):
+                writer = DecompressingWriter(sys.stdout.buffer, codec)
+                engine.run(writer)
+                writer.finish()
+            else:
+                with open(filename, "wb") as f:
+                    writer = DecompressingWriter(f, codec)
+                    engine.run(writer)
+                    writer.finish()
+            self.logger.info(
+                "File '%s' downloaded from '%s' to '%s' and decompressed with %s "
+                "(%d -> %d bytes).",
+                object_key,
+                bucket_name,
+                filename,
+                codec,
+                total_size,
+                writer.bytes_out,
+            )
+        except BrokenPipeError:
+            self.logger.warning("Output closed before '%s' was complete.", object_key)
+        except Exception as e:
+            raise S3ActionError(f"Error downloading file: {e}") from e
         finally:
             progress_callback.close()
+
+    @staticmethod
+    def etag_store() -> ETagStore:
+        """
+        Return the shared store of ETags remembered for downloaded files.
+        Returns:
+            ETagStore: Store used by if_changed downloads.
+        """
+        if S3Downloader._etag_store is None:
+            S3Downloader._etag_store = ETagStore()
+        return S3Downloader._etag_store
+
+    def _get_if_changed(
+        self, bucket_name: str, object_key: str, etag: str
+    ) -> Optional[dict]:
+        """Send a GetObject with If-None-Match; return None if it was not modified."""
+        try:
+            return self.s3.get_object(
+                Bucket=bucket_name, Key=object_key, IfNoneMatch=etag
+            )
+        except Exception as e:
+            response = getattr(e, "response", {})
+            status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            code = response.get("Error", {}).get("Code")
+            if status == 304 or code in ("304", "NotModified"):
+                return None
+            raise
+
+    def _keep(
+        self,
+        bucket_name: str,
+        object_key: str,
+        filename: str,
+        head: dict,
+        if_changed: bool,
+        cache: Optional[ObjectCache],
+    ) -> None:
+        """Remember a downloaded file's ETag and add it to the object cache."""
+        if if_changed:
+            self._remember(filename, head)
+        if cache is not None and head.get("ETag"):
+            cache.store(
+                cache.entry_name(
+                    self.endpoint_url, bucket_name, object_key, head["ETag"]
+                ),
+                filename,
+            )
+
+    def _remember(self, filename: str, head: dict) -> None:
+        """Record the ETag of the object a file was just downloaded from."""
+        if head.get("ETag"):
+            self.etag_store().put(filename, head["ETag"], head.get("LastModified"))
+
+    @staticmethod
+    def local_path_for(directory: str, prefix: str, object_key: str) -> str:
+        """
+        Map an object key below prefix to a path inside directory.
+        Args:
+            directory (str): Local destination directory.
+            prefix (str): Key prefix being downloaded.
+            object_key (str): S3 object key.
+        Returns:
+            str: Local file path.
+        Raises:
+            S3ActionError: If the key would escape the destination directory.
+        """
+        relative = object_key[len(prefix) :].lstrip("/") or os.path.basename(object_key)
+        root = os.path.abspath(directory)
+        path = os.path.abspath(os.path.join(root, *relative.split("/")))
+        if os.path.commonpath([root, path]) != root:
+            raise S3ActionError(
+                f"Refusing to write outside '{directory}': {object_key}"
+            )
+        return path
+
+    def _get_small(
+        self,
+        bucket_name: str,
+        object_key: str,
+        filename: str,
+        decompress: bool = False,
+        response: Optional[dict] = None,
+    ) -> dict:
+        """
+        Download a small object with a single GetObject request.
+        Args:
+            bucket_name (str): Source bucket name.
+            object_key (str): S3 object key.
+            filename (str): Local file path.
+            decompress (bool): Decode objects stored with gzip or zstd compression.
+            response (Optional[dict]): GetObject response to read instead of
+                sending a new request.
+        Returns:
+            dict: The GetObject response.
+        """
+        if response is None:
+            response = self.s3.get_object(Bucket=bucket_name, Key=object_key)
+        body = response["Body"]
+        try:
+            data = body.read()
+        finally:
+            body.close()
+        parent = os.path.dirname(filename)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        codec = codec_from_head(response) if decompress else None
+        with open(filename, "wb") as f:
+            if codec:
+                writer = DecompressingWriter(f, codec)
+                writer.write(data)
+                writer.finish()
+            else:
+                f.write(data)
+        return response
+
+
+def _copy_exact(body, out, size: int, view: memoryview) -> None:
+    """Copy exactly size bytes of a response body to out, or discard them if None."""
+    while size:
+        read = readinto(body, view[: min(len(view), size)])
+        if not read:
+            raise IOError(f"Shard ended {size} bytes early")
+        if out is not None:
+            out.write(view[:read])
+        size -= read
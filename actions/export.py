@@ -0,0 +1,182 @@
+"""
+Export Action for R2Py CLI.
+
+This module defines the S3Exporter class, which writes every object under a prefix
+in a Cloudflare R2 bucket as a single tar stream, to stdout or a file, optionally
+gzip or zstd compressed, without downloading to disk first. Objects are listed page
+by page and emitted in key order. Small objects are fetched concurrently ahead of
+the writer into a reorder buffer capped in bytes, and larger objects are streamed
+through with ordered ranged GETs when the writer reaches them, so memory stays
+bounded however large the prefix is. All GETs share the byte and connection budgets
+of one TransferScheduler, and every GET is pinned to the listed ETag.
+"""
+
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from utils import Region, S3ActionError, S3Base
+from utils.compression import CompressingWriter
+from utils.pack import BLOCK_SIZE, padding, tar_header
+from utils.scheduler import TransferScheduler
+from utils.streaming import DEFAULT_STREAM_PART_SIZE, StreamDownload
+
+DEFAULT_EXPORT_BUFFER = 256 * 1024 * 1024
+# Listed objects held in the reorder buffer at once, prefetched or not.
+MAX_WINDOW_OBJECTS = 1024
+
+
+class S3Exporter(S3Base):
+    """Streams a prefix of a Cloudflare R2 bucket as a tar archive."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: Region = Region.AUTO,
+    ):
+        """
+        Initialize the exporter with S3 credentials and endpoint.
+        Args:
+            endpoint_url (str): S3-compatible endpoint URL.
+            access_key (str): Access key ID.
+            secret_key (str): Secret access key.
+            region (Region): AWS region or 'auto'.
+        """
+        super().__init__(endpoint_url, access_key, secret_key, region)
+        self.logger = S3Base.get_logger()
+
+    def export(
+        self,
+        bucket_name: str,
+        prefix: str,
+        out=None,
+        compress: Optional[str] = None,
+        max_buffer: int = DEFAULT_EXPORT_BUFFER,
+    ) -> Tuple[int, int]:
+        """
+        Write the objects under a prefix to a stream as a tar archive.
+        Member names are the keys relative to the prefix.
+        Args:
+            bucket_name (str): Source bucket name.
+            prefix (str): Key prefix to export.
+            out: Binary stream to write to (defaults to stdout).
+            compress (Optional[str]): Compress the archive with 'gzip' or 'zstd'.
+            max_buffer (int): Maximum bytes of prefetched objects held at once.
+        Returns:
+            Tuple[int, int]: Number of objects and of content bytes exported.
+        Raises:
+            S3ActionError: If listing or any object fails; the archive is then
+                incomplete.
+        """
+        out = out or sys.stdout.buffer
+        writer = CompressingWriter(out, compress) if compress else out
+        try:
+            count, total = self._write_archive(bucket_name, prefix, writer, max_buffer)
+            if compress:
+                writer.finish()
+            else:
+                out.flush()
+        except BrokenPipeError:
+            self.logger.warning("Output closed before the export was complete.")
+            return 0, 0
+        except S3ActionError:
+            raise
+        except Exception as e:
+            raise S3ActionError(f"Error exporting '{bucket_name}/{prefix}': {e}") from e
+        self.logger.info(
+            "Exported %d object(s) (%d bytes) from '%s/%s'.",
+            count,
+            total,
+            bucket_name,
+            prefix,
+        )
+        return count, total
+
+    def _write_archive(
+        self, bucket_name: str, prefix: str, out, max_buffer: int
+    ) -> Tuple[int, int]:
+        """Emit every object in key order while keeping the reorder buffer full."""
+        objects = self._list(bucket_name, prefix)
+        scheduler = TransferScheduler(
+            max_buffer, max_connections=self.concurrency.maximum
+        )
+        small_budget = scheduler.budget("small objects")
+        window = deque()
+        buffered = 0
+        count, total = 0, 0
+        with ThreadPoolExecutor(max_workers=self.concurrency.maximum) as pool:
+            while True:
+                # Prefetch small objects until the buffer is full; large ones
+                # only hold their place in line.
+                while True:
+                    obj = next(objects, None) if objects else None
+                    if obj is None:
+                        objects = None
+                        break
+                    if obj["Size"] > DEFAULT_STREAM_PART_SIZE:
+                        window.append((obj, None))
+                    else:
+                        buffered += obj["Size"]
+                        future = pool.submit(
+                            self._fetch, bucket_name, obj, small_budget
+                        )
+                        window.append((obj, future))
+                    if buffered >= max_buffer or len(window) >= MAX_WINDOW_OBJECTS:
+                        break
+                if not window:
+                    break
+                obj, future = window.popleft()
+                name = obj["Key"][len(prefix) :].lstrip("/") or obj["Key"]
+                mtime = int(obj["LastModified"].timestamp())
+                if future is None:
+                    out.write(tar_header(name, obj["Size"], mtime))
+                    StreamDownload(
+                        self.s3,
+                        bucket_name,
+                        obj["Key"],
+                        obj["Size"],
+                        etag=obj.get("ETag"),
+                        controller=self.concurrency,
+                        budget=scheduler.budget(obj["Key"]),
+                    ).run(out)
+                else:
+                    data = future.result()
+                    buffered -= obj["Size"]
+                    out.write(tar_header(name, len(data), mtime))
+                    out.write(data)
+                out.write(bytes(padding(obj["Size"])))
+                count += 1
+                total += obj["Size"]
+        out.write(bytes(2 * BLOCK_SIZE))
+        return count, total
+
+    def _list(self, bucket_name: str, prefix: str):
+        """Yield the objects under prefix in key order, page by page."""
+        try:
+            paginator = self.s3.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    if not obj["Key"].endswith("/"):
+                        yield obj
+        except Exception as e:
+            raise S3ActionError(f"Error listing objects: {e}") from e
+
+    def _fetch(self, bucket_name: str, obj: dict, budget) -> bytes:
+        """Fetch a small object whole, pinned to its listed ETag."""
+        kwargs = {"Bucket": bucket_name, "Key": obj["Key"]}
+        if obj.get("ETag"):
+            kwargs["IfMatch"] = obj["ETag"]
+        with budget.part(obj["Size"]), self.concurrency.slot():
+            body = self.s3.get_object(**kwargs)["Body"]
+            try:
+                data = body.read()
+            finally:
+                body.close()
+        if len(data) != obj["Size"]:
+            raise IOError(
+                f"'{obj['Key']}' has {len(data)} bytes, expected {obj['Size']}"
+            )
+        return data
@@ -4,10 +4,17 @@ List Action for R2Py CLI.
 This module defines the S3Lister class, which handles the listing of buckets,
 objects, and multipart uploads from a Cloudflare R2 bucket using the S3-compatible API.
 It provides methods to list buckets, objects, and multipart uploads by specifying
-the bucket name and region.
+the bucket name and region (bucket regions are looked up concurrently and cached
+locally), and a usage summary that aggregates object counts,
+sizes and size histograms per prefix from parallel listings.
 """
 
-from utils import S3Base, Colors, S3ActionError, Region
+import json
+from typing import List
+
+from utils import S3Base, Colors, S3ActionError, Region, map_concurrent
+from utils.cache import TTLCache
+from utils.usage import HISTOGRAM_LABELS, PrefixUsage, format_size
 
 
 class S3Lister(S3Base):
@@ -15,6 +22,9 @@ class S3Lister(S3Base):
     Handles listing buckets, files, etc. from a Cloudflare R2 bucket using the S3-compatible API.
     """
 
+    # Bucket locations essentially never change; cache them for a week.
+    region_cache_ttl = 7 * 24 * 3600
+
     def __init__(
         self,
         endpoint_url: str,
@@ -36,9 +46,14 @@ class S3Lister(S3Base):
         self.colorize_bold = Colors.colorize_bold
         self.colorize_underline = Colors.colorize_underline
 
-    def list_buckets(self, with_region: bool) -> None:
+    def list_buckets(self, with_region: bool, refresh: bool = False) -> None:
         """
         List all buckets in the S3-compatible storage.
+        Regions are served from the local cache when possible; the remaining
+        lookups run concurrently and each bucket is printed as its lookup finishes.
+        Args:
+            with_region (bool): Include the region of each bucket.
+            refresh (bool): Ignore cached regions and look them all up again.
         Raises:
             S3ActionError: If listing buckets fails.
         """
@@ -49,28 +64,56 @@ class S3Lister(S3Base):
             if not buckets:
                 print(self.colorize("No buckets found.", "WARNING"))
                 self.logger.warning("No buckets found.")
+            elif with_region:
+                self._list_buckets_with_region(buckets, refresh)
             else:
                 for bucket in buckets:
-                    print(self.colorize(f"Bucket: {bucket['Name']}", "OKGREEN"))
-                    if with_region:
-                        print(self.colorize("  Region: ", "OKBLUE"), end="")
-                        try:
-                            region = self.s3.get_bucket_location(Bucket=bucket["Name"])[
-                                "LocationConstraint"
-                            ]
-                        except Exception as e:
-                            region = self.colorize(f"Error: {e}", "FAIL")
-                        print(f"{region}")
-                    print(
-                        self.colorize(
-                            f"  Created: {bucket['CreationDate']}\n", "OKCYAN"
-                        )
-                    )
+                    self._print_bucket(bucket)
         except Exception as e:
             raise S3ActionError(f"Error listing buckets: {e}") from e
         finally:
             self.logger.info("Finished listing buckets.")
 
+    def _list_buckets_with_region(self, buckets: list, refresh: bool) -> None:
+        """Print cached buckets first, then the others as their lookups finish."""
+        cache = TTLCache("regions.json", self.region_cache_ttl)
+        pending = []
+        for bucket in buckets:
+            key = f"{self.endpoint_url}/{bucket['Name']}"
+            if not refresh and key in cache:
+                self._print_bucket(bucket, cache.get(key), with_region=True)
+            else:
+                pending.append(bucket)
+        self.logger.info(
+            "Looking up %d bucket region(s), %d cached.",
+            len(pending),
+            len(buckets) - len(pending),
+        )
+
+        def lookup(bucket):
+            return self.s3.get_bucket_location(Bucket=bucket["Name"])[
+                "LocationConstraint"
+            ]
+
+        try:
+            for bucket, region, error in map_concurrent(
+                self.concurrency, lookup, pending
+            ):
+                if error:
+                    region = self.colorize(f"Error: {error}", "FAIL")
+                else:
+                    cache.set(f"{self.endpoint_url}/{bucket['Name']}", region)
+                self._print_bucket(bucket, region, with_region=True)
+        finally:
+            cache.save()
+
+    def _print_bucket(self, bucket: dict, region=None, with_region: bool = False):
+        """Print one bucket row."""
+        print(self.colorize(f"Bucket: {bucket['Name']}", "OKGREEN"))
+        if with_region:
+            print(self.colorize("  Region: ", "OKBLUE") + f"{region}")
+        print(self.colorize(f"  Created: {bucket['CreationDate']}\n", "OKCYAN"))
+
     def list_objects(self, bucket_name: str) -> None:
         """
         List all objects in the specified bucket.
@@ -99,29 +142,32 @@ class S3Lister(S3Base):
 
     def list_multipart_uploads(self, bucket_name: str) -> None:
         """
-        List all multipart uploads in the specified bucket.
+        List all multipart uploads in the specified bucket, across every page.
         Args:
             bucket_name (str): Target bucket name.
         Raises:
             S3ActionError: If listing multipart uploads fails.
         """
         try:
-            response = self.s3.list_multipart_uploads(Bucket=bucket_name)
+            paginator = self.s3.get_paginator("list_multipart_uploads")
             print(
                 self.colorize_bold(
                     f"=== Multipart Uploads in Bucket: {bucket_name} ===", "HEADER"
                 )
             )
-            if "Uploads" in response:
-                print(
-                    self.colorize_underline("%-40s %-40s", "UNDERLINE")
-                    % ("Upload ID", "Object Key")
-                )
-                for upload in response["Uploads"]:
+            found = False
+            for page in paginator.paginate(Bucket=bucket_name):
+                for upload in page.get("Uploads", []):
+                    if not found:
+                        print(
+                            self.colorize_underline("%-40s %-40s", "UNDERLINE")
+                            % ("Upload ID", "Object Key")
+                        )
+                        found = True
                     colored_id = self.colorize(upload["UploadId"], "OKBLUE")
                     colored_key = self.colorize(upload["Key"], "OKGREEN")
                     print(f"{colored_id:<40} {colored_key:<40}")
-            else:
+            if not found:
                 print(self.colorize("No multipart uploads found.", "WARNING"))
         except Exception as e:
             raise S3ActionError(f"Error listing multipart uploads: {e}") from e
@@ -165,3 +211,152 @@ class S3Lister(S3Base):
                 prefix,
                 bucket_name,
             )
+
+    def disk_usage(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        depth: int = 1,
+        sort_by: str = "size",
+        as_json: bool = False,
+        histogram: bool = False,
+    ) -> List[PrefixUsage]:
+        """
+        Summarize object counts and sizes per prefix, like 'du'.
+        Common prefixes are discovered level by level down to depth, listing the
+        prefixes of each level in parallel; each prefix at the final depth is then
+        listed in full by its own worker. Totals are aggregated page by page, so
+        keys are never held in memory. Objects that sit directly in a shallower
+        prefix are counted under that prefix.
+        Args:
+            bucket_name (str): Target bucket name.
+            prefix (str): Prefix to summarize (defaults to the whole bucket).
+            depth (int): Number of '/'-delimited levels below prefix to group by.
+            sort_by (str): 'size', 'count' or 'name'.
+            as_json (bool): Print JSON instead of a table.
+            histogram (bool): Include the size histogram of each prefix in the table.
+        Returns:
+            List[PrefixUsage]: Usage per prefix, sorted as printed.
+        Raises:
+            S3ActionError: If any listing fails.
+        """
+        try:
+            direct, leaves = self._discover_prefixes(bucket_name, prefix, depth)
+            usages = [usage for usage in direct if usage.objects]
+            for _, usage, error in map_concurrent(
+                self.concurrency,
+                lambda p: self._prefix_usage(bucket_name, p),
+                leaves,
+            ):
+                if error:
+                    raise error
+                usages.append(usage)
+        except Exception as e:
+            raise S3ActionError(f"Error computing usage: {e}") from e
+        sort_keys = {
+            "size": lambda u: (-u.bytes, u.prefix),
+            "count": lambda u: (-u.objects, u.prefix),
+            "name": lambda u: u.prefix,
+        }
+        usages.sort(key=sort_keys[sort_by])
+        total = PrefixUsage(prefix)
+        for usage in usages:
+            total.merge(usage)
+        if as_json:
+            print(
+                json.dumps(
+                    {
+                        "bucket": bucket_name,
+                        "total": total.to_dict(),
+                        "prefixes": [u.to_dict() for u in usages],
+                    },
+                    indent=2,
+                )
+            )
+        else:
+            self._print_usage(bucket_name, usages, total, histogram)
+        self.logger.info(
+            "Summarized %d prefix(es) in bucket '%s'.", len(usages), bucket_name
+        )
+        return usages
+
+    def _discover_prefixes(self, bucket_name: str, prefix: str, depth: int) -> tuple:
+        """
+        Walk common prefixes down to depth, one parallel listing per prefix.
+        Returns:
+            tuple: (usages of objects found directly in shallower prefixes,
+                prefixes at the final depth).
+        """
+        level = [prefix]
+        direct = []
+        for _ in range(depth):
+            next_level = []
+            for _, result, error in map_concurrent(
+                self.concurrency,
+                lambda p: self._list_level(bucket_name, p),
+                level,
+            ):
+                if error:
+                    raise error
+                usage, children = result
+                direct.append(usage)
+                next_level.extend(children)
+            level = sorted(next_level)
+            if not level:
+                break
+        return direct, level
+
+    def _list_level(self, bucket_name: str, prefix: str) -> tuple:
+        """List one '/'-delimited level: count its objects and collect subprefixes."""
+        usage = PrefixUsage(prefix)
+        children = []
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=bucket_name, Prefix=prefix, Delimiter="/"
+        ):
+            usage.add_page(page.get("Contents", []))
+            children.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+        return usage, children
+
+    def _prefix_usage(self, bucket_name: str, prefix: str) -> PrefixUsage:
+        """Aggregate every object below prefix, one listing page at a time."""
+        usage = PrefixUsage(prefix)
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            usage.add_page(page.get("Contents", []))
+        return usage
+
+    def _print_usage(
+        self,
+        bucket_name: str,
+        usages: List[PrefixUsage],
+        total: PrefixUsage,
+        histogram: bool,
+    ) -> None:
+        """Print usage rows as a table."""
+        print(self.colorize_bold(f"=== Usage in Bucket: {bucket_name} ===", "HEADER"))
+        if not usages:
+            print(self.colorize("No objects found.", "WARNING"))
+            return
+        print(
+            self.colorize_underline("%-50s %12s %12s %7s", "UNDERLINE")
+            % ("Prefix", "Objects", "Size", "Share")
+        )
+        for usage in usages + [total]:
+            share = usage.bytes / total.bytes * 100 if total.bytes else 0.0
+            label = usage.prefix or "/"
+            if usage is total:
+                label = self.colorize_bold(f"Total ({label})", "OKBLUE")
+            else:
+                label = self.colorize(label, "OKGREEN")
+            print(
+                f"{label:<50} {usage.objects:12} {format_size(usage.bytes):>12} "
+                f"{share:6.1f}%"
+            )
+            if histogram and usage is not total:
+                bins = ", ".join(
+                    f"{name}: {count}"
+                    for name, count in zip(HISTOGRAM_LABELS, usage.histogram)
+                    if count
+                )
+                print(self.colorize(f"  {bins}", "OKCYAN"))
@@ -0,0 +1,158 @@
+"""
+Read Action for R2Py CLI.
+
+This module defines the S3Reader class, which opens objects in a Cloudflare R2
+bucket as read-only, seekable file objects, so Python code can read parts of large
+objects (archives, Parquet footers, indexes) without downloading them. Reads are
+served by ranged GETs through a block cache with sequential readahead. It also
+streams whole objects, byte ranges and object heads straight to stdout with a
+single GET each.
+"""
+
+import sys
+from typing import Optional
+
+from utils import Region, S3ActionError, S3Base
+from utils.remotefile import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_CACHE_BLOCKS,
+    DEFAULT_READAHEAD_BLOCKS,
+    RemoteFile,
+)
+from utils.streaming import copy_body
+
+
+class S3Reader(S3Base):
+    """Opens Cloudflare R2 objects as seekable file objects using the S3-compatible API."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: Region = Region.AUTO,
+    ):
+        """
+        Initialize the reader with S3 credentials and endpoint.
+        Args:
+            endpoint_url (str): S3-compatible endpoint URL.
+            access_key (str): Access key ID.
+            secret_key (str): Secret access key.
+            region (Region): AWS region or 'auto'.
+        """
+        super().__init__(endpoint_url, access_key, secret_key, region)
+        self.logger = S3Base.get_logger()
+
+    def open(
+        self,
+        bucket_name: str,
+        object_key: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        readahead: int = DEFAULT_READAHEAD_BLOCKS,
+    ) -> RemoteFile:
+        """
+        Open an object for reading.
+        Args:
+            bucket_name (str): Bucket name.
+            object_key (str): Object key.
+            block_size (int): Size of each ranged GET and cached block in bytes.
+            cache_blocks (int): Maximum number of blocks kept in memory.
+            readahead (int): Blocks prefetched ahead of sequential reads (0 disables).
+        Returns:
+            RemoteFile: Seekable binary file object; close it when done.
+        Raises:
+            S3ActionError: If the object metadata cannot be read.
+        """
+        try:
+            head = self.s3.head_object(Bucket=bucket_name, Key=object_key)
+        except Exception as e:
+            raise S3ActionError(f"Could not get object metadata: {e}") from e
+        self.logger.info(
+            "Opened '%s/%s' (%d bytes) for reading.",
+            bucket_name,
+            object_key,
+            head["ContentLength"],
+        )
+        return RemoteFile(
+            self.s3,
+            bucket_name,
+            object_key,
+            head["ContentLength"],
+            etag=head.get("ETag"),
+            controller=self.concurrency,
+            block_size=block_size,
+            cache_blocks=cache_blocks,
+            readahead=readahead,
+        )
+
+    def cat(
+        self,
+        bucket_name: str,
+        object_key: str,
+        byte_range: Optional[str] = None,
+        out=None,
+    ) -> int:
+        """
+        Stream an object, or a byte range of it, to a stream with a single GET.
+        No HEAD request is sent and no progress bar is shown.
+        Args:
+            bucket_name (str): Bucket name.
+            object_key (str): Object key.
+            byte_range (Optional[str]): HTTP Range value, e.g. 'bytes=0-1023'.
+            out: Binary stream to write to (defaults to stdout).
+        Returns:
+            int: Number of bytes written.
+        Raises:
+            S3ActionError: If the object cannot be read.
+        """
+        return self._stream(bucket_name, object_key, byte_range, out)
+
+    def head(self, bucket_name: str, object_key: str, length: int, out=None) -> int:
+        """
+        Stream the first bytes of an object to a stream with a single ranged GET.
+        Args:
+            bucket_name (str): Bucket name.
+            object_key (str): Object key.
+            length (int): Number of bytes to read from the start of the object.
+            out: Binary stream to write to (defaults to stdout).
+        Returns:
+            int: Number of bytes written (less than length for shorter objects).
+        Raises:
+            S3ActionError: If the object cannot be read.
+        """
+        if length <= 0:
+            return 0
+        # Any range of an empty object is unsatisfiable; its head is empty.
+        return self._stream(
+            bucket_name, object_key, f"bytes=0-{length - 1}", out, empty_ok=True
+        )
+
+    def _stream(
+        self,
+        bucket_name: str,
+        object_key: str,
+        byte_range: Optional[str],
+        out,
+        empty_ok: bool = False,
+    ) -> int:
+        """Copy one GetObject response body to out."""
+        out = out or sys.stdout.buffer
+        kwargs = {"Bucket": bucket_name, "Key": object_key}
+        if byte_range:
+            kwargs["Range"] = byte_range
+        try:
+            body = self.s3.get_object(**kwargs)["Body"]
+            written = copy_body(body, out)
+        except BrokenPipeError:
+            self.logger.warning("Output closed before '%s' was complete.", object_key)
+            return 0
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if empty_ok and code == "InvalidRange":
+                return 0
+            raise S3ActionError(f"Error reading object: {e}") from e
+        self.logger.info(
+            "Streamed %d bytes of '%s/%s' to output.", written, bucket_name, object_key
+        )
+        return written
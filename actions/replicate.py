@@ -0,0 +1,248 @@
+"""
+Replicate Action for R2Py CLI.
+
+This module defines the S3Replicator class, which copies the objects under a prefix
+from one S3 client to another, such as from one Cloudflare R2 account to another or
+from another S3-compatible provider, where a server-side copy cannot reach the
+source. Objects are streamed through memory without touching local disk: small
+objects with one GET and one PUT, large objects with ranged GETs feeding the parts
+of a multipart upload. All parts in flight share one byte budget, and large objects
+keep the part layout of their source so their multipart ETags carry over. Objects
+already present with the same size and ETag can be skipped.
+"""
+
+from typing import Optional
+
+
+from utils import Colors, Region, S3ActionError, S3Base, TqdmProgress, map_concurrent
+from utils.crosscopy import CrossCopy
+from utils.listing import list_range, merge_listings
+from utils.multipart import DEFAULT_MAX_IN_FLIGHT, DEFAULT_PART_SIZE
+from utils.partcopy import COPIED_HEADERS
+from utils.scheduler import TransferOrder, TransferScheduler, order_transfers
+
+# Records the source ETag on copies whose own ETag cannot match it.
+SOURCE_ETAG_METADATA = "r2py-source-etag"
+
+
+class S3Replicator(S3Base):
+    """Replicates objects from another S3 client into a Cloudflare R2 bucket."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: Region = Region.AUTO,
+    ):
+        """
+        Initialize the replicator with the S3 credentials and endpoint of the target.
+        Args:
+            endpoint_url (str): S3-compatible endpoint URL.
+            access_key (str): Access key ID.
+            secret_key (str): Secret access key.
+            region (Region): AWS region or 'auto'.
+        """
+        super().__init__(endpoint_url, access_key, secret_key, region)
+        self.logger = S3Base.get_logger()
+
+    def replicate(
+        self,
+        source: S3Base,
+        source_bucket: str,
+        source_prefix: str,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        skip_identical: bool = False,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        part_size: int = DEFAULT_PART_SIZE,
+        order: TransferOrder = TransferOrder.LARGEST,
+    ) -> None:
+        """
+        Copy every object under a prefix of the source client into this client.
+        Objects up to part_size are copied by a pool of workers while the source is
+        listed; larger objects follow a few at a time, each with parallel parts.
+        Args:
+            source (S3Base): Client holding the source objects.
+            source_bucket (str): Source bucket name.
+            source_prefix (str): Source key prefix.
+            bucket_name (str): Target bucket name.
+            prefix (Optional[str]): Target key prefix (defaults to source_prefix).
+            skip_identical (bool): Skip objects already in the target with the same
+                size and ETag.
+            max_in_flight (int): Maximum bytes held in memory at once.
+            part_size (int): Size above which objects are copied in parts, and part
+                size of objects whose source was uploaded in one piece.
+            order (TransferOrder): Start large objects largest or smallest first.
+        Raises:
+            S3ActionError: If listing fails or any object fails to replicate.
+        """
+        if prefix is None:
+            prefix = source_prefix
+        same_client = source.s3 is self.s3
+        if same_client and source_bucket == bucket_name and source_prefix == prefix:
+            raise S3ActionError("Source and destination are the same.")
+        # Skip our own output when the destination lies inside the source prefix.
+        nested = (
+            same_client
+            and source_bucket == bucket_name
+            and prefix.startswith(source_prefix)
+        )
+        scheduler = TransferScheduler(
+            max_in_flight, max_connections=self.concurrency.maximum
+        )
+        small_budget = scheduler.budget("small objects")
+        large_objects = []
+        skipped = 0
+
+        def pending():
+            nonlocal skipped
+            listing = list_range(source.s3, source_bucket, source_prefix)
+            if skip_identical:
+                target = list_range(self.s3, bucket_name, prefix)
+                entries = merge_listings(listing, target)
+            else:
+                entries = ((None, obj, None) for obj in listing)
+            for status, obj, existing in entries:
+                if obj is None:
+                    continue
+                if nested and (source_prefix + obj[0]).startswith(prefix):
+                    continue
+                if status == "unchanged" or (
+                    status == "changed"
+                    and self._is_replica(bucket_name, prefix, obj, existing)
+                ):
+                    skipped += 1
+                elif obj[1] > part_size:
+                    large_objects.append(obj)
+                else:
+                    yield obj
+
+        def copy_small(obj):
+            relative, size, etag = obj
+            with small_budget.part(size):
+                kwargs = {"Bucket": source_bucket, "Key": source_prefix + relative}
+                if etag:
+                    kwargs["IfMatch"] = f'"{etag}"'
+                response = source.s3.get_object(**kwargs)
+                body = response["Body"]
+                try:
+                    data = body.read()
+                finally:
+                    body.close()
+                extra_args = {k: response[k] for k in COPIED_HEADERS if response.get(k)}
+                # A single PUT reproduces the ETag of a single-part source only.
+                if "-" in etag:
+                    extra_args["Metadata"] = {
+                        **extra_args.get("Metadata", {}),
+                        SOURCE_ETAG_METADATA: etag,
+                    }
+                self.s3.put_object(
+                    Bucket=bucket_name, Key=prefix + relative, Body=data, **extra_args
+                )
+
+        def copy_large(obj):
+            self._copy_large(
+                source,
+                source_bucket,
+                source_prefix + obj[0],
+                bucket_name,
+                prefix + obj[0],
+                part_size,
+                scheduler,
+            )
+
+        replicated, failed = 0, 0
+        try:
+            for (relative, _, _), _, error in map_concurrent(
+                self.concurrency, copy_small, pending()
+            ):
+                if error:
+                    failed += 1
+                    self.logger.error("Failed to replicate '%s': %s", relative, error)
+                else:
+                    replicated += 1
+        except Exception as e:
+            raise S3ActionError(f"Error listing objects: {e}") from e
+        for (relative, _, _), _, error in scheduler.run(
+            copy_large, order_transfers(large_objects, order, lambda obj: obj[1])
+        ):
+            if error:
+                failed += 1
+                self.logger.error("Failed to replicate '%s': %s", relative, error)
+            else:
+                replicated += 1
+        if large_objects:
+            self.logger.info(
+                "Replicated %d large object(s) with at most %.2f MB in flight.",
+                len(large_objects),
+                scheduler.peak / (1024 * 1024),
+            )
+        summary = (
+            f"Replicated {replicated} object(s) from '{source_bucket}/{source_prefix}' "
+            f"to '{bucket_name}/{prefix}'"
+        )
+        if skipped:
+            summary += f", skipped {skipped} identical"
+        print(Colors.colorize(summary, "OKGREEN"))
+        if failed:
+            raise S3ActionError(f"{failed} object(s) failed to replicate.")
+
+    def _is_replica(
+        self, bucket_name: str, prefix: str, obj: tuple, existing: tuple
+    ) -> bool:
+        """Check whether a target object of another ETag was copied from obj."""
+        relative, size, etag = obj
+        if existing[1] != size:
+            return False
+        head = self.s3.head_object(Bucket=bucket_name, Key=prefix + relative)
+        return head.get("Metadata", {}).get(SOURCE_ETAG_METADATA) == etag
+
+    def _copy_large(
+        self,
+        source: S3Base,
+        source_bucket: str,
+        source_key: str,
+        bucket_name: str,
+        object_key: str,
+        part_size: int,
+        scheduler: TransferScheduler,
+    ) -> None:
+        """Copy one large object in parts taken from the scheduler's budget."""
+        head = source.s3.head_object(Bucket=source_bucket, Key=source_key)
+        etag = head["ETag"].strip('"')
+        metadata = None
+        if "-" in etag:
+            # The first part's size gives the source layout; the same parts give
+            # the same multipart ETag.
+            first = source.s3.head_object(
+                Bucket=source_bucket, Key=source_key, PartNumber=1
+            )
+            part_size = first["ContentLength"]
+        else:
+            metadata = {SOURCE_ETAG_METADATA: etag}
+        progress_callback = TqdmProgress(
+            object_key,
+            action="upload",
+            total_size=head["ContentLength"],
+            logger=self.logger,
+        )
+        try:
+            CrossCopy(
+                source.s3,
+                source_bucket,
+                source_key,
+                self.s3,
+                bucket_name,
+                object_key,
+                head,
+                source_controller=source.concurrency,
+                controller=self.concurrency,
+                part_size=part_size,
+                metadata=metadata,
+                callback=progress_callback,
+                logger=self.logger,
+                budget=scheduler.budget(object_key),
+            ).run()
+        finally:
+            progress_callback.close()
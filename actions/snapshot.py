@@ -0,0 +1,484 @@
+"""
+Snapshot Action for R2Py CLI.
+
+This module defines the S3Snapshotter class, which backs up directories to a
+Cloudflare R2 bucket as deduplicated snapshots. Files are split into content-defined
+chunks and every chunk is stored once under a key derived from its SHA-256, so data
+shared between files or between snapshots, including files that only had bytes
+inserted, is never uploaded twice. A local chunk index answers most existence checks
+without a request, and each snapshot is a single gzip-compressed JSON manifest
+listing its chunks and the files built from them. Restores fetch every distinct
+chunk once, in parallel, verify it against its hash and write it to each place it
+is used. Chunks in flight either way take their bytes and connections from one
+TransferScheduler, which bounds the memory they hold.
+
+Repository layout below the prefix:
+    chunks/<2 hex digits>/<sha256>   chunk contents
+    manifests/<name>.json.gz         one manifest per snapshot
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from utils import Colors, Region, S3ActionError, S3Base, map_concurrent
+from utils.chunkindex import ChunkIndex
+from utils.chunking import CHUNKING_VERSION, chunk_file
+from utils.hashcache import INLINE_HASH_SIZE, file_identity
+from utils.scanner import scan_tree, walk_order
+from utils.scheduler import TransferScheduler
+
+from .download import S3Downloader
+
+DEFAULT_REPOSITORY = "snapshots/"
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".json.gz"
+# Hash cache kind under which the chunk list of an unchanged file is remembered.
+CHUNK_LIST_KIND = f"chunks:{CHUNKING_VERSION}"
+
+
+def repository_prefix(prefix: Optional[str]) -> str:
+    """Return a repository key prefix that ends with '/' (or '' for the bucket root)."""
+    prefix = (prefix or "").lstrip("/")
+    return prefix if not prefix or prefix.endswith("/") else f"{prefix}/"
+
+
+def chunk_key(prefix: str, chunk_id: str) -> str:
+    """Return the object key of a chunk."""
+    return f"{prefix}chunks/{chunk_id[:2]}/{chunk_id}"
+
+
+def manifest_key(prefix: str, name: str) -> str:
+    """Return the object key of a snapshot manifest."""
+    return f"{prefix}manifests/{name}{MANIFEST_SUFFIX}"
+
+
+class S3Snapshotter(S3Base):
+    """Creates and restores deduplicated directory snapshots in Cloudflare R2."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: Region = Region.AUTO,
+    ):
+        """
+        Initialize the snapshotter with S3 credentials and endpoint.
+        Args:
+            endpoint_url (str): S3-compatible endpoint URL.
+            access_key (str): Access key ID.
+            secret_key (str): Secret access key.
+            region (Region): AWS region or 'auto'.
+        """
+        super().__init__(endpoint_url, access_key, secret_key, region)
+        self.logger = S3Base.get_logger()
+
+    def snapshot(
+        self,
+        directory: str,
+        bucket_name: str,
+        prefix: str = DEFAULT_REPOSITORY,
+        name: Optional[str] = None,
+    ) -> str:
+        """
+        Back up a directory as a new snapshot.
+        Args:
+            directory (str): Local directory to back up.
+            bucket_name (str): Target bucket name.
+            prefix (str): Key prefix of the snapshot repository.
+            name (Optional[str]): Snapshot name (defaults to the UTC time).
+        Returns:
+            str: The snapshot name.
+        Raises:
+            S3ActionError: If the directory is missing, the name is taken, or
+                any chunk or the manifest fails to upload.
+        """
+        if not os.path.isdir(directory):
+            raise S3ActionError(f"Directory not found: {directory}")
+        prefix = repository_prefix(prefix)
+        name = name or time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        if self._exists(bucket_name, manifest_key(prefix, name)):
+            raise S3ActionError(f"Snapshot '{name}' already exists.")
+
+        files, directories = self._scan(directory)
+        chunk_lists, unreadable = self._chunk_files([path for path, _, _ in files])
+        chunk_ids: Dict[str, int] = {}
+        chunks: List[list] = []
+        sources: Dict[str, Tuple[str, int, int]] = {}
+        entries = []
+        total_size = 0
+        for path, relative, stat in files:
+            if path not in chunk_lists:
+                continue
+            indexes = []
+            for chunk_id, offset, size in chunk_lists[path]:
+                if chunk_id not in chunk_ids:
+                    chunk_ids[chunk_id] = len(chunks)
+                    chunks.append([chunk_id, size])
+                    sources[chunk_id] = (path, offset, size)
+                indexes.append(chunk_ids[chunk_id])
+            total_size += stat.st_size
+            entries.append(
+                {
+                    "path": relative,
+                    "size": stat.st_size,
+                    "mode": stat.st_mode & 0o7777,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "chunks": indexes,
+                }
+            )
+
+        uploaded, uploaded_bytes = self._upload_chunks(bucket_name, prefix, sources)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "name": name,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "chunking": CHUNKING_VERSION,
+            "chunks": chunks,
+            "directories": directories,
+            "files": entries,
+        }
+        body = gzip.compress(json.dumps(manifest, separators=(",", ":")).encode())
+        try:
+            self.s3.put_object(
+                Bucket=bucket_name,
+                Key=manifest_key(prefix, name),
+                Body=body,
+                ContentType="application/gzip",
+            )
+        except Exception as e:
+            raise S3ActionError(f"Error writing snapshot manifest: {e}") from e
+        print(
+            Colors.colorize(
+                f"Snapshot '{name}' of '{directory}' saved to "
+                f"'{bucket_name}/{prefix}': {len(entries)} file(s), "
+                f"{total_size} bytes in {len(chunks)} chunk(s), "
+                f"uploaded {uploaded} new chunk(s) ({uploaded_bytes} bytes)",
+                "OKGREEN",
+            )
+        )
+        if unreadable:
+            raise S3ActionError(
+                f"{unreadable} file(s) could not be read and were left out."
+            )
+        return name
+
+    def restore(
+        self,
+        bucket_name: str,
+        directory: str,
+        name: str = "latest",
+        prefix: str = DEFAULT_REPOSITORY,
+    ) -> None:
+        """
+        Restore a snapshot into a local directory.
+        Args:
+            bucket_name (str): Source bucket name.
+            directory (str): Local destination directory.
+            name (str): Snapshot name, or 'latest' for the most recent one.
+            prefix (str): Key prefix of the snapshot repository.
+        Raises:
+            S3ActionError: If the snapshot cannot be read, a file would be written
+                outside the directory, or any chunk fails to restore.
+        """
+        prefix = repository_prefix(prefix)
+        manifest = self.read_manifest(bucket_name, name, prefix)
+        chunks = manifest["chunks"]
+        placements: List[List[Tuple[str, int]]] = [[] for _ in chunks]
+        files = []
+        for entry in manifest["files"]:
+            path = S3Downloader.local_path_for(directory, "", entry["path"])
+            offset = 0
+            for index in entry["chunks"]:
+                placements[index].append((path, offset))
+                offset += chunks[index][1]
+            files.append((path, entry))
+        try:
+            for relative in manifest.get("directories", []):
+                path = S3Downloader.local_path_for(directory, "", relative)
+                os.makedirs(path, exist_ok=True)
+            for path, entry in files:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.truncate(entry["size"])
+        except OSError as e:
+            raise S3ActionError(f"Error creating files: {e}") from e
+
+        budget = self._chunk_budget()
+
+        def fetch(index):
+            chunk_id, size = chunks[index]
+            with budget.part(size):
+                body = self.s3.get_object(
+                    Bucket=bucket_name, Key=chunk_key(prefix, chunk_id)
+                )["Body"]
+                try:
+                    data = body.read()
+                finally:
+                    body.close()
+                if len(data) != size or hashlib.sha256(data).hexdigest() != chunk_id:
+                    raise IOError(f"Chunk {chunk_id} is corrupt")
+                for path, offset in placements[index]:
+                    with open(path, "r+b") as f:
+                        f.seek(offset)
+                        f.write(data)
+            return size
+
+        fetched, failed = 0, 0
+        for index, size, error in map_concurrent(
+            self.concurrency, fetch, range(len(chunks))
+        ):
+            if error:
+                failed += 1
+                self.logger.error(
+                    "Failed to restore chunk %s: %s", chunks[index][0], error
+                )
+            else:
+                fetched += size
+        for path, entry in files:
+            os.chmod(path, entry["mode"])
+            os.utime(path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        print(
+            Colors.colorize(
+                f"Restored snapshot '{manifest['name']}' to '{directory}': "
+                f"{len(files)} file(s) from {len(chunks)} chunk(s) ({fetched} bytes)",
+                "OKGREEN",
+            )
+        )
+        if failed:
+            raise S3ActionError(f"{failed} chunk(s) failed to restore.")
+
+    def list_snapshots(
+        self, bucket_name: str, prefix: str = DEFAULT_REPOSITORY
+    ) -> List[dict]:
+        """
+        List the snapshots of a repository, oldest first.
+        Args:
+            bucket_name (str): Bucket name.
+            prefix (str): Key prefix of the snapshot repository.
+        Returns:
+            List[dict]: 'name', 'size' (manifest bytes) and 'last_modified' of each.
+        Raises:
+            S3ActionError: If listing fails.
+        """
+        prefix = repository_prefix(prefix)
+        manifests = f"{prefix}manifests/"
+        snapshots = []
+        try:
+            paginator = self.s3.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=manifests):
+                for obj in page.get("Contents", []):
+                    if not obj["Key"].endswith(MANIFEST_SUFFIX):
+                        continue
+                    snapshots.append(
+                        {
+                            "name": obj["Key"][len(manifests) : -len(MANIFEST_SUFFIX)],
+                            "size": obj["Size"],
+                            "last_modified": obj["LastModified"],
+                        }
+                    )
+        except Exception as e:
+            raise S3ActionError(f"Error listing snapshots: {e}") from e
+        return sorted(snapshots, key=lambda s: (s["last_modified"], s["name"]))
+
+    def read_manifest(
+        self, bucket_name: str, name: str = "latest", prefix: str = DEFAULT_REPOSITORY
+    ) -> dict:
+        """
+        Fetch and decode a snapshot manifest.
+        Args:
+            bucket_name (str): Bucket name.
+            name (str): Snapshot name, or 'latest' for the most recent one.
+            prefix (str): Key prefix of the snapshot repository.
+        Returns:
+            dict: The manifest.
+        Raises:
+            S3ActionError: If the snapshot does not exist or cannot be decoded.
+        """
+        prefix = repository_prefix(prefix)
+        if name == "latest":
+            snapshots = self.list_snapshots(bucket_name, prefix)
+            if not snapshots:
+                raise S3ActionError(f"No snapshots found in '{bucket_name}/{prefix}'")
+            name = snapshots[-1]["name"]
+        try:
+            body = self.s3.get_object(
+                Bucket=bucket_name, Key=manifest_key(prefix, name)
+            )["Body"]
+            try:
+                manifest = json.loads(gzip.decompress(body.read()))
+            finally:
+                body.close()
+        except Exception as e:
+            raise S3ActionError(f"Error reading snapshot '{name}': {e}") from e
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise S3ActionError(
+                f"Unsupported snapshot version: {manifest.get('version')}"
+            )
+        return manifest
+
+    @staticmethod
+    def _scan(directory: str) -> Tuple[List[tuple], List[str]]:
+        """Return (path, relative path, stat) of every file and all subdirectories."""
+        files, directories = [], []
+        for entry in sorted(scan_tree(directory, directories=True), key=walk_order):
+            if entry.is_dir:
+                directories.append(entry.relative)
+            else:
+                files.append((entry.path, entry.relative, entry.stat))
+        return files, directories
+
+    def _chunk_files(self, paths: List[str]) -> Tuple[Dict[str, list], int]:
+        """
+        Return the chunk list of every readable file and the number of failures.
+        Chunk lists of unchanged files come from the hash cache; small files are
+        chunked inline and large ones in worker processes.
+        """
+        cache = S3Base.hash_engine().cache
+        results, identities, futures = {}, {}, {}
+        unreadable = 0
+        pool = None
+        try:
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                except OSError as e:
+                    unreadable += 1
+                    self.logger.error("Could not read '%s': %s", path, e)
+                    continue
+                identities[path] = file_identity(stat)
+                cached = cache.get(identities[path], CHUNK_LIST_KIND) if cache else None
+                if cached is not None:
+                    offset = 0
+                    results[path] = []
+                    for chunk_id, size in json.loads(cached):
+                        results[path].append((chunk_id, offset, size))
+                        offset += size
+                elif stat.st_size <= INLINE_HASH_SIZE:
+                    futures[path] = None
+                else:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+                    futures[path] = pool.submit(chunk_file, path)
+            for path, future in futures.items():
+                try:
+                    chunks = future.result() if future else chunk_file(path)
+                    # The file may have been deleted or renamed since it was read.
+                    unchanged = file_identity(os.stat(path)) == identities[path]
+                except OSError as e:
+                    unreadable += 1
+                    self.logger.error("Could not read '%s': %s", path, e)
+                    continue
+                results[path] = chunks
+                if cache and unchanged:
+                    listing = json.dumps([[c, s] for c, _, s in chunks])
+                    cache.put(identities[path], {CHUNK_LIST_KIND: listing})
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        return results, unreadable
+
+    def _upload_chunks(
+        self,
+        bucket_name: str,
+        prefix: str,
+        sources: Dict[str, Tuple[str, int, int]],
+    ) -> Tuple[int, int]:
+        """
+        Upload the chunks the repository does not hold yet.
+        Args:
+            bucket_name (str): Target bucket name.
+            prefix (str): Repository key prefix.
+            sources (Dict[str, Tuple[str, int, int]]): Chunk ID to (file, offset, size).
+        Returns:
+            Tuple[int, int]: Number and total size of the uploaded chunks.
+        Raises:
+            S3ActionError: If any chunk fails to upload.
+        """
+        index = ChunkIndex(f"{self.endpoint_url}/{bucket_name}/{prefix}")
+        try:
+            unknown = set(sources) - index.known(sources)
+            # A repository this machine has never written to: learn its chunks
+            # with one listing rather than an existence check per chunk.
+            listed = bool(unknown) and len(index) == 0
+            if listed:
+                index.add(self._list_chunks(bucket_name, prefix))
+                unknown -= index.known(unknown)
+
+            budget = self._chunk_budget()
+
+            def store(chunk_id):
+                key = chunk_key(prefix, chunk_id)
+                if not listed and self._exists(bucket_name, key):
+                    return 0
+                path, offset, size = sources[chunk_id]
+                with budget.part(size):
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        data = f.read(size)
+                    if hashlib.sha256(data).hexdigest() != chunk_id:
+                        raise IOError(f"'{path}' changed during the snapshot")
+                    self.s3.put_object(
+                        Bucket=bucket_name,
+                        Key=key,
+                        Body=data,
+                        ContentType="application/octet-stream",
+                    )
+                return size
+
+            uploaded, uploaded_bytes, failed, stored = 0, 0, 0, []
+            for chunk_id, size, error in map_concurrent(
+                self.concurrency, store, sorted(unknown)
+            ):
+                if error:
+                    failed += 1
+                    self.logger.error("Failed to upload chunk %s: %s", chunk_id, error)
+                    continue
+                stored.append(chunk_id)
+                if size:
+                    uploaded += 1
+                    uploaded_bytes += size
+            index.add(stored)
+        finally:
+            index.close()
+        if failed:
+            raise S3ActionError(f"{failed} chunk(s) failed to upload.")
+        return uploaded, uploaded_bytes
+
+    def _chunk_budget(self):
+        """Return the budget chunks in flight take their bytes and connections from."""
+        scheduler = TransferScheduler(max_connections=self.concurrency.maximum)
+        return scheduler.budget("chunks")
+
+    def _list_chunks(self, bucket_name: str, prefix: str) -> List[str]:
+        """Return the IDs of every chunk stored in a repository."""
+        chunk_prefix = f"{prefix}chunks/"
+        ids = []
+        try:
+            paginator = self.s3.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=chunk_prefix):
+                ids.extend(
+                    obj["Key"].rsplit("/", 1)[-1] for obj in page.get("Contents", [])
+                )
+        except Exception as e:
+            raise S3ActionError(f"Error listing chunks: {e}") from e
+        return ids
+
+    def _exists(self, bucket_name: str, object_key: str) -> bool:
+        """Return True if an object exists."""
+        try:
+            self.s3.head_object(Bucket=bucket_name, Key=object_key)
+            return True
+        except Exception as e:
+            if getattr(e, "response", {}).get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                return False
+            raise S3ActionError(f"Error checking '{object_key}': {e}") from e
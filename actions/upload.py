@@ -2,20 +2,54 @@
 Upload Action for R2Py CLI.
 
 This module defines the S3Uploader class, which handles the uploading of files
-to a Cloudflare R2 bucket using the S3-compatible API. It provides a method to
-upload a file by specifying the filename, bucket name, and object key.
+to a Cloudflare R2 bucket using the S3-compatible API. It provides methods to
+upload a file, a stream of unknown length, or a whole directory.
 """
 
 import mimetypes
 import os
+import sys
+import time
+from contextlib import nullcontext
 from typing import Optional
 
-from utils import Region, S3ActionError, S3Base, TqdmProgress
+from utils import Colors, Region, S3ActionError, S3Base, TqdmProgress, map_concurrent
+from utils.appendstate import AppendState, hash_prefixes
+from utils.appendupload import AppendUpload
+from utils.compression import METADATA_KEY, CompressingReader, compress_frame
+from utils.multipart import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_PART_SIZE,
+    MIN_PART_SIZE,
+    MmapUpload,
+)
+from utils.pack import (
+    DEFAULT_SHARD_SIZE,
+    INDEX_NAME,
+    PACK_DIR,
+    PackIndex,
+    TarShardReader,
+    pack_key,
+    plan_shards,
+    read_index,
+)
+from utils.scanner import scan_tree
+from utils.scheduler import (
+    DEFAULT_MAX_FILES,
+    TransferOrder,
+    TransferScheduler,
+    order_transfers,
+)
+from utils.streaming import STDIO_PATH, StreamUpload, is_stdio
+
+from .copy import DELETE_BATCH_SIZE
 
 
 class S3Uploader(S3Base):
     """Handles uploading files to a Cloudflare R2 bucket using the S3-compatible API."""
 
+    _append_state = None
+
     def __init__(
         self,
         endpoint_url: str,
@@ -35,17 +69,44 @@ class S3Uploader(S3Base):
         self.logger = S3Base.get_logger()
 
     def upload_file(
-        self, filename: str, bucket_name: str, object_key: Optional[str] = None
+        self,
+        filename: str,
+        bucket_name: str,
+        object_key: Optional[str] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        compress: Optional[str] = None,
+        skip_unchanged: bool = False,
+        append: bool = False,
+        scheduler: Optional[TransferScheduler] = None,
     ) -> None:
         """
         Upload a file to the specified bucket.
+        Files up to one part are sent with a single PutObject. Larger files are
+        memory-mapped and sent as zero-copy multipart uploads, with the parts in
+        flight capped by a byte budget. A filename of '-' streams stdin through
+        upload_stream(). Compressed uploads are encoded on the fly and keep the
+        original content type.
         Args:
             filename (str): Local file path to upload.
             bucket_name (str): Target bucket name.
             object_key (Optional[str]): S3 object key (defaults to filename).
+            max_in_flight (int): Maximum bytes of multipart parts in flight at once.
+            compress (Optional[str]): Compress on the fly with 'gzip' or 'zstd'.
+            skip_unchanged (bool): Skip the upload if the object already has the
+                file's size and ETag (ignored with compression).
+            append (bool): Treat the file as append-only: if the object still holds
+                the bytes uploaded last time, copy them server-side and upload only
+                the new tail (ignored with compression).
+            scheduler (Optional[TransferScheduler]): Shared scheduler to take
+                multipart parts from instead of max_in_flight.
         Raises:
             S3ActionError: If file not found or upload fails.
         """
+        if is_stdio(filename):
+            self.upload_stream(
+                sys.stdin.buffer, bucket_name, object_key, compress=compress
+            )
+            return
         if not os.path.isfile(filename):
             raise S3ActionError(f"File not found: {filename}")
         if not object_key:
@@ -53,14 +114,16 @@ class S3Uploader(S3Base):
                 "Object key not provided. Using filename as object key."
             )
             object_key = os.path.basename(filename)
-        mime_type, _ = mimetypes.guess_type(filename)
-        if not mime_type:
-            self.logger.warning(
-                "Could not determine MIME type for %s. "
-                "Defaulting to 'application/octet-stream'.",
-                filename,
-            )
-            mime_type = "application/octet-stream"
+        if skip_unchanged and not compress:
+            if self.is_uploaded(filename, bucket_name, object_key):
+                self.logger.info(
+                    "Skipping unchanged '%s' (already at '%s/%s').",
+                    filename,
+                    bucket_name,
+                    object_key,
+                )
+                return
+        mime_type = self.guess_mime_type(filename)
         self.logger.info(
             "Uploading '%s' to '%s/%s' with MIME type '%s'.",
             filename,
@@ -68,17 +131,56 @@ class S3Uploader(S3Base):
             object_key,
             mime_type,
         )
+        if append and not compress:
+            self._upload_appending(
+                filename, bucket_name, object_key, mime_type, max_in_flight
+            )
+            return
+        if compress:
+            with open(filename, "rb") as file:
+                self._upload_compressed(
+                    file, filename, bucket_name, object_key, mime_type, compress
+                )
+            return
+        size = os.path.getsize(filename)
+        if size <= self.small_object_threshold:
+            try:
+                self._put_small(filename, bucket_name, object_key, mime_type)
+            except Exception as e:
+                raise S3ActionError(f"Error uploading file: {e}") from e
+            self.logger.info(
+                "File '%s' uploaded to '%s/%s'.", filename, bucket_name, object_key
+            )
+            return
         progress_callback = TqdmProgress(filename, action="upload", logger=self.logger)
+        budget = scheduler.budget(filename) if scheduler else None
 
         try:
-            with open(filename, "rb") as file:
-                self.s3.upload_fileobj(
-                    file,
+            if size > DEFAULT_PART_SIZE:
+                MmapUpload(
+                    self.s3,
+                    filename,
                     bucket_name,
                     object_key,
-                    ExtraArgs={"ContentType": mime_type},
-                    Callback=progress_callback,
-                )
+                    extra_args={"ContentType": mime_type},
+                    controller=self.concurrency,
+                    max_in_flight=max_in_flight,
+                    callback=progress_callback,
+                    logger=self.logger,
+                    budget=budget,
+                ).run()
+            else:
+                # Below one part, the whole file counts as one part in flight.
+                with budget.part(size) if budget else nullcontext():
+                    with open(filename, "rb") as file:
+                        self.s3.upload_fileobj(
+                            file,
+                            bucket_name,
+                            object_key,
+                            ExtraArgs={"ContentType": mime_type},
+                            Callback=progress_callback,
+                            Config=self.transfer_config(),
+                        )
             self.logger.info(
                 "File '%s' uploaded to '%s/%s'.", filename, bucket_name, object_key
             )
@@ -86,3 +188,584 @@ class S3Uploader(S3Base):
             raise S3ActionError(f"Error uploading file: {e}") from e
         finally:
             progress_callback.close()
+
+    def upload_stream(
+        self,
+        stream,
+        bucket_name: str,
+        object_key: Optional[str] = None,
+        compress: Optional[str] = None,
+    ) -> None:
+        """
+        Upload a stream of unknown length (e.g. stdin) without a temporary file.
+        The stream is read into a bounded ring of part buffers and sent as a
+        multipart upload, or as a single PutObject if it is shorter than one part.
+        Args:
+            stream: Binary stream to read until EOF.
+            bucket_name (str): Target bucket name.
+            object_key (Optional[str]): S3 object key (required).
+            compress (Optional[str]): Compress on the fly with 'gzip' or 'zstd'.
+        Raises:
+            S3ActionError: If the object key is missing or the upload fails.
+        """
+        if not object_key:
+            raise S3ActionError("Object key is required when uploading from stdin.")
+        mime_type = self.guess_mime_type(object_key)
+        if compress:
+            self._upload_compressed(
+                stream, STDIO_PATH, bucket_name, object_key, mime_type, compress
+            )
+            return
+        self.logger.info(
+            "Uploading stdin to '%s/%s' with MIME type '%s'.",
+            bucket_name,
+            object_key,
+            mime_type,
+        )
+        progress_callback = TqdmProgress(
+            STDIO_PATH, action="upload", logger=self.logger
+        )
+        try:
+            upload = StreamUpload(
+                self.s3,
+                stream,
+                bucket_name,
+                object_key,
+                extra_args={"ContentType": mime_type},
+                controller=self.concurrency,
+                callback=progress_callback,
+                logger=self.logger,
+            )
+            upload.run()
+            self.logger.info(
+                "Uploaded %d bytes from stdin to '%s/%s'.",
+                upload.total_bytes,
+                bucket_name,
+                object_key,
+            )
+        except Exception as e:
+            raise S3ActionError(f"Error uploading stream: {e}") from e
+        finally:
+            progress_callback.close()
+
+    def upload_directory(
+        self,
+        directory: str,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        compress: Optional[str] = None,
+        skip_unchanged: bool = False,
+        order: TransferOrder = TransferOrder.LARGEST,
+    ) -> None:
+        """
+        Upload every file below a directory, keyed by its relative path.
+        The directory is walked by the parallel scanner, which skips paths matched
+        by '.r2ignore' files. Small files are uploaded concurrently through the
+        single-request fast path. Larger files follow a few at a time in the given
+        order under one TransferScheduler, their parts sharing one global byte and
+        connection budget.
+        Args:
+            directory (str): Local directory to upload.
+            bucket_name (str): Target bucket name.
+            prefix (Optional[str]): Key prefix for the uploaded files.
+            max_in_flight (int): Maximum bytes of multipart parts in flight at once,
+                across all files.
+            compress (Optional[str]): Compress on the fly with 'gzip' or 'zstd'.
+            skip_unchanged (bool): Skip files whose object already has the same
+                size and ETag (ignored with compression).
+            order (TransferOrder): Start large files largest or smallest first.
+        Raises:
+            S3ActionError: If the directory is missing or any file fails to upload.
+        """
+        if not os.path.isdir(directory):
+            raise S3ActionError(f"Directory not found: {directory}")
+        prefix = prefix or ""
+        large_files = []
+        skip_unchanged = skip_unchanged and not compress
+
+        def small_files():
+            for entry in scan_tree(directory):
+                key = f"{prefix}{entry.relative}"
+                if entry.size <= self.small_object_threshold:
+                    yield entry.path, key
+                else:
+                    large_files.append((entry.path, key, entry.size))
+
+        def put(item):
+            path, key = item
+            if skip_unchanged and self.is_uploaded(path, bucket_name, key):
+                return False
+            self._put_small(
+                path, bucket_name, key, self.guess_mime_type(path), compress=compress
+            )
+            return True
+
+        uploaded, skipped, failed = 0, 0, 0
+        for (path, key), sent, error in map_concurrent(
+            self.concurrency, put, small_files()
+        ):
+            if error:
+                failed += 1
+                self.logger.error("Failed to upload '%s' to '%s': %s", path, key, error)
+            elif sent:
+                uploaded += 1
+            else:
+                skipped += 1
+        sent, unchanged, errors = self._upload_large(
+            large_files,
+            bucket_name,
+            max_in_flight,
+            order,
+            compress=compress,
+            skip_unchanged=skip_unchanged,
+        )
+        uploaded, skipped, failed = (
+            uploaded + sent,
+            skipped + unchanged,
+            failed + errors,
+        )
+        summary = (
+            f"Uploaded {uploaded} file(s) from '{directory}' to "
+            f"'{bucket_name}/{prefix}'"
+        )
+        if skipped:
+            summary += f", skipped {skipped} unchanged"
+        print(Colors.colorize(summary, "OKGREEN"))
+        if failed:
+            raise S3ActionError(f"{failed} file(s) failed to upload.")
+
+    def upload_packed(
+        self,
+        directory: str,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        order: TransferOrder = TransferOrder.LARGEST,
+    ) -> None:
+        """
+        Upload a directory with its small files packed into tar shard objects.
+        Files up to small_object_threshold are streamed into shards under
+        '<prefix>.r2pack/' as the directory is scanned and recorded in the prefix's
+        pack index, which keeps the entries of earlier packed uploads for files not
+        packed again. Earlier shards left without entries are deleted once the new
+        index is written. Larger files are uploaded as ordinary objects.
+        Args:
+            directory (str): Local directory to upload.
+            bucket_name (str): Target bucket name.
+            prefix (Optional[str]): Key prefix for the uploaded files.
+            shard_size (int): Target shard size in bytes.
+            max_in_flight (int): Maximum bytes of multipart parts in flight at once,
+                across all larger files.
+            order (TransferOrder): Start larger files largest or smallest first.
+        Raises:
+            S3ActionError: If the directory is missing or any shard, file or the
+                index fails to upload.
+        """
+        if not os.path.isdir(directory):
+            raise S3ActionError(f"Directory not found: {directory}")
+        prefix = prefix or ""
+        try:
+            index = read_index(self.s3, bucket_name, prefix) or PackIndex()
+        except Exception as e:
+            raise S3ActionError(f"Error reading pack index: {e}") from e
+        large_files = []
+
+        def small_files():
+            # Shards are filled while the scan goes on; larger files wait for it.
+            for entry in scan_tree(directory):
+                if entry.size <= self.small_object_threshold:
+                    yield entry.path, entry.relative, entry.size
+                else:
+                    large_files.append(
+                        (entry.path, f"{prefix}{entry.relative}", entry.size)
+                    )
+
+        run = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        packed, failed = 0, 0
+        # Each shard is one multipart upload with parallel parts of its own.
+        for number, files in enumerate(plan_shards(small_files(), shard_size)):
+            name = f"{run}-{os.urandom(3).hex()}-{number:05d}.tar"
+            reader = TarShardReader(files)
+            try:
+                StreamUpload(
+                    self.s3,
+                    reader,
+                    bucket_name,
+                    pack_key(prefix, name),
+                    extra_args={"ContentType": "application/x-tar"},
+                    controller=self.concurrency,
+                    logger=self.logger,
+                ).run()
+            except Exception as e:
+                failed += len(files)
+                self.logger.error("Failed to upload shard '%s': %s", name, e)
+                continue
+            finally:
+                reader.close()
+            index.add_shard(name, reader.members)
+            packed += len(files)
+            self.logger.info(
+                "Packed %d file(s) into shard '%s' (%d bytes).",
+                len(files),
+                name,
+                reader.size,
+            )
+        if packed:
+            # Shards whose files were all packed again are dropped from the index.
+            unused = index.unused_shards()
+            try:
+                self.s3.put_object(
+                    Bucket=bucket_name,
+                    Key=pack_key(prefix, INDEX_NAME),
+                    Body=index.to_bytes(),
+                    ContentType="application/gzip",
+                )
+            except Exception as e:
+                raise S3ActionError(f"Error writing pack index: {e}") from e
+            self._delete_shards(bucket_name, prefix, unused)
+        uploaded, _, errors = self._upload_large(
+            large_files, bucket_name, max_in_flight, order
+        )
+        failed += errors
+        print(
+            Colors.colorize(
+                f"Packed {packed} file(s) from '{directory}' into "
+                f"'{bucket_name}/{prefix}{PACK_DIR}' and uploaded {uploaded} "
+                "larger file(s) individually",
+                "OKGREEN",
+            )
+        )
+        if failed:
+            raise S3ActionError(f"{failed} file(s) failed to upload.")
+
+    def _delete_shards(self, bucket_name: str, prefix: str, names: list) -> None:
+        """Delete shards the pack index no longer refers to, logging any left over."""
+        keys = [pack_key(prefix, name) for name in names]
+        left = []
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            try:
+                response = self.s3.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                self.logger.warning("Failed to delete unused shards: %s", e)
+                left.extend(batch)
+                continue
+            left.extend(error.get("Key") for error in response.get("Errors", []))
+        if left:
+            self.logger.warning(
+                "%d unused shard(s) could not be deleted and can be removed by "
+                "hand: %s",
+                len(left),
+                ", ".join(left),
+            )
+        if keys:
+            self.logger.info(
+                "Deleted %d unused shard(s) from '%s/%s%s'.",
+                len(keys) - len(left),
+                bucket_name,
+                prefix,
+                PACK_DIR,
+            )
+
+    def _upload_large(
+        self,
+        large_files: list,
+        bucket_name: str,
+        max_in_flight: int,
+        order: TransferOrder,
+        compress: Optional[str] = None,
+        skip_unchanged: bool = False,
+    ) -> tuple:
+        """
+        Upload (path, key, size) files a few at a time under one TransferScheduler.
+        Returns:
+            tuple: Numbers of files uploaded, skipped as unchanged, and failed.
+        """
+        # Compressed uploads buffer their own parts, so they run one at a time.
+        scheduler = TransferScheduler(
+            max_in_flight,
+            max_connections=self.concurrency.maximum,
+            max_files=1 if compress else DEFAULT_MAX_FILES,
+        )
+
+        def put(item):
+            path, key, _ = item
+            if skip_unchanged and self.is_uploaded(path, bucket_name, key):
+                return False
+            self.upload_file(
+                path,
+                bucket_name,
+                key,
+                max_in_flight=max_in_flight,
+                compress=compress,
+                scheduler=scheduler,
+            )
+            return True
+
+        uploaded, skipped, failed = 0, 0, 0
+        for (path, key, _), sent, error in scheduler.run(
+            put, order_transfers(large_files, order, lambda item: item[2])
+        ):
+            if error:
+                failed += 1
+                self.logger.error("Failed to upload '%s' to '%s': %s", path, key, error)
+            elif sent:
+                uploaded += 1
+            else:
+                skipped += 1
+        if large_files:
+            self.logger.info(
+                "Uploaded %d large file(s) with at most %.2f MB in %d part(s) in flight.",
+                uploaded,
+                scheduler.peak / (1024 * 1024),
+                scheduler.peak_connections,
+            )
+        return uploaded, skipped, failed
+
+    def is_uploaded(self, filename: str, bucket_name: str, object_key: str) -> bool:
+        """
+        Check whether an object already holds the contents of a local file.
+        Args:
+            filename (str): Local file path.
+            bucket_name (str): Target bucket name.
+            object_key (str): Object key.
+        Returns:
+            bool: True if the object exists with the file's size and ETag.
+        """
+        try:
+            head = self.s3.head_object(Bucket=bucket_name, Key=object_key)
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return self.is_unchanged(
+            filename, bucket_name, object_key, head["ContentLength"], head["ETag"]
+        )
+
+    @staticmethod
+    def append_state() -> AppendState:
+        """
+        Return the shared record of files uploaded in append mode.
+        Returns:
+            AppendState: Store used by append uploads.
+        """
+        if S3Uploader._append_state is None:
+            S3Uploader._append_state = AppendState()
+        return S3Uploader._append_state
+
+    def _upload_appending(
+        self,
+        filename: str,
+        bucket_name: str,
+        object_key: str,
+        mime_type: str,
+        max_in_flight: int,
+    ) -> None:
+        """
+        Upload only the new tail of an append-only file, or all of it as a fallback.
+        The tail is appended when the object still has the ETag and size recorded
+        by the last append upload and the file still starts with the bytes sent
+        then; otherwise the file is uploaded in full and recorded for next time.
+        """
+        state = self.append_state()
+        destination = AppendState.destination(
+            self.endpoint_url, bucket_name, object_key
+        )
+        size = os.path.getsize(filename)
+        record = state.get(filename, destination)
+        head = self._head(bucket_name, object_key) if record else None
+        if (
+            head is not None
+            and head.get("ETag") == record["etag"]
+            and head["ContentLength"] == record["size"]
+            and record["size"] <= size
+        ):
+            prefix_digest, digest = hash_prefixes(filename, record["size"], size)
+            if prefix_digest != record["digest"]:
+                reason = "the file no longer starts with the uploaded bytes"
+            elif size == record["size"]:
+                self.logger.info(
+                    "Skipping '%s': nothing appended since the last upload.", filename
+                )
+                return
+            elif record["size"] < MIN_PART_SIZE:
+                reason = "the object is smaller than one part"
+            else:
+                etag = self._append_tail(
+                    filename,
+                    bucket_name,
+                    object_key,
+                    mime_type,
+                    max_in_flight,
+                    head,
+                    size,
+                )
+                state.put(filename, destination, etag, size, digest)
+                return
+        elif record is None:
+            reason = "no earlier append upload is recorded"
+        else:
+            reason = "the object changed since the last append upload"
+        self.logger.info("Uploading '%s' in full: %s.", filename, reason)
+        self.upload_file(filename, bucket_name, object_key, max_in_flight=max_in_flight)
+        head = self._head(bucket_name, object_key)
+        if head is None:
+            return
+        try:
+            (digest,) = hash_prefixes(filename, head["ContentLength"])
+        except (OSError, ValueError) as e:
+            self.logger.warning("Could not record '%s' for appending: %s", filename, e)
+            return
+        state.put(filename, destination, head["ETag"], head["ContentLength"], digest)
+
+    def _append_tail(
+        self,
+        filename: str,
+        bucket_name: str,
+        object_key: str,
+        mime_type: str,
+        max_in_flight: int,
+        head: dict,
+        size: int,
+    ) -> str:
+        """Extend an object to the first size bytes of a file; return its new ETag."""
+        progress_callback = TqdmProgress(
+            filename, action="upload", total_size=size, logger=self.logger
+        )
+        try:
+            response = AppendUpload(
+                self.s3,
+                filename,
+                bucket_name,
+                object_key,
+                size=size,
+                copied_size=head["ContentLength"],
+                etag=head["ETag"],
+                extra_args={"ContentType": head.get("ContentType") or mime_type},
+                controller=self.concurrency,
+                max_in_flight=max_in_flight,
+                callback=progress_callback,
+                logger=self.logger,
+            ).run()
+        except Exception as e:
+            raise S3ActionError(f"Error appending to object: {e}") from e
+        finally:
+            progress_callback.close()
+        self.logger.info(
+            "Appended %d bytes of '%s' to '%s/%s' (copied %d bytes remotely).",
+            size - head["ContentLength"],
+            filename,
+            bucket_name,
+            object_key,
+            head["ContentLength"],
+        )
+        return response["ETag"]
+
+    def _head(self, bucket_name: str, object_key: str) -> Optional[dict]:
+        """Return the HeadObject response of an object, or None if it is missing."""
+        try:
+            return self.s3.head_object(Bucket=bucket_name, Key=object_key)
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise S3ActionError(f"Could not get object metadata: {e}") from e
+
+    def guess_mime_type(self, filename: str) -> str:
+        """
+        Guess the MIME type of a file from its name.
+        Args:
+            filename (str): Local file path.
+        Returns:
+            str: The MIME type, or 'application/octet-stream' if unknown.
+        """
+        mime_type, _ = mimetypes.guess_type(filename)
+        if not mime_type:
+            self.logger.warning(
+                "Could not determine MIME type for %s. "
+                "Defaulting to 'application/octet-stream'.",
+                filename,
+            )
+            mime_type = "application/octet-stream"
+        return mime_type
+
+    @staticmethod
+    def compression_args(mime_type: str, compress: str) -> dict:
+        """
+        Build the object arguments for a compressed upload.
+        The original MIME type is kept as the content type; the codec is recorded
+        both as Content-Encoding and in the object metadata.
+        Args:
+            mime_type (str): MIME type of the uncompressed content.
+            compress (str): 'gzip' or 'zstd'.
+        Returns:
+            dict: Extra PutObject/CreateMultipartUpload arguments.
+        """
+        return {
+            "ContentType": mime_type,
+            "ContentEncoding": compress,
+            "Metadata": {METADATA_KEY: compress},
+        }
+
+    def _upload_compressed(
+        self,
+        stream,
+        source: str,
+        bucket_name: str,
+        object_key: str,
+        mime_type: str,
+        compress: str,
+    ) -> None:
+        """Compress a stream in parallel frames and upload it as it is produced."""
+        progress_callback = TqdmProgress(source, action="upload", logger=self.logger)
+        try:
+            with CompressingReader(
+                stream, compress, callback=progress_callback
+            ) as reader:
+                StreamUpload(
+                    self.s3,
+                    reader,
+                    bucket_name,
+                    object_key,
+                    extra_args=self.compression_args(mime_type, compress),
+                    controller=self.concurrency,
+                    logger=self.logger,
+                ).run()
+            ratio = reader.bytes_out / reader.bytes_in if reader.bytes_in else 1.0
+            self.logger.info(
+                "Uploaded '%s' to '%s/%s' with %s: %d -> %d bytes (%.1f%%).",
+                source,
+                bucket_name,
+                object_key,
+                compress,
+                reader.bytes_in,
+                reader.bytes_out,
+                ratio * 100,
+            )
+        except Exception as e:
+            raise S3ActionError(f"Error uploading file: {e}") from e
+        finally:
+            progress_callback.close()
+
+    def _put_small(
+        self,
+        filename: str,
+        bucket_name: str,
+        object_key: str,
+        mime_type: str,
+        compress: Optional[str] = None,
+    ) -> None:
+        """Upload a small file with a single PutObject request."""
+        with open(filename, "rb") as file:
+            data = file.read()
+        extra_args = {"ContentType": mime_type}
+        if compress:
+            data = compress_frame(compress, data)
+            extra_args = self.compression_args(mime_type, compress)
+        self.s3.put_object(Bucket=bucket_name, Key=object_key, Body=data, **extra_args)
@@ -0,0 +1,157 @@
+"""
+Verify Action for R2Py CLI.
+
+This module defines the S3Verifier class, which checks local files against remote
+objects in a Cloudflare R2 bucket without downloading them. The remote ETag, and
+optionally the CRC32 or SHA-256 checksum, is read with a HEAD request and compared
+with the same digest computed locally; for multipart objects the original part
+sizes are read with HEAD requests, so the multipart ETag can be reproduced.
+Local digests come from the shared hash cache, so unchanged files are not re-read,
+and directories are verified concurrently.
+"""
+
+import os
+from typing import Iterable, Optional, Tuple
+
+from utils import Colors, Region, S3ActionError, S3Base, map_concurrent
+from utils.hashing import CHECKSUM_ALGORITHMS
+from utils.scanner import scan_tree
+
+STATUS_COLORS = {
+    "OK": "OKGREEN",
+    "MISMATCH": "FAIL",
+    "MISSING": "WARNING",
+    "UNVERIFIABLE": "WARNING",
+}
+
+
+class S3Verifier(S3Base):
+    """Handles verifying local files against Cloudflare R2 objects using the S3-compatible API."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: Region = Region.AUTO,
+    ):
+        """
+        Initialize the verifier with S3 credentials and endpoint.
+        Args:
+            endpoint_url (str): S3-compatible endpoint URL.
+            access_key (str): Access key ID.
+            secret_key (str): Secret access key.
+            region (Region): AWS region or 'auto'.
+        """
+        super().__init__(endpoint_url, access_key, secret_key, region)
+        self.logger = S3Base.get_logger()
+        self.colorize = Colors.colorize
+
+    def verify(
+        self,
+        path: str,
+        bucket_name: str,
+        object_key: Optional[str] = None,
+        checksums: Iterable[str] = (),
+    ) -> None:
+        """
+        Verify a local file, or every file below a directory, against the bucket.
+        Args:
+            path (str): Local file or directory.
+            bucket_name (str): Bucket name.
+            object_key (Optional[str]): Object key, or key prefix for a directory
+                (defaults to the file name, or no prefix).
+            checksums (Iterable[str]): Extra checksums to compare: 'crc32', 'sha256'.
+        Raises:
+            S3ActionError: If the path is missing or any file does not match.
+        """
+        checksums = tuple(checksums)
+        for algorithm in checksums:
+            if algorithm not in CHECKSUM_ALGORITHMS:
+                raise S3ActionError(f"Unsupported checksum: {algorithm}")
+        if os.path.isdir(path):
+            files = self._directory_files(path, object_key or "")
+        elif os.path.isfile(path):
+            files = [(path, object_key or os.path.basename(path))]
+        else:
+            raise S3ActionError(f"Path not found: {path}")
+        counts = {status: 0 for status in STATUS_COLORS}
+        for (filename, key), result, error in map_concurrent(
+            self.concurrency,
+            lambda item: self.verify_file(item[0], bucket_name, item[1], checksums),
+            files,
+        ):
+            if error:
+                raise S3ActionError(f"Error verifying '{filename}': {error}") from error
+            status, detail = result
+            counts[status] += 1
+            message = f"{status:<12} {filename} -> {bucket_name}/{key}"
+            print(self.colorize(f"{message} {detail}".rstrip(), STATUS_COLORS[status]))
+        print(
+            self.colorize(
+                ", ".join(
+                    f"{count} {status.lower()}" for status, count in counts.items()
+                ),
+                "OKCYAN",
+            )
+        )
+        failed = counts["MISMATCH"] + counts["MISSING"]
+        if failed:
+            raise S3ActionError(f"{failed} file(s) failed verification.")
+
+    def verify_file(
+        self,
+        filename: str,
+        bucket_name: str,
+        object_key: str,
+        checksums: Iterable[str] = (),
+    ) -> Tuple[str, str]:
+        """
+        Compare one local file with one remote object.
+        Args:
+            filename (str): Local file path.
+            bucket_name (str): Bucket name.
+            object_key (str): Object key.
+            checksums (Iterable[str]): Extra checksums to compare: 'crc32', 'sha256'.
+        Returns:
+            Tuple[str, str]: Status ('OK', 'MISMATCH', 'MISSING' or 'UNVERIFIABLE')
+                and a detail.
+        """
+        try:
+            head = self.s3.head_object(
+                Bucket=bucket_name, Key=object_key, ChecksumMode="ENABLED"
+            )
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return "MISSING", ""
+            raise
+        size = os.path.getsize(filename)
+        if head["ContentLength"] != size:
+            return "MISMATCH", f"(size {size} != {head['ContentLength']})"
+        remote = {"md5": head["ETag"].strip('"')}
+        for algorithm in checksums:
+            value = head.get(f"Checksum{algorithm.upper()}")
+            if value:
+                remote[algorithm] = value
+            else:
+                self.logger.warning(
+                    "Object '%s' has no stored %s checksum.", object_key, algorithm
+                )
+        part_size = None
+        if "-" in remote["md5"]:
+            part_size = self.part_layout(bucket_name, object_key, size, remote["md5"])
+            if part_size is None:
+                return "UNVERIFIABLE", "(unknown part layout)"
+        local = S3Base.hash_engine().digests(filename, part_size, list(remote))
+        for algorithm, value in remote.items():
+            if local[algorithm] != value:
+                name = "etag" if algorithm == "md5" else algorithm
+                return "MISMATCH", f"({name} {local[algorithm]} != {value})"
+        return "OK", ""
+
+    @staticmethod
+    def _directory_files(directory: str, prefix: str):
+        """Yield (path, key) for every file below directory, keyed like uploads."""
+        for entry in scan_tree(directory):
+            yield entry.path, f"{prefix}{entry.relative}"
@@ -5,31 +5,101 @@ This module defines the CLI for the R2Py CLI tool.
 It uses Typer to define the commands and options for the tool.
 """
 
+import os
+import time
+from datetime import timedelta
+from enum import Enum
+from typing import List, Optional
+
 import typer
 from dotenv import load_dotenv
-from actions import S3Uploader, S3Downloader, S3Aborter, S3Deleter, S3Lister, S3Creator
-from utils import S3Base, S3ActionError, Region
+from actions import (
+    S3Uploader,
+    S3Downloader,
+    S3Aborter,
+    S3Deleter,
+    S3Lister,
+    S3Creator,
+    S3Copier,
+    S3Verifier,
+    S3Reader,
+    S3Snapshotter,
+    S3Exporter,
+    S3Differ,
+    S3Replicator,
+)
+from utils import Colors, S3Base, S3ActionError, Region
+from utils.compression import Compression
+from utils.objectcache import ObjectCache
+from utils.scheduler import TransferOrder
+from utils.units import parse_byte_range, parse_duration, parse_size
 
 app = typer.Typer(help="R2Py CLI Tool")
 
 
 @app.callback()
-def main_callback():
+def main_callback(
+    ctx: typer.Context,
+    stats: bool = typer.Option(
+        False, "--stats", help="Print adaptive concurrency stats on exit"
+    ),
+):
     """Callback for the main command."""
     load_dotenv()
+    if stats:
+        ctx.call_on_close(print_stats)
 
 
-def get_s3_action(action_cls, region: Region):
-    """Get the S3 action class."""
-    endpoint_url = S3Base.get_env_var("ENDPOINT_URL", required=True)
-    aws_access_key_id = S3Base.get_env_var("AWS_ACCESS_KEY_ID", required=True)
-    aws_secret_access_key = S3Base.get_env_var("AWS_SECRET_ACCESS_KEY", required=True)
-    return action_cls(
-        endpoint_url=endpoint_url,
-        access_key=aws_access_key_id,
-        secret_key=aws_secret_access_key,
-        region=region.value,
-    )
+def print_stats():
+    """Print the adaptive concurrency decisions made during the command."""
+    typer.echo(Colors.colorize_bold("=== Transfer Stats ===", "HEADER"), err=True)
+    for stats in S3Base.get_stats():
+        typer.echo(
+            Colors.colorize(
+                f"Concurrency limit: {stats['limit']} "
+                f"(min {stats['minimum']}, max {stats['maximum']}, "
+                f"peak in flight {stats['peak_in_flight']})",
+                "OKGREEN",
+            ),
+            err=True,
+        )
+        typer.echo(
+            f"Requests: {stats['requests']} ({stats['bytes'] / (1024 * 1024):.2f} MB), "
+            f"throttled: {stats['throttles']}, "
+            f"increases: {stats['increases']}, decreases: {stats['decreases']}",
+            err=True,
+        )
+        for decision in stats["decisions"]:
+            color = "OKCYAN" if decision.action == "increase" else "WARNING"
+            typer.echo(
+                Colors.colorize(
+                    f"  {time.strftime('%H:%M:%S', time.localtime(decision.timestamp))} "
+                    f"{decision.action} {decision.old} -> {decision.new} "
+                    f"({decision.reason})",
+                    color,
+                ),
+                err=True,
+            )
+
+
+def get_s3_action(action_cls, region: Region, profile: Optional[str] = None):
+    """Get the S3 action class, with the credentials of a profile if given."""
+    env = f"{profile.upper()}_" if profile else ""
+    try:
+        endpoint_url = S3Base.get_env_var(f"{env}ENDPOINT_URL", required=True)
+        aws_access_key_id = S3Base.get_env_var(f"{env}AWS_ACCESS_KEY_ID", required=True)
+        aws_secret_access_key = S3Base.get_env_var(
+            f"{env}AWS_SECRET_ACCESS_KEY", required=True
+        )
+        return action_cls(
+            endpoint_url=endpoint_url,
+            access_key=aws_access_key_id,
+            secret_key=aws_secret_access_key,
+            region=region.value,
+        )
+    except S3ActionError as e:
+        typer.echo(f"Configuration error: {e}", err=True)
+        raise typer.Exit(code=1)
 
 
 @app.command(name="list")
@@ -42,6 +112,9 @@ def list_command(
     with_region: bool = typer.Option(
         False, "--with-region", help="Include regions in the bucket list"
     ),
+    refresh_regions: bool = typer.Option(
+        False, "--refresh-regions", help="Ignore cached bucket regions"
+    ),
     multipart: bool = typer.Option(
         False, "--multipart", help="List multipart uploads in the bucket"
     ),
@@ -51,7 +124,7 @@ def list_command(
     lister = get_s3_action(S3Lister, region)
     try:
         if buckets:
-            lister.list_buckets(with_region)
+            lister.list_buckets(with_region, refresh=refresh_regions)
         elif multipart:
             if not bucket_name:
                 typer.echo("Error: --multipart requires a bucket name.", err=True)
@@ -83,6 +156,47 @@ def list_command(
         raise typer.Exit(code=1)
 
 
+class UsageSort(str, Enum):
+    """Sort orders for the du command."""
+
+    SIZE = "size"
+    COUNT = "count"
+    NAME = "name"
+
+
+@app.command()
+def du(
+    bucket_name: str,
+    prefix: str = typer.Argument("", help="Prefix to summarize"),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    depth: int = typer.Option(
+        1, "--depth", min=0, help="Prefix levels below PREFIX to group by"
+    ),
+    sort: UsageSort = typer.Option(UsageSort.SIZE, "--sort", help="Sort order"),
+    as_json: bool = typer.Option(False, "--json", help="Print JSON instead of a table"),
+    histogram: bool = typer.Option(
+        False, "--histogram", help="Show the object size histogram of each prefix"
+    ),
+):
+    """Summarize object counts and sizes per prefix."""
+    lister = get_s3_action(S3Lister, region)
+    try:
+        lister.disk_usage(
+            bucket_name,
+            prefix,
+            depth=depth,
+            sort_by=sort.value,
+            as_json=as_json,
+            histogram=histogram,
+        )
+    except S3ActionError as e:
+        typer.echo(f"Usage error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error computing usage: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def create(
     bucket_name: str, region: Region = typer.Option(Region.AUTO, help="AWS region name")
@@ -105,11 +219,84 @@ def upload(
     filename: str,
     object_key: str = typer.Argument(None),
     region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    max_in_flight: str = typer.Option(
+        "256MB",
+        "--max-in-flight",
+        help="Maximum bytes of multipart parts in flight at once, across all files "
+        "(e.g. 512MB)",
+    ),
+    order: TransferOrder = typer.Option(
+        TransferOrder.LARGEST,
+        "--order",
+        help="Start the large files of a directory largest or smallest first",
+    ),
+    compress: Compression = typer.Option(
+        None, "--compress", help="Compress on the fly before uploading"
+    ),
+    skip_unchanged: bool = typer.Option(
+        False,
+        "--skip-unchanged",
+        help="Skip files whose remote object already has the same size and ETag",
+    ),
+    append: bool = typer.Option(
+        False,
+        "--append",
+        help="Upload only the bytes appended since the last --append upload",
+    ),
+    pack: bool = typer.Option(
+        False,
+        "--pack",
+        help="Pack the small files of a directory into indexed tar shards",
+    ),
+    shard_size: str = typer.Option(
+        "256MB", "--shard-size", help="Target size of each shard with --pack"
+    ),
 ):
-    """Upload a file to the S3 bucket."""
+    """Upload a file, or every file in a directory, to the S3 bucket."""
+    if append and (compress or os.path.isdir(filename)):
+        typer.echo(
+            "Upload error: --append works on single files without --compress.",
+            err=True,
+        )
+        raise typer.Exit(code=1)
+    if pack and (compress or not os.path.isdir(filename)):
+        typer.echo(
+            "Upload error: --pack works on directories without --compress.",
+            err=True,
+        )
+        raise typer.Exit(code=1)
     uploader = get_s3_action(S3Uploader, region)
+    codec = compress.value if compress else None
     try:
-        uploader.upload_file(filename, bucket_name, object_key)
+        if pack:
+            uploader.upload_packed(
+                filename,
+                bucket_name,
+                object_key,
+                shard_size=parse_size(shard_size),
+                max_in_flight=parse_size(max_in_flight),
+                order=order,
+            )
+        elif os.path.isdir(filename):
+            uploader.upload_directory(
+                filename,
+                bucket_name,
+                object_key,
+                max_in_flight=parse_size(max_in_flight),
+                compress=codec,
+                skip_unchanged=skip_unchanged,
+                order=order,
+            )
+        else:
+            uploader.upload_file(
+                filename,
+                bucket_name,
+                object_key,
+                max_in_flight=parse_size(max_in_flight),
+                compress=codec,
+                skip_unchanged=skip_unchanged,
+                append=append,
+            )
     except S3ActionError as e:
         typer.echo(f"Upload error: {e}", err=True)
         raise typer.Exit(code=1)
@@ -124,11 +311,112 @@ def download(
     object_key: str,
     filename: str = typer.Argument(None),
     region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    hedge: bool = typer.Option(
+        False, "--hedge", help="Hedge slow parts of large downloads"
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Treat OBJECT_KEY as a prefix and FILENAME as a destination directory",
+    ),
+    decompress: bool = typer.Option(
+        False, "--decompress", help="Decode objects uploaded with --compress"
+    ),
+    skip_unchanged: bool = typer.Option(
+        False,
+        "--skip-unchanged",
+        help="Skip objects whose local file already has the same size and ETag",
+    ),
+    if_changed: bool = typer.Option(
+        False,
+        "--if-changed",
+        help="Only fetch objects whose ETag changed since they were last downloaded",
+    ),
+    cache_dir: str = typer.Option(
+        None,
+        "--cache-dir",
+        help="Shared local object cache directory (or set R2PY_OBJECT_CACHE_DIR)",
+    ),
+    cache_size: str = typer.Option(
+        "10GB", "--cache-size", help="Maximum size of the local object cache"
+    ),
+    cache_hard_links: bool = typer.Option(
+        False,
+        "--cache-hard-links",
+        help="Serve cache hits as read-only hard links instead of copies",
+    ),
+    byte_range: str = typer.Option(
+        None,
+        "--range",
+        help="Only download this byte range: START-END, START- or -LENGTH",
+    ),
+    packed: bool = typer.Option(
+        False,
+        "--packed",
+        help="Download files packed under OBJECT_KEY by upload --pack into FILENAME",
+    ),
+    members: List[str] = typer.Option(
+        [], "--member", help="With --packed, only fetch this file (repeatable)"
+    ),
+    max_in_flight: str = typer.Option(
+        "256MB",
+        "--max-in-flight",
+        help="With --recursive, maximum bytes of ranged GETs in flight at once "
+        "across all objects",
+    ),
+    order: TransferOrder = typer.Option(
+        TransferOrder.LARGEST,
+        "--order",
+        help="With --recursive, start large objects largest or smallest first",
+    ),
 ):
-    """Download a file from the S3 bucket."""
+    """Download a file, or every object under a prefix, from the S3 bucket."""
+    if byte_range and recursive:
+        typer.echo("Error: --range cannot be used with --recursive.", err=True)
+        raise typer.Exit(code=1)
     downloader = get_s3_action(S3Downloader, region)
     try:
-        downloader.download_file(bucket_name, object_key, filename)
+        if packed:
+            downloader.download_packed(
+                bucket_name, object_key, filename, names=members or None
+            )
+            return
+        if byte_range:
+            downloader.download_range(
+                bucket_name, object_key, filename, parse_byte_range(byte_range)
+            )
+            return
+        cache_dir = cache_dir or S3Base.get_env_var("R2PY_OBJECT_CACHE_DIR")
+        cache = (
+            ObjectCache(cache_dir, parse_size(cache_size), hard_links=cache_hard_links)
+            if cache_dir
+            else None
+        )
+        if recursive:
+            downloader.download_prefix(
+                bucket_name,
+                object_key,
+                filename,
+                hedge=hedge,
+                decompress=decompress,
+                skip_unchanged=skip_unchanged,
+                if_changed=if_changed,
+                cache=cache,
+                max_in_flight=parse_size(max_in_flight),
+                order=order,
+            )
+        else:
+            downloader.download_file(
+                bucket_name,
+                object_key,
+                filename,
+                hedge=hedge,
+                decompress=decompress,
+                skip_unchanged=skip_unchanged,
+                if_changed=if_changed,
+                cache=cache,
+            )
     except S3ActionError as e:
         typer.echo(f"Download error: {e}", err=True)
         raise typer.Exit(code=1)
@@ -137,6 +425,102 @@ def download(
         raise typer.Exit(code=1)
 
 
+@app.command()
+def cat(
+    bucket_name: str,
+    object_key: str,
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    byte_range: str = typer.Option(
+        None,
+        "--range",
+        help="Only print this byte range: START-END, START- or -LENGTH",
+    ),
+):
+    """Print an object, or a byte range of it, to stdout."""
+    reader = get_s3_action(S3Reader, region)
+    try:
+        reader.cat(
+            bucket_name,
+            object_key,
+            parse_byte_range(byte_range) if byte_range else None,
+        )
+    except S3ActionError as e:
+        typer.echo(f"Cat error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error reading object: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def head(
+    bucket_name: str,
+    object_key: str,
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    length: str = typer.Option(
+        "1KB", "--bytes", "-c", help="Number of leading bytes to print (e.g. 4KB)"
+    ),
+):
+    """Print the first bytes of an object to stdout."""
+    reader = get_s3_action(S3Reader, region)
+    try:
+        reader.head(bucket_name, object_key, parse_size(length))
+    except S3ActionError as e:
+        typer.echo(f"Head error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error reading object: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def export(
+    bucket_name: str,
+    prefix: str,
+    output: str = typer.Argument("-", help="Output file, or '-' for stdout"),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    compress: Compression = typer.Option(
+        None, "--compress", help="Compress the archive"
+    ),
+    max_buffer: str = typer.Option(
+        "256MB",
+        "--max-buffer",
+        help="Maximum bytes of objects prefetched ahead of the writer",
+    ),
+):
+    """Write every object under a prefix as a tar archive to stdout or a file."""
+    exporter = get_s3_action(S3Exporter, region)
+    codec = compress.value if compress else None
+    try:
+        if output == "-":
+            count, total = exporter.export(
+                bucket_name, prefix, compress=codec, max_buffer=parse_size(max_buffer)
+            )
+        else:
+            with open(output, "wb") as out:
+                count, total = exporter.export(
+                    bucket_name,
+                    prefix,
+                    out,
+                    compress=codec,
+                    max_buffer=parse_size(max_buffer),
+                )
+        typer.echo(
+            Colors.colorize(
+                f"Exported {count} object(s) ({total} bytes) from "
+                f"'{bucket_name}/{prefix}'",
+                "OKGREEN",
+            ),
+            err=True,
+        )
+    except S3ActionError as e:
+        typer.echo(f"Export error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error exporting: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def delete(
     bucket_name: str,
@@ -173,16 +557,329 @@ def delete(
         raise typer.Exit(code=1)
 
 
+class Checksum(str, Enum):
+    """Checksums the verify command can compare besides the ETag."""
+
+    CRC32 = "crc32"
+    SHA256 = "sha256"
+
+
+@app.command()
+def verify(
+    bucket_name: str,
+    path: str,
+    object_key: str = typer.Argument(
+        None, help="Object key, or key prefix when PATH is a directory"
+    ),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    checksum: List[Checksum] = typer.Option(
+        [], "--checksum", help="Also compare a stored checksum (repeatable)"
+    ),
+):
+    """Verify local files against objects in the S3 bucket without downloading."""
+    verifier = get_s3_action(S3Verifier, region)
+    try:
+        verifier.verify(
+            path, bucket_name, object_key, checksums=[c.value for c in checksum]
+        )
+    except S3ActionError as e:
+        typer.echo(f"Verify error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error verifying: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def snapshot(
+    bucket_name: str,
+    directory: str,
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    prefix: str = typer.Option(
+        "snapshots/", "--prefix", help="Key prefix of the snapshot repository"
+    ),
+    name: str = typer.Option(
+        None, "--name", help="Snapshot name (defaults to the current UTC time)"
+    ),
+):
+    """Back up a directory as a deduplicated snapshot in the S3 bucket."""
+    snapshotter = get_s3_action(S3Snapshotter, region)
+    try:
+        snapshotter.snapshot(directory, bucket_name, prefix=prefix, name=name)
+    except S3ActionError as e:
+        typer.echo(f"Snapshot error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error creating snapshot: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def restore(
+    bucket_name: str,
+    directory: str,
+    name: str = typer.Argument("latest", help="Snapshot name, or 'latest'"),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    prefix: str = typer.Option(
+        "snapshots/", "--prefix", help="Key prefix of the snapshot repository"
+    ),
+):
+    """Restore a snapshot from the S3 bucket into a local directory."""
+    snapshotter = get_s3_action(S3Snapshotter, region)
+    try:
+        snapshotter.restore(bucket_name, directory, name=name, prefix=prefix)
+    except S3ActionError as e:
+        typer.echo(f"Restore error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error restoring snapshot: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
+def abort_stale(
+    aborter: S3Aborter,
+    bucket_name: str,
+    older_than: timedelta,
+    prefix: Optional[str],
+    dry_run: bool,
+):
+    """Find stale multipart uploads and abort them after one confirmation."""
+    uploads = aborter.find_stale_uploads(bucket_name, older_than, prefix)
+    if dry_run:
+        aborter.print_stale_uploads(
+            uploads, aborter.reclaimable_bytes(bucket_name, uploads)
+        )
+        return
+    aborter.print_stale_uploads(uploads)
+    if not uploads:
+        return
+    confirm = typer.confirm(
+        f"Are you sure you want to abort {len(uploads)} multipart upload(s) "
+        f"in bucket '{bucket_name}'?"
+    )
+    if not confirm:
+        typer.echo("Abortion cancelled.")
+        return
+    aborter.abort_uploads(bucket_name, uploads)
+
+
+def run_copy(
+    source_bucket: str,
+    source_key: str,
+    bucket_name: str,
+    object_key: Optional[str],
+    region: Region,
+    recursive: bool,
+    move: bool,
+):
+    """Run a server-side copy or move of an object or a prefix."""
+    copier = get_s3_action(S3Copier, region)
+    try:
+        if recursive:
+            copier.copy_prefix(
+                source_bucket, source_key, bucket_name, object_key, move=move
+            )
+        elif move:
+            copier.move_object(source_bucket, source_key, bucket_name, object_key)
+        else:
+            copier.copy_object(source_bucket, source_key, bucket_name, object_key)
+    except S3ActionError as e:
+        typer.echo(f"{'Move' if move else 'Copy'} error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error {'moving' if move else 'copying'}: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def copy(
+    source_bucket: str,
+    source_key: str,
+    bucket_name: str,
+    object_key: str = typer.Argument(None),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Treat SOURCE_KEY and OBJECT_KEY as prefixes",
+    ),
+):
+    """Copy an object, or every object under a prefix, without downloading it."""
+    run_copy(
+        source_bucket, source_key, bucket_name, object_key, region, recursive, False
+    )
+
+
+@app.command()
+def move(
+    source_bucket: str,
+    source_key: str,
+    bucket_name: str,
+    object_key: str = typer.Argument(None),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Treat SOURCE_KEY and OBJECT_KEY as prefixes",
+    ),
+):
+    """Move an object, or every object under a prefix, without downloading it."""
+    run_copy(
+        source_bucket, source_key, bucket_name, object_key, region, recursive, True
+    )
+
+
+@app.command()
+def diff(
+    source_bucket: str,
+    source_prefix: str,
+    bucket_name: str,
+    prefix: str = typer.Argument(
+        None, help="Target prefix (defaults to SOURCE_PREFIX)"
+    ),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    output: str = typer.Option(
+        None, "--output", "-o", help="Write the JSON lines to this file"
+    ),
+    partitions: int = typer.Option(
+        1, "--partitions", min=1, help="Number of key ranges compared in parallel"
+    ),
+    unchanged: bool = typer.Option(
+        False, "--unchanged", help="Also list objects that are identical"
+    ),
+):
+    """Compare two prefixes and print added, removed and changed objects as NDJSON."""
+    differ = get_s3_action(S3Differ, region)
+    try:
+        if output:
+            with open(output, "w", encoding="utf-8") as out:
+                counts = differ.diff(
+                    source_bucket,
+                    source_prefix,
+                    bucket_name,
+                    prefix,
+                    out,
+                    partitions=partitions,
+                    include_unchanged=unchanged,
+                )
+        else:
+            counts = differ.diff(
+                source_bucket,
+                source_prefix,
+                bucket_name,
+                prefix,
+                partitions=partitions,
+                include_unchanged=unchanged,
+            )
+        typer.echo(
+            Colors.colorize(
+                f"{counts['added']} added, {counts['removed']} removed, "
+                f"{counts['changed']} changed, {counts['unchanged']} unchanged",
+                "OKGREEN",
+            ),
+            err=True,
+        )
+    except S3ActionError as e:
+        typer.echo(f"Diff error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error comparing: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def replicate(
+    source_bucket: str,
+    source_prefix: str,
+    bucket_name: str,
+    prefix: str = typer.Argument(
+        None, help="Target prefix (defaults to SOURCE_PREFIX)"
+    ),
+    region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    source_profile: str = typer.Option(
+        None,
+        "--source-profile",
+        help="Read the source credentials from <PROFILE>_ENDPOINT_URL, "
+        "<PROFILE>_AWS_ACCESS_KEY_ID and <PROFILE>_AWS_SECRET_ACCESS_KEY",
+    ),
+    profile: str = typer.Option(
+        None, "--profile", help="Read the target credentials the same way"
+    ),
+    skip_identical: bool = typer.Option(
+        False,
+        "--skip-identical",
+        help="Skip objects already in the target with the same size and ETag",
+    ),
+    max_in_flight: str = typer.Option(
+        "256MB",
+        "--max-in-flight",
+        help="Maximum bytes held in memory at once (e.g. 512MB)",
+    ),
+    part_size: str = typer.Option(
+        "8MB", "--part-size", help="Size above which objects are copied in parts"
+    ),
+    order: TransferOrder = typer.Option(
+        TransferOrder.LARGEST,
+        "--order",
+        help="Start large objects largest or smallest first",
+    ),
+):
+    """Copy a prefix between accounts or providers, streaming through memory."""
+    source = get_s3_action(S3Base, region, source_profile)
+    replicator = get_s3_action(S3Replicator, region, profile)
+    try:
+        replicator.replicate(
+            source,
+            source_bucket,
+            source_prefix,
+            bucket_name,
+            prefix,
+            skip_identical=skip_identical,
+            max_in_flight=parse_size(max_in_flight),
+            part_size=parse_size(part_size),
+            order=order,
+        )
+    except S3ActionError as e:
+        typer.echo(f"Replicate error: {e}", err=True)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        typer.echo(f"Error replicating: {e}", err=True)
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def abort(
     bucket_name: str,
-    object_key: str,
-    upload_id: str,
+    object_key: str = typer.Argument(None),
+    upload_id: str = typer.Argument(None),
     region: Region = typer.Option(Region.AUTO, help="AWS region name"),
+    older_than: str = typer.Option(
+        None,
+        "--older-than",
+        help="Abort every upload initiated longer ago than this (e.g. 24h, 7d)",
+    ),
+    prefix: str = typer.Option(
+        None, "--prefix", help="Only abort uploads for keys with this prefix"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Report stale uploads and reclaimable bytes only"
+    ),
 ):
-    """Aborts a multipart upload in the S3 bucket."""
+    """Aborts a multipart upload, or every stale one, in the S3 bucket."""
+    if older_than is None and (not object_key or not upload_id):
+        typer.echo(
+            "Error: Provide OBJECT_KEY and UPLOAD_ID, or use --older-than.", err=True
+        )
+        raise typer.Exit(code=1)
     aborter = get_s3_action(S3Aborter, region)
     try:
+        if older_than is not None:
+            abort_stale(
+                aborter, bucket_name, parse_duration(older_than), prefix, dry_run
+            )
+            return
         confirm = typer.confirm(
             f"Are you sure you want to abort the multipart upload '{upload_id}' "
             f"for object '{object_key}' in bucket '{bucket_name}'?"
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta, timezone
 import pytest
 from actions.abort import S3Aborter
 from utils.s3base import S3ActionError, S3Base
@@ -9,6 +10,36 @@ class DummyS3Client:
             raise Exception("Simulated abort failure")
         return {"ResponseMetadata": {"HTTPStatusCode": 204}}
 
+    def get_paginator(self, name):
+        return DummyPaginator(name)
+
+
+NOW = datetime.now(timezone.utc)
+UPLOADS = [
+    {"Key": "logs/old.gz", "UploadId": "old-id", "Initiated": NOW - timedelta(days=3)},
+    {"Key": "logs/new.gz", "UploadId": "new-id", "Initiated": NOW},
+    {"Key": "img/old.png", "UploadId": "img-id", "Initiated": NOW - timedelta(days=2)},
+]
+
+
+class DummyPaginator:
+    def __init__(self, name):
+        self.name = name
+
+    def paginate(self, Bucket, Prefix="", Key=None, UploadId=None):
+        if Bucket == "fail-bucket":
+            raise Exception("Simulated list failure")
+        if self.name == "list_parts":
+            if UploadId == "img-id":
+                raise Exception("Simulated list_parts failure")
+            yield {"Parts": [{"Size": 5 * 1024 * 1024}]}
+            yield {"Parts": [{"Size": 1024}]}
+            return
+        # One upload per page to exercise pagination.
+        for upload in UPLOADS:
+            if upload["Key"].startswith(Prefix):
+                yield {"Uploads": [upload]}
+
 
 @pytest.fixture(autouse=True)
 def patch_boto3_client(monkeypatch):
@@ -33,3 +64,40 @@ def test_abort_multipart_upload_failure():
     aborter = S3Aborter("url", "key", "secret", "auto")
     with pytest.raises(S3ActionError):
         aborter.abort_multipart_upload("bucket", "key", "fail-upload-id")
+
+
+def test_find_stale_uploads():
+    aborter = S3Aborter("url", "key", "secret", "auto")
+    stale = aborter.find_stale_uploads("bucket", timedelta(hours=24))
+    assert [u["UploadId"] for u in stale] == ["old-id", "img-id"]
+    stale = aborter.find_stale_uploads("bucket", timedelta(hours=24), prefix="logs/")
+    assert [u["UploadId"] for u in stale] == ["old-id"]
+
+
+def test_find_stale_uploads_failure():
+    aborter = S3Aborter("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        aborter.find_stale_uploads("fail-bucket", timedelta(hours=24))
+
+
+def test_reclaimable_bytes_skips_failures(capfd):
+    aborter = S3Aborter("url", "key", "secret", "auto")
+    sizes = aborter.reclaimable_bytes("bucket", UPLOADS[::2])
+    assert sizes == {"old-id": 5 * 1024 * 1024 + 1024}
+    aborter.print_stale_uploads(UPLOADS[::2], sizes)
+    assert "5.0 MB reclaimable" in capfd.readouterr().out
+
+
+def test_abort_uploads(capfd):
+    aborter = S3Aborter("url", "key", "secret", "auto")
+    aborter.abort_uploads("bucket", UPLOADS)
+    assert "Aborted 3 multipart upload(s)" in capfd.readouterr().out
+
+
+def test_abort_uploads_failure():
+    aborter = S3Aborter("url", "key", "secret", "auto")
+    uploads = UPLOADS + [
+        {"Key": "x", "UploadId": "fail-upload-id", "Initiated": NOW},
+    ]
+    with pytest.raises(S3ActionError, match="1 multipart upload"):
+        aborter.abort_uploads("bucket", uploads)
@@ -0,0 +1,31 @@
+import hashlib
+import pytest
+from utils.appendstate import AppendState, hash_prefixes
+
+
+def test_hash_prefixes(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"first line\nsecond line\n")
+
+    assert hash_prefixes(str(path), 5, 11) == [
+        hashlib.sha256(b"first").hexdigest(),
+        hashlib.sha256(b"first line\n").hexdigest(),
+    ]
+    with pytest.raises(ValueError):
+        hash_prefixes(str(path), 100)
+
+
+def test_append_state_round_trip(tmp_path):
+    state = AppendState(str(tmp_path / "appends.sqlite"))
+    destination = AppendState.destination("url", "bucket", "app.log")
+
+    assert state.get("app.log", destination) is None
+    state.put("app.log", destination, '"etag"', 10, "digest")
+
+    assert state.get("app.log", destination) == {
+        "etag": '"etag"',
+        "size": 10,
+        "digest": "digest",
+    }
+    assert state.get("app.log", AppendState.destination("url", "other", "k")) is None
+    state.close()
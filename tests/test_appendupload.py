@@ -0,0 +1,247 @@
+import hashlib
+import threading
+
+import pytest
+from actions.upload import S3Uploader
+from utils.appendupload import AppendUpload, plan_copy_parts
+from utils.concurrency import AdaptiveConcurrency
+from utils.multipart import MIN_PART_SIZE
+from utils.s3base import S3Base
+
+MIB = 1024 * 1024
+
+
+class NotFound(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class DummyS3Client:
+    """Stores objects in memory and assembles multipart uploads from their parts."""
+
+    def __init__(self):
+        self.objects = {}
+        self.parts = {}
+        self.copied = 0
+        self.uploaded = 0
+        self._lock = threading.Lock()
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise NotFound("Not Found")
+        data = self.objects[Key]
+        return {
+            "ContentLength": len(data),
+            "ETag": f'"{hashlib.md5(data).hexdigest()}"',
+            "ContentType": "text/plain",
+        }
+
+    def upload_fileobj(
+        self, file, Bucket, Key, ExtraArgs=None, Callback=None, Config=None
+    ):
+        data = file.read()
+        self.uploaded += len(data)
+        self.objects[Key] = data
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        data = Body.read() if hasattr(Body, "read") else Body
+        self.uploaded += len(data)
+        self.objects[Key] = data
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        data = bytes(Body.read())
+        with self._lock:
+            self.uploaded += len(data)
+            self.parts[PartNumber] = data
+        return {"ETag": f"part-{PartNumber}"}
+
+    def upload_part_copy(self, **kwargs):
+        source = self.objects[kwargs["CopySource"]["Key"]]
+        assert kwargs["CopySourceIfMatch"] == f'"{hashlib.md5(source).hexdigest()}"'
+        start, end = map(int, kwargs["CopySourceRange"][6:].split("-"))
+        with self._lock:
+            self.copied += end - start + 1
+            self.parts[kwargs["PartNumber"]] = source[start : end + 1]
+        return {"CopyPartResult": {"ETag": f"part-{kwargs['PartNumber']}"}}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == list(range(1, len(numbers) + 1))
+        for number in numbers[:-1]:
+            assert len(self.parts[number]) >= MIN_PART_SIZE
+        data = b"".join(self.parts[number] for number in numbers)
+        self.objects[Key] = data
+        self.parts = {}
+        return {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def abort_multipart_upload(self, **kwargs):
+        self.parts = {}
+
+
+class DummyProgress:
+    def __init__(self, *a, **kw):
+        pass
+
+    def __call__(self, *a, **kw):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = DummyS3Client()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: client)
+    monkeypatch.setattr("actions.upload.TqdmProgress", DummyProgress)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+@pytest.fixture(autouse=True)
+def isolate_append_state(monkeypatch, tmp_path_factory):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setattr(S3Base, "_hash_engine", None)
+    monkeypatch.setattr(S3Uploader, "_append_state", None)
+
+
+def test_plan_copy_parts_folds_short_tail():
+    parts = plan_copy_parts(21 * MIB, 10 * MIB)
+    assert parts == [(0, 0, 10 * MIB - 1), (1, 10 * MIB, 21 * MIB - 1)]
+    assert plan_copy_parts(6 * MIB) == [(0, 0, 6 * MIB - 1)]
+
+
+def test_append_upload_copies_prefix(client, tmp_path):
+    data = bytes(range(256)) * (32 * 1024)
+    client.objects["app.log"] = data[: 6 * MIB]
+    path = tmp_path / "app.log"
+    path.write_bytes(data)
+    etag = client.head_object(Bucket="bucket", Key="app.log")["ETag"]
+
+    AppendUpload(
+        client,
+        str(path),
+        "bucket",
+        "app.log",
+        size=len(data),
+        copied_size=6 * MIB,
+        etag=etag,
+        controller=AdaptiveConcurrency(initial=4),
+    ).run()
+
+    assert client.objects["app.log"] == data
+    assert client.copied == 6 * MIB
+    assert client.uploaded == 2 * MIB
+
+
+def test_append_upload_rejects_small_objects(client, tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"x" * 10)
+    with pytest.raises(ValueError):
+        AppendUpload(client, str(path), "b", "k", size=10, copied_size=5, etag="e")
+
+
+def test_append_upload_sizes_tail_for_remaining_part_numbers(
+    client, tmp_path, monkeypatch
+):
+    monkeypatch.setattr("utils.appendupload.MAX_PARTS", 3)
+    path = tmp_path / "app.log"
+    path.write_bytes(b"x" * (40 * MIB))
+    engine = AppendUpload(
+        client,
+        str(path),
+        "b",
+        "k",
+        size=40 * MIB,
+        copied_size=12 * MIB,
+        etag="e",
+        copy_part_size=6 * MIB,
+    )
+    # Two copied parts leave one part number for the 28 MiB tail.
+    assert len(engine.copy_parts) == 2
+    assert engine.part_size == 28 * MIB
+
+    monkeypatch.setattr("utils.appendupload.MAX_PARTS", 2)
+    with pytest.raises(ValueError, match="all 2 part numbers"):
+        AppendUpload(
+            client,
+            str(path),
+            "b",
+            "k",
+            size=40 * MIB,
+            copied_size=12 * MIB,
+            etag="e",
+            copy_part_size=6 * MIB,
+        )
+
+
+def test_upload_append_sends_only_the_tail(client, tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"a" * 6 * MIB)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+    assert client.uploaded == 6 * MIB
+
+    with open(path, "ab") as f:
+        f.write(b"b" * 1000)
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+
+    assert client.objects["app.log"] == path.read_bytes()
+    assert client.copied == 6 * MIB
+    assert client.uploaded == 6 * MIB + 1000
+
+    # The appended object is recorded, so a further append is incremental too.
+    with open(path, "ab") as f:
+        f.write(b"c" * 10)
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+    assert client.objects["app.log"] == path.read_bytes()
+    assert client.uploaded == 6 * MIB + 1010
+
+
+def test_upload_append_falls_back_when_prefix_changed(client, tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"a" * 6 * MIB)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+
+    path.write_bytes(b"z" + b"a" * (6 * MIB))
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+
+    assert client.objects["app.log"] == path.read_bytes()
+    assert client.copied == 0
+    assert client.uploaded == 12 * MIB + 1
+
+
+def test_upload_append_falls_back_when_object_replaced(client, tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"a" * 6 * MIB)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+    client.objects["app.log"] = b"other"
+
+    with open(path, "ab") as f:
+        f.write(b"b")
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+
+    assert client.objects["app.log"] == path.read_bytes()
+    assert client.copied == 0
+
+
+def test_upload_append_skips_unchanged_file(client, tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"a" * 100)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+
+    uploader.upload_file(str(path), "bucket", "app.log", append=True)
+
+    assert client.uploaded == 100
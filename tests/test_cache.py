@@ -0,0 +1,37 @@
+import json
+from utils.cache import TTLCache, cache_dir
+
+
+def test_cache_round_trip(tmp_path):
+    cache = TTLCache("regions.json", 60, directory=str(tmp_path))
+    cache.set("bucket", None)
+    cache.set("other", "weur")
+    cache.save()
+    reloaded = TTLCache("regions.json", 60, directory=str(tmp_path))
+    assert "bucket" in reloaded
+    assert reloaded.get("bucket", "missing") is None
+    assert reloaded.get("other") == "weur"
+    assert reloaded.get("unknown", "missing") == "missing"
+
+
+def test_cache_drops_expired_entries(tmp_path):
+    cache = TTLCache("regions.json", -1, directory=str(tmp_path))
+    cache.set("bucket", "weur")
+    cache.save()
+    assert "bucket" not in TTLCache("regions.json", 60, directory=str(tmp_path))
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    (tmp_path / "regions.json").write_text("{not json")
+    cache = TTLCache("regions.json", 60, directory=str(tmp_path))
+    assert "bucket" not in cache
+    cache.set("bucket", "weur")
+    cache.save()
+    assert json.loads((tmp_path / "regions.json").read_text())["bucket"]["value"] == (
+        "weur"
+    )
+
+
+def test_cache_dir_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path))
+    assert cache_dir() == str(tmp_path)
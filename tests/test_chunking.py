@@ -0,0 +1,62 @@
+import hashlib
+import random
+
+from utils.chunking import chunk_file, find_boundary, window_maximum
+
+WINDOW = 1024
+MAX_SIZE = 4096
+
+
+def random_bytes(size, seed=0):
+    return random.Random(seed).randbytes(size)
+
+
+def test_window_maximum():
+    for data in (b"\x00", b"abc", bytes([7, 200, 13]), bytes(range(255)), b"\xff"):
+        assert window_maximum(data) == max(data)
+
+
+def test_find_boundary_respects_window_and_max_size():
+    data = random_bytes(20000)
+    end = find_boundary(data, 0, WINDOW, MAX_SIZE)
+    assert WINDOW < end <= MAX_SIZE
+    assert find_boundary(data[:500], 0, WINDOW, MAX_SIZE) == 500
+    # Any byte is at least the maximum of an all-zero window.
+    assert find_boundary(bytes(10000), 0, WINDOW, MAX_SIZE) == WINDOW + 1
+    assert (
+        find_boundary(b"\xff" * WINDOW + bytes(10000), 0, WINDOW, MAX_SIZE) == MAX_SIZE
+    )
+
+
+def test_chunk_file_covers_file(tmp_path):
+    data = random_bytes(50000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+
+    chunks = chunk_file(str(path), WINDOW, MAX_SIZE)
+
+    offset = 0
+    for digest, chunk_offset, size in chunks:
+        assert chunk_offset == offset
+        assert digest == hashlib.sha256(data[offset : offset + size]).hexdigest()
+        offset += size
+    assert offset == len(data)
+
+
+def test_chunk_file_empty(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    assert chunk_file(str(path), WINDOW, MAX_SIZE) == []
+
+
+def test_insertion_keeps_later_chunks(tmp_path):
+    data = random_bytes(100000)
+    before = tmp_path / "before.bin"
+    after = tmp_path / "after.bin"
+    before.write_bytes(data)
+    after.write_bytes(data[:1000] + b"inserted" + data[1000:])
+
+    old = {digest for digest, _, _ in chunk_file(str(before), WINDOW, MAX_SIZE)}
+    new = [digest for digest, _, _ in chunk_file(str(after), WINDOW, MAX_SIZE)]
+
+    assert len([digest for digest in new if digest in old]) >= len(new) - 2
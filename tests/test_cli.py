@@ -4,7 +4,8 @@ from typer.testing import CliRunner
 import sys
 import os
 from cli import app
-from utils import Region, S3ActionError
+from utils import Region, S3ActionError, S3Base
+from utils.scheduler import TransferOrder
 
 # Add parent directory to path to import the cli module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -41,7 +42,7 @@ class TestCliCommands:
         mock_get_s3_action.assert_called_once_with(
             pytest.importorskip("actions").S3Lister, Region.AUTO
         )
-        mock_lister.list_buckets.assert_called_once_with(False)
+        mock_lister.list_buckets.assert_called_once_with(False, refresh=False)
 
     def test_list_buckets_with_region(self, mock_env_vars, mock_get_s3_action):
         mock_lister = MagicMock()
@@ -50,7 +51,7 @@ class TestCliCommands:
         result = runner.invoke(app, ["list", "--buckets", "--with-region"])
 
         assert result.exit_code == 0
-        mock_lister.list_buckets.assert_called_once_with(True)
+        mock_lister.list_buckets.assert_called_once_with(True, refresh=False)
 
     def test_list_objects(self, mock_env_vars, mock_get_s3_action):
         mock_lister = MagicMock()
@@ -160,7 +161,13 @@ class TestCliCommands:
             pytest.importorskip("actions").S3Uploader, Region.AUTO
         )
         mock_uploader.upload_file.assert_called_once_with(
-            "test-file.txt", "test-bucket", "test-key"
+            "test-file.txt",
+            "test-bucket",
+            "test-key",
+            max_in_flight=256 * 1024 * 1024,
+            compress=None,
+            skip_unchanged=False,
+            append=False,
         )
 
     def test_upload_file_no_object_key(self, mock_env_vars, mock_get_s3_action):
@@ -174,7 +181,106 @@ class TestCliCommands:
             pytest.importorskip("actions").S3Uploader, Region.AUTO
         )
         mock_uploader.upload_file.assert_called_once_with(
-            "test-file.txt", "test-bucket", None
+            "test-file.txt",
+            "test-bucket",
+            None,
+            max_in_flight=256 * 1024 * 1024,
+            compress=None,
+            skip_unchanged=False,
+            append=False,
+        )
+
+    def test_upload_file_max_in_flight(self, mock_env_vars, mock_get_s3_action):
+        mock_uploader = MagicMock()
+        mock_get_s3_action.return_value = mock_uploader
+
+        result = runner.invoke(
+            app,
+            ["upload", "test-bucket", "test-file.txt", "--max-in-flight", "64MB"],
+        )
+
+        assert result.exit_code == 0
+        mock_uploader.upload_file.assert_called_once_with(
+            "test-file.txt",
+            "test-bucket",
+            None,
+            max_in_flight=64 * 1024 * 1024,
+            compress=None,
+            skip_unchanged=False,
+            append=False,
+        )
+
+    def test_upload_file_compressed(self, mock_env_vars, mock_get_s3_action):
+        mock_uploader = MagicMock()
+        mock_get_s3_action.return_value = mock_uploader
+
+        result = runner.invoke(
+            app, ["upload", "test-bucket", "app.log", "--compress", "zstd"]
+        )
+
+        assert result.exit_code == 0
+        mock_uploader.upload_file.assert_called_once_with(
+            "app.log",
+            "test-bucket",
+            None,
+            max_in_flight=256 * 1024 * 1024,
+            compress="zstd",
+            skip_unchanged=False,
+            append=False,
+        )
+
+    def test_upload_file_skip_unchanged(self, mock_env_vars, mock_get_s3_action):
+        mock_uploader = MagicMock()
+        mock_get_s3_action.return_value = mock_uploader
+
+        result = runner.invoke(
+            app, ["upload", "test-bucket", "test-file.txt", "--skip-unchanged"]
+        )
+
+        assert result.exit_code == 0
+        mock_uploader.upload_file.assert_called_once_with(
+            "test-file.txt",
+            "test-bucket",
+            None,
+            max_in_flight=256 * 1024 * 1024,
+            compress=None,
+            skip_unchanged=True,
+            append=False,
+        )
+
+    def test_upload_directory(self, mock_env_vars, mock_get_s3_action, tmp_path):
+        mock_uploader = MagicMock()
+        mock_get_s3_action.return_value = mock_uploader
+
+        result = runner.invoke(app, ["upload", "test-bucket", str(tmp_path), "data/"])
+
+        assert result.exit_code == 0
+        mock_uploader.upload_directory.assert_called_once_with(
+            str(tmp_path),
+            "test-bucket",
+            "data/",
+            max_in_flight=256 * 1024 * 1024,
+            compress=None,
+            skip_unchanged=False,
+            order=TransferOrder.LARGEST,
+        )
+        mock_uploader.upload_file.assert_not_called()
+
+    def test_upload_directory_smallest_first(
+        self, mock_env_vars, mock_get_s3_action, tmp_path
+    ):
+        mock_uploader = MagicMock()
+        mock_get_s3_action.return_value = mock_uploader
+
+        result = runner.invoke(
+            app,
+            ["upload", "test-bucket", str(tmp_path), "--order", "smallest"],
+        )
+
+        assert result.exit_code == 0
+        assert (
+            mock_uploader.upload_directory.call_args[1]["order"]
+            == TransferOrder.SMALLEST
         )
 
     def test_upload_file_with_s3actionerror(self, mock_env_vars, mock_get_s3_action):
@@ -220,7 +326,14 @@ class TestCliCommands:
             pytest.importorskip("actions").S3Downloader, Region.AUTO
         )
         mock_downloader.download_file.assert_called_once_with(
-            "test-bucket", "test-key", "test-file.txt"
+            "test-bucket",
+            "test-key",
+            "test-file.txt",
+            hedge=False,
+            decompress=False,
+            skip_unchanged=False,
+            if_changed=False,
+            cache=None,
         )
 
     def test_download_file_no_object_key(self, mock_env_vars, mock_get_s3_action):
@@ -234,9 +347,145 @@ class TestCliCommands:
             pytest.importorskip("actions").S3Downloader, Region.AUTO
         )
         mock_downloader.download_file.assert_called_once_with(
-            "test-bucket", "test-key", None
+            "test-bucket",
+            "test-key",
+            None,
+            hedge=False,
+            decompress=False,
+            skip_unchanged=False,
+            if_changed=False,
+            cache=None,
+        )
+
+    def test_download_file_with_hedge(self, mock_env_vars, mock_get_s3_action):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app, ["download", "test-bucket", "test-key", "test-file.txt", "--hedge"]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_file.assert_called_once_with(
+            "test-bucket",
+            "test-key",
+            "test-file.txt",
+            hedge=True,
+            decompress=False,
+            skip_unchanged=False,
+            if_changed=False,
+            cache=None,
+        )
+
+    def test_download_recursive(self, mock_env_vars, mock_get_s3_action):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app, ["download", "test-bucket", "data/", "out", "--recursive"]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_prefix.assert_called_once_with(
+            "test-bucket",
+            "data/",
+            "out",
+            hedge=False,
+            decompress=False,
+            skip_unchanged=False,
+            if_changed=False,
+            cache=None,
+            max_in_flight=256 * 1024 * 1024,
+            order=TransferOrder.LARGEST,
+        )
+        mock_downloader.download_file.assert_not_called()
+
+    def test_download_file_with_decompress(self, mock_env_vars, mock_get_s3_action):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app, ["download", "test-bucket", "test-key", "-", "--decompress"]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_file.assert_called_once_with(
+            "test-bucket",
+            "test-key",
+            "-",
+            hedge=False,
+            decompress=True,
+            skip_unchanged=False,
+            if_changed=False,
+            cache=None,
+        )
+
+    def test_download_file_skip_unchanged(self, mock_env_vars, mock_get_s3_action):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app, ["download", "test-bucket", "test-key", "out.txt", "--skip-unchanged"]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_file.assert_called_once_with(
+            "test-bucket",
+            "test-key",
+            "out.txt",
+            hedge=False,
+            decompress=False,
+            skip_unchanged=True,
+            if_changed=False,
+            cache=None,
         )
 
+    def test_download_recursive_if_changed(self, mock_env_vars, mock_get_s3_action):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app, ["download", "test-bucket", "data/", "out", "-r", "--if-changed"]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_prefix.assert_called_once_with(
+            "test-bucket",
+            "data/",
+            "out",
+            hedge=False,
+            decompress=False,
+            skip_unchanged=False,
+            if_changed=True,
+            cache=None,
+            max_in_flight=256 * 1024 * 1024,
+            order=TransferOrder.LARGEST,
+        )
+
+    def test_download_file_with_cache_dir(
+        self, mock_env_vars, mock_get_s3_action, tmp_path
+    ):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app,
+            [
+                "download",
+                "test-bucket",
+                "test-key",
+                "--cache-dir",
+                str(tmp_path),
+                "--cache-size",
+                "1GB",
+            ],
+        )
+
+        assert result.exit_code == 0
+        cache = mock_downloader.download_file.call_args[1]["cache"]
+        assert cache.directory == str(tmp_path)
+        assert cache.max_size == 1024**3
+
     def test_download_file_with_s3actionerror(self, mock_env_vars, mock_get_s3_action):
         mock_downloader = MagicMock()
         mock_downloader.download_file.side_effect = S3ActionError("Test error")
@@ -267,6 +516,375 @@ class TestCliCommands:
             pytest.importorskip("actions").S3Downloader, Region.AUTO
         )
 
+    def test_copy_object(self, mock_env_vars, mock_get_s3_action):
+        mock_copier = MagicMock()
+        mock_get_s3_action.return_value = mock_copier
+
+        result = runner.invoke(app, ["copy", "src", "a.txt", "dst", "b.txt"])
+
+        assert result.exit_code == 0
+        mock_get_s3_action.assert_called_once_with(
+            pytest.importorskip("actions").S3Copier, Region.AUTO
+        )
+        mock_copier.copy_object.assert_called_once_with("src", "a.txt", "dst", "b.txt")
+
+    def test_move_prefix(self, mock_env_vars, mock_get_s3_action):
+        mock_copier = MagicMock()
+        mock_get_s3_action.return_value = mock_copier
+
+        result = runner.invoke(app, ["move", "src", "old/", "src", "new/", "-r"])
+
+        assert result.exit_code == 0
+        mock_copier.copy_prefix.assert_called_once_with(
+            "src", "old/", "src", "new/", move=True
+        )
+
+    def test_move_with_s3actionerror(self, mock_env_vars, mock_get_s3_action):
+        mock_copier = MagicMock()
+        mock_copier.move_object.side_effect = S3ActionError("Test error")
+        mock_get_s3_action.return_value = mock_copier
+
+        result = runner.invoke(app, ["move", "src", "a.txt", "dst"])
+
+        assert result.exit_code == 1
+        assert "Move error: Test error" in result.stdout
+
+    def test_du(self, mock_env_vars, mock_get_s3_action):
+        mock_lister = MagicMock()
+        mock_get_s3_action.return_value = mock_lister
+
+        result = runner.invoke(
+            app, ["du", "test-bucket", "logs/", "--depth", "2", "--json"]
+        )
+
+        assert result.exit_code == 0
+        mock_lister.disk_usage.assert_called_once_with(
+            "test-bucket",
+            "logs/",
+            depth=2,
+            sort_by="size",
+            as_json=True,
+            histogram=False,
+        )
+
+    def test_verify(self, mock_env_vars, mock_get_s3_action):
+        mock_verifier = MagicMock()
+        mock_get_s3_action.return_value = mock_verifier
+
+        result = runner.invoke(
+            app, ["verify", "test-bucket", "data/", "--checksum", "sha256"]
+        )
+
+        assert result.exit_code == 0
+        mock_verifier.verify.assert_called_once_with(
+            "data/", "test-bucket", None, checksums=["sha256"]
+        )
+
+    def test_cat(self, mock_env_vars, mock_get_s3_action):
+        mock_reader = MagicMock()
+        mock_get_s3_action.return_value = mock_reader
+
+        result = runner.invoke(
+            app, ["cat", "test-bucket", "test-key", "--range", "0-1KB"]
+        )
+
+        assert result.exit_code == 0
+        mock_get_s3_action.assert_called_once_with(
+            pytest.importorskip("actions").S3Reader, Region.AUTO
+        )
+        mock_reader.cat.assert_called_once_with(
+            "test-bucket", "test-key", "bytes=0-1024"
+        )
+
+    def test_cat_with_s3actionerror(self, mock_env_vars, mock_get_s3_action):
+        mock_reader = MagicMock()
+        mock_reader.cat.side_effect = S3ActionError("Test error")
+        mock_get_s3_action.return_value = mock_reader
+
+        result = runner.invoke(app, ["cat", "test-bucket", "test-key"])
+
+        assert result.exit_code == 1
+        assert "Cat error: Test error" in result.stdout
+
+    def test_head(self, mock_env_vars, mock_get_s3_action):
+        mock_reader = MagicMock()
+        mock_get_s3_action.return_value = mock_reader
+
+        result = runner.invoke(app, ["head", "test-bucket", "test-key", "-c", "4KB"])
+
+        assert result.exit_code == 0
+        mock_reader.head.assert_called_once_with("test-bucket", "test-key", 4096)
+
+    def test_download_range(self, mock_env_vars, mock_get_s3_action):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app, ["download", "test-bucket", "test-key", "-", "--range", "-100"]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_range.assert_called_once_with(
+            "test-bucket", "test-key", "-", "bytes=-100"
+        )
+        mock_downloader.download_file.assert_not_called()
+
+    def test_download_range_recursive(self, mock_env_vars, mock_get_s3_action):
+        result = runner.invoke(
+            app, ["download", "test-bucket", "data/", "--range", "0-9", "-r"]
+        )
+
+        assert result.exit_code == 1
+        mock_get_s3_action.assert_not_called()
+
+    def test_upload_append(self, mock_env_vars, mock_get_s3_action):
+        mock_uploader = MagicMock()
+        mock_get_s3_action.return_value = mock_uploader
+
+        result = runner.invoke(app, ["upload", "test-bucket", "app.log", "--append"])
+
+        assert result.exit_code == 0
+        mock_uploader.upload_file.assert_called_once_with(
+            "app.log",
+            "test-bucket",
+            None,
+            max_in_flight=256 * 1024 * 1024,
+            compress=None,
+            skip_unchanged=False,
+            append=True,
+        )
+
+    def test_upload_append_with_compress(self, mock_env_vars, mock_get_s3_action):
+        result = runner.invoke(
+            app, ["upload", "test-bucket", "app.log", "--append", "--compress", "gzip"]
+        )
+
+        assert result.exit_code == 1
+        mock_get_s3_action.assert_not_called()
+
+    def test_upload_pack(self, mock_env_vars, mock_get_s3_action, tmp_path):
+        mock_uploader = MagicMock()
+        mock_get_s3_action.return_value = mock_uploader
+
+        result = runner.invoke(
+            app,
+            ["upload", "test-bucket", str(tmp_path), "data/", "--pack"],
+        )
+
+        assert result.exit_code == 0
+        mock_uploader.upload_packed.assert_called_once_with(
+            str(tmp_path),
+            "test-bucket",
+            "data/",
+            shard_size=256 * 1024 * 1024,
+            max_in_flight=256 * 1024 * 1024,
+            order=TransferOrder.LARGEST,
+        )
+
+    def test_upload_pack_file(self, mock_env_vars, mock_get_s3_action):
+        result = runner.invoke(app, ["upload", "test-bucket", "app.log", "--pack"])
+
+        assert result.exit_code == 1
+        mock_get_s3_action.assert_not_called()
+
+    def test_download_packed(self, mock_env_vars, mock_get_s3_action):
+        mock_downloader = MagicMock()
+        mock_get_s3_action.return_value = mock_downloader
+
+        result = runner.invoke(
+            app,
+            [
+                "download",
+                "test-bucket",
+                "data/",
+                "out",
+                "--packed",
+                "--member",
+                "a.txt",
+            ],
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_packed.assert_called_once_with(
+            "test-bucket", "data/", "out", names=["a.txt"]
+        )
+
+    def test_export(self, mock_env_vars, mock_get_s3_action, tmp_path):
+        mock_exporter = MagicMock()
+        mock_exporter.export.return_value = (2, 100)
+        mock_get_s3_action.return_value = mock_exporter
+        output = tmp_path / "data.tar.zst"
+
+        result = runner.invoke(
+            app,
+            ["export", "test-bucket", "data/", str(output), "--compress", "zstd"],
+        )
+
+        assert result.exit_code == 0
+        args, kwargs = mock_exporter.export.call_args
+        assert args[:2] == ("test-bucket", "data/")
+        assert kwargs == {"compress": "zstd", "max_buffer": 256 * 1024 * 1024}
+        assert "Exported 2 object(s)" in result.stdout
+
+    def test_diff(self, mock_env_vars, mock_get_s3_action):
+        mock_differ = MagicMock()
+        mock_differ.diff.return_value = {
+            "added": 1,
+            "removed": 2,
+            "changed": 3,
+            "unchanged": 4,
+        }
+        mock_get_s3_action.return_value = mock_differ
+
+        result = runner.invoke(
+            app, ["diff", "primary", "data/", "replica", "--partitions", "4"]
+        )
+
+        assert result.exit_code == 0
+        mock_differ.diff.assert_called_once_with(
+            "primary",
+            "data/",
+            "replica",
+            None,
+            partitions=4,
+            include_unchanged=False,
+        )
+        assert "1 added, 2 removed, 3 changed, 4 unchanged" in result.stdout
+
+    def test_diff_to_file(self, mock_env_vars, mock_get_s3_action, tmp_path):
+        mock_differ = MagicMock()
+        mock_differ.diff.return_value = dict.fromkeys(
+            ("added", "removed", "changed", "unchanged"), 0
+        )
+        mock_get_s3_action.return_value = mock_differ
+        output = tmp_path / "diff.ndjson"
+
+        result = runner.invoke(
+            app, ["diff", "primary", "data/", "replica", "v2/", "-o", str(output)]
+        )
+
+        assert result.exit_code == 0
+        args, kwargs = mock_differ.diff.call_args
+        assert args[:4] == ("primary", "data/", "replica", "v2/")
+        assert args[4].name == str(output)
+        assert kwargs == {"partitions": 1, "include_unchanged": False}
+
+    def test_diff_error(self, mock_env_vars, mock_get_s3_action):
+        mock_differ = MagicMock()
+        mock_differ.diff.side_effect = S3ActionError("Source and target are the same.")
+        mock_get_s3_action.return_value = mock_differ
+
+        result = runner.invoke(app, ["diff", "primary", "data/", "primary"])
+
+        assert result.exit_code == 1
+        assert "Diff error: Source and target are the same." in result.stdout
+
+    def test_replicate(self, mock_env_vars, mock_get_s3_action):
+        mock_source, mock_replicator = MagicMock(), MagicMock()
+        mock_get_s3_action.side_effect = [mock_source, mock_replicator]
+
+        result = runner.invoke(
+            app,
+            [
+                "replicate",
+                "primary",
+                "data/",
+                "replica",
+                "--source-profile",
+                "old",
+                "--skip-identical",
+                "--part-size",
+                "16MB",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert [call.args[2] for call in mock_get_s3_action.call_args_list] == [
+            "old",
+            None,
+        ]
+        mock_replicator.replicate.assert_called_once_with(
+            mock_source,
+            "primary",
+            "data/",
+            "replica",
+            None,
+            skip_identical=True,
+            max_in_flight=256 * 1024 * 1024,
+            part_size=16 * 1024 * 1024,
+            order=TransferOrder.LARGEST,
+        )
+
+    def test_replicate_error(self, mock_env_vars, mock_get_s3_action):
+        mock_replicator = MagicMock()
+        mock_replicator.replicate.side_effect = S3ActionError("Test error")
+        mock_get_s3_action.return_value = mock_replicator
+
+        result = runner.invoke(app, ["replicate", "primary", "data/", "replica"])
+
+        assert result.exit_code == 1
+        assert "Replicate error: Test error" in result.stdout
+
+    def test_get_s3_action_reads_profile(self, mock_env_vars):
+        from cli import get_s3_action
+
+        action_cls = MagicMock()
+        with patch.dict(
+            os.environ,
+            {
+                "OLD_ENDPOINT_URL": "https://old.example.com",
+                "OLD_AWS_ACCESS_KEY_ID": "old_key",
+                "OLD_AWS_SECRET_ACCESS_KEY": "old_secret",
+            },
+        ):
+            get_s3_action(action_cls, Region.AUTO, "old")
+            get_s3_action(action_cls, Region.AUTO)
+
+        assert [call.kwargs["endpoint_url"] for call in action_cls.call_args_list] == [
+            "https://old.example.com",
+            "https://example.com",
+        ]
+
+    def test_invalid_max_concurrency_is_reported(self, mock_env_vars, monkeypatch):
+        monkeypatch.setenv("R2PY_MAX_CONCURRENCY", "abc")
+        monkeypatch.setattr(S3Base, "_clients", {})
+
+        result = runner.invoke(app, ["list", "--buckets"])
+
+        assert result.exit_code == 1
+        assert "Configuration error: R2PY_MAX_CONCURRENCY must be an integer" in (
+            result.stdout
+        )
+        assert not isinstance(result.exception, ValueError)
+
+    def test_snapshot(self, mock_env_vars, mock_get_s3_action):
+        mock_snapshotter = MagicMock()
+        mock_get_s3_action.return_value = mock_snapshotter
+
+        result = runner.invoke(
+            app, ["snapshot", "test-bucket", "data/", "--name", "nightly"]
+        )
+
+        assert result.exit_code == 0
+        mock_snapshotter.snapshot.assert_called_once_with(
+            "data/", "test-bucket", prefix="snapshots/", name="nightly"
+        )
+
+    def test_restore(self, mock_env_vars, mock_get_s3_action):
+        mock_snapshotter = MagicMock()
+        mock_snapshotter.restore.side_effect = S3ActionError("Test error")
+        mock_get_s3_action.return_value = mock_snapshotter
+
+        result = runner.invoke(
+            app, ["restore", "test-bucket", "out/", "--prefix", "backups/"]
+        )
+
+        assert result.exit_code == 1
+        assert "Restore error: Test error" in result.stdout
+        mock_snapshotter.restore.assert_called_once_with(
+            "test-bucket", "out/", name="latest", prefix="backups/"
+        )
+
     def test_delete_object(self, mock_env_vars, mock_get_s3_action):
         mock_deleter = MagicMock()
         mock_get_s3_action.return_value = mock_deleter
@@ -360,6 +978,45 @@ class TestCliCommands:
             "test-bucket", "test-key", "upload-id"
         )
 
+    def test_abort_older_than(self, mock_env_vars, mock_get_s3_action):
+        from datetime import timedelta
+
+        mock_aborter = MagicMock()
+        mock_aborter.find_stale_uploads.return_value = [{"UploadId": "a"}]
+        mock_get_s3_action.return_value = mock_aborter
+
+        result = runner.invoke(
+            app,
+            ["abort", "test-bucket", "--older-than", "24h", "--prefix", "logs/"],
+            input="y\n",
+        )
+
+        assert result.exit_code == 0
+        mock_aborter.find_stale_uploads.assert_called_once_with(
+            "test-bucket", timedelta(hours=24), "logs/"
+        )
+        mock_aborter.abort_uploads.assert_called_once_with(
+            "test-bucket", [{"UploadId": "a"}]
+        )
+
+    def test_abort_older_than_dry_run(self, mock_env_vars, mock_get_s3_action):
+        mock_aborter = MagicMock()
+        mock_get_s3_action.return_value = mock_aborter
+
+        result = runner.invoke(
+            app, ["abort", "test-bucket", "--older-than", "7d", "--dry-run"]
+        )
+
+        assert result.exit_code == 0
+        mock_aborter.reclaimable_bytes.assert_called_once()
+        mock_aborter.abort_uploads.assert_not_called()
+
+    def test_abort_requires_upload_id(self, mock_env_vars, mock_get_s3_action):
+        result = runner.invoke(app, ["abort", "test-bucket", "test-key"])
+
+        assert result.exit_code == 1
+        mock_get_s3_action.assert_not_called()
+
     def test_abort_multipart_no_confirm(self, mock_env_vars, mock_get_s3_action):
         mock_aborter = MagicMock()
         mock_get_s3_action.return_value = mock_aborter
@@ -427,3 +1084,11 @@ class TestCliCommands:
 
         assert result.exit_code == 1
         assert "List error: Test error" in result.stdout
+
+    def test_stats_output(self, mock_env_vars, mock_get_s3_action):
+        mock_get_s3_action.return_value = MagicMock()
+
+        result = runner.invoke(app, ["--stats", "list", "test-bucket"])
+
+        assert result.exit_code == 0
+        assert "Transfer Stats" in result.stdout
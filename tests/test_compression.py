@@ -0,0 +1,106 @@
+import gzip
+import io
+import pytest
+from utils.compression import (
+    CompressingReader,
+    CompressingWriter,
+    DecompressingWriter,
+    codec_from_head,
+    compress_frame,
+)
+
+DATA = b"".join(b"line %d of a very repetitive log file\n" % i for i in range(5000))
+
+
+def read_all(reader, size=1000):
+    out = bytearray()
+    while True:
+        chunk = reader.read(size)
+        if not chunk:
+            return bytes(out)
+        out += chunk
+
+
+def test_compressing_reader_single_frame():
+    progress = []
+    with CompressingReader(
+        io.BytesIO(DATA), "gzip", callback=progress.append
+    ) as reader:
+        compressed = read_all(reader)
+        assert reader._pool is None
+    assert gzip.decompress(compressed) == DATA
+    assert progress == [len(DATA)]
+    assert reader.bytes_out == len(compressed) < len(DATA)
+
+
+def test_compressing_reader_parallel_frames():
+    with CompressingReader(
+        io.BytesIO(DATA), "gzip", frame_size=16 * 1024, workers=2
+    ) as reader:
+        compressed = read_all(reader)
+    # Concatenated gzip members decode as one stream with standard tools.
+    assert gzip.decompress(compressed) == DATA
+    assert reader.bytes_in == len(DATA)
+
+
+def test_compressing_writer_parallel_frames():
+    out = io.BytesIO()
+    writer = CompressingWriter(out, "gzip", frame_size=10000, workers=2)
+    for start in range(0, len(DATA), 7000):
+        writer.write(DATA[start : start + 7000])
+    writer.finish()
+    assert gzip.decompress(out.getvalue()) == DATA
+    assert writer.bytes_in == len(DATA)
+    assert writer.bytes_out == len(out.getvalue())
+
+
+def test_compressing_writer_empty():
+    out = io.BytesIO()
+    writer = CompressingWriter(out, "gzip")
+    writer.finish()
+    assert gzip.decompress(out.getvalue()) == b""
+
+
+def test_decompressing_writer_across_frames():
+    compressed = b"".join(
+        compress_frame("gzip", DATA[i : i + 10000]) for i in range(0, len(DATA), 10000)
+    )
+    out = io.BytesIO()
+    writer = DecompressingWriter(out, "gzip")
+    for i in range(0, len(compressed), 777):
+        writer.write(compressed[i : i + 777])
+    writer.finish()
+    assert out.getvalue() == DATA
+    assert writer.bytes_out == len(DATA)
+
+
+def test_decompressing_writer_truncated():
+    writer = DecompressingWriter(io.BytesIO(), "gzip")
+    writer.write(compress_frame("gzip", DATA)[:-10])
+    with pytest.raises(ValueError):
+        writer.finish()
+
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+    with CompressingReader(
+        io.BytesIO(DATA), "zstd", frame_size=16 * 1024, workers=2
+    ) as reader:
+        compressed = read_all(reader)
+    out = io.BytesIO()
+    writer = DecompressingWriter(out, "zstd")
+    writer.write(compressed)
+    writer.finish()
+    assert out.getvalue() == DATA
+
+
+def test_unsupported_codec():
+    with pytest.raises(ValueError):
+        CompressingReader(io.BytesIO(DATA), "lz4")
+
+
+def test_codec_from_head():
+    assert codec_from_head({"Metadata": {"r2py-compression": "zstd"}}) == "zstd"
+    assert codec_from_head({"ContentEncoding": "gzip"}) == "gzip"
+    assert codec_from_head({"ContentEncoding": "identity"}) is None
+    assert codec_from_head({}) is None
@@ -0,0 +1,120 @@
+import threading
+import pytest
+from utils.concurrency import AdaptiveConcurrency, map_concurrent
+
+
+class DummyResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def saturate(controller, requests, latency=0.01, nbytes=1024):
+    controller._window_peak = controller.limit
+    for _ in range(requests):
+        controller.record(latency, nbytes)
+
+
+def test_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(minimum=4, maximum=2)
+
+
+def test_increase_when_saturated():
+    controller = AdaptiveConcurrency(initial=2, maximum=4, window=4)
+    saturate(controller, 4)
+    assert controller.limit == 3
+    assert controller.decisions[-1].action == "increase"
+
+
+def test_no_increase_when_not_saturated():
+    controller = AdaptiveConcurrency(initial=2, maximum=4, window=4)
+    for _ in range(8):
+        controller.record(0.01, 1024)
+    assert controller.limit == 2
+
+
+def test_increase_capped_at_maximum():
+    controller = AdaptiveConcurrency(initial=4, maximum=4, window=2)
+    saturate(controller, 10)
+    assert controller.limit == 4
+
+
+def test_throttle_backs_off_with_cooldown():
+    controller = AdaptiveConcurrency(initial=16, window=4, cooldown=60)
+    controller.record_throttle("SlowDown")
+    controller.record_throttle("SlowDown")
+    assert controller.limit == 8
+    stats = controller.stats()
+    assert stats["throttles"] == 2
+    assert stats["decreases"] == 1
+    assert stats["decisions"][-1].reason == "SlowDown"
+
+
+def test_throttle_respects_minimum():
+    controller = AdaptiveConcurrency(initial=1, minimum=1, cooldown=0)
+    controller.record_throttle()
+    assert controller.limit == 1
+
+
+def test_rising_latency_backs_off():
+    controller = AdaptiveConcurrency(initial=16, window=2, cooldown=0)
+    controller.record(0.01)
+    controller.record(0.01)
+    controller.record(0.5)
+    controller.record(0.5)
+    assert controller.limit < 16
+    assert controller.decisions[-1].reason.startswith("latency")
+
+
+def test_needs_retry_hook_detects_slowdown():
+    controller = AdaptiveConcurrency(initial=8, cooldown=0)
+    controller._on_needs_retry(
+        response=(DummyResponse(503), {"Error": {"Code": "SlowDown"}})
+    )
+    controller._on_needs_retry(response=(DummyResponse(200), {}))
+    assert controller.limit == 4
+    assert controller.stats()["throttles"] == 1
+
+
+def test_call_hooks_record_latency_and_bytes():
+    controller = AdaptiveConcurrency()
+    context = {}
+    controller._on_before_call(params={"body": b"abcd"}, context=context)
+    controller._on_after_call(
+        http_response=DummyResponse(200, {"content-length": "6"}), context=context
+    )
+    stats = controller.stats()
+    assert stats["requests"] == 1
+    assert stats["bytes"] == 10
+    assert stats["peak_in_flight"] == 1
+
+
+def test_attach_ignores_clients_without_events():
+    AdaptiveConcurrency().attach(object())
+
+
+def test_map_concurrent_respects_limit():
+    controller = AdaptiveConcurrency(initial=3, maximum=3)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def work(item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        with lock:
+            running.remove(item)
+        if item == 5:
+            raise ValueError("boom")
+        return item * 2
+
+    results = list(map_concurrent(controller, work, range(10)))
+    assert len(results) == 10
+    assert max(peak) <= 3
+    errors = [item for item, _, error in results if error]
+    assert errors == [5]
+    assert sorted(r for _, r, e in results if e is None) == [
+        i * 2 for i in range(10) if i != 5
+    ]
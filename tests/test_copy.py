@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+from actions.copy import S3Copier
+from utils.s3base import S3ActionError, S3Base
+
+
+class DummyPaginator:
+    def __init__(self, contents):
+        self.contents = contents
+
+    def paginate(self, Bucket, Prefix):
+        if Bucket == "fail-bucket":
+            raise Exception("Simulated list failure")
+        yield {"Contents": [c for c in self.contents if c["Key"].startswith(Prefix)]}
+
+
+class DummyProgress:
+    def __init__(self, *a, **kw):
+        pass
+
+    def __call__(self, *a, **kw):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    mock_client = MagicMock()
+    mock_client.head_object.return_value = {"ContentLength": 4, "ETag": '"etag"'}
+    mock_client.delete_objects.return_value = {}
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    monkeypatch.setattr("actions.copy.TqdmProgress", DummyProgress)
+    return mock_client
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+def test_copy_object_small(client, capsys):
+    S3Copier("url", "key", "secret", "auto").copy_object("src", "a.txt", "dst")
+    client.copy_object.assert_called_once_with(
+        Bucket="dst",
+        Key="a.txt",
+        CopySource={"Bucket": "src", "Key": "a.txt"},
+        CopySourceIfMatch='"etag"',
+    )
+    assert "Copied 'src/a.txt' to 'dst/a.txt'" in capsys.readouterr().out
+
+
+def test_copy_object_large_uses_part_copy(client, monkeypatch):
+    engine = MagicMock()
+    monkeypatch.setattr("actions.copy.PartCopy", engine)
+    monkeypatch.setattr(S3Copier, "multipart_copy_threshold", 2)
+    S3Copier("url", "key", "secret", "auto").copy_object("src", "a.txt", "src", "b")
+    engine.return_value.run.assert_called_once()
+    client.copy_object.assert_not_called()
+
+
+def test_copy_object_onto_itself(client):
+    with pytest.raises(S3ActionError):
+        S3Copier("url", "key", "secret", "auto").copy_object("src", "a.txt", "src")
+
+
+def test_copy_object_failure(client):
+    client.copy_object.side_effect = Exception("Simulated copy failure")
+    with pytest.raises(S3ActionError, match="Failed to copy object"):
+        S3Copier("url", "key", "secret", "auto").copy_object("src", "a.txt", "dst")
+
+
+def test_move_object(client):
+    S3Copier("url", "key", "secret", "auto").move_object("src", "a.txt", "src", "b")
+    client.copy_object.assert_called_once()
+    client.delete_object.assert_called_once_with(Bucket="src", Key="a.txt")
+
+
+def test_move_prefix_batches_deletes(client, monkeypatch):
+    monkeypatch.setattr("actions.copy.DELETE_BATCH_SIZE", 2)
+    client.get_paginator.return_value = DummyPaginator(
+        [{"Key": f"old/{i}.txt", "Size": 4} for i in range(5)]
+    )
+    S3Copier("url", "key", "secret", "auto").copy_prefix(
+        "src", "old/", "src", "new/", move=True
+    )
+    targets = sorted(c[1]["Key"] for c in client.copy_object.call_args_list)
+    assert targets == [f"new/{i}.txt" for i in range(5)]
+    batches = [
+        len(c[1]["Delete"]["Objects"]) for c in client.delete_objects.call_args_list
+    ]
+    assert sorted(batches) == [1, 2, 2]
+
+
+def test_move_prefix_deletes_batches_concurrently(client, monkeypatch):
+    monkeypatch.setattr("actions.copy.DELETE_BATCH_SIZE", 2)
+    client.get_paginator.return_value = DummyPaginator(
+        [{"Key": f"old/{i}.txt", "Size": 4} for i in range(6)]
+    )
+    # Every batch waits for the others, so this only passes if they overlap.
+    barrier = threading.Barrier(3, timeout=5)
+    client.delete_objects.side_effect = lambda **kw: (barrier.wait(), {})[1]
+    S3Copier("url", "key", "secret", "auto").copy_prefix(
+        "src", "old/", "dst", move=True
+    )
+    assert client.delete_objects.call_count == 3
+
+
+def test_copy_prefix_skips_nested_destination(client):
+    client.get_paginator.return_value = DummyPaginator(
+        [{"Key": "a/x.txt", "Size": 4}, {"Key": "a/b/y.txt", "Size": 4}]
+    )
+    S3Copier("url", "key", "secret", "auto").copy_prefix("src", "a/", "src", "a/b/")
+    client.copy_object.assert_called_once_with(
+        Bucket="src", Key="a/b/x.txt", CopySource={"Bucket": "src", "Key": "a/x.txt"}
+    )
+
+
+def test_copy_prefix_copies_large_objects_concurrently(client, monkeypatch):
+    monkeypatch.setattr(S3Copier, "multipart_copy_threshold", 2)
+    client.get_paginator.return_value = DummyPaginator(
+        [{"Key": f"big/{i}.bin", "Size": 4} for i in range(3)]
+    )
+    # Every copy waits for the others, so this only passes if they overlap.
+    barrier = threading.Barrier(3, timeout=5)
+    copied = []
+
+    def copy(self, source_bucket, source_key, bucket_name, object_key, budget=None):
+        barrier.wait()
+        copied.append(object_key)
+
+    monkeypatch.setattr(S3Copier, "_copy", copy)
+    S3Copier("url", "key", "secret", "auto").copy_prefix("src", "big/", "dst", "new/")
+    assert sorted(copied) == [f"new/{i}.bin" for i in range(3)]
+
+
+def test_move_prefix_keeps_failed_sources(client):
+    client.get_paginator.return_value = DummyPaginator(
+        [{"Key": "old/ok.txt", "Size": 4}, {"Key": "old/bad.txt", "Size": 4}]
+    )
+    client.copy_object.side_effect = lambda **kw: (
+        (_ for _ in ()).throw(Exception("fail")) if "bad" in kw["Key"] else {}
+    )
+    with pytest.raises(S3ActionError, match="1 object"):
+        S3Copier("url", "key", "secret", "auto").copy_prefix(
+            "src", "old/", "dst", move=True
+        )
+    deleted = client.delete_objects.call_args[1]["Delete"]["Objects"]
+    assert deleted == [{"Key": "old/ok.txt"}]
+
+
+def test_copy_prefix_list_failure(client):
+    client.get_paginator.return_value = DummyPaginator([])
+    with pytest.raises(S3ActionError, match="Error listing objects"):
+        S3Copier("url", "key", "secret", "auto").copy_prefix("fail-bucket", "a/", "dst")
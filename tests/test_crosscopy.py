@@ -0,0 +1,120 @@
+import io
+import threading
+
+import pytest
+from utils.budget import ByteBudget
+from utils.concurrency import AdaptiveConcurrency
+from utils.crosscopy import CrossCopy
+
+MB = 1024 * 1024
+DATA = bytes(range(256)) * (25 * MB // 256)
+
+
+class SourceClient:
+    def __init__(self, data=DATA, short=False):
+        self.data = data
+        self.short = short
+        self.ranges = []
+        self._lock = threading.Lock()
+
+    def get_object(self, Bucket, Key, Range, IfMatch=None):
+        assert (Bucket, Key, IfMatch) == ("src", "a.bin", '"etag"')
+        start, end = (int(n) for n in Range[len("bytes=") :].split("-"))
+        with self._lock:
+            self.ranges.append(Range)
+        body = self.data[start : end + 1]
+        return {"Body": io.BytesIO(body[:-1] if self.short else body)}
+
+
+class TargetClient:
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.parts = {}
+        self.created = None
+        self.completed = None
+        self.aborted = False
+
+    def create_multipart_upload(self, **kwargs):
+        self.created = kwargs
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, PartNumber, Body, **kwargs):
+        if PartNumber == self.fail_part:
+            raise Exception("Simulated part upload failure")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs
+        return {}
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+HEAD = {
+    "ContentLength": len(DATA),
+    "ETag": '"etag"',
+    "ContentType": "video/mp4",
+    "Metadata": {"owner": "me"},
+}
+
+
+def copy(source, target, **kwargs):
+    return CrossCopy(
+        source, "src", "a.bin", target, "dst", "b.bin", HEAD, **kwargs
+    ).run()
+
+
+def test_cross_copy_streams_every_part():
+    source, target = SourceClient(), TargetClient()
+    progress = []
+
+    copy(
+        source,
+        target,
+        controller=AdaptiveConcurrency(initial=4),
+        part_size=10 * MB,
+        metadata={"r2py-source-etag": "etag"},
+        callback=progress.append,
+    )
+
+    assert sorted(source.ranges) == [
+        "bytes=0-10485759",
+        "bytes=10485760-20971519",
+        "bytes=20971520-26214399",
+    ]
+    assert b"".join(target.parts[n] for n in sorted(target.parts)) == DATA
+    assert sum(progress) == len(DATA)
+    assert target.created["ContentType"] == "video/mp4"
+    assert target.created["Metadata"] == {"owner": "me", "r2py-source-etag": "etag"}
+    parts = target.completed["MultipartUpload"]["Parts"]
+    assert [p["PartNumber"] for p in parts] == [1, 2, 3]
+
+
+def test_cross_copy_bounds_bytes_in_flight():
+    budget = ByteBudget(10 * MB)
+
+    copy(SourceClient(), TargetClient(), part_size=5 * MB, budget=budget)
+
+    assert budget.peak <= 10 * MB
+    assert budget.in_flight == 0
+
+
+def test_cross_copy_failure_aborts():
+    target = TargetClient(fail_part=2)
+
+    with pytest.raises(Exception, match="Simulated part upload failure"):
+        copy(SourceClient(), target, part_size=10 * MB)
+
+    assert target.aborted
+    assert target.completed is None
+
+
+def test_cross_copy_short_read_aborts():
+    target = TargetClient()
+
+    with pytest.raises(IOError, match="Short read"):
+        copy(SourceClient(short=True), target, part_size=10 * MB)
+
+    assert target.aborted
@@ -0,0 +1,194 @@
+import io
+import json
+
+import pytest
+from actions.diff import S3Differ, plan_partitions
+from utils.listing import list_range
+from utils.s3base import S3ActionError, S3Base
+
+
+class DummyPaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix, StartAfter=None, Delimiter=None):
+        if self.client.fail_bucket == Bucket:
+            raise Exception("Simulated listing failure")
+        self.client.listings.append((Bucket, Prefix, StartAfter, Delimiter))
+        keys = sorted(
+            key
+            for bucket, key in self.client.objects
+            if bucket == Bucket and key.startswith(Prefix)
+        )
+        if StartAfter is not None:
+            keys = [key for key in keys if key > StartAfter]
+        contents, prefixes = [], []
+        for key in keys:
+            rest = key[len(Prefix) :]
+            if Delimiter and Delimiter in rest:
+                common = Prefix + rest[: rest.index(Delimiter) + 1]
+                if common not in prefixes:
+                    prefixes.append(common)
+                continue
+            size, etag = self.client.objects[(Bucket, key)]
+            contents.append({"Key": key, "Size": size, "ETag": f'"{etag}"'})
+        # Pages of two objects, to check merging across page boundaries.
+        for start in range(0, max(len(contents), 1), 2):
+            self.client.pages += 1
+            yield {
+                "Contents": contents[start : start + 2],
+                "CommonPrefixes": (
+                    [{"Prefix": p} for p in prefixes] if not start else []
+                ),
+            }
+
+
+class DummyS3Client:
+    def __init__(self, objects, fail_bucket=None):
+        self.objects = objects
+        self.fail_bucket = fail_bucket
+        self.listings = []
+        self.pages = 0
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return DummyPaginator(self)
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+def make_client(monkeypatch, objects, **kwargs):
+    client = DummyS3Client(objects, **kwargs)
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: client)
+    return client
+
+
+def run_diff(*args, **kwargs):
+    out = io.StringIO()
+    counts = S3Differ("url", "key", "secret", "auto").diff(*args, out=out, **kwargs)
+    return counts, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+OBJECTS = {
+    ("primary", "data/a.txt"): (1, "a"),
+    ("primary", "data/b.txt"): (2, "b"),
+    ("primary", "data/c.txt"): (3, "c"),
+    ("primary", "data/d/e.txt"): (4, "e"),
+    ("primary", "other/x.txt"): (9, "x"),
+    ("replica", "data/a.txt"): (1, "a"),
+    ("replica", "data/b.txt"): (2, "b2"),
+    ("replica", "data/d/e.txt"): (5, "e"),
+    ("replica", "data/f.txt"): (6, "f"),
+}
+
+
+def test_diff_reports_added_removed_and_changed(monkeypatch):
+    make_client(monkeypatch, OBJECTS)
+
+    counts, lines = run_diff("primary", "data/", "replica")
+
+    assert counts == {"added": 1, "removed": 1, "changed": 2, "unchanged": 1}
+    assert lines == [
+        {
+            "status": "changed",
+            "key": "b.txt",
+            "source": {"size": 2, "etag": "b"},
+            "target": {"size": 2, "etag": "b2"},
+        },
+        {"status": "removed", "key": "c.txt", "source": {"size": 3, "etag": "c"}},
+        {
+            "status": "changed",
+            "key": "d/e.txt",
+            "source": {"size": 4, "etag": "e"},
+            "target": {"size": 5, "etag": "e"},
+        },
+        {"status": "added", "key": "f.txt", "target": {"size": 6, "etag": "f"}},
+    ]
+
+
+def test_diff_include_unchanged(monkeypatch):
+    make_client(monkeypatch, OBJECTS)
+
+    _, lines = run_diff("primary", "data/", "replica", include_unchanged=True)
+
+    assert lines[0] == {
+        "status": "unchanged",
+        "key": "a.txt",
+        "source": {"size": 1, "etag": "a"},
+        "target": {"size": 1, "etag": "a"},
+    }
+
+
+def test_diff_different_prefixes_in_one_bucket(monkeypatch):
+    objects = {
+        ("bucket", "v1/a"): (1, "a"),
+        ("bucket", "v2/a"): (1, "a"),
+        ("bucket", "v2/b"): (1, "b"),
+    }
+    make_client(monkeypatch, objects)
+
+    counts, lines = run_diff("bucket", "v1/", "bucket", "v2/")
+
+    assert counts["added"] == 1 and counts["unchanged"] == 1
+    assert [line["key"] for line in lines] == ["b"]
+
+
+def test_diff_rejects_same_source_and_target(monkeypatch):
+    make_client(monkeypatch, OBJECTS)
+
+    with pytest.raises(S3ActionError, match="same"):
+        run_diff("primary", "data/", "primary")
+
+
+def test_diff_listing_failure(monkeypatch):
+    make_client(monkeypatch, OBJECTS, fail_bucket="replica")
+
+    with pytest.raises(S3ActionError, match="Simulated listing failure"):
+        run_diff("primary", "data/", "replica")
+
+
+def test_diff_partitions_match_single_pass(monkeypatch):
+    objects = {}
+    for group in "abcdefgh":
+        for i in range(3):
+            objects[("primary", f"p/{group}/{i}")] = (i, "x")
+            if (group, i) != ("c", 1):
+                size = i + 1 if (group, i) == ("f", 2) else i
+                objects[("replica", f"p/{group}/{i}")] = (size, "x")
+    objects[("replica", "p/h/9")] = (1, "y")
+    objects[("primary", "p/top")] = (1, "t")
+    client = make_client(monkeypatch, objects)
+
+    counts, lines = run_diff("primary", "p/", "replica", partitions=4)
+
+    assert counts == {"added": 1, "removed": 2, "changed": 1, "unchanged": 22}
+    assert sorted((line["status"], line["key"]) for line in lines) == [
+        ("added", "h/9"),
+        ("changed", "f/2"),
+        ("removed", "c/1"),
+        ("removed", "top"),
+    ]
+    ranged = [listing for listing in client.listings if listing[2] is not None]
+    assert len({listing[2] for listing in ranged}) == 3
+
+
+def test_diff_stops_listing_at_partition_end(monkeypatch):
+    client = DummyS3Client(OBJECTS)
+
+    keys = [obj[0] for obj in list_range(client, "primary", "data/", "a.txt", "c.txt")]
+
+    assert keys == ["b.txt", "c.txt"]
+    assert client.pages == 2
+
+
+def test_plan_partitions():
+    names = ["a/", "b/", "c/", "d/", "e/", "f/"]
+
+    assert plan_partitions(names, 3) == [(None, "c/"), ("c/", "e/"), ("e/", None)]
+    assert plan_partitions(names, 1) == [(None, None)]
+    assert plan_partitions(["a/"], 4) == [(None, None)]
@@ -1,22 +1,57 @@
+import hashlib
+import io
 import os
 import pytest
 from actions.download import S3Downloader
 from utils.s3base import S3ActionError, S3Base
 
+ETAG = f'"{hashlib.md5(b"data").hexdigest()}"'
+
+
+class NotModified(Exception):
+    response = {
+        "Error": {"Code": "304"},
+        "ResponseMetadata": {"HTTPStatusCode": 304},
+    }
+
 
 class DummyS3Client:
     def head_object(self, Bucket, Key):
         if Key == "fail-key":
             raise Exception("Simulated head_object failure")
-        return {"ContentLength": 4}
+        return {"ContentLength": 4, "ETag": ETAG}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None, IfNoneMatch=None):
+        if Bucket == "fail-bucket":
+            raise Exception("Simulated get_object failure")
+        if IfNoneMatch == ETAG:
+            raise NotModified("Not Modified")
+        return {"Body": io.BytesIO(b"data"), "ContentLength": 4, "ETag": ETAG}
+
+    def get_paginator(self, name):
+        return DummyPaginator()
 
-    def download_fileobj(self, Bucket, Key, fileobj, Callback=None):
+    def download_fileobj(self, Bucket, Key, fileobj, Callback=None, Config=None):
         if Bucket == "fail-bucket":
             raise Exception("Simulated download failure")
         if Callback:
             Callback(4)
 
 
+class DummyPaginator:
+    def paginate(self, Bucket, Prefix):
+        if Bucket == "fail-bucket":
+            raise Exception("Simulated list failure")
+        yield {
+            "Contents": [
+                {"Key": f"{Prefix}a.txt", "Size": 4, "ETag": ETAG},
+                {"Key": f"{Prefix}dir/", "Size": 0},
+                {"Key": f"{Prefix}sub/b.txt", "Size": 4},
+            ]
+        }
+        yield {"Contents": [{"Key": f"{Prefix}../escape.txt", "Size": 4}]}
+
+
 class DummyProgress:
     def __init__(self, *a, **kw):
         pass
@@ -42,6 +77,13 @@ def clear_clients_cache():
     S3Base._clients = {}
 
 
+@pytest.fixture(autouse=True)
+def isolate_hash_cache(monkeypatch, tmp_path_factory):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setattr(S3Base, "_hash_engine", None)
+    monkeypatch.setattr(S3Downloader, "_etag_store", None)
+
+
 def test_download_file_success(monkeypatch, tmp_path):
     test_file = tmp_path / "file.txt"
     monkeypatch.setattr("actions.download.TqdmProgress", DummyProgress)
@@ -79,3 +121,205 @@ def test_download_file_download_failure(monkeypatch, tmp_path):
     downloader = S3Downloader("url", "key", "secret", "auto")
     with pytest.raises(S3ActionError):
         downloader.download_file("fail-bucket", "object-key", str(test_file))
+
+
+def test_download_file_ranged_engine(monkeypatch, tmp_path):
+    test_file = tmp_path / "file.txt"
+    monkeypatch.setattr("actions.download.TqdmProgress", DummyProgress)
+    monkeypatch.setattr("actions.download.DEFAULT_PART_SIZE", 2)
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    downloader.small_object_threshold = 0
+    downloader.download_file("bucket", "object-key", str(test_file))
+    assert test_file.read_bytes() == b"data"
+
+
+def test_download_file_small_skips_progress(monkeypatch, tmp_path):
+    test_file = tmp_path / "file.txt"
+    from unittest.mock import MagicMock
+
+    progress = MagicMock()
+    monkeypatch.setattr("actions.download.TqdmProgress", progress)
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    downloader.download_file("bucket", "object-key", str(test_file))
+    assert test_file.read_bytes() == b"data"
+    progress.assert_not_called()
+
+
+def test_download_prefix(tmp_path):
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError, match="1 object"):
+        downloader.download_prefix("bucket", "data/", str(tmp_path / "out"))
+    assert (tmp_path / "out" / "a.txt").read_bytes() == b"data"
+    assert (tmp_path / "out" / "sub" / "b.txt").read_bytes() == b"data"
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_download_file_skip_unchanged(monkeypatch, tmp_path):
+    from unittest.mock import MagicMock
+
+    test_file = tmp_path / "file.txt"
+    test_file.write_bytes(b"data")
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    get = MagicMock()
+    monkeypatch.setattr(downloader, "_get_small", get)
+    downloader.download_file(
+        "bucket", "object-key", str(test_file), skip_unchanged=True
+    )
+    get.assert_not_called()
+    test_file.write_bytes(b"DATA")
+    downloader.download_file(
+        "bucket", "object-key", str(test_file), skip_unchanged=True
+    )
+    get.assert_called_once()
+
+
+def test_download_prefix_skip_unchanged(tmp_path, capsys):
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "a.txt").write_bytes(b"data")
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError, match="1 object"):
+        downloader.download_prefix(
+            "bucket", "data/", str(tmp_path / "out"), skip_unchanged=True
+        )
+    out = capsys.readouterr().out
+    assert "Downloaded 1 object(s)" in out
+    assert "skipped 1 unchanged" in out
+
+
+def test_download_file_if_changed(monkeypatch, tmp_path):
+    from unittest.mock import MagicMock
+
+    test_file = tmp_path / "file.txt"
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    downloader.download_file("bucket", "object-key", str(test_file), if_changed=True)
+    assert S3Downloader.etag_store().get(str(test_file)) == ETAG
+    head = MagicMock(side_effect=AssertionError("HEAD sent"))
+    monkeypatch.setattr(downloader.s3, "head_object", head)
+    downloader.download_file("bucket", "object-key", str(test_file), if_changed=True)
+    assert test_file.read_bytes() == b"data"
+
+
+def test_download_file_if_changed_refetches_modified_file(tmp_path):
+    test_file = tmp_path / "file.txt"
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    downloader.download_file("bucket", "object-key", str(test_file), if_changed=True)
+    test_file.write_bytes(b"local edit")
+    downloader.download_file("bucket", "object-key", str(test_file), if_changed=True)
+    assert test_file.read_bytes() == b"data"
+
+
+def test_download_file_if_changed_stale_etag(monkeypatch, tmp_path):
+    test_file = tmp_path / "file.txt"
+    test_file.write_bytes(b"old")
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    S3Downloader.etag_store().put(str(test_file), '"old-etag"')
+    monkeypatch.setattr(
+        downloader.s3, "head_object", lambda **kw: pytest.fail("HEAD sent")
+    )
+    downloader.download_file("bucket", "object-key", str(test_file), if_changed=True)
+    assert test_file.read_bytes() == b"data"
+    assert S3Downloader.etag_store().get(str(test_file)) == ETAG
+
+
+def test_download_prefix_if_changed(tmp_path, capsys):
+    out = tmp_path / "out"
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        downloader.download_prefix("bucket", "data/", str(out), if_changed=True)
+    capsys.readouterr()
+    with pytest.raises(S3ActionError):
+        downloader.download_prefix("bucket", "data/", str(out), if_changed=True)
+    assert "skipped 1 unchanged" in capsys.readouterr().out
+
+
+def test_download_file_object_cache(monkeypatch, tmp_path):
+    from unittest.mock import MagicMock
+    from utils.objectcache import ObjectCache
+
+    cache = ObjectCache(str(tmp_path / "cache"))
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    downloader.download_file(
+        "bucket", "object-key", str(tmp_path / "a.txt"), cache=cache
+    )
+    get = MagicMock(side_effect=AssertionError("GET sent"))
+    monkeypatch.setattr(downloader.s3, "get_object", get)
+    downloader.download_file(
+        "bucket", "object-key", str(tmp_path / "b.txt"), cache=cache
+    )
+    assert (tmp_path / "b.txt").read_bytes() == b"data"
+    assert cache.hits == 1
+    cache.close()
+
+
+def test_download_prefix_object_cache(tmp_path):
+    from utils.objectcache import ObjectCache
+
+    cache = ObjectCache(str(tmp_path / "cache"))
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    for out in ("one", "two"):
+        with pytest.raises(S3ActionError):
+            downloader.download_prefix(
+                "bucket", "data/", str(tmp_path / out), cache=cache
+            )
+    assert (tmp_path / "two" / "a.txt").read_bytes() == b"data"
+    assert cache.hits == 1
+    cache.close()
+
+
+def test_download_range(monkeypatch, tmp_path):
+    calls = []
+
+    def get_object(**kwargs):
+        calls.append(kwargs)
+        return {"Body": io.BytesIO(b"at")}
+
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    monkeypatch.setattr(downloader.s3, "get_object", get_object)
+    monkeypatch.setattr(downloader.s3, "head_object", None)
+    test_file = tmp_path / "part.bin"
+    downloader.download_range("bucket", "object-key", str(test_file), "bytes=1-2")
+    assert test_file.read_bytes() == b"at"
+    assert calls == [{"Bucket": "bucket", "Key": "object-key", "Range": "bytes=1-2"}]
+
+
+def test_download_range_failure(tmp_path):
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        downloader.download_range(
+            "fail-bucket", "object-key", str(tmp_path / "part.bin"), "bytes=0-1"
+        )
+
+
+def test_download_prefix_list_failure(tmp_path):
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        downloader.download_prefix("fail-bucket", "data/", str(tmp_path))
+
+
+def test_download_file_to_stdout(monkeypatch):
+    from unittest.mock import MagicMock
+
+    out = io.BytesIO()
+    monkeypatch.setattr("sys.stdout", MagicMock(buffer=out))
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    downloader.download_file("bucket", "object-key", "-")
+    assert out.getvalue() == b"data"
+
+
+def test_download_file_decompress(monkeypatch, tmp_path):
+    import gzip
+    from unittest.mock import MagicMock
+
+    compressed = gzip.compress(b"log line\n" * 100)
+    mock_client = MagicMock()
+    mock_client.head_object.return_value = {
+        "ContentLength": len(compressed),
+        "ContentEncoding": "gzip",
+    }
+    mock_client.get_object.side_effect = lambda **kw: {"Body": io.BytesIO(compressed)}
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    monkeypatch.setattr("actions.download.TqdmProgress", DummyProgress)
+    target = tmp_path / "app.log"
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    downloader.download_file("bucket", "app.log", str(target), decompress=True)
+    assert target.read_bytes() == b"log line\n" * 100
@@ -0,0 +1,47 @@
+import os
+import pytest
+from utils.etagstore import ETagStore
+
+
+@pytest.fixture(params=[True, False], ids=["xattr", "index"])
+def store(request, tmp_path):
+    store = ETagStore(str(tmp_path / "cache" / "etags.sqlite"))
+    store.use_xattr = request.param and store.use_xattr
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"data")
+    return str(path)
+
+
+def test_put_and_get(store, local_file):
+    store.put(local_file, '"abc"', "2024-01-01 00:00:00+00:00")
+    assert store.get(local_file) == '"abc"'
+
+
+def test_unknown_file(store, local_file, tmp_path):
+    assert store.get(local_file) is None
+    assert store.get(str(tmp_path / "missing.txt")) is None
+
+
+def test_modified_file_is_stale(store, local_file):
+    store.put(local_file, '"abc"')
+    stat = os.stat(local_file)
+    os.utime(local_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert store.get(local_file) is None
+
+
+def test_index_persists(tmp_path, local_file):
+    path = str(tmp_path / "etags.sqlite")
+    store = ETagStore(path)
+    store.use_xattr = False
+    store.put(local_file, '"abc"')
+    store.close()
+    store = ETagStore(path)
+    store.use_xattr = False
+    assert store.get(local_file) == '"abc"'
+    store.close()
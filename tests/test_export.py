@@ -0,0 +1,132 @@
+import gzip
+import io
+import tarfile
+from datetime import datetime, timezone
+
+import pytest
+from actions.export import S3Exporter
+from utils.s3base import S3ActionError, S3Base
+
+MODIFIED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class DummyPaginator:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def paginate(self, Bucket, Prefix):
+        keys = sorted(k for k in self.objects if k.startswith(Prefix))
+        # Two pages, to check ordering across page boundaries.
+        middle = len(keys) // 2
+        for page in (keys[:middle], keys[middle:]):
+            yield {
+                "Contents": [
+                    {
+                        "Key": key,
+                        "Size": len(self.objects[key]),
+                        "ETag": f'"{key}"',
+                        "LastModified": MODIFIED,
+                    }
+                    for key in page
+                ]
+            }
+
+
+class DummyS3Client:
+    def __init__(self, objects, fail_key=None):
+        self.objects = objects
+        self.fail_key = fail_key
+        self.ranged = []
+
+    def get_paginator(self, name):
+        return DummyPaginator(self.objects)
+
+    def get_object(self, Bucket, Key, IfMatch=None, Range=None):
+        if Key == self.fail_key:
+            raise Exception("Simulated GET failure")
+        assert IfMatch == f'"{Key}"'
+        data = self.objects[Key]
+        if Range:
+            self.ranged.append(Key)
+            start, end = map(int, Range[6:].split("-"))
+            data = data[start : end + 1]
+        return {"Body": io.BytesIO(data)}
+
+
+OBJECTS = {
+    "data/b.txt": b"bravo",
+    "data/a.txt": b"alpha" * 100,
+    "data/sub/c.bin": bytes(range(256)) * 4,
+    "data/dir/": b"",
+    "other/x.txt": b"not exported",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = DummyS3Client(dict(OBJECTS))
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+def members(data):
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        return [
+            (info.name, archive.extractfile(info).read(), info.mtime)
+            for info in archive.getmembers()
+        ]
+
+
+def test_export_writes_tar_in_key_order(client):
+    out = io.BytesIO()
+    exporter = S3Exporter("url", "key", "secret", "auto")
+
+    count, total = exporter.export("bucket", "data/", out, max_buffer=600)
+
+    assert (count, total) == (3, 500 + 5 + 1024)
+    assert members(out.getvalue()) == [
+        ("a.txt", b"alpha" * 100, int(MODIFIED.timestamp())),
+        ("b.txt", b"bravo", int(MODIFIED.timestamp())),
+        ("sub/c.bin", bytes(range(256)) * 4, int(MODIFIED.timestamp())),
+    ]
+
+
+def test_export_streams_large_objects(client, monkeypatch):
+    monkeypatch.setattr("actions.export.DEFAULT_STREAM_PART_SIZE", 100)
+    out = io.BytesIO()
+
+    S3Exporter("url", "key", "secret", "auto").export("bucket", "data/", out)
+
+    assert sorted(client.ranged) == ["data/a.txt", "data/sub/c.bin"]
+    assert [name for name, _, _ in members(out.getvalue())] == [
+        "a.txt",
+        "b.txt",
+        "sub/c.bin",
+    ]
+
+
+def test_export_compressed(client):
+    out = io.BytesIO()
+
+    S3Exporter("url", "key", "secret", "auto").export(
+        "bucket", "data/", out, compress="gzip"
+    )
+
+    assert members(gzip.decompress(out.getvalue()))[1][1] == b"bravo"
+
+
+def test_export_failure(monkeypatch):
+    client = DummyS3Client(dict(OBJECTS), fail_key="data/b.txt")
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: client)
+
+    with pytest.raises(S3ActionError, match="Simulated GET failure"):
+        S3Exporter("url", "key", "secret", "auto").export(
+            "bucket", "data/", io.BytesIO()
+        )
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import pytest
+from utils import hashcache
+from utils.hashcache import HashCache, HashEngine, digest_kind, file_identity
+
+DATA = b"hello world" * 1000
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HashCache(str(tmp_path / "hashes.sqlite"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def test_digest_kind():
+    assert digest_kind("md5", None) == "md5"
+    assert digest_kind("md5", 4096) == "md5:4096"
+    assert digest_kind("md5", (2000, 9000)).startswith("md5:parts-")
+    assert digest_kind("md5", (2000, 9000)) != digest_kind("md5", (9000, 2000))
+
+
+def test_cache_round_trip_persists(tmp_path, local_file):
+    path = str(tmp_path / "hashes.sqlite")
+    identity = file_identity(os.stat(local_file))
+    cache = HashCache(path)
+    cache.put(identity, {"md5": "abc", "md5:4096": "def-3"})
+    cache.close()
+    cache = HashCache(path)
+    assert cache.get(identity, "md5") == "abc"
+    assert cache.get(identity, "md5:4096") == "def-3"
+    assert cache.get(identity, "sha256") is None
+    cache.close()
+
+
+def test_cache_defaults_to_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path))
+    cache = HashCache()
+    assert cache.path == str(tmp_path / "hashes.sqlite")
+    cache.close()
+
+
+def test_engine_hashes_once(cache, local_file, monkeypatch):
+    engine = HashEngine(cache)
+    expected = hashlib.md5(DATA).hexdigest()
+    assert engine.digests(local_file) == {"md5": expected}
+    monkeypatch.setattr(hashcache, "hash_file", None)
+    assert engine.digests(local_file) == {"md5": expected}
+    assert (engine.hits, engine.misses) == (1, 1)
+
+
+def test_engine_rehashes_modified_file(cache, local_file):
+    engine = HashEngine(cache)
+    engine.digests(local_file)
+    with open(local_file, "ab") as f:
+        f.write(b"!")
+    assert engine.digests(local_file)["md5"] == hashlib.md5(DATA + b"!").hexdigest()
+    assert engine.misses == 2
+
+
+def test_engine_hashes_missing_algorithms_only(cache, local_file, monkeypatch):
+    engine = HashEngine(cache)
+    engine.digests(local_file)
+    calls = []
+    hash_file = hashcache.hash_file
+
+    def recording(filename, part_size, algorithms, **kw):
+        calls.append(list(algorithms))
+        return hash_file(filename, part_size, algorithms, **kw)
+
+    monkeypatch.setattr(hashcache, "hash_file", recording)
+    result = engine.digests(local_file, algorithms=("md5", "sha256"))
+    assert calls == [["sha256"]]
+    assert set(result) == {"md5", "sha256"}
+
+
+def test_engine_large_file_uses_process_pool(cache, local_file, monkeypatch):
+    monkeypatch.setattr(hashcache, "INLINE_HASH_SIZE", 0)
+    engine = HashEngine(cache, workers=1)
+    try:
+        assert engine.digests(local_file)["md5"] == hashlib.md5(DATA).hexdigest()
+        assert engine._pool is not None
+    finally:
+        engine.close()
+
+
+def test_engine_matches(cache, local_file):
+    engine = HashEngine(cache)
+    single = f'"{hashlib.md5(DATA).hexdigest()}"'
+    parts = [DATA[i : i + 4096] for i in range(0, len(DATA), 4096)]
+    multi = hashlib.md5(b"".join(hashlib.md5(p).digest() for p in parts))
+    multi = f'"{multi.hexdigest()}-{len(parts)}"'
+    assert engine.matches(local_file, len(DATA), single, lambda: 1 / 0)
+    assert engine.matches(local_file, len(DATA), multi, lambda: 4096)
+    assert not engine.matches(local_file, len(DATA) + 1, single, lambda: 4096)
+    assert not engine.matches(local_file + ".missing", len(DATA), single, None)
+
+
+def test_engine_matches_uneven_parts(cache, local_file):
+    engine = HashEngine(cache)
+    parts = [DATA[:2000], DATA[2000:]]
+    multi = hashlib.md5(b"".join(hashlib.md5(p).digest() for p in parts))
+    multi = f'"{multi.hexdigest()}-2"'
+    assert engine.matches(local_file, len(DATA), multi, lambda: (2000, 9000))
+    assert not engine.matches(local_file, len(DATA), multi, lambda: 2000)
+    assert not engine.matches(local_file, len(DATA), multi, lambda: None)
+
+
+def test_engine_without_cache(local_file):
+    engine = HashEngine()
+    assert engine.digests(local_file)["md5"] == hashlib.md5(DATA).hexdigest()
+    assert engine.digests(local_file)["md5"] == hashlib.md5(DATA).hexdigest()
+    assert engine.misses == 2
@@ -0,0 +1,63 @@
+import base64
+import hashlib
+import zlib
+import pytest
+from utils.hashing import hash_file
+
+DATA = bytes(range(256)) * 4096  # 1 MiB
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def test_single_part_digests(data_file):
+    digests = hash_file(data_file, algorithms=("md5", "crc32", "sha256"))
+    assert digests["md5"] == hashlib.md5(DATA).hexdigest()
+    assert (
+        digests["crc32"]
+        == base64.b64encode(zlib.crc32(DATA).to_bytes(4, "big")).decode()
+    )
+    assert digests["sha256"] == base64.b64encode(hashlib.sha256(DATA).digest()).decode()
+
+
+def test_multipart_etag(data_file):
+    part_size = 300 * 1024
+    parts = [DATA[i : i + part_size] for i in range(0, len(DATA), part_size)]
+    expected = hashlib.md5(b"".join(hashlib.md5(p).digest() for p in parts))
+    digests = hash_file(data_file, part_size, algorithms=("md5",), workers=4)
+    assert digests["md5"] == f"{expected.hexdigest()}-{len(parts)}"
+
+
+def test_multipart_etag_with_uneven_parts(data_file):
+    sizes = [100 * 1024, 600 * 1024, 324 * 1024]
+    parts = [DATA[:102400], DATA[102400:716800], DATA[716800:]]
+    expected = hashlib.md5(b"".join(hashlib.md5(p).digest() for p in parts))
+    digests = hash_file(data_file, sizes, algorithms=("md5",))
+    assert digests["md5"] == f"{expected.hexdigest()}-3"
+    with pytest.raises(ValueError, match="add up"):
+        hash_file(data_file, sizes[:2])
+
+
+def test_multipart_composite_crc32(data_file):
+    part_size = 512 * 1024
+    parts = [DATA[:part_size], DATA[part_size:]]
+    crcs = b"".join(zlib.crc32(p).to_bytes(4, "big") for p in parts)
+    expected = base64.b64encode(zlib.crc32(crcs).to_bytes(4, "big")).decode()
+    assert hash_file(data_file, part_size, algorithms=("crc32",))["crc32"] == (
+        f"{expected}-2"
+    )
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    assert hash_file(str(path))["md5"] == hashlib.md5(b"").hexdigest()
+
+
+def test_unsupported_algorithm(data_file):
+    with pytest.raises(ValueError):
+        hash_file(data_file, algorithms=("sha1",))
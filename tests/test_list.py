@@ -26,12 +26,29 @@ class DummyS3Client:
             return {}
         return {"Uploads": [{"UploadId": "upload-id", "Key": "file.txt"}]}
 
+    def get_paginator(self, name):
+        return DummyPaginator(self, name)
+
+
+class DummyPaginator:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def paginate(self, **kwargs):
+        yield getattr(self.client, self.name)(**kwargs)
+
 
 @pytest.fixture(autouse=True)
 def patch_boto3_client(monkeypatch):
     monkeypatch.setattr("boto3.client", lambda *a, **kw: DummyS3Client())
 
 
+@pytest.fixture(autouse=True)
+def isolate_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path / "cache"))
+
+
 @pytest.fixture(autouse=True)
 def clear_clients_cache():
     # Clear the clients cache before each test to avoid test interference
@@ -144,3 +161,104 @@ def test_list_objects_with_prefix_failure(monkeypatch):
     lister = S3Lister("url", "key", "secret", "auto")
     with pytest.raises(S3ActionError):
         lister.list_objects_with_prefix("fail-bucket", "prefix/")
+
+
+class DummyUsagePaginator:
+    KEYS = {
+        "top.txt": 1,
+        "logs/2024/a.log": 100,
+        "logs/2024/b.log": 200,
+        "logs/2025/c.log": 300,
+        "img/x.png": 4000,
+    }
+
+    def paginate(self, Bucket, Prefix, Delimiter=None):
+        if Bucket == "fail-bucket":
+            raise Exception("Simulated list failure")
+        contents, prefixes = [], set()
+        for key, size in self.KEYS.items():
+            if not key.startswith(Prefix):
+                continue
+            rest = key[len(Prefix) :]
+            if Delimiter and Delimiter in rest:
+                prefixes.add(Prefix + rest.split(Delimiter)[0] + Delimiter)
+            else:
+                contents.append({"Key": key, "Size": size})
+        # One page per object to exercise streaming aggregation.
+        for obj in contents:
+            yield {"Contents": [obj]}
+        yield {"CommonPrefixes": [{"Prefix": p} for p in sorted(prefixes)]}
+
+
+def test_disk_usage_depth_one(monkeypatch, capfd):
+    lister = S3Lister("url", "key", "secret", "auto")
+    lister.s3.get_paginator = lambda name: DummyUsagePaginator()
+    usages = lister.disk_usage("bucket")
+    assert [(u.prefix, u.objects, u.bytes) for u in usages] == [
+        ("img/", 1, 4000),
+        ("logs/", 3, 600),
+        ("", 1, 1),
+    ]
+    assert "Total" in capfd.readouterr().out
+
+
+def test_disk_usage_depth_two_json(capfd):
+    import json
+
+    lister = S3Lister("url", "key", "secret", "auto")
+    lister.s3.get_paginator = lambda name: DummyUsagePaginator()
+    lister.disk_usage("bucket", "logs/", depth=2, sort_by="name", as_json=True)
+    output = json.loads(capfd.readouterr().out)
+    assert [p["prefix"] for p in output["prefixes"]] == ["logs/2024/", "logs/2025/"]
+    assert output["total"]["objects"] == 3
+    assert output["total"]["bytes"] == 600
+
+
+def test_disk_usage_failure():
+    lister = S3Lister("url", "key", "secret", "auto")
+    lister.s3.get_paginator = lambda name: DummyUsagePaginator()
+    with pytest.raises(S3ActionError):
+        lister.disk_usage("fail-bucket")
+
+
+def test_list_multipart_uploads_all_pages(capfd):
+    lister = S3Lister("url", "key", "secret", "auto")
+
+    class TwoPages:
+        def paginate(self, Bucket):
+            yield {"Uploads": [{"UploadId": "first-id", "Key": "a"}]}
+            yield {"Uploads": [{"UploadId": "second-id", "Key": "b"}]}
+
+    lister.s3.get_paginator = lambda name: TwoPages()
+    lister.list_multipart_uploads("bucket")
+    captured = capfd.readouterr()
+    assert "first-id" in captured.out
+    assert "second-id" in captured.out
+
+
+def test_list_buckets_with_region_uses_cache(capfd):
+    calls = []
+    lister = S3Lister("url", "key", "secret", "auto")
+    lister.s3.get_bucket_location = lambda Bucket: calls.append(Bucket) or {
+        "LocationConstraint": "weur"
+    }
+    lister.list_buckets(with_region=True)
+    lister.list_buckets(with_region=True)
+    assert calls == ["bucket"]
+    assert capfd.readouterr().out.count("weur") == 2
+    lister.list_buckets(with_region=True, refresh=True)
+    assert calls == ["bucket", "bucket"]
+
+
+def test_list_buckets_with_region_does_not_cache_errors(monkeypatch):
+    lister = S3Lister("url", "key", "secret", "auto")
+    lister.s3.list_buckets = lambda: {
+        "Buckets": [{"Name": "fail-bucket", "CreationDate": "2025-04-23T00:00:00Z"}]
+    }
+    lister.list_buckets(with_region=True)
+    calls = []
+    lister.s3.get_bucket_location = lambda Bucket: calls.append(Bucket) or {
+        "LocationConstraint": "auto"
+    }
+    lister.list_buckets(with_region=True)
+    assert calls == ["fail-bucket"]
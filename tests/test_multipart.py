@@ -0,0 +1,109 @@
+import threading
+import pytest
+from utils.budget import ByteBudget
+from utils.concurrency import AdaptiveConcurrency
+from utils.multipart import MemoryviewReader, MmapUpload, part_size_for
+
+MB = 1024 * 1024
+
+
+class DummyS3Client:
+    def __init__(self, fail_part=None):
+        self.parts = {}
+        self.completed = None
+        self.aborted = False
+        self.fail_part = fail_part
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.create_args = kwargs
+        return {"UploadId": "upload-id"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_part:
+            raise Exception("Simulated upload_part failure")
+        assert isinstance(Body.read(0), memoryview)
+        with self._lock:
+            self.parts[PartNumber] = bytes(Body.read())
+        return {"ETag": f'"etag-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed = MultipartUpload["Parts"]
+        return {"ETag": '"final"'}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+def test_part_size_for_respects_limits():
+    assert part_size_for(10 * MB, 1 * MB) == 5 * MB
+    assert part_size_for(100000 * MB) == 10 * MB
+
+
+def test_memoryview_reader_is_seekable():
+    reader = MemoryviewReader(memoryview(b"hello world"))
+    assert len(reader) == 11
+    assert bytes(reader.read(5)) == b"hello"
+    assert reader.tell() == 5
+    reader.seek(0)
+    assert bytes(reader.read()) == b"hello world"
+    assert bytes(reader.read()) == b""
+
+
+def test_byte_budget_blocks_until_released():
+    budget = ByteBudget(10)
+    budget.acquire(6)
+    acquired = threading.Event()
+
+    def take():
+        budget.acquire(6)
+        acquired.set()
+
+    thread = threading.Thread(target=take)
+    thread.start()
+    assert not acquired.wait(0.05)
+    budget.release(6)
+    assert acquired.wait(1)
+    thread.join()
+    assert budget.peak == 6
+
+
+def test_byte_budget_admits_oversized_request_alone():
+    budget = ByteBudget(10)
+    budget.acquire(20)
+    assert budget.in_flight == 20
+
+
+def test_mmap_upload_sends_all_parts(tmp_path):
+    data = bytes(range(256)) * (48 * 1024)  # 12 MiB
+    source = tmp_path / "big.bin"
+    source.write_bytes(data)
+    client = DummyS3Client()
+    progress = []
+    upload = MmapUpload(
+        client,
+        str(source),
+        "bucket",
+        "key",
+        extra_args={"ContentType": "application/octet-stream"},
+        controller=AdaptiveConcurrency(initial=2),
+        part_size=5 * MB,
+        max_in_flight=10 * MB,
+        callback=progress.append,
+    )
+    upload.run()
+    assert b"".join(client.parts[n] for n in sorted(client.parts)) == data
+    assert [p["PartNumber"] for p in client.completed] == [1, 2, 3]
+    assert client.create_args == {"ContentType": "application/octet-stream"}
+    assert sum(progress) == len(data)
+    assert upload.budget.peak <= 10 * MB
+
+
+def test_mmap_upload_aborts_on_failure(tmp_path):
+    source = tmp_path / "big.bin"
+    source.write_bytes(b"x" * (11 * MB))
+    client = DummyS3Client(fail_part=2)
+    with pytest.raises(Exception):
+        MmapUpload(client, str(source), "bucket", "key", part_size=5 * MB).run()
+    assert client.aborted
+    assert client.completed is None
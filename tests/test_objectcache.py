@@ -0,0 +1,125 @@
+import os
+import pytest
+from utils import objectcache
+from utils.objectcache import ObjectCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ObjectCache(str(tmp_path / "cache"), max_size=10)
+    yield cache
+    cache.close()
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_entry_name_depends_on_every_field():
+    names = {
+        ObjectCache.entry_name("url", "bucket", "key", '"a"'),
+        ObjectCache.entry_name("url", "bucket", "key", '"b"'),
+        ObjectCache.entry_name("url", "bucket", "other", '"a"'),
+        ObjectCache.entry_name("url", "other", "key", '"a"'),
+        ObjectCache.entry_name("other", "bucket", "key", '"a"'),
+    }
+    assert len(names) == 5
+
+
+def test_store_and_fetch(cache, tmp_path):
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    assert not cache.fetch(name, str(tmp_path / "out.bin"), 4)
+    cache.store(name, write(tmp_path / "in.bin", b"data"))
+    assert cache.fetch(name, str(tmp_path / "out.bin"), 4)
+    assert (tmp_path / "out.bin").read_bytes() == b"data"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fetch_size_mismatch_is_a_miss(cache, tmp_path):
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    cache.store(name, write(tmp_path / "in.bin", b"data"))
+    assert not cache.fetch(name, str(tmp_path / "out.bin"), 5)
+    assert not (tmp_path / "out.bin").exists()
+
+
+def test_entries_are_read_only(cache, tmp_path):
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    cache.store(name, write(tmp_path / "in.bin", b"data"))
+    assert not os.stat(cache.entry_path(name)).st_mode & 0o222
+
+
+def test_falls_back_to_copy(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(objectcache, "reflink", lambda src, dst: False)
+
+    def no_link(src, dst):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(objectcache.os, "link", no_link)
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    cache.store(name, write(tmp_path / "in.bin", b"data"))
+    assert cache.fetch(name, str(tmp_path / "out.bin"), 4)
+    assert (
+        os.stat(tmp_path / "out.bin").st_ino != os.stat(cache.entry_path(name)).st_ino
+    )
+
+
+def test_hits_are_independent_writable_copies(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(objectcache, "reflink", lambda src, dst: False)
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    cache.store(name, write(tmp_path / "in.bin", b"data"))
+
+    assert cache.fetch(name, str(tmp_path / "out.bin"), 4)
+
+    out = tmp_path / "out.bin"
+    assert os.stat(out).st_ino != os.stat(cache.entry_path(name)).st_ino
+    out.write_bytes(b"edit")
+    with open(cache.entry_path(name), "rb") as f:
+        assert f.read() == b"data"
+
+
+def test_hard_links_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(objectcache, "reflink", lambda src, dst: False)
+    cache = ObjectCache(str(tmp_path / "cache"), max_size=10, hard_links=True)
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    cache.store(name, write(tmp_path / "in.bin", b"data"))
+
+    assert cache.fetch(name, str(tmp_path / "out.bin"), 4)
+
+    out = os.stat(tmp_path / "out.bin")
+    assert out.st_ino == os.stat(cache.entry_path(name)).st_ino
+    assert not out.st_mode & 0o222
+    cache.close()
+
+
+def test_evicts_least_recently_used(cache, tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(objectcache.time, "time", lambda: next(clock))
+    first, second, third = (
+        ObjectCache.entry_name("url", "bucket", key, '"a"') for key in "abc"
+    )
+    cache.store(first, write(tmp_path / "a.bin", b"aaaa"))
+    cache.store(second, write(tmp_path / "b.bin", b"bbbb"))
+    assert cache.fetch(first, str(tmp_path / "out.bin"), 4)
+    cache.store(third, write(tmp_path / "c.bin", b"cccc"))
+    assert cache.total_size() == 8
+    assert os.path.exists(cache.entry_path(first))
+    assert not os.path.exists(cache.entry_path(second))
+
+
+def test_skips_objects_larger_than_cache(cache, tmp_path):
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    cache.store(name, write(tmp_path / "in.bin", b"x" * 11))
+    assert cache.total_size() == 0
+    assert not os.path.exists(cache.entry_path(name))
+
+
+def test_index_is_shared(cache, tmp_path):
+    name = ObjectCache.entry_name("url", "bucket", "key", '"a"')
+    cache.store(name, write(tmp_path / "in.bin", b"data"))
+    other = ObjectCache(cache.directory, max_size=10)
+    try:
+        assert other.fetch(name, str(tmp_path / "out.bin"), 4)
+        assert other.total_size() == 4
+    finally:
+        other.close()
@@ -0,0 +1,195 @@
+import io
+import tarfile
+
+import pytest
+from actions.download import S3Downloader
+from actions.upload import S3Uploader
+from utils.pack import PackIndex, TarShardReader, pack_key, plan_shards
+from utils.s3base import S3ActionError, S3Base
+
+
+class NotFound(Exception):
+    response = {"Error": {"Code": "NoSuchKey"}}
+
+
+class DummyS3Client:
+    def __init__(self):
+        self.objects = {}
+        self.ranges = []
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = bytes(Body.read() if hasattr(Body, "read") else Body)
+
+    def upload_fileobj(
+        self, file, Bucket, Key, ExtraArgs=None, Callback=None, Config=None
+    ):
+        self.objects[Key] = file.read()
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+        return {}
+
+    def get_object(self, Bucket, Key, Range=None):
+        if Key not in self.objects:
+            raise NotFound("Not Found")
+        data = self.objects[Key]
+        if Range:
+            self.ranges.append((Key, Range))
+            start, end = map(int, Range[6:].split("-"))
+            data = data[start : end + 1]
+        return {"Body": io.BytesIO(data)}
+
+
+class DummyProgress:
+    def __init__(self, *a, **kw):
+        pass
+
+    def __call__(self, *a, **kw):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = DummyS3Client()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: client)
+    monkeypatch.setattr("actions.upload.TqdmProgress", DummyProgress)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    directory = tmp_path / "tree"
+    (directory / "sub").mkdir(parents=True)
+    (directory / "a.txt").write_bytes(b"alpha")
+    (directory / "sub" / "b.txt").write_bytes(b"beta" * 300)
+    (directory / "sub" / "empty").write_bytes(b"")
+    (directory / "big.bin").write_bytes(b"x" * (S3Base.small_object_threshold + 1))
+    return directory
+
+
+def test_plan_shards_groups_by_size():
+    files = [(f"p{i}", f"f{i}", 1000) for i in range(5)]
+    shards = list(plan_shards(iter(files), shard_size=4000))
+    assert [len(shard) for shard in shards] == [2, 2, 1]
+
+
+def test_tar_shard_reader_is_a_valid_tar(tmp_path):
+    names = {"a.txt": b"alpha", "dir/" + "n" * 120: b"long name", "empty": b""}
+    files = []
+    for index, (name, data) in enumerate(names.items()):
+        path = tmp_path / f"file{index}"
+        path.write_bytes(data)
+        files.append((str(path), name, len(data)))
+    reader = TarShardReader(files)
+
+    data = reader.read()
+
+    assert len(data) == reader.size
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        for name, content in names.items():
+            assert archive.extractfile(name).read() == content
+    for name, offset, size in reader.members:
+        assert data[offset : offset + size] == names[name]
+
+
+def test_tar_shard_reader_detects_shrunk_file(tmp_path):
+    path = tmp_path / "file"
+    path.write_bytes(b"short")
+    reader = TarShardReader([(str(path), "file", 100)])
+    with pytest.raises(IOError):
+        reader.read()
+
+
+def test_pack_index_round_trip_keeps_latest_entries():
+    index = PackIndex()
+    index.add_shard("one.tar", [("a", 512, 5), ("b", 1536, 4)])
+    index.add_shard("two.tar", [("a", 512, 7)])
+
+    decoded = PackIndex.from_bytes(index.to_bytes())
+
+    assert decoded.locate("a") == ("two.tar", 512, 7)
+    assert decoded.locate("b") == ("one.tar", 1536, 4)
+    assert decoded.by_shard() == {
+        "one.tar": [("b", 1536, 4)],
+        "two.tar": [("a", 512, 7)],
+    }
+
+
+def test_upload_packed_and_download(client, tree, tmp_path):
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_packed(str(tree), "bucket", "data/")
+
+    shards = [key for key in client.objects if key.endswith(".tar")]
+    assert len(shards) == 1
+    assert "data/big.bin" in client.objects
+    assert "data/a.txt" not in client.objects
+
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    target = tmp_path / "all"
+    downloader.download_packed("bucket", "data/", str(target))
+    assert (target / "a.txt").read_bytes() == b"alpha"
+    assert (target / "sub" / "b.txt").read_bytes() == b"beta" * 300
+    assert (target / "sub" / "empty").read_bytes() == b""
+
+    client.ranges.clear()
+    single = tmp_path / "single"
+    downloader.download_packed("bucket", "data/", str(single), names=["sub/b.txt"])
+    assert (single / "sub" / "b.txt").read_bytes() == b"beta" * 300
+    assert len(client.ranges) == 1
+
+
+def test_upload_packed_merges_index(client, tree, tmp_path):
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_packed(str(tree), "bucket", "data/")
+    update = tmp_path / "update"
+    update.mkdir()
+    (update / "a.txt").write_bytes(b"new alpha")
+
+    uploader.upload_packed(str(update), "bucket", "data/")
+
+    target = tmp_path / "target"
+    S3Downloader("url", "key", "secret", "auto").download_packed(
+        "bucket", "data/", str(target)
+    )
+    assert (target / "a.txt").read_bytes() == b"new alpha"
+    assert (target / "sub" / "b.txt").read_bytes() == b"beta" * 300
+
+
+def test_upload_packed_deletes_unused_shards(client, tmp_path):
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    (tree / "a.txt").write_bytes(b"alpha")
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_packed(str(tree), "bucket", "data/")
+    (first,) = [key for key in client.objects if key.endswith(".tar")]
+    (tree / "a.txt").write_bytes(b"new alpha")
+
+    uploader.upload_packed(str(tree), "bucket", "data/")
+
+    shards = [key for key in client.objects if key.endswith(".tar")]
+    assert len(shards) == 1
+    assert first not in shards
+
+
+def test_download_packed_errors(client, tree, tmp_path):
+    downloader = S3Downloader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError, match="No packed files"):
+        downloader.download_packed("bucket", "data/", str(tmp_path))
+
+    S3Uploader("url", "key", "secret", "auto").upload_packed(
+        str(tree), "bucket", "data/"
+    )
+    with pytest.raises(S3ActionError, match="Not packed"):
+        downloader.download_packed("bucket", "data/", str(tmp_path), names=["nope"])
+    assert pack_key("data/", "index.json.gz") in client.objects
@@ -0,0 +1,95 @@
+import threading
+import pytest
+from utils.concurrency import AdaptiveConcurrency
+from utils.partcopy import PartCopy
+from utils.scheduler import TransferScheduler
+
+
+class DummyS3Client:
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.ranges = []
+        self.created = None
+        self.completed = None
+        self.aborted = False
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, **kwargs):
+        self.created = kwargs
+        return {"UploadId": "upload-1"}
+
+    def upload_part_copy(self, **kwargs):
+        if kwargs["PartNumber"] == self.fail_part:
+            raise Exception("Simulated part copy failure")
+        with self._lock:
+            self.ranges.append(kwargs["CopySourceRange"])
+        assert kwargs["CopySourceIfMatch"] == '"etag"'
+        return {"CopyPartResult": {"ETag": f"etag-{kwargs['PartNumber']}"}}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs
+        return {}
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+HEAD = {
+    "ContentLength": 25 * 1024 * 1024,
+    "ETag": '"etag"',
+    "ContentType": "video/mp4",
+    "Metadata": {"owner": "me"},
+}
+
+
+def test_part_copy_copies_all_ranges():
+    client = DummyS3Client()
+    progress = []
+    PartCopy(
+        client,
+        "src",
+        "a.mp4",
+        "dst",
+        "b.mp4",
+        HEAD,
+        controller=AdaptiveConcurrency(initial=4),
+        part_size=10 * 1024 * 1024,
+        callback=progress.append,
+    ).run()
+    assert sorted(client.ranges) == [
+        "bytes=0-10485759",
+        "bytes=10485760-20971519",
+        "bytes=20971520-26214399",
+    ]
+    assert sum(progress) == HEAD["ContentLength"]
+    assert client.created["ContentType"] == "video/mp4"
+    assert client.created["Metadata"] == {"owner": "me"}
+    parts = client.completed["MultipartUpload"]["Parts"]
+    assert [p["PartNumber"] for p in parts] == [1, 2, 3]
+
+
+def test_part_copy_failure_aborts():
+    client = DummyS3Client(fail_part=2)
+    with pytest.raises(Exception, match="Simulated part copy failure"):
+        PartCopy(
+            client, "src", "a.mp4", "dst", "b.mp4", HEAD, part_size=10 * 1024 * 1024
+        ).run()
+    assert client.aborted
+    assert client.completed is None
+
+
+def test_part_copy_takes_connections_from_scheduler():
+    scheduler = TransferScheduler(max_bytes=1, max_connections=2)
+    PartCopy(
+        DummyS3Client(),
+        "src",
+        "a.mp4",
+        "dst",
+        "b.mp4",
+        HEAD,
+        controller=AdaptiveConcurrency(initial=8),
+        part_size=5 * 1024 * 1024,
+        budget=scheduler.budget("b.mp4"),
+    ).run()
+    assert scheduler.peak_connections <= 2
+    assert scheduler.peak == 0
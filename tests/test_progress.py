@@ -35,6 +35,15 @@ def test_tqdm_progress_download(monkeypatch, tmp_path):
     progress.close()
 
 
+def test_tqdm_progress_copy():
+    progress = TqdmProgress("dst/key", action="copy", total_size=4096)
+    progress(4096)
+    assert progress._tqdm.colour == "cyan"
+    progress.close()
+    with pytest.raises(ValueError):
+        TqdmProgress("dst/key", action="copy")
+
+
 def test_tqdm_progress_invalid_action(tmp_path):
     test_file = tmp_path / "file.txt"
     with pytest.raises(ValueError):
@@ -45,3 +54,9 @@ def test_tqdm_progress_download_missing_total_size(tmp_path):
     test_file = tmp_path / "file.txt"
     with pytest.raises(ValueError):
         TqdmProgress(str(test_file), action="download", logger=DummyLogger())
+
+
+def test_tqdm_progress_stdin_unknown_size():
+    progress = TqdmProgress("-", action="upload", logger=DummyLogger())
+    progress(1024)
+    progress.close()
@@ -0,0 +1,167 @@
+import io
+import threading
+import time
+import pytest
+from utils.concurrency import AdaptiveConcurrency
+from utils.ranged import RangedDownload, percentile, plan_parts, readinto
+
+DATA = bytes(range(256)) * 4
+
+
+class DummyBody:
+    def __init__(self, data, delay=0.0):
+        self._stream = io.BytesIO(data)
+        self._delay = delay
+        self.closed = False
+
+    def read(self, amt=None):
+        if self._delay:
+            time.sleep(self._delay)
+            self._delay = 0.0
+        return self._stream.read(amt)
+
+    def close(self):
+        self.closed = True
+
+
+class DummyS3Client:
+    def __init__(self, slow_start=None, fail_start=None):
+        self.calls = []
+        self.bodies = []
+        self.slow_start = slow_start
+        self.fail_start = fail_start
+        self._lock = threading.Lock()
+
+    def get_object(self, Bucket, Key, Range, IfMatch=None):
+        start, end = (int(x) for x in Range[len("bytes=") :].split("-"))
+        with self._lock:
+            first = not any(c == start for c in self.calls)
+            self.calls.append(start)
+        if start == self.fail_start:
+            raise Exception("Simulated get_object failure")
+        delay = 1.0 if start == self.slow_start and first else 0.0
+        body = DummyBody(DATA[start : end + 1], delay)
+        self.bodies.append((start, body))
+        return {"Body": body}
+
+
+def test_plan_parts_covers_object():
+    parts = plan_parts(25, 10)
+    assert parts == [(0, 0, 9), (1, 10, 19), (2, 20, 24)]
+
+
+def test_percentile():
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+    assert percentile([1, 2, 3, 4], 0.95) == 4
+
+
+def test_ranged_download_writes_all_parts():
+    client = DummyS3Client()
+    progress = []
+    out = io.BytesIO()
+    RangedDownload(
+        client,
+        "bucket",
+        "key",
+        len(DATA),
+        controller=AdaptiveConcurrency(initial=4),
+        part_size=100,
+        callback=progress.append,
+    ).run(out)
+    assert out.getvalue() == DATA
+    assert sum(progress) == len(DATA)
+
+
+def test_ranged_download_hedges_slow_part():
+    client = DummyS3Client(slow_start=500)
+    progress = []
+    out = io.BytesIO()
+    stats = RangedDownload(
+        client,
+        "bucket",
+        "key",
+        len(DATA),
+        controller=AdaptiveConcurrency(initial=4),
+        part_size=100,
+        hedge=True,
+        hedge_budget=0.5,
+        callback=progress.append,
+    ).run(out)
+    assert out.getvalue() == DATA
+    assert sum(progress) == len(DATA)
+    assert stats["hedges_issued"] >= 1
+    assert stats["hedges_won"] >= 1
+    assert client.calls.count(500) == 2
+    assert all(body.closed for _, body in client.bodies)
+
+
+def test_ranged_download_failure_raises():
+    client = DummyS3Client(fail_start=200)
+    with pytest.raises(Exception, match="Simulated get_object failure"):
+        RangedDownload(
+            client,
+            "bucket",
+            "key",
+            len(DATA),
+            controller=AdaptiveConcurrency(initial=4),
+            part_size=100,
+        ).run(io.BytesIO())
+
+
+def test_run_to_file_preallocates_and_renames(tmp_path):
+    target = tmp_path / "out.bin"
+    RangedDownload(
+        DummyS3Client(slow_start=500),
+        "bucket",
+        "key",
+        len(DATA),
+        controller=AdaptiveConcurrency(initial=4),
+        part_size=100,
+        hedge=True,
+        hedge_budget=0.5,
+    ).run_to_file(str(target))
+    assert target.read_bytes() == DATA
+    assert [p.name for p in tmp_path.iterdir()] == ["out.bin"]
+
+
+def test_run_to_file_failure_removes_temp(tmp_path):
+    target = tmp_path / "out.bin"
+    with pytest.raises(Exception):
+        RangedDownload(
+            DummyS3Client(fail_start=200),
+            "bucket",
+            "key",
+            len(DATA),
+            controller=AdaptiveConcurrency(initial=4),
+            part_size=100,
+        ).run_to_file(str(target))
+    assert list(tmp_path.iterdir()) == []
+
+
+class ReadOnlyBody:
+    """Body with only the public read(), like a wrapped StreamingBody."""
+
+    def __init__(self, data, raw=None):
+        self._data = io.BytesIO(data)
+        if raw is not None:
+            self._raw_stream = raw
+
+    def read(self, amt=None):
+        return self._data.read(amt)
+
+
+class NoReadinto(io.RawIOBase):
+    def readinto(self, buffer):
+        raise io.UnsupportedOperation("readinto")
+
+
+def test_readinto_uses_public_or_raw_stream_and_falls_back_to_read():
+    view = memoryview(bytearray(4))
+    assert readinto(io.BytesIO(b"abcdef"), view) == 4
+    assert bytes(view) == b"abcd"
+    assert readinto(ReadOnlyBody(b"", raw=io.BytesIO(b"wxyz")), view) == 4
+    assert bytes(view) == b"wxyz"
+    assert readinto(ReadOnlyBody(b"12"), view) == 2
+    assert bytes(view[:2]) == b"12"
+    assert readinto(ReadOnlyBody(b"pqrs", raw=NoReadinto()), view) == 4
+    assert bytes(view) == b"pqrs"
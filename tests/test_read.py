@@ -0,0 +1,85 @@
+import io
+import pytest
+from actions.read import S3Reader
+from utils.s3base import S3ActionError, S3Base
+
+
+class InvalidRange(Exception):
+    response = {"Error": {"Code": "InvalidRange"}}
+
+
+class DummyS3Client:
+    def head_object(self, Bucket, Key):
+        if Key == "missing":
+            raise Exception("Not Found")
+        return {"ContentLength": 4, "ETag": '"abc"'}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        data = b"" if Key == "empty" else b"data"
+        if Range is None:
+            return {"Body": io.BytesIO(data)}
+        start, end = (int(x) for x in Range[len("bytes=") :].split("-"))
+        if start >= len(data):
+            raise InvalidRange("Requested range not satisfiable")
+        return {"Body": io.BytesIO(data[start : end + 1])}
+
+
+@pytest.fixture(autouse=True)
+def patch_boto3_client(monkeypatch):
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: DummyS3Client())
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+def test_open_reads_object():
+    reader = S3Reader("url", "key", "secret", "auto")
+    with reader.open("bucket", "key") as f:
+        assert f.size == 4
+        f.seek(2)
+        assert f.read() == b"ta"
+
+
+def test_open_missing_object():
+    reader = S3Reader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        reader.open("bucket", "missing")
+
+
+def test_cat_whole_object_without_head(monkeypatch):
+    reader = S3Reader("url", "key", "secret", "auto")
+    monkeypatch.setattr(reader.s3, "head_object", None)
+    out = io.BytesIO()
+    assert reader.cat("bucket", "key", out=out) == 4
+    assert out.getvalue() == b"data"
+
+
+def test_cat_range():
+    reader = S3Reader("url", "key", "secret", "auto")
+    out = io.BytesIO()
+    reader.cat("bucket", "key", "bytes=1-2", out=out)
+    assert out.getvalue() == b"at"
+
+
+def test_cat_unsatisfiable_range():
+    reader = S3Reader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        reader.cat("bucket", "key", "bytes=10-20", out=io.BytesIO())
+
+
+def test_head():
+    reader = S3Reader("url", "key", "secret", "auto")
+    out = io.BytesIO()
+    assert reader.head("bucket", "key", 2, out=out) == 2
+    assert out.getvalue() == b"da"
+
+
+def test_head_of_empty_object():
+    reader = S3Reader("url", "key", "secret", "auto")
+    out = io.BytesIO()
+    assert reader.head("bucket", "empty", 1024, out=out) == 0
+    assert out.getvalue() == b""
@@ -0,0 +1,103 @@
+import io
+import os
+import zipfile
+import pytest
+from utils.remotefile import RemoteFile
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+class DummyS3Client:
+    def __init__(self, data=DATA, etag='"v1"'):
+        self.data = data
+        self.etag = etag
+        self.ranges = []
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        if IfMatch and IfMatch != self.etag:
+            raise Exception("PreconditionFailed")
+        start, end = (int(x) for x in Range[len("bytes=") :].split("-"))
+        self.ranges.append((start, end))
+        return {"Body": io.BytesIO(self.data[start : end + 1])}
+
+
+def open_file(client, **kwargs):
+    kwargs.setdefault("block_size", 1024)
+    return RemoteFile(client, "bucket", "key", len(client.data), etag='"v1"', **kwargs)
+
+
+def test_seek_and_read():
+    client = DummyS3Client()
+    with open_file(client, readahead=0) as f:
+        f.seek(-10, os.SEEK_END)
+        assert f.read() == DATA[-10:]
+        f.seek(1000)
+        assert f.read(100) == DATA[1000:1100]
+        assert f.tell() == 1100
+        assert f.read(0) == b""
+        f.seek(len(DATA) + 5)
+        assert f.read(10) == b""
+
+
+def test_read_spanning_blocks_is_coalesced():
+    client = DummyS3Client()
+    with open_file(client, readahead=0) as f:
+        f.seek(500)
+        assert f.read(3000) == DATA[500:3500]
+    assert client.ranges == [(0, 4095)]
+
+
+def test_blocks_are_cached():
+    client = DummyS3Client()
+    with open_file(client, readahead=0) as f:
+        f.read(10)
+        f.seek(5)
+        f.read(10)
+        assert f.requests == 1
+
+
+def test_cache_evicts_least_recently_used():
+    client = DummyS3Client()
+    with open_file(client, readahead=0, cache_blocks=2) as f:
+        for offset in (0, 1024, 2048, 0):
+            f.seek(offset)
+            f.read(1)
+        assert client.ranges == [(0, 1023), (1024, 2047), (2048, 3071), (0, 1023)]
+
+
+def test_sequential_reads_prefetch():
+    client = DummyS3Client()
+    with open_file(client, readahead=4) as f:
+        assert f.read(1024) == DATA[:1024]
+        assert f.read(1024) == DATA[1024:2048]
+        assert f.read() == DATA[2048:]
+    # The second, sequential read prefetches blocks 2-5 in one request.
+    assert (2048, 6143) in client.ranges
+    assert sum(end - start + 1 for start, end in client.ranges) == len(DATA)
+
+
+def test_etag_is_pinned():
+    client = DummyS3Client()
+    client.etag = '"v2"'
+    with open_file(client) as f:
+        with pytest.raises(Exception, match="PreconditionFailed"):
+            f.read(10)
+
+
+def test_closed_file_raises():
+    f = open_file(DummyS3Client())
+    f.close()
+    with pytest.raises(ValueError):
+        f.read(1)
+
+
+def test_zipfile_reads_only_what_it_needs():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("big.bin", os.urandom(64 * 1024))
+        archive.writestr("small.txt", "hello")
+    client = DummyS3Client(buffer.getvalue())
+    with open_file(client, readahead=0) as f:
+        with zipfile.ZipFile(f) as archive:
+            assert archive.read("small.txt") == b"hello"
+        assert f.bytes_fetched < len(client.data) / 2
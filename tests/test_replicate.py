@@ -0,0 +1,246 @@
+import hashlib
+import io
+import threading
+
+import pytest
+from actions.replicate import SOURCE_ETAG_METADATA, S3Replicator
+from utils.s3base import S3ActionError, S3Base
+
+MB = 1024 * 1024
+
+
+def md5(data):
+    return hashlib.md5(data).hexdigest()
+
+
+def multipart_etag(parts):
+    digest = hashlib.md5(b"".join(hashlib.md5(p).digest() for p in parts))
+    return f"{digest.hexdigest()}-{len(parts)}"
+
+
+class DummyPaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix, StartAfter=None):
+        if Bucket == "fail-bucket":
+            raise Exception("Simulated listing failure")
+        keys = sorted(k for b, k in self.client.objects if b == Bucket)
+        contents = []
+        for key in keys:
+            if key.startswith(Prefix) and (StartAfter is None or key > StartAfter):
+                obj = self.client.objects[(Bucket, key)]
+                contents.append(
+                    {"Key": key, "Size": len(obj["Body"]), "ETag": f'"{obj["ETag"]}"'}
+                )
+        yield {"Contents": contents}
+
+
+class DummyS3Client:
+    """In-memory bucket store with the calls used by replication."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def add(self, bucket, key, body, parts=None, **headers):
+        parts = parts or [body]
+        etag = md5(body) if len(parts) == 1 else multipart_etag(parts)
+        sizes = [len(p) for p in parts]
+        self.objects[(bucket, key)] = {
+            "Body": body,
+            "ETag": etag,
+            "Parts": sizes,
+            **headers,
+        }
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return DummyPaginator(self)
+
+    def _object(self, Bucket, Key, IfMatch=None):
+        obj = self.objects[(Bucket, Key)]
+        if IfMatch is not None:
+            assert IfMatch == f'"{obj["ETag"]}"'
+        return obj
+
+    def head_object(self, Bucket, Key, PartNumber=None):
+        with self._lock:
+            self.calls.append(("head_object", Key, PartNumber))
+        obj = self._object(Bucket, Key)
+        length = obj["Parts"][PartNumber - 1] if PartNumber else len(obj["Body"])
+        headers = {k: v for k, v in obj.items() if k not in ("Body", "Parts")}
+        return {**headers, "ETag": f'"{obj["ETag"]}"', "ContentLength": length}
+
+    def get_object(self, Bucket, Key, IfMatch=None, Range=None):
+        with self._lock:
+            self.calls.append(("get_object", Key, Range))
+        obj = self._object(Bucket, Key, IfMatch)
+        body = obj["Body"]
+        if Range:
+            start, end = (int(n) for n in Range[len("bytes=") :].split("-"))
+            body = body[start : end + 1]
+        headers = {k: v for k, v in obj.items() if k not in ("Body", "Parts")}
+        return {**headers, "Body": io.BytesIO(body)}
+
+    def put_object(self, Bucket, Key, Body, **headers):
+        with self._lock:
+            self.calls.append(("put_object", Key, None))
+        self.add(Bucket, Key, Body, **headers)
+
+    def create_multipart_upload(self, Bucket, Key, **headers):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {"headers": headers, "parts": {}}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            self.uploads[UploadId]["parts"][PartNumber] = Body
+        return {"ETag": f'"{md5(Body)}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        parts = [upload["parts"][number] for number in numbers]
+        self.add(Bucket, Key, b"".join(parts), parts=parts, **upload["headers"])
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+
+class DummyProgress:
+    def __init__(self, *a, **kw):
+        pass
+
+    def __call__(self, *a, **kw):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    stores = {"source-url": DummyS3Client(), "target-url": DummyS3Client()}
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: stores[kw["endpoint_url"]])
+    monkeypatch.setattr("actions.replicate.TqdmProgress", DummyProgress)
+    return stores["source-url"], stores["target-url"]
+
+
+def replicate(*args, **kwargs):
+    source = S3Base("source-url", "key", "secret", "auto")
+    target = S3Replicator("target-url", "key", "secret", "auto")
+    target.replicate(source, *args, **kwargs)
+
+
+LARGE = bytes(range(256)) * (12 * MB // 256)
+
+
+def test_replicate_copies_small_and_large_objects(clients, capsys):
+    source, target = clients
+    source.add("src", "data/a.txt", b"hello", ContentType="text/plain")
+    source.add("src", "data/sub/b.bin", LARGE, Metadata={"owner": "me"})
+    source.add("src", "other/c.txt", b"skip")
+
+    replicate("src", "data/", "dst", "copy/", part_size=5 * MB)
+
+    assert target.objects[("dst", "copy/a.txt")]["Body"] == b"hello"
+    assert target.objects[("dst", "copy/a.txt")]["ContentType"] == "text/plain"
+    assert target.objects[("dst", "copy/a.txt")]["ETag"] == md5(b"hello")
+    large = target.objects[("dst", "copy/sub/b.bin")]
+    assert large["Body"] == LARGE
+    assert large["Parts"] == [5 * MB, 5 * MB, 2 * MB]
+    assert large["Metadata"] == {"owner": "me", SOURCE_ETAG_METADATA: md5(LARGE)}
+    assert ("dst", "copy/c.txt") not in target.objects
+    assert "Replicated 2 object(s) from 'src/data/' to 'dst/copy/'" in (
+        capsys.readouterr().out
+    )
+
+
+def test_replicate_keeps_source_part_layout(clients):
+    source, target = clients
+    parts = [LARGE[: 6 * MB], LARGE[6 * MB :]]
+    source.add("src", "big.bin", LARGE, parts=parts)
+
+    replicate("src", "", "dst", part_size=5 * MB)
+
+    copied = target.objects[("dst", "big.bin")]
+    assert copied["Parts"] == [6 * MB, 6 * MB]
+    assert copied["ETag"] == source.objects[("src", "big.bin")]["ETag"]
+    assert SOURCE_ETAG_METADATA not in copied.get("Metadata", {})
+
+
+def test_replicate_skip_identical(clients, capsys):
+    source, target = clients
+    source.add("src", "same.txt", b"same")
+    source.add("src", "changed.txt", b"new")
+    source.add("src", "big.bin", LARGE)
+    target.add("dst", "same.txt", b"same")
+    target.add("dst", "changed.txt", b"old")
+    target.add("dst", "extra.txt", b"kept")
+    replicate("src", "", "dst", part_size=5 * MB)
+    target.calls.clear()
+
+    replicate("src", "", "dst", skip_identical=True, part_size=5 * MB)
+
+    # The multipart copy of a single-part source is recognised by its metadata.
+    assert [call[0] for call in target.calls] == ["head_object"]
+    assert "skipped 3 identical" in capsys.readouterr().out
+    assert target.objects[("dst", "extra.txt")]["Body"] == b"kept"
+
+
+def test_replicate_skip_identical_copies_changed_objects(clients, capsys):
+    source, target = clients
+    source.add("src", "a.txt", b"new")
+    target.add("dst", "a.txt", b"old")
+
+    replicate("src", "", "dst", skip_identical=True)
+
+    assert target.objects[("dst", "a.txt")]["Body"] == b"new"
+    assert "Replicated 1 object(s)" in capsys.readouterr().out
+
+
+def test_replicate_within_one_client(monkeypatch):
+    store = DummyS3Client()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: store)
+    store.add("bucket", "data/a.txt", b"a")
+    replicator = S3Replicator("url", "key", "secret", "auto")
+
+    with pytest.raises(S3ActionError, match="same"):
+        replicator.replicate(replicator, "bucket", "data/", "bucket")
+    replicator.replicate(replicator, "bucket", "data/", "bucket", "data/copy/")
+
+    assert store.objects[("bucket", "data/copy/a.txt")]["Body"] == b"a"
+    assert ("bucket", "data/copy/copy/a.txt") not in store.objects
+
+
+def test_replicate_listing_failure(clients):
+    with pytest.raises(S3ActionError, match="Simulated listing failure"):
+        replicate("fail-bucket", "", "dst")
+
+
+def test_replicate_object_failure(clients, monkeypatch):
+    source, target = clients
+    source.add("src", "a.txt", b"a")
+    source.add("src", "b.txt", b"b")
+
+    def put_object(Bucket, Key, Body, **headers):
+        if Key == "b.txt":
+            raise Exception("Simulated put failure")
+        target.add(Bucket, Key, Body, **headers)
+
+    monkeypatch.setattr(target, "put_object", put_object)
+
+    with pytest.raises(S3ActionError, match="1 object"):
+        replicate("src", "", "dst")
+    assert ("dst", "a.txt") in target.objects
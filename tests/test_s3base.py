@@ -16,3 +16,39 @@ def test_get_env_var_required_raises(monkeypatch):
     monkeypatch.delenv("TEST_ENV_VAR", raising=False)
     with pytest.raises(S3ActionError):
         S3Base.get_env_var("TEST_ENV_VAR", required=True)
+
+
+def test_client_uses_adaptive_retries(monkeypatch):
+    captured = {}
+
+    def fake_client(*a, **kw):
+        captured.update(kw)
+        return object()
+
+    monkeypatch.setattr("boto3.client", fake_client)
+    S3Base._clients = {}
+    base = S3Base("url", "key", "secret", "auto")
+    assert captured["config"].retries["mode"] == "adaptive"
+    assert base.transfer_config().max_concurrency == base.concurrency.limit
+    assert S3Base.get_stats()
+    S3Base._clients = {}
+
+
+def test_max_concurrency_from_env(monkeypatch):
+    monkeypatch.setenv("R2PY_MAX_CONCURRENCY", "16")
+    assert S3Base.max_concurrency() == 16
+    monkeypatch.delenv("R2PY_MAX_CONCURRENCY")
+    assert S3Base.max_concurrency() == 64
+
+
+def test_max_concurrency_clamped_to_minimum(monkeypatch):
+    monkeypatch.setenv("R2PY_MAX_CONCURRENCY", "0")
+    assert S3Base.max_concurrency() == 1
+    monkeypatch.setenv("R2PY_MAX_CONCURRENCY", "-5")
+    assert S3Base.max_concurrency(minimum=2) == 2
+
+
+def test_max_concurrency_rejects_non_integer(monkeypatch):
+    monkeypatch.setenv("R2PY_MAX_CONCURRENCY", "abc")
+    with pytest.raises(S3ActionError, match="must be an integer, got 'abc'"):
+        S3Base.max_concurrency()
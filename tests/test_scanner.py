@@ -0,0 +1,144 @@
+import os
+
+import pytest
+
+from utils.scanner import IgnoreRules, parse_ignore, scan_tree, walk_order
+
+
+def make_tree(root, paths):
+    for path in paths:
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(path.encode())
+
+
+def relatives(directory, **kwargs):
+    return sorted(entry.relative for entry in scan_tree(str(directory), **kwargs))
+
+
+def rules(text):
+    return IgnoreRules(tuple(parse_ignore(text)))
+
+
+def test_scan_yields_every_file_with_stat(tmp_path):
+    make_tree(tmp_path, ["a.txt", "sub/b.txt", "sub/deeper/c.txt"])
+
+    entries = {entry.relative: entry for entry in scan_tree(str(tmp_path))}
+
+    assert sorted(entries) == ["a.txt", "sub/b.txt", "sub/deeper/c.txt"]
+    entry = entries["sub/deeper/c.txt"]
+    assert entry.path == os.path.join(str(tmp_path), "sub", "deeper", "c.txt")
+    assert entry.size == len("sub/deeper/c.txt")
+    assert not entry.is_dir
+
+
+def test_scan_with_directories(tmp_path):
+    make_tree(tmp_path, ["sub/b.txt"])
+    (tmp_path / "empty").mkdir()
+
+    assert relatives(tmp_path, directories=True) == ["empty", "sub", "sub/b.txt"]
+
+
+def test_scan_many_directories_with_few_workers(tmp_path):
+    paths = [f"d{i}/e{j}/f.txt" for i in range(10) for j in range(5)]
+    make_tree(tmp_path, paths)
+
+    assert relatives(tmp_path, workers=2) == sorted(paths)
+
+
+def test_scan_does_not_descend_into_directory_symlinks(tmp_path):
+    make_tree(tmp_path, ["real/a.txt"])
+    os.symlink(tmp_path / "real", tmp_path / "link")
+    os.symlink(tmp_path / "real" / "a.txt", tmp_path / "alias.txt")
+
+    assert relatives(tmp_path) == ["alias.txt", "real/a.txt"]
+
+
+def test_scan_honours_ignore_files(tmp_path):
+    make_tree(
+        tmp_path,
+        ["a.txt", "b.log", "build/x", "src/build/y", "src/c.log", "src/keep.log"],
+    )
+    (tmp_path / ".r2ignore").write_text("# comment\n*.log\n/build/\n")
+    (tmp_path / "src" / ".r2ignore").write_text("!keep.log\n")
+
+    assert relatives(tmp_path) == [
+        ".r2ignore",
+        "a.txt",
+        "src/.r2ignore",
+        "src/build/y",
+        "src/keep.log",
+    ]
+
+
+def test_scan_without_ignore_file(tmp_path):
+    make_tree(tmp_path, ["a.log"])
+    (tmp_path / ".r2ignore").write_text("*.log\n")
+
+    assert relatives(tmp_path, ignore_file=None) == [".r2ignore", "a.log"]
+
+
+def test_scan_missing_directory_yields_nothing(tmp_path):
+    assert relatives(tmp_path / "missing") == []
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.log", "a.log", False, True),
+        ("*.log", "deep/dir/a.log", False, True),
+        ("*.log", "a.log.txt", False, False),
+        ("/root.txt", "root.txt", False, True),
+        ("/root.txt", "sub/root.txt", False, False),
+        ("doc/*.txt", "doc/a.txt", False, True),
+        ("doc/*.txt", "doc/sub/a.txt", False, False),
+        ("**/cache", "a/b/cache", True, True),
+        ("**/cache", "cache", False, True),
+        ("logs/**", "logs/a/b.txt", False, True),
+        ("logs/**", "logs", True, False),
+        ("a/**/z", "a/z", False, True),
+        ("a/**/z", "a/b/c/z", False, True),
+        ("tmp/", "tmp", True, True),
+        ("tmp/", "tmp", False, False),
+        ("file?.txt", "file1.txt", False, True),
+        ("file?.txt", "file10.txt", False, False),
+        ("[ab].txt", "b.txt", False, True),
+        ("[!ab].txt", "b.txt", False, False),
+        ("\\#hash", "#hash", False, True),
+        ("\\!bang", "!bang", False, True),
+        ("trailing\\ ", "trailing ", False, True),
+    ],
+)
+def test_ignore_patterns(pattern, path, is_dir, expected):
+    assert rules(pattern).ignored(path, is_dir) is expected
+
+
+def test_last_matching_rule_wins():
+    ignore = rules("*.txt\n!keep.txt\n")
+
+    assert ignore.ignored("drop.txt", False)
+    assert not ignore.ignored("keep.txt", False)
+
+
+def test_nested_rules_apply_below_their_directory():
+    ignore = IgnoreRules().extend(parse_ignore("/only.txt\n", "sub/"))
+
+    assert ignore.ignored("sub/only.txt", False)
+    assert not ignore.ignored("only.txt", False)
+    assert not ignore.ignored("sub/deeper/only.txt", False)
+
+
+def test_walk_order_lists_files_before_subdirectories(tmp_path):
+    make_tree(tmp_path, ["b.txt", "a/z.txt", "a/b/c.txt", "c/d.txt"])
+
+    entries = sorted(scan_tree(str(tmp_path), directories=True), key=walk_order)
+
+    assert [entry.relative for entry in entries] == [
+        "b.txt",
+        "a",
+        "a/z.txt",
+        "a/b",
+        "a/b/c.txt",
+        "c",
+        "c/d.txt",
+    ]
@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+
+from utils.scheduler import (
+    TransferOrder,
+    TransferScheduler,
+    order_transfers,
+)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def test_order_transfers_largest_first():
+    items = [("a", 1), ("b", 3), ("c", 2), ("d", 3)]
+
+    ordered = order_transfers(items, TransferOrder.LARGEST, lambda item: item[1])
+
+    assert [name for name, _ in ordered] == ["b", "d", "c", "a"]
+
+
+def test_order_transfers_smallest_first():
+    items = [("a", 1), ("b", 3), ("c", 2)]
+
+    ordered = order_transfers(items, "smallest", lambda item: item[1])
+
+    assert [name for name, _ in ordered] == ["a", "c", "b"]
+
+
+def test_rejects_non_positive_budgets():
+    with pytest.raises(ValueError):
+        TransferScheduler(max_bytes=0)
+    with pytest.raises(ValueError):
+        TransferScheduler(max_connections=0)
+
+
+def test_byte_budget_is_global_across_files():
+    scheduler = TransferScheduler(max_bytes=100, max_connections=10)
+    first, second = scheduler.budget("a"), scheduler.budget("b")
+    first.acquire(60)
+    acquired = threading.Event()
+
+    def take():
+        second.acquire(60)
+        acquired.set()
+
+    thread = threading.Thread(target=take)
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    first.release(60)
+    thread.join(timeout=2)
+
+    assert acquired.is_set()
+    assert scheduler.in_flight == 60
+    assert scheduler.peak == 60
+    assert first.peak == 60 and second.in_flight == 60
+
+
+def test_connection_budget_is_global_across_files():
+    scheduler = TransferScheduler(max_bytes=1000, max_connections=2)
+    first, second = scheduler.budget("a"), scheduler.budget("b")
+    first.acquire(1)
+    first.acquire(1)
+    acquired = threading.Event()
+
+    def take():
+        second.acquire(1)
+        acquired.set()
+
+    thread = threading.Thread(target=take)
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    first.release(1)
+    thread.join(timeout=2)
+
+    assert acquired.is_set()
+    assert scheduler.peak_connections == 2
+
+
+def test_oversized_part_is_admitted_alone():
+    scheduler = TransferScheduler(max_bytes=10)
+    budget = scheduler.budget("a")
+
+    with budget.part(50):
+        assert scheduler.in_flight == 50
+
+    assert scheduler.in_flight == 0
+
+
+def test_next_slot_goes_to_file_with_fewest_parts_in_flight():
+    scheduler = TransferScheduler(max_bytes=1000, max_connections=2)
+    busy, idle = scheduler.budget("busy"), scheduler.budget("idle")
+    busy.acquire(1)
+    busy.acquire(1)
+    order = []
+
+    def take(budget, name):
+        budget.acquire(1)
+        order.append(name)
+
+    # The busy file queues first, but the idle file has no part in flight.
+    waiters = [threading.Thread(target=take, args=(busy, "busy"))]
+    waiters[0].start()
+    wait_for(lambda: len(scheduler._waiting) == 1)
+    waiters.append(threading.Thread(target=take, args=(idle, "idle")))
+    waiters[1].start()
+    wait_for(lambda: len(scheduler._waiting) == 2)
+
+    busy.release(1)
+    wait_for(lambda: order)
+    assert order == ["idle"]
+
+    busy.release(1)
+    for thread in waiters:
+        thread.join(timeout=2)
+    assert order == ["idle", "busy"]
+
+
+def test_run_limits_files_and_reports_errors():
+    scheduler = TransferScheduler(max_files=2)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def work(item):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        if item == 3:
+            raise RuntimeError("boom")
+        return item * 10
+
+    results = {
+        item: (result, error) for item, result, error in scheduler.run(work, range(5))
+    }
+
+    assert peak[0] <= 2
+    assert results[1] == (10, None)
+    assert isinstance(results[3][1], RuntimeError)
+    assert len(results) == 5
+
+
+def test_run_starts_files_in_the_given_order():
+    scheduler = TransferScheduler(max_files=1)
+    started = []
+
+    list(scheduler.run(started.append, ["c", "a", "b"]))
+
+    assert started == ["c", "a", "b"]
@@ -0,0 +1,211 @@
+import io
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from actions.snapshot import S3Snapshotter, manifest_key
+from utils.s3base import S3ActionError, S3Base
+
+
+class NotFound(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class DummyPaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix):
+        keys = sorted(k for k in self.client.objects if k.startswith(Prefix))
+        yield {
+            "Contents": [
+                {
+                    "Key": key,
+                    "Size": len(self.client.objects[key]),
+                    "LastModified": self.client.modified[key],
+                }
+                for key in keys
+            ]
+        }
+
+
+class DummyS3Client:
+    def __init__(self):
+        self.objects = {}
+        self.modified = {}
+        self.heads = 0
+        self.puts = []
+        self.clock = datetime(2026, 1, 1)
+
+    def head_object(self, Bucket, Key):
+        self.heads += 1
+        if Key not in self.objects:
+            raise NotFound("Not Found")
+        return {"ContentLength": len(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.clock += timedelta(seconds=1)
+        self.objects[Key] = bytes(Body)
+        self.modified[Key] = self.clock
+        self.puts.append(Key)
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise NotFound("Not Found")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def get_paginator(self, name):
+        return DummyPaginator(self)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = DummyS3Client()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+@pytest.fixture(autouse=True)
+def isolate_hash_cache(monkeypatch, tmp_path_factory):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setattr(S3Base, "_hash_engine", None)
+
+
+@pytest.fixture
+def source(tmp_path):
+    directory = tmp_path / "source"
+    (directory / "docs" / "empty").mkdir(parents=True)
+    data = random.Random(0).randbytes(300000)
+    (directory / "a.bin").write_bytes(data)
+    (directory / "docs" / "copy.bin").write_bytes(data)
+    (directory / "docs" / "note.txt").write_bytes(b"hello")
+    (directory / "zero.txt").write_bytes(b"")
+    os.chmod(directory / "docs" / "note.txt", 0o600)
+    os.utime(directory / "a.bin", ns=(1_000_000_000, 1_000_000_000))
+    return directory
+
+
+def chunk_puts(client):
+    return [key for key in client.puts if "/chunks/" in key]
+
+
+def test_snapshot_stores_duplicate_files_once(client, source):
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+
+    snapshotter.snapshot(str(source), "bucket", name="first")
+
+    # a.bin and docs/copy.bin share their only chunk; note.txt adds one.
+    assert len(chunk_puts(client)) == 2
+    assert manifest_key("snapshots/", "first") in client.objects
+    manifest = snapshotter.read_manifest("bucket", "first")
+    assert [f["path"] for f in manifest["files"]] == [
+        "a.bin",
+        "zero.txt",
+        "docs/copy.bin",
+        "docs/note.txt",
+    ]
+    assert manifest["directories"] == ["docs", "docs/empty"]
+
+
+def test_second_snapshot_uploads_only_new_chunks(client, source):
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+    snapshotter.snapshot(str(source), "bucket", name="first")
+    client.heads = 0
+    (source / "new.txt").write_bytes(b"new file")
+
+    snapshotter.snapshot(str(source), "bucket", name="second")
+
+    assert len(chunk_puts(client)) == 3
+    # Only the chunk missing from the local index is checked remotely.
+    assert client.heads == 2
+
+
+def test_snapshot_seeds_index_from_listing(client, source, monkeypatch, tmp_path):
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+    snapshotter.snapshot(str(source), "bucket", name="first")
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path / "other-machine"))
+    monkeypatch.setattr(S3Base, "_hash_engine", None)
+    client.heads = 0
+
+    snapshotter.snapshot(str(source), "bucket", name="second")
+
+    assert len(chunk_puts(client)) == 2
+    assert client.heads == 1
+
+
+def test_snapshot_file_deleted_after_chunking(client, source, monkeypatch):
+    from actions import snapshot as snapshot_module
+
+    original = snapshot_module.chunk_file
+
+    def chunk_then_delete(path):
+        chunks = original(path)
+        if path.endswith("note.txt"):
+            os.remove(path)
+        return chunks
+
+    monkeypatch.setattr(snapshot_module, "chunk_file", chunk_then_delete)
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+
+    with pytest.raises(S3ActionError, match="1 file"):
+        snapshotter.snapshot(str(source), "bucket", name="first")
+
+    manifest = snapshotter.read_manifest("bucket", "first")
+    assert "docs/note.txt" not in [f["path"] for f in manifest["files"]]
+
+
+def test_snapshot_name_taken(client, source):
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+    snapshotter.snapshot(str(source), "bucket", name="first")
+
+    with pytest.raises(S3ActionError, match="already exists"):
+        snapshotter.snapshot(str(source), "bucket", name="first")
+
+
+def test_restore_latest_round_trip(client, source, tmp_path):
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+    snapshotter.snapshot(str(source), "bucket", name="first")
+    (source / "a.bin").write_bytes(b"changed")
+    snapshotter.snapshot(str(source), "bucket", name="second")
+    target = tmp_path / "target"
+
+    snapshotter.restore("bucket", str(target))
+
+    assert (target / "a.bin").read_bytes() == b"changed"
+    assert (target / "docs" / "copy.bin").read_bytes() == (
+        source / "docs" / "copy.bin"
+    ).read_bytes()
+    assert (target / "zero.txt").read_bytes() == b""
+    assert (target / "docs" / "empty").is_dir()
+    assert os.stat(target / "docs" / "note.txt").st_mode & 0o777 == 0o600
+
+    snapshotter.restore("bucket", str(target), name="first")
+
+    assert (target / "a.bin").read_bytes() == (
+        source / "docs" / "copy.bin"
+    ).read_bytes()
+    assert os.stat(target / "a.bin").st_mtime_ns == 1_000_000_000
+
+
+def test_restore_rejects_corrupt_chunk(client, source, tmp_path):
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+    snapshotter.snapshot(str(source), "bucket", name="first")
+    client.objects[chunk_puts(client)[0]] = b"garbage"
+
+    with pytest.raises(S3ActionError, match="1 chunk"):
+        snapshotter.restore("bucket", str(tmp_path / "target"), name="first")
+
+
+def test_restore_without_snapshots(client, tmp_path):
+    snapshotter = S3Snapshotter("url", "key", "secret", "auto")
+
+    with pytest.raises(S3ActionError, match="No snapshots"):
+        snapshotter.restore("bucket", str(tmp_path))
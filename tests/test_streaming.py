@@ -0,0 +1,189 @@
+import io
+import threading
+import pytest
+from utils.concurrency import AdaptiveConcurrency
+from utils.scheduler import TransferScheduler
+from utils.streaming import (
+    StreamDownload,
+    StreamUpload,
+    fill_buffer,
+    is_stdio,
+    stream_part_size,
+)
+
+MB = 1024 * 1024
+
+
+class TrickleStream(io.RawIOBase):
+    """Returns short reads, like a pipe."""
+
+    def __init__(self, data, step=1000):
+        self._data = io.BytesIO(data)
+        self._step = step
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._data.read(min(len(buffer), self._step))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+class DummyS3Client:
+    def __init__(self, data=b"", fail_part=None):
+        self.data = data
+        self.parts = {}
+        self.put = None
+        self.completed = None
+        self.aborted = False
+        self.fail_part = fail_part
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.put = Body
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        return {"UploadId": "upload-id"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_part:
+            raise Exception("Simulated upload_part failure")
+        with self._lock:
+            self.parts[PartNumber] = bytes(Body.read())
+        return {"ETag": f'"etag-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.completed = MultipartUpload["Parts"]
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+    def get_object(self, Bucket, Key, Range, IfMatch=None):
+        start, end = (int(x) for x in Range[len("bytes=") :].split("-"))
+        return {"Body": io.BytesIO(self.data[start : end + 1])}
+
+
+def test_is_stdio():
+    assert is_stdio("-")
+    assert not is_stdio("file.txt")
+
+
+def test_fill_buffer_handles_short_reads():
+    view = memoryview(bytearray(5000))
+    assert fill_buffer(TrickleStream(b"x" * 4500), view) == 4500
+
+
+def test_stream_upload_small_uses_put_object():
+    client = DummyS3Client()
+    StreamUpload(client, io.BytesIO(b"hello"), "bucket", "key", part_size=5 * MB).run()
+    assert client.put == b"hello"
+    assert client.completed is None
+
+
+def test_stream_upload_multipart_with_bounded_ring():
+    data = bytes(range(256)) * (64 * 1024)  # 16 MiB
+    client = DummyS3Client()
+    upload = StreamUpload(
+        client,
+        TrickleStream(data, step=1024 * 1024),
+        "bucket",
+        "key",
+        controller=AdaptiveConcurrency(initial=2),
+        part_size=5 * MB,
+        ring_size=2,
+    )
+    upload.run()
+    assert upload.total_bytes == len(data)
+    assert [p["PartNumber"] for p in client.completed] == [1, 2, 3, 4]
+    assert b"".join(client.parts[n] for n in sorted(client.parts)) == data
+
+
+def test_stream_upload_aborts_on_failure():
+    client = DummyS3Client(fail_part=2)
+    with pytest.raises(Exception):
+        StreamUpload(
+            client, io.BytesIO(b"x" * (12 * MB)), "bucket", "key", part_size=5 * MB
+        ).run()
+    assert client.aborted
+
+
+def test_stream_part_size_grows_with_part_number():
+    assert stream_part_size(1, 16 * MB) == 16 * MB
+    assert stream_part_size(1000, 16 * MB) == 16 * MB
+    assert stream_part_size(1001, 16 * MB) == 32 * MB
+    assert stream_part_size(10000, 16 * MB) == 1024 * MB
+
+
+def test_stream_upload_shrinks_ring_as_parts_grow(monkeypatch):
+    # Parts double every 2 parts, 5 to 40 MiB, while the ring holds 20 MiB.
+    monkeypatch.setattr("utils.streaming.MAX_PARTS", 20)
+    monkeypatch.setattr("utils.streaming.PART_SIZE_TIERS", 10)
+    data = bytes(range(256)) * (100 * MB // 256)
+    client = DummyS3Client()
+    upload = StreamUpload(
+        client,
+        TrickleStream(data, step=MB),
+        "bucket",
+        "key",
+        part_size=5 * MB,
+        ring_size=4,
+    )
+
+    upload.run()
+
+    assert b"".join(client.parts[n] for n in sorted(client.parts)) == data
+    assert upload.peak_buffered <= 2 * 40 * MB
+
+
+def test_stream_upload_past_part_limit_times_part_size(monkeypatch):
+    # With a limit of 4 parts, sizes double every part: 5, 10, 20 MiB.
+    monkeypatch.setattr("utils.streaming.MAX_PARTS", 4)
+    data = bytes(range(256)) * (25 * MB // 256)
+    client = DummyS3Client()
+
+    StreamUpload(
+        client, TrickleStream(data, step=MB), "bucket", "key", part_size=5 * MB
+    ).run()
+
+    assert [len(client.parts[n]) for n in sorted(client.parts)] == [
+        5 * MB,
+        10 * MB,
+        10 * MB,
+    ]
+    assert b"".join(client.parts[n] for n in sorted(client.parts)) == data
+
+
+def test_stream_download_writes_in_order():
+    data = bytes(range(256)) * 40
+    out = io.BytesIO()
+    progress = []
+    StreamDownload(
+        DummyS3Client(data),
+        "bucket",
+        "key",
+        len(data),
+        part_size=1000,
+        read_ahead=3,
+        callback=progress.append,
+    ).run(out)
+    assert out.getvalue() == data
+    assert sum(progress) == len(data)
+
+
+def test_stream_download_takes_parts_from_budget():
+    data = bytes(range(256)) * 40
+    scheduler = TransferScheduler(max_bytes=2000, max_connections=8)
+    out = io.BytesIO()
+    StreamDownload(
+        DummyS3Client(data),
+        "bucket",
+        "key",
+        len(data),
+        part_size=1000,
+        read_ahead=6,
+        budget=scheduler.budget("key"),
+    ).run(out)
+    assert out.getvalue() == data
+    assert 0 < scheduler.peak <= 2000
+    assert scheduler.in_flight == 0
@@ -0,0 +1,41 @@
+from datetime import timedelta
+import pytest
+from utils.units import parse_byte_range, parse_duration, parse_size
+
+
+def test_parse_size():
+    assert parse_size("4096") == 4096
+    assert parse_size("64KB") == 64 * 1024
+    assert parse_size("256mb") == 256 * 1024 * 1024
+    assert parse_size("1.5GiB") == int(1.5 * 1024**3)
+
+
+def test_parse_size_invalid():
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_parse_duration():
+    assert parse_duration("90") == timedelta(seconds=90)
+    assert parse_duration("30m") == timedelta(minutes=30)
+    assert parse_duration("24h") == timedelta(days=1)
+    assert parse_duration("1.5d") == timedelta(hours=36)
+    assert parse_duration("2W") == timedelta(weeks=2)
+
+
+def test_parse_duration_invalid():
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+
+def test_parse_byte_range():
+    assert parse_byte_range("0-1023") == "bytes=0-1023"
+    assert parse_byte_range("1MB-") == f"bytes={1024 * 1024}-"
+    assert parse_byte_range("-64KB") == f"bytes=-{64 * 1024}"
+    assert parse_byte_range(" 5-5 ") == "bytes=5-5"
+
+
+@pytest.mark.parametrize("value", ["", "-", "10", "20-10", "-0", "a-b"])
+def test_parse_byte_range_invalid(value):
+    with pytest.raises(ValueError):
+        parse_byte_range(value)
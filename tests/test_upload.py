@@ -1,15 +1,33 @@
+import hashlib
 import pytest
 from utils.s3base import S3ActionError
 from actions.upload import S3Uploader, S3Base
 
 
+class NotFound(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
 class DummyS3Client:
-    def upload_fileobj(self, file, bucket, key, ExtraArgs=None, Callback=None):
+    def head_object(self, Bucket, Key):
+        if not Key.startswith("existing"):
+            raise NotFound("Not Found")
+        return {"ContentLength": 4, "ETag": f'"{hashlib.md5(b"data").hexdigest()}"'}
+
+    def upload_fileobj(
+        self, file, bucket, key, ExtraArgs=None, Callback=None, Config=None
+    ):
         if bucket == "fail-bucket":
             raise Exception("Simulated upload failure")
         if Callback:
             Callback(1024)
 
+    def put_object(self, Bucket, Key, Body, ContentType):
+        if Bucket == "fail-bucket":
+            raise Exception("Simulated put_object failure")
+        if Key.endswith("fail.txt"):
+            raise Exception("Simulated put_object failure")
+
 
 class DummyProgress:
     def __init__(self, *a, **kw):
@@ -36,6 +54,12 @@ def clear_clients_cache():
     S3Base._clients = {}
 
 
+@pytest.fixture(autouse=True)
+def isolate_hash_cache(monkeypatch, tmp_path_factory):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setattr(S3Base, "_hash_engine", None)
+
+
 def test_upload_file_success(monkeypatch, tmp_path):
     test_file = tmp_path / "file.txt"
     test_file.write_text("data")
@@ -85,6 +109,156 @@ def test_upload_file_no_mime_type(monkeypatch, tmp_path):
 
     # Check if the default MIME type is set to 'application/octet-stream'
     assert (
-        mock_client.upload_fileobj.call_args[1]["ExtraArgs"]["ContentType"]
-        == "application/octet-stream"
+        mock_client.put_object.call_args[1]["ContentType"] == "application/octet-stream"
+    )
+
+
+def test_upload_file_small_skips_progress(monkeypatch, tmp_path):
+    test_file = tmp_path / "file.json"
+    test_file.write_text("{}")
+    from unittest.mock import MagicMock
+
+    progress = MagicMock()
+    mock_client = MagicMock()
+    monkeypatch.setattr("actions.upload.TqdmProgress", progress)
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_file(str(test_file), "bucket", "object-key")
+    mock_client.put_object.assert_called_once_with(
+        Bucket="bucket", Key="object-key", Body=b"{}", ContentType="application/json"
     )
+    mock_client.upload_fileobj.assert_not_called()
+    progress.assert_not_called()
+
+
+def test_upload_file_above_threshold_uses_transfer(monkeypatch, tmp_path):
+    test_file = tmp_path / "file.txt"
+    test_file.write_text("data")
+    from unittest.mock import MagicMock
+
+    mock_client = MagicMock()
+    monkeypatch.setattr("actions.upload.TqdmProgress", DummyProgress)
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.small_object_threshold = 0
+    uploader.upload_file(str(test_file), "bucket", "object-key")
+    mock_client.upload_fileobj.assert_called_once()
+    mock_client.put_object.assert_not_called()
+
+
+def test_upload_directory(monkeypatch, tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    from unittest.mock import MagicMock
+
+    mock_client = MagicMock()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_directory(str(tmp_path), "bucket", "prefix/")
+    keys = sorted(c[1]["Key"] for c in mock_client.put_object.call_args_list)
+    assert keys == ["prefix/a.txt", "prefix/sub/b.txt"]
+
+
+def test_upload_directory_honours_r2ignore(monkeypatch, tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "debug.log").write_text("log")
+    (tmp_path / ".r2ignore").write_text("*.log\n.r2ignore\n")
+    from unittest.mock import MagicMock
+
+    mock_client = MagicMock()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_directory(str(tmp_path), "bucket", "prefix/")
+    keys = [c[1]["Key"] for c in mock_client.put_object.call_args_list]
+    assert keys == ["prefix/a.txt"]
+
+
+def test_upload_directory_large_files_in_order(monkeypatch, tmp_path):
+    for name, size in (("small.bin", 10), ("big.bin", 30), ("mid.bin", 20)):
+        (tmp_path / name).write_bytes(b"x" * size)
+    from unittest.mock import MagicMock
+
+    mock_client = MagicMock()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    monkeypatch.setattr("actions.upload.DEFAULT_MAX_FILES", 1)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.small_object_threshold = 0
+    uploader.upload_directory(str(tmp_path), "bucket", "p/", order="smallest")
+    keys = [c[0][2] for c in mock_client.upload_fileobj.call_args_list]
+    assert keys == ["p/small.bin", "p/mid.bin", "p/big.bin"]
+
+
+def test_upload_directory_failure(monkeypatch, tmp_path):
+    (tmp_path / "ok.txt").write_text("a")
+    (tmp_path / "fail.txt").write_text("b")
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError, match="1 file"):
+        uploader.upload_directory(str(tmp_path), "bucket")
+
+
+def test_upload_directory_not_found():
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        uploader.upload_directory("/nonexistent/dir", "bucket")
+
+
+def test_upload_stdin(monkeypatch):
+    import io
+    from unittest.mock import MagicMock
+
+    mock_client = MagicMock()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    monkeypatch.setattr("actions.upload.TqdmProgress", DummyProgress)
+    monkeypatch.setattr("sys.stdin", MagicMock(buffer=io.BytesIO(b"piped")))
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_file("-", "bucket", "dump.sql")
+    assert mock_client.put_object.call_args[1]["Body"] == b"piped"
+
+
+def test_upload_stdin_requires_key(monkeypatch):
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        uploader.upload_file("-", "bucket", None)
+
+
+def test_upload_file_compressed(monkeypatch, tmp_path):
+    import gzip
+    from unittest.mock import MagicMock
+
+    test_file = tmp_path / "app.csv"
+    test_file.write_bytes(b"log line\n" * 1000)
+    mock_client = MagicMock()
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: mock_client)
+    monkeypatch.setattr("actions.upload.TqdmProgress", DummyProgress)
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_file(str(test_file), "bucket", "app.csv", compress="gzip")
+    kwargs = mock_client.put_object.call_args[1]
+    assert gzip.decompress(kwargs["Body"]) == b"log line\n" * 1000
+    assert kwargs["ContentType"] == "text/csv"
+    assert kwargs["ContentEncoding"] == "gzip"
+    assert kwargs["Metadata"] == {"r2py-compression": "gzip"}
+
+
+def test_upload_file_skip_unchanged(monkeypatch, tmp_path):
+    from unittest.mock import MagicMock
+
+    test_file = tmp_path / "file.txt"
+    test_file.write_text("data")
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    put = MagicMock()
+    monkeypatch.setattr(uploader, "_put_small", put)
+    uploader.upload_file(str(test_file), "bucket", "existing.txt", skip_unchanged=True)
+    put.assert_not_called()
+    uploader.upload_file(str(test_file), "bucket", "new.txt", skip_unchanged=True)
+    put.assert_called_once()
+
+
+def test_upload_directory_skip_unchanged(monkeypatch, tmp_path, capsys):
+    (tmp_path / "existing.txt").write_text("data")
+    (tmp_path / "changed.txt").write_text("data")
+    uploader = S3Uploader("url", "key", "secret", "auto")
+    uploader.upload_directory(str(tmp_path), "bucket", skip_unchanged=True)
+    out = capsys.readouterr().out
+    assert "Uploaded 1 file(s)" in out
+    assert "skipped 1 unchanged" in out
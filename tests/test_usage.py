@@ -0,0 +1,28 @@
+from utils.usage import PrefixUsage, format_size
+
+
+def test_prefix_usage_histogram():
+    usage = PrefixUsage("logs/")
+    usage.add_page([{"Size": 10}, {"Size": 2048}, {"Size": 2 * 1024**3}])
+    assert usage.objects == 3
+    assert usage.bytes == 10 + 2048 + 2 * 1024**3
+    assert usage.largest == 2 * 1024**3
+    assert usage.to_dict()["histogram"]["<1KB"] == 1
+    assert usage.to_dict()["histogram"]["1KB-64KB"] == 1
+    assert usage.to_dict()["histogram"][">=1GB"] == 1
+
+
+def test_prefix_usage_merge():
+    total = PrefixUsage("")
+    first, second = PrefixUsage("a/"), PrefixUsage("b/")
+    first.add(5)
+    second.add(7)
+    total.merge(first)
+    total.merge(second)
+    assert (total.objects, total.bytes, total.largest) == (2, 12, 7)
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(3 * 1024**3) == "3.0 GB"
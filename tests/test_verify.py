@@ -0,0 +1,136 @@
+import hashlib
+import pytest
+from actions.verify import S3Verifier
+from utils.s3base import S3ActionError, S3Base
+
+DATA = b"hello world" * 1000
+
+
+class NotFound(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class DummyS3Client:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def head_object(self, Bucket, Key, ChecksumMode=None, PartNumber=None):
+        if Key not in self.objects:
+            raise NotFound("Not Found")
+        head = dict(self.objects[Key])
+        if PartNumber:
+            sizes = head.pop("PartSize")
+            if isinstance(sizes, list):
+                sizes = sizes[PartNumber - 1]
+            head["ContentLength"] = sizes
+        return head
+
+
+def multipart_etag(data, part_size):
+    if isinstance(part_size, list):
+        starts = [sum(part_size[:i]) for i in range(len(part_size))]
+        parts = [data[s : s + n] for s, n in zip(starts, part_size)]
+    else:
+        parts = [data[i : i + part_size] for i in range(0, len(data), part_size)]
+    digest = hashlib.md5(b"".join(hashlib.md5(p).digest() for p in parts))
+    return f'"{digest.hexdigest()}-{len(parts)}"'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = DummyS3Client(
+        {
+            "single.bin": {
+                "ContentLength": len(DATA),
+                "ETag": f'"{hashlib.md5(DATA).hexdigest()}"',
+            },
+            "multi.bin": {
+                "ContentLength": len(DATA),
+                "ETag": multipart_etag(DATA, 4096),
+                "PartSize": 4096,
+            },
+            "uneven.bin": {
+                "ContentLength": len(DATA),
+                "ETag": multipart_etag(DATA, [2000, 4500, 4500]),
+                "PartSize": [2000, 4500, 4500],
+            },
+            "unknown.bin": {
+                "ContentLength": len(DATA),
+                "ETag": multipart_etag(DATA, [2000, 4500, 4500]),
+                "PartSize": [2000, 4500, 4000],
+            },
+            "bad.bin": {"ContentLength": len(DATA), "ETag": '"0000"'},
+        }
+    )
+    monkeypatch.setattr("boto3.client", lambda *a, **kw: client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_clients_cache():
+    S3Base._clients = {}
+    yield
+    S3Base._clients = {}
+
+
+@pytest.fixture(autouse=True)
+def isolate_hash_cache(monkeypatch, tmp_path_factory):
+    monkeypatch.setenv("R2PY_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setattr(S3Base, "_hash_engine", None)
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def test_verify_single_part(client, local_file):
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    assert verifier.verify_file(local_file, "bucket", "single.bin") == ("OK", "")
+
+
+def test_verify_multipart_uses_first_part_size(client, local_file):
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    assert verifier.verify_file(local_file, "bucket", "multi.bin") == ("OK", "")
+
+
+def test_verify_multipart_with_uneven_parts(client, local_file):
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    assert verifier.verify_file(local_file, "bucket", "uneven.bin") == ("OK", "")
+
+
+def test_verify_unknown_part_layout_is_unverifiable(client, local_file):
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    status, _ = verifier.verify_file(local_file, "bucket", "unknown.bin")
+    assert status == "UNVERIFIABLE"
+
+
+def test_verify_mismatch_and_missing(client, local_file):
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    assert verifier.verify_file(local_file, "bucket", "bad.bin")[0] == "MISMATCH"
+    assert verifier.verify_file(local_file, "bucket", "gone.bin")[0] == "MISSING"
+
+
+def test_verify_directory(client, tmp_path, capfd):
+    (tmp_path / "single.bin").write_bytes(DATA)
+    (tmp_path / "bad.bin").write_bytes(DATA)
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError, match="1 file"):
+        verifier.verify(str(tmp_path), "bucket")
+    assert "1 ok, 1 mismatch, 0 missing" in capfd.readouterr().out
+
+
+def test_verify_path_not_found(client):
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    with pytest.raises(S3ActionError):
+        verifier.verify("/nonexistent/file", "bucket")
+
+
+def test_verify_reuses_cached_digest(client, local_file, monkeypatch):
+    verifier = S3Verifier("url", "key", "secret", "auto")
+    assert verifier.verify_file(local_file, "bucket", "single.bin") == ("OK", "")
+    monkeypatch.setattr("utils.hashcache.hash_file", None)
+    assert verifier.verify_file(local_file, "bucket", "single.bin") == ("OK", "")
+    assert S3Base.hash_engine().hits == 1
@@ -1,7 +1,17 @@
 from .colors import Colors
+from .concurrency import AdaptiveConcurrency, map_concurrent
 from .logger import Logger
 from .progress import TqdmProgress
 from .region import Region
 from .s3base import S3Base, S3ActionError
 
-__all__ = ["Colors", "Logger", "TqdmProgress", "Region", "S3Base", "S3ActionError"]
\ No newline at end of file
+__all__ = [
+    "AdaptiveConcurrency",
+    "Colors",
+    "Logger",
+    "TqdmProgress",
+    "Region",
+    "S3Base",
+    "S3ActionError",
+    "map_concurrent",
+]
@@ -0,0 +1,130 @@
+"""
+Append State Utility for R2Py CLI.
+
+This module provides the AppendState class, which records, for each local file
+uploaded in append mode, the ETag and size of the object it produced and the SHA-256
+of the bytes uploaded. A later append upload only sends the new tail when the object
+still has that ETag and the local file still starts with those bytes, which is how
+growing log and journal files behave. Records live in a SQLite table in the cache
+directory, keyed by the file's real path and the destination object.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+from .cache import cache_dir
+from .logger import Logger
+
+logger = Logger("appendState").get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    path TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (path, destination)
+)
+"""
+_READ_SIZE = 8 * 1024 * 1024
+
+
+def hash_prefixes(filename: str, *sizes: int) -> List[str]:
+    """
+    Return the SHA-256 of the first n bytes of a file for each n in sizes.
+    The file is read once, up to the largest size.
+    Args:
+        filename (str): Local file path.
+        *sizes (int): Prefix lengths in ascending order.
+    Returns:
+        List[str]: Hex digest per size.
+    Raises:
+        ValueError: If the file is shorter than a requested prefix.
+    """
+    digests = []
+    hasher = hashlib.sha256()
+    position = 0
+    with open(filename, "rb") as f:
+        for size in sizes:
+            while position < size:
+                data = f.read(min(_READ_SIZE, size - position))
+                if not data:
+                    raise ValueError(f"'{filename}' is shorter than {size} bytes")
+                hasher.update(data)
+                position += len(data)
+            digests.append(hasher.hexdigest())
+    return digests
+
+
+class AppendState:
+    """Remembers which prefix of each local file an object holds."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open or create the state database.
+        Args:
+            path (Optional[str]): Database file (defaults to appends.sqlite in cache_dir()).
+        """
+        self.path = path or os.path.join(cache_dir(), "appends.sqlite")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    @staticmethod
+    def destination(endpoint_url: str, bucket_name: str, object_key: str) -> str:
+        """Return the identity of a destination object."""
+        return "\0".join((endpoint_url or "", bucket_name, object_key))
+
+    def get(self, filename: str, destination: str) -> Optional[dict]:
+        """
+        Return the last append upload of a file to a destination.
+        Args:
+            filename (str): Local file path.
+            destination (str): Destination from destination().
+        Returns:
+            Optional[dict]: 'etag', 'size' and 'digest', or None if unknown.
+        """
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT etag, size, digest FROM uploads "
+                    "WHERE path=? AND destination=?",
+                    (os.path.realpath(filename), destination),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Could not read append state '%s': %s", self.path, e)
+            return None
+        return dict(zip(("etag", "size", "digest"), row)) if row else None
+
+    def put(
+        self, filename: str, destination: str, etag: str, size: int, digest: str
+    ) -> None:
+        """
+        Record that an object with etag holds the first size bytes of a file.
+        Args:
+            filename (str): Local file path.
+            destination (str): Destination from destination().
+            etag (str): Object ETag after the upload.
+            size (int): Number of bytes uploaded.
+            digest (str): SHA-256 of those bytes.
+        """
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?)",
+                    (os.path.realpath(filename), destination, etag, size, digest),
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Could not write append state '%s': %s", self.path, e)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
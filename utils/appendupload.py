@@ -0,0 +1,164 @@
+"""
+Append Upload Engine for R2Py CLI.
+
+This module provides the AppendUpload class, which replaces an object with a longer
+version of it whose first bytes are unchanged, such as a log file that has only been
+appended to. The existing object becomes the first parts of a new multipart upload
+through UploadPartCopy, pinned to its ETag, so those bytes never leave R2; only the
+new tail is uploaded from a memory map of the local file. Every part but the last
+must be at least 5 MiB, so objects smaller than that cannot be extended this way,
+and the copied and uploaded parts share the 10,000 part numbers of one upload.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from .concurrency import AdaptiveConcurrency
+from .multipart import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_PART_SIZE,
+    MAX_PART_SIZE,
+    MAX_PARTS,
+    MIN_PART_SIZE,
+    MmapUpload,
+    part_size_for,
+)
+from .partcopy import DEFAULT_COPY_PART_SIZE
+from .ranged import plan_parts
+
+
+def plan_copy_parts(size: int, part_size: int = DEFAULT_COPY_PART_SIZE) -> List[tuple]:
+    """
+    Split an object into UploadPartCopy ranges that are all at least MIN_PART_SIZE.
+    Args:
+        size (int): Object size in bytes (at least MIN_PART_SIZE).
+        part_size (int): Preferred part size in bytes.
+    Returns:
+        List[tuple]: (index, start, end) tuples with inclusive end offsets.
+    """
+    parts = plan_parts(size, part_size_for(size, part_size))
+    # Fold a short final range into the one before it, since more bytes follow.
+    if len(parts) > 1 and parts[-1][2] - parts[-1][1] + 1 < MIN_PART_SIZE:
+        index, start, _ = parts[-2]
+        parts[-2:] = [(index, start, size - 1)]
+    return parts
+
+
+class AppendUpload(MmapUpload):
+    """Multipart upload that copies an object's existing bytes and uploads the tail."""
+
+    def __init__(
+        self,
+        client,
+        filename: str,
+        bucket_name: str,
+        object_key: str,
+        size: int,
+        copied_size: int,
+        etag: str,
+        extra_args: Optional[dict] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        copy_part_size: int = DEFAULT_COPY_PART_SIZE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        callback: Optional[Callable[[int], None]] = None,
+        logger=None,
+        budget=None,
+    ):
+        """
+        Initialize the upload engine.
+        Args:
+            client: boto3 S3 client.
+            filename (str): Local file whose first copied_size bytes the object holds.
+            bucket_name (str): Bucket name of the object.
+            object_key (str): Key of the object, which is replaced.
+            size (int): Number of bytes of the file to upload in total.
+            copied_size (int): Current object size; these bytes are copied remotely.
+            etag (str): Current object ETag, required to match on every copy.
+            extra_args (Optional[dict]): Extra CreateMultipartUpload arguments.
+            controller (Optional[AdaptiveConcurrency]): Controller gating part workers.
+            part_size (int): Preferred size of uploaded tail parts in bytes.
+            copy_part_size (int): Preferred size of copied parts in bytes.
+            max_in_flight (int): Maximum bytes of tail parts in flight at once.
+            callback (Optional[Callable[[int], None]]): Progress callback in bytes.
+            logger: Logger for engine messages.
+            budget: Shared budget to take tail parts from instead of max_in_flight.
+        """
+        if copied_size < MIN_PART_SIZE:
+            raise ValueError(
+                f"Objects smaller than {MIN_PART_SIZE} bytes cannot be extended."
+            )
+        if size <= copied_size:
+            raise ValueError("Nothing to append.")
+        super().__init__(
+            client,
+            filename,
+            bucket_name,
+            object_key,
+            extra_args=extra_args,
+            controller=controller,
+            part_size=part_size,
+            max_in_flight=max_in_flight,
+            callback=callback,
+            logger=logger,
+            budget=budget,
+        )
+        # The file may keep growing; upload exactly the bytes that were planned.
+        self.total_size = size
+        self.copied_size = copied_size
+        self.etag = etag
+        self.copy_parts = plan_copy_parts(copied_size, copy_part_size)
+        # The tail only gets the part numbers the copied parts leave over.
+        remaining = MAX_PARTS - len(self.copy_parts)
+        if remaining <= 0:
+            raise ValueError(
+                f"The existing object already uses all {MAX_PARTS} part numbers."
+            )
+        tail = size - copied_size
+        self.part_size = max(part_size, MIN_PART_SIZE, math.ceil(tail / remaining))
+        if self.part_size > MAX_PART_SIZE:
+            raise ValueError(
+                f"{tail} appended bytes do not fit in the {remaining} part numbers "
+                "left after the existing object."
+            )
+
+    def _submit_parts(self, upload_id: str, view: memoryview) -> list:
+        """Copy the existing object's ranges, then upload the tail from the map."""
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.controller.maximum) as pool:
+            for index, start, end in self.copy_parts:
+                futures.append(
+                    pool.submit(self._copy_part, upload_id, index + 1, start, end)
+                )
+            number = len(self.copy_parts)
+            for start in range(self.copied_size, self.total_size, self.part_size):
+                if self._failed.is_set():
+                    break
+                number += 1
+                chunk = view[start : min(start + self.part_size, self.total_size)]
+                self.budget.acquire(len(chunk))
+                futures.append(pool.submit(self._upload_part, upload_id, number, chunk))
+        return [future.result() for future in futures]
+
+    def _copy_part(self, upload_id: str, number: int, start: int, end: int) -> dict:
+        """Copy one byte range of the existing object into the new upload."""
+        if self._failed.is_set():
+            raise RuntimeError("Upload cancelled after an earlier part failed.")
+        try:
+            with self.controller.slot():
+                response = self.s3.upload_part_copy(
+                    Bucket=self.bucket_name,
+                    Key=self.object_key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    CopySource={"Bucket": self.bucket_name, "Key": self.object_key},
+                    CopySourceRange=f"bytes={start}-{end}",
+                    CopySourceIfMatch=self.etag,
+                )
+        except BaseException:
+            self._failed.set()
+            raise
+        if self.callback:
+            self.callback(end - start + 1)
+        return {"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]}
@@ -0,0 +1,61 @@
+"""
+Byte Budget Utility for R2Py CLI.
+
+This module provides the ByteBudget class, a counting semaphore measured in bytes.
+Transfer engines acquire the size of a part before putting it in flight and release
+it when the part completes, which caps memory use by a configurable number of bytes
+instead of by part count times part size.
+"""
+
+import threading
+
+
+class ByteBudget:
+    """Blocking budget of bytes that may be in flight at once."""
+
+    def __init__(self, limit: int):
+        """
+        Initialize the budget.
+        Args:
+            limit (int): Maximum number of bytes in flight.
+        """
+        if limit <= 0:
+            raise ValueError("byte budget must be positive")
+        self.limit = limit
+        self._in_flight = 0
+        self._peak = 0
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """Bytes currently acquired."""
+        return self._in_flight
+
+    @property
+    def peak(self) -> int:
+        """Highest number of bytes acquired at once."""
+        return self._peak
+
+    def acquire(self, nbytes: int) -> None:
+        """
+        Block until nbytes fit in the budget, then take them.
+        A request larger than the whole budget is admitted once nothing else is
+        in flight, so oversized parts cannot deadlock.
+        Args:
+            nbytes (int): Number of bytes to acquire.
+        """
+        with self._cond:
+            while self._in_flight and self._in_flight + nbytes > self.limit:
+                self._cond.wait()
+            self._in_flight += nbytes
+            self._peak = max(self._peak, self._in_flight)
+
+    def release(self, nbytes: int) -> None:
+        """
+        Return nbytes to the budget.
+        Args:
+            nbytes (int): Number of bytes to release.
+        """
+        with self._cond:
+            self._in_flight -= nbytes
+            self._cond.notify_all()
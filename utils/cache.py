@@ -0,0 +1,95 @@
+"""
+Local Cache Utility for R2Py CLI.
+
+This module provides the TTLCache class, a small JSON file of key/value pairs that
+expire after a fixed time to live. It is meant for metadata that rarely changes,
+such as bucket locations, so repeated commands can skip the lookups. The cache
+lives in $R2PY_CACHE_DIR, or in the platform cache directory by default, and a
+missing, unreadable or unwritable cache only costs the lookups it would have saved.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+from .logger import Logger
+
+logger = Logger("cache").get_logger()
+
+
+def cache_dir() -> str:
+    """
+    Return the directory holding R2Py CLI caches.
+    Returns:
+        str: $R2PY_CACHE_DIR, else $XDG_CACHE_HOME/r2py, else ~/.cache/r2py.
+    """
+    if os.getenv("R2PY_CACHE_DIR"):
+        return os.environ["R2PY_CACHE_DIR"]
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "r2py")
+
+
+class TTLCache:
+    """JSON-file key/value cache whose entries expire after a time to live."""
+
+    def __init__(self, name: str, ttl: float, directory: Optional[str] = None):
+        """
+        Load the cache file, dropping expired entries.
+        Args:
+            name (str): Cache file name, e.g. 'regions.json'.
+            ttl (float): Time to live of new entries in seconds.
+            directory (Optional[str]): Cache directory (defaults to cache_dir()).
+        """
+        self.path = os.path.join(directory or cache_dir(), name)
+        self.ttl = ttl
+        self._dirty = False
+        self._entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            now = time.time()
+            self._entries = {
+                key: entry
+                for key, entry in entries.items()
+                if isinstance(entry, dict) and entry.get("expires", 0) > now
+            }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning("Ignoring unreadable cache '%s': %s", self.path, e)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._entries.get(key)
+        return entry["value"] if entry else default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value for key."""
+        self._entries[key] = {"value": value, "expires": time.time() + self.ttl}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if it changed; failures are only logged."""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self._dirty = False
+        except OSError as e:
+            logger.warning("Could not write cache '%s': %s", self.path, e)
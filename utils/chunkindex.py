@@ -0,0 +1,80 @@
+"""
+Chunk Index Utility for R2Py CLI.
+
+This module provides the ChunkIndex class, a local SQLite record of the chunks known
+to exist in each snapshot repository (an endpoint, bucket and key prefix), so a
+snapshot only sends existence checks and uploads for chunks it has not seen before.
+The index is only a hint: a chunk missing from it is checked remotely before being
+uploaded, and a stale entry is harmless because chunks are never deleted.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional, Set
+
+from .cache import cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    repository TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (repository, id)
+) WITHOUT ROWID
+"""
+_BATCH = 500
+
+
+class ChunkIndex:
+    """Local set of chunk IDs known to be stored in one repository."""
+
+    def __init__(self, repository: str, path: Optional[str] = None):
+        """
+        Open or create the index.
+        Args:
+            repository (str): Repository identity, e.g. 'endpoint/bucket/prefix'.
+            path (Optional[str]): Database file (defaults to chunks.sqlite in cache_dir()).
+        """
+        self.repository = repository
+        self.path = path or os.path.join(cache_dir(), "chunks.sqlite")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM chunks WHERE repository=?", (self.repository,)
+            ).fetchone()[0]
+
+    def known(self, ids: Iterable[str]) -> Set[str]:
+        """Return the subset of ids recorded in the index."""
+        ids = list(ids)
+        found = set()
+        with self._lock:
+            for start in range(0, len(ids), _BATCH):
+                batch = ids[start : start + _BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT id FROM chunks WHERE repository=? AND id IN ({placeholders})",
+                    (self.repository, *batch),
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def add(self, ids: Iterable[str]) -> None:
+        """Record chunk ids as stored."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO chunks VALUES (?, ?)",
+                [(self.repository, chunk_id) for chunk_id in ids],
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,113 @@
+"""
+Content-Defined Chunking Utility for R2Py CLI.
+
+This module splits files into variable-size chunks whose boundaries depend on the
+data itself, so inserting or removing bytes only changes the chunks around the edit
+and every other chunk of a file, or of any other file, keeps its identity. Chunks
+are identified by the SHA-256 of their contents.
+
+Boundaries follow the asymmetric-maximum scheme (RAM): after a fixed window that
+starts at the previous boundary, a chunk ends at the first byte at least as large
+as the largest byte of the window. Unlike rolling hashes, both steps are byte scans
+that run in C (bytes.translate and a regex character class), so chunking keeps up
+with disk reads without a compiled extension. chunk_file() is a top-level function
+so it can run in worker processes.
+"""
+
+import hashlib
+import re
+from typing import List, Tuple
+
+CHUNKING_VERSION = "ram-v1"
+CHUNK_WINDOW = 1024 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+
+# _BELOW[t] holds every byte value below t; _AT_LEAST[t] matches any byte >= t.
+_BELOW = [bytes(range(t)) for t in range(256)]
+_AT_LEAST = [re.compile(b"[\\x%02x-\\xff]" % t) for t in range(256)]
+
+
+def window_maximum(window: bytes) -> int:
+    """
+    Return the largest byte value of a non-empty buffer.
+    Binary search over thresholds, narrowing the buffer to the bytes that are at
+    least each threshold found, so every step is a C-level scan.
+    """
+    # Compressed and binary data almost always holds 0xff; memchr finds it fast.
+    if window.find(b"\xff") >= 0:
+        return 255
+    low, high = 0, 254
+    while low < high:
+        middle = (low + high + 1) // 2
+        remaining = window.translate(None, _BELOW[middle])
+        if remaining:
+            window, low = remaining, middle
+        else:
+            high = middle - 1
+    return low
+
+
+def find_boundary(
+    data: bytes,
+    start: int = 0,
+    window: int = CHUNK_WINDOW,
+    max_size: int = MAX_CHUNK_SIZE,
+) -> int:
+    """
+    Return the end offset of the chunk that starts at start.
+    Args:
+        data (bytes): Buffer holding at least max_size bytes after start, or the
+            rest of the file.
+        start (int): Offset of the chunk in data.
+        window (int): Window size; also the minimum chunk size.
+        max_size (int): Maximum chunk size.
+    Returns:
+        int: Offset just past the last byte of the chunk.
+    """
+    length = len(data)
+    if length - start <= window:
+        return length
+    threshold = window_maximum(data[start : start + window])
+    end = min(length, start + max_size)
+    match = _AT_LEAST[threshold].search(data, start + window, end)
+    return match.end() if match else end
+
+
+def chunk_file(
+    filename: str,
+    window: int = CHUNK_WINDOW,
+    max_size: int = MAX_CHUNK_SIZE,
+) -> List[Tuple[str, int, int]]:
+    """
+    Split a file into content-defined chunks.
+    Args:
+        filename (str): Local file path.
+        window (int): Window size; also the minimum chunk size.
+        max_size (int): Maximum chunk size.
+    Returns:
+        List[Tuple[str, int, int]]: (sha256 hex, offset, size) of each chunk.
+    """
+    chunks = []
+    offset = 0
+    buffer = b""
+    eof = False
+    with open(filename, "rb") as f:
+        while buffer or not eof:
+            if not eof and len(buffer) < max_size:
+                data = f.read(2 * max_size)
+                eof = not data
+                buffer += data
+                continue
+            position = 0
+            # Cut every chunk whose boundary cannot depend on unread bytes.
+            while position < len(buffer) and (
+                eof or len(buffer) - position >= max_size
+            ):
+                end = find_boundary(buffer, position, window, max_size)
+                size = end - position
+                digest = hashlib.sha256(memoryview(buffer)[position:end]).hexdigest()
+                chunks.append((digest, offset, size))
+                offset += size
+                position = end
+            buffer = buffer[position:]
+    return chunks
@@ -0,0 +1,298 @@
+"""
+Compression Utility for R2Py CLI.
+
+This module provides streaming compression and decompression stages for the
+transfer pipeline. CompressingReader splits its source into fixed-size frames and
+compresses them in a process pool, so compression scales across cores; every frame
+is an independent gzip member or zstd frame, and concatenated frames form a valid
+stream for standard tools (gzip -d, zstd -d). CompressingWriter does the same for
+data that is pushed rather than pulled, and DecompressingWriter decodes such a
+stream incrementally as it is written. zstd support requires the optional
+'zstandard' package.
+"""
+
+import gzip
+import io
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Callable, Optional
+
+DEFAULT_FRAME_SIZE = 4 * 1024 * 1024
+METADATA_KEY = "r2py-compression"
+
+
+class Compression(str, Enum):
+    """Supported compression codecs."""
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+def _zstandard():
+    """Import the optional zstandard module."""
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise RuntimeError(
+            "zstd support requires the 'zstandard' package (pip install zstandard)"
+        ) from e
+    return zstandard
+
+
+def compress_frame(codec: str, data: bytes, level: Optional[int] = None) -> bytes:
+    """
+    Compress data as one independent frame.
+    Args:
+        codec (str): 'gzip' or 'zstd'.
+        data (bytes): Data to compress.
+        level (Optional[int]): Codec compression level.
+    Returns:
+        bytes: A gzip member or zstd frame.
+    """
+    if codec == Compression.GZIP:
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    if codec == Compression.ZSTD:
+        return (
+            _zstandard()
+            .ZstdCompressor(level=3 if level is None else level)
+            .compress(data)
+        )
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+def _decompressor(codec: str):
+    """Return a fresh incremental decompressor for one frame."""
+    if codec == Compression.GZIP:
+        return zlib.decompressobj(wbits=31)
+    if codec == Compression.ZSTD:
+        return _zstandard().ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+class CompressingReader(io.RawIOBase):
+    """Readable stream of compressed frames produced in parallel from a source."""
+
+    def __init__(
+        self,
+        source,
+        codec: str,
+        frame_size: int = DEFAULT_FRAME_SIZE,
+        workers: Optional[int] = None,
+        level: Optional[int] = None,
+        callback: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Initialize the compression stage.
+        Args:
+            source: Binary stream of uncompressed data.
+            codec (str): 'gzip' or 'zstd'.
+            frame_size (int): Uncompressed bytes per independent frame.
+            workers (Optional[int]): Compression processes (defaults to CPU count).
+            level (Optional[int]): Codec compression level.
+            callback (Optional[Callable[[int], None]]): Called with the uncompressed
+                size of each frame as it is handed downstream.
+        """
+        super().__init__()
+        if codec == Compression.ZSTD:
+            _zstandard()
+        elif codec != Compression.GZIP:
+            raise ValueError(f"Unsupported compression codec: {codec}")
+        self.source = source
+        self.codec = Compression(codec).value
+        self.frame_size = frame_size
+        self.workers = workers or os.cpu_count() or 1
+        self.level = level
+        self.callback = callback
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._pool = None
+        self._pending = deque()
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Fill buffer with the next compressed bytes, in frame order."""
+        while not self._buffer:
+            frame = self._next_frame()
+            if frame is None:
+                return 0
+            self._buffer = memoryview(frame)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def _next_frame(self) -> Optional[bytes]:
+        """Keep the pool busy and return the next compressed frame in order."""
+        while not self._eof and len(self._pending) < self.workers * 2:
+            data = self.source.read(self.frame_size)
+            if not data:
+                self._eof = True
+                break
+            self.bytes_in += len(data)
+            if self._pool is None and len(data) < self.frame_size:
+                # Everything fits in one frame: not worth starting processes.
+                frame = compress_frame(self.codec, data, self.level)
+            else:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                frame = self._pool.submit(compress_frame, self.codec, data, self.level)
+            self._pending.append((len(data), frame))
+        if not self._pending:
+            return None
+        size, frame = self._pending.popleft()
+        if not isinstance(frame, bytes):
+            frame = frame.result()
+        self.bytes_out += len(frame)
+        if self.callback:
+            self.callback(size)
+        return frame
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        super().close()
+
+
+class CompressingWriter:
+    """Writable stage that compresses data in parallel frames into an output stream."""
+
+    def __init__(
+        self,
+        out,
+        codec: str,
+        frame_size: int = DEFAULT_FRAME_SIZE,
+        workers: Optional[int] = None,
+        level: Optional[int] = None,
+    ):
+        """
+        Initialize the compression stage.
+        Args:
+            out: Binary stream receiving compressed frames, in order.
+            codec (str): 'gzip' or 'zstd'.
+            frame_size (int): Uncompressed bytes per independent frame.
+            workers (Optional[int]): Compression processes (defaults to CPU count).
+            level (Optional[int]): Codec compression level.
+        """
+        if codec == Compression.ZSTD:
+            _zstandard()
+        elif codec != Compression.GZIP:
+            raise ValueError(f"Unsupported compression codec: {codec}")
+        self.out = out
+        self.codec = Compression(codec).value
+        self.frame_size = frame_size
+        self.workers = workers or os.cpu_count() or 1
+        self.level = level
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._pool = None
+        self._pending = deque()
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        """Buffer data and hand every full frame to the pool."""
+        self._buffer += data
+        self.bytes_in += len(data)
+        while len(self._buffer) >= self.frame_size:
+            frame = bytes(self._buffer[: self.frame_size])
+            del self._buffer[: self.frame_size]
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self._pending.append(
+                self._pool.submit(compress_frame, self.codec, frame, self.level)
+            )
+            # Bound memory: wait for the oldest frame once the pool is saturated.
+            while len(self._pending) >= self.workers * 2:
+                self._write_frame(self._pending.popleft().result())
+        return len(data)
+
+    def flush(self) -> None:
+        self.out.flush()
+
+    def finish(self) -> None:
+        """Compress the remaining data, write every frame and stop the pool."""
+        try:
+            while self._pending:
+                self._write_frame(self._pending.popleft().result())
+            if self._buffer or not self.bytes_in:
+                self._write_frame(
+                    compress_frame(self.codec, bytes(self._buffer), self.level)
+                )
+                self._buffer = bytearray()
+            self.out.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _write_frame(self, frame: bytes) -> None:
+        self.out.write(frame)
+        self.bytes_out += len(frame)
+
+
+class DecompressingWriter:
+    """Writable stage that decodes a multi-frame stream into an output stream."""
+
+    def __init__(self, out, codec: str):
+        """
+        Initialize the decompression stage.
+        Args:
+            out: Binary stream receiving decompressed data.
+            codec (str): 'gzip' or 'zstd'.
+        """
+        self.out = out
+        self.codec = Compression(codec).value
+        self.bytes_out = 0
+        self._decoder = _decompressor(self.codec)
+        self._in_frame = False
+
+    def write(self, data) -> int:
+        """Decode data and write the result, crossing frame boundaries."""
+        size = len(data)
+        data = bytes(data)
+        while data:
+            decoded = self._decoder.decompress(data)
+            self._in_frame = True
+            if decoded:
+                self.out.write(decoded)
+                self.bytes_out += len(decoded)
+            if not self._decoder.eof:
+                break
+            data = self._decoder.unused_data
+            self._decoder = _decompressor(self.codec)
+            self._in_frame = False
+        return size
+
+    def flush(self) -> None:
+        self.out.flush()
+
+    def finish(self) -> None:
+        """
+        Flush the output and check that the stream ended on a frame boundary.
+        Raises:
+            ValueError: If the compressed stream is truncated.
+        """
+        if self._in_frame:
+            raise ValueError(f"Truncated {self.codec} stream.")
+        self.out.flush()
+
+
+def codec_from_head(head: dict) -> Optional[str]:
+    """
+    Return the codec an object was stored with, from its HEAD response.
+    Args:
+        head (dict): HeadObject response.
+    Returns:
+        Optional[str]: 'gzip', 'zstd', or None if the object is not compressed.
+    """
+    codec = head.get("Metadata", {}).get(METADATA_KEY) or head.get("ContentEncoding")
+    if codec in (Compression.GZIP.value, Compression.ZSTD.value):
+        return codec
+    return None
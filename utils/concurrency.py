@@ -0,0 +1,325 @@
+"""
+Adaptive Concurrency Utility for R2Py CLI.
+
+This module provides the AdaptiveConcurrency class, an AIMD (additive increase,
+multiplicative decrease) controller that decides how many S3 requests may be in
+flight at once. It observes every request made by a boto3 client through botocore
+events, grows the limit while throughput keeps improving, and backs off when R2
+answers with throttling errors (e.g. 503 SlowDown) or when latency starts rising.
+The controller is shared by every worker pool of the CLI through map_concurrent.
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+Decision = namedtuple("Decision", ["timestamp", "action", "old", "new", "reason"])
+
+THROTTLE_STATUS_CODES = (429, 503)
+THROTTLE_ERROR_CODES = (
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "TooManyRequests",
+    "TooManyRequestsException",
+)
+
+
+class AdaptiveConcurrency:
+    """AIMD controller for the number of concurrent S3 requests."""
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 64,
+        window: int = 16,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        """
+        Initialize the controller.
+        Args:
+            initial (int): Starting concurrency limit.
+            minimum (int): Lowest limit the controller may back off to.
+            maximum (int): Highest limit the controller may grow to.
+            window (int): Number of completed requests per evaluation window.
+            latency_tolerance (float): Factor over the baseline latency considered "rising".
+            backoff (float): Multiplicative decrease applied on throttling.
+            cooldown (float): Seconds to wait before backing off again.
+        """
+        if not 1 <= minimum <= maximum:
+            raise ValueError("concurrency bounds must satisfy 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._active_requests = 0
+        self._peak_in_flight = 0
+        self._window_peak = 0
+        self._cond = threading.Condition()
+        self._window_started = time.monotonic()
+        self._window_requests = 0
+        self._window_bytes = 0
+        self._window_latency = 0.0
+        self._last_throughput = None
+        self._baseline_latency = None
+        self._last_decrease = 0.0
+        self._requests = 0
+        self._bytes = 0
+        self._throttles = 0
+        self._increases = 0
+        self._decreases = 0
+        self.decisions = deque(maxlen=50)
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """Block until a request slot is available under the current limit."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            self._track_peak()
+
+    def release(self) -> None:
+        """Return a request slot acquired with acquire()."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """Context manager holding one request slot."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record(self, latency: float, nbytes: int = 0) -> None:
+        """
+        Record a completed request and re-evaluate the limit once per window.
+        Args:
+            latency (float): Request latency in seconds, including retries.
+            nbytes (int): Payload bytes sent or received by the request.
+        """
+        with self._cond:
+            self._requests += 1
+            self._bytes += nbytes
+            self._window_requests += 1
+            self._window_bytes += nbytes
+            self._window_latency += latency
+            if self._window_requests >= self.window:
+                self._evaluate_window()
+
+    def record_throttle(self, reason: str = "throttled") -> None:
+        """
+        Record a throttling response and back off multiplicatively.
+        Args:
+            reason (str): Short description of the throttling signal.
+        """
+        with self._cond:
+            self._throttles += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._decrease(self._limit * self.backoff, reason)
+            self._reset_window()
+            self._last_throughput = None
+
+    def _evaluate_window(self) -> None:
+        """Apply the AIMD rule to the window that just finished."""
+        elapsed = max(time.monotonic() - self._window_started, 1e-6)
+        work = self._window_bytes if self._window_bytes else self._window_requests
+        throughput = work / elapsed
+        mean_latency = self._window_latency / self._window_requests
+        baseline = self._baseline_latency
+        if baseline is None or mean_latency < baseline:
+            self._baseline_latency = mean_latency
+        else:
+            # Let the baseline drift up slowly so a change in request mix
+            # (e.g. HEADs followed by large GETs) does not pin the limit down.
+            self._baseline_latency += (mean_latency - baseline) * 0.1
+        if (
+            baseline is not None
+            and mean_latency > baseline * self.latency_tolerance
+            and time.monotonic() - self._last_decrease >= self.cooldown
+        ):
+            self._decrease(
+                self._limit * (1 + self.backoff) / 2,
+                f"latency {mean_latency * 1000:.0f}ms over baseline "
+                f"{baseline * 1000:.0f}ms",
+            )
+        elif self._last_throughput is None or throughput >= self._last_throughput:
+            # Only probe upwards when the current limit was actually saturated.
+            if self._limit < self.maximum and self._window_peak >= int(self._limit):
+                old = self.limit
+                self._limit = min(self._limit + 1, float(self.maximum))
+                self._increases += 1
+                self._log_decision("increase", old, "throughput improving")
+        self._last_throughput = throughput
+        self._reset_window()
+
+    def _track_peak(self) -> None:
+        """Track the highest concurrency seen overall and in this window."""
+        current = max(self._in_flight, self._active_requests)
+        self._peak_in_flight = max(self._peak_in_flight, current)
+        self._window_peak = max(self._window_peak, current)
+
+    def _decrease(self, target: float, reason: str) -> None:
+        """Lower the limit to target, bounded by the minimum."""
+        old = self.limit
+        self._limit = max(float(self.minimum), target)
+        self._last_decrease = time.monotonic()
+        if self.limit != old:
+            self._decreases += 1
+            self._log_decision("decrease", old, reason)
+
+    def _log_decision(self, action: str, old: int, reason: str) -> None:
+        """Remember a limit change for the stats output."""
+        self.decisions.append(Decision(time.time(), action, old, self.limit, reason))
+        self._cond.notify_all()
+
+    def _reset_window(self) -> None:
+        """Start a new evaluation window."""
+        self._window_started = time.monotonic()
+        self._window_requests = 0
+        self._window_bytes = 0
+        self._window_latency = 0.0
+        self._window_peak = max(self._in_flight, self._active_requests)
+
+    def attach(self, client) -> None:
+        """
+        Observe every request made by a boto3 client.
+        Args:
+            client: boto3 S3 client whose events feed this controller.
+        """
+        events = getattr(getattr(client, "meta", None), "events", None)
+        if events is None:
+            return
+        events.register("before-call.s3", self._on_before_call, "r2py-concurrency")
+        events.register("after-call.s3", self._on_after_call, "r2py-concurrency")
+        events.register(
+            "after-call-error.s3", self._on_after_call_error, "r2py-concurrency"
+        )
+        events.register("needs-retry.s3", self._on_needs_retry, "r2py-concurrency")
+
+    def _on_before_call(self, params=None, context=None, **kwargs) -> None:
+        """Stamp the request with its start time and payload size."""
+        if context is None:
+            return
+        context["r2py_started"] = time.monotonic()
+        with self._cond:
+            self._active_requests += 1
+            self._track_peak()
+        body = (params or {}).get("body")
+        try:
+            context["r2py_sent"] = len(body) if body is not None else 0
+        except TypeError:
+            context["r2py_sent"] = 0
+
+    def _on_after_call(self, http_response=None, context=None, **kwargs) -> None:
+        """Feed the latency and payload of a finished request into the window."""
+        if not context or "r2py_started" not in context:
+            return
+        latency = time.monotonic() - context.pop("r2py_started")
+        with self._cond:
+            self._active_requests -= 1
+        received = 0
+        if http_response is not None and http_response.status_code < 300:
+            try:
+                received = int(http_response.headers.get("content-length", 0))
+            except (TypeError, ValueError):
+                received = 0
+        self.record(latency, context.get("r2py_sent", 0) + received)
+
+    def _on_after_call_error(self, context=None, **kwargs) -> None:
+        """Release the request bookkeeping when a call fails without a response."""
+        if context and context.pop("r2py_started", None) is not None:
+            with self._cond:
+                self._active_requests -= 1
+
+    def _on_needs_retry(self, response=None, **kwargs) -> None:
+        """Back off when a request is about to be retried because of throttling."""
+        if not response:
+            return None
+        http_response, parsed = response
+        code = (parsed or {}).get("Error", {}).get("Code")
+        if (
+            getattr(http_response, "status_code", None) in THROTTLE_STATUS_CODES
+            or code in THROTTLE_ERROR_CODES
+        ):
+            self.record_throttle(code or f"HTTP {http_response.status_code}")
+        return None
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the controller state.
+        Returns:
+            dict: Current limit, bounds, counters, and recent decisions.
+        """
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "minimum": self.minimum,
+                "maximum": self.maximum,
+                "peak_in_flight": self._peak_in_flight,
+                "requests": self._requests,
+                "bytes": self._bytes,
+                "throttles": self._throttles,
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "decisions": list(self.decisions),
+            }
+
+
+def map_concurrent(
+    controller: AdaptiveConcurrency,
+    func: Callable,
+    items: Iterable,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[object, object, Optional[Exception]]]:
+    """
+    Run func over items in a thread pool gated by the adaptive controller.
+    Items are consumed lazily, so paginated listings never need to be held in memory.
+    Args:
+        controller (AdaptiveConcurrency): Controller deciding how many calls run at once.
+        func (Callable): Function called with each item.
+        items (Iterable): Work items.
+        max_workers (Optional[int]): Pool size (defaults to the controller maximum).
+    Yields:
+        tuple: (item, result, error) in completion order; error is None on success.
+    """
+
+    def run(item):
+        try:
+            return item, func(item), None
+        except Exception as e:  # pylint: disable=broad-except
+            return item, None, e
+        finally:
+            controller.release()
+
+    with ThreadPoolExecutor(max_workers=max_workers or controller.maximum) as pool:
+        pending = set()
+        for item in items:
+            controller.acquire()
+            pending.add(pool.submit(run, item))
+            done = {future for future in pending if future.done()}
+            pending -= done
+            for future in done:
+                yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
@@ -0,0 +1,184 @@
+"""
+Cross-Client Copy Engine for R2Py CLI.
+
+This module provides the CrossCopy class, which copies a large object between two
+S3 clients, such as buckets in different accounts or on different endpoints, where
+UploadPartCopy cannot reach the source. Each part is fetched with a ranged GET from
+the source client, pinned to the source ETag, and sent as one part of a multipart
+upload through the target client, so nothing is written to local disk. Part buffers
+are taken from a byte budget before their GET starts, which bounds the memory in
+use, and the requests on each side are gated by that side's concurrency controller.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .budget import ByteBudget
+from .concurrency import AdaptiveConcurrency
+from .multipart import DEFAULT_MAX_IN_FLIGHT, DEFAULT_PART_SIZE, part_size_for
+from .partcopy import COPIED_HEADERS
+from .ranged import plan_parts
+
+
+class CrossCopy:
+    """Multipart copy of one object from one client to another through memory."""
+
+    def __init__(
+        self,
+        source_client,
+        source_bucket: str,
+        source_key: str,
+        client,
+        bucket_name: str,
+        object_key: str,
+        head: dict,
+        source_controller: Optional[AdaptiveConcurrency] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        metadata: Optional[dict] = None,
+        callback: Optional[Callable[[int], None]] = None,
+        logger=None,
+        budget=None,
+    ):
+        """
+        Initialize the copy engine.
+        Args:
+            source_client: boto3 S3 client of the source.
+            source_bucket (str): Source bucket name.
+            source_key (str): Source object key.
+            client: boto3 S3 client of the target.
+            bucket_name (str): Target bucket name.
+            object_key (str): Target object key.
+            head (dict): HeadObject response of the source object.
+            source_controller (Optional[AdaptiveConcurrency]): Controller gating
+                the ranged GETs.
+            controller (Optional[AdaptiveConcurrency]): Controller gating the part
+                uploads and sizing the worker pool.
+            part_size (int): Preferred part size in bytes.
+            max_in_flight (int): Maximum bytes of parts held in memory at once.
+            metadata (Optional[dict]): User metadata added to the source's.
+            callback (Optional[Callable[[int], None]]): Progress callback in bytes.
+            logger: Logger for engine messages.
+            budget: Shared budget to take parts from instead of max_in_flight, such
+                as a TransferScheduler.budget().
+        """
+        self.source_client = source_client
+        self.source_bucket = source_bucket
+        self.source_key = source_key
+        self.s3 = client
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.head = head
+        self.total_size = head["ContentLength"]
+        self.source_controller = source_controller or AdaptiveConcurrency()
+        self.controller = controller or AdaptiveConcurrency()
+        self.part_size = part_size_for(self.total_size, part_size)
+        self.parts = plan_parts(self.total_size, self.part_size)
+        self.budget = budget or ByteBudget(max(max_in_flight, self.part_size))
+        self.metadata = metadata or {}
+        self.callback = callback
+        self.logger = logger
+        self._failed = threading.Event()
+
+    def run(self) -> dict:
+        """
+        Copy the object and complete the multipart upload.
+        Returns:
+            dict: The CompleteMultipartUpload response.
+        Raises:
+            Exception: Any part or API error; the multipart upload is aborted.
+        """
+        extra_args = {k: self.head[k] for k in COPIED_HEADERS if self.head.get(k)}
+        if self.metadata:
+            extra_args["Metadata"] = {**extra_args.get("Metadata", {}), **self.metadata}
+        upload_id = self.s3.create_multipart_upload(
+            Bucket=self.bucket_name, Key=self.object_key, **extra_args
+        )["UploadId"]
+        try:
+            parts = self._submit_parts(upload_id)
+            response = self.s3.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self._abort(upload_id)
+            raise
+        if self.logger:
+            self.logger.info(
+                "Replicated '%s/%s' to '%s/%s' in %d parts (peak %.2f MB in flight).",
+                self.source_bucket,
+                self.source_key,
+                self.bucket_name,
+                self.object_key,
+                len(parts),
+                self.budget.peak / (1024 * 1024),
+            )
+        return response
+
+    def _submit_parts(self, upload_id: str) -> list:
+        """Put parts in flight as the byte budget allows and collect their ETags."""
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.controller.maximum) as pool:
+            for part in self.parts:
+                if self._failed.is_set():
+                    break
+                self.budget.acquire(part[2] - part[1] + 1)
+                futures.append(pool.submit(self._copy_part, upload_id, part))
+        return [future.result() for future in futures]
+
+    def _copy_part(self, upload_id: str, part: tuple) -> dict:
+        """Fetch one range from the source, upload it, and release its budget."""
+        index, start, end = part
+        length = end - start + 1
+        try:
+            if self._failed.is_set():
+                raise RuntimeError("Copy cancelled after an earlier part failed.")
+            kwargs = {
+                "Bucket": self.source_bucket,
+                "Key": self.source_key,
+                "Range": f"bytes={start}-{end}",
+            }
+            if self.head.get("ETag"):
+                kwargs["IfMatch"] = self.head["ETag"]
+            with self.source_controller.slot():
+                body = self.source_client.get_object(**kwargs)["Body"]
+                try:
+                    data = body.read()
+                finally:
+                    body.close()
+            if len(data) != length:
+                raise IOError(
+                    f"Short read for bytes {start}-{end} of '{self.source_key}'"
+                )
+            with self.controller.slot():
+                response = self.s3.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=self.object_key,
+                    UploadId=upload_id,
+                    PartNumber=index + 1,
+                    Body=data,
+                )
+            if self.callback:
+                self.callback(length)
+            return {"PartNumber": index + 1, "ETag": response["ETag"]}
+        except BaseException:
+            self._failed.set()
+            raise
+        finally:
+            self.budget.release(length)
+
+    def _abort(self, upload_id: str) -> None:
+        """Abort the multipart upload after a failure."""
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.object_key, UploadId=upload_id
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            if self.logger:
+                self.logger.error(
+                    "Failed to abort multipart upload %s: %s", upload_id, e
+                )
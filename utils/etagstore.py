@@ -0,0 +1,148 @@
+"""
+ETag Store Utility for R2Py CLI.
+
+This module provides the ETagStore class, which remembers the ETag and last-modified
+time of the object each downloaded file came from, so a later download can send a
+conditional GET (If-None-Match) and skip unchanged objects with a 304. The record is
+kept in an extended attribute on the file itself where the filesystem supports it,
+and in a SQLite index in the cache directory otherwise. Each record also holds the
+file's size and modification time, and is ignored once the local file is modified.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from .cache import cache_dir
+from .logger import Logger
+
+logger = Logger("etagStore").get_logger()
+
+XATTR_NAME = "user.r2py.etag"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS etags (
+    path TEXT PRIMARY KEY,
+    record TEXT NOT NULL
+)
+"""
+
+
+class ETagStore:
+    """Remembers the remote ETag of downloaded files, in xattrs or a sidecar index."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store; the sidecar index is opened on first use.
+        Args:
+            path (Optional[str]): Index database (defaults to etags.sqlite in cache_dir()).
+        """
+        self.path = path or os.path.join(cache_dir(), "etags.sqlite")
+        self.use_xattr = hasattr(os, "setxattr")
+        self._db = None
+        self._lock = threading.Lock()
+
+    def get(self, filename: str) -> Optional[str]:
+        """
+        Return the ETag remembered for a file, if the file is unmodified since.
+        Args:
+            filename (str): Local file path.
+        Returns:
+            Optional[str]: The quoted ETag, or None if unknown or stale.
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        record = None
+        if self.use_xattr:
+            try:
+                record = json.loads(os.getxattr(filename, XATTR_NAME))
+            except (OSError, ValueError):
+                record = None
+        if record is None:
+            record = self._index_get(filename)
+        if (
+            not isinstance(record, dict)
+            or record.get("size") != stat.st_size
+            or record.get("mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        return record.get("etag")
+
+    def put(self, filename: str, etag: str, last_modified=None) -> None:
+        """
+        Remember the object a freshly downloaded file came from.
+        Args:
+            filename (str): Local file path.
+            etag (str): Object ETag.
+            last_modified: Object LastModified time, if known.
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError as e:
+            logger.warning("Could not remember ETag of '%s': %s", filename, e)
+            return
+        record = json.dumps(
+            {
+                "etag": etag,
+                "last_modified": str(last_modified) if last_modified else None,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        )
+        if self.use_xattr:
+            try:
+                os.setxattr(filename, XATTR_NAME, record.encode("utf-8"))
+                return
+            except OSError as e:
+                logger.debug("No xattr support for '%s', using index: %s", filename, e)
+        self._index_put(filename, record)
+
+    def _index(self) -> sqlite3.Connection:
+        """Return the sidecar index, creating it on first use."""
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute(_SCHEMA)
+            self._db.commit()
+        return self._db
+
+    def _index_get(self, filename: str) -> Optional[dict]:
+        """Read a record from the sidecar index."""
+        try:
+            with self._lock:
+                row = (
+                    self._index()
+                    .execute(
+                        "SELECT record FROM etags WHERE path=?",
+                        (os.path.realpath(filename),),
+                    )
+                    .fetchone()
+                )
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning("Could not read ETag index '%s': %s", self.path, e)
+            return None
+
+    def _index_put(self, filename: str, record: str) -> None:
+        """Write a record to the sidecar index."""
+        try:
+            with self._lock:
+                db = self._index()
+                db.execute(
+                    "INSERT OR REPLACE INTO etags VALUES (?, ?)",
+                    (os.path.realpath(filename), record),
+                )
+                db.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Could not write ETag index '%s': %s", self.path, e)
+
+    def close(self) -> None:
+        """Close the sidecar index."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,217 @@
+"""
+Hash Cache Utility for R2Py CLI.
+
+This module provides the HashCache class, a persistent SQLite table mapping a file's
+identity (device, inode, size, mtime_ns) to the digests computed for it, and the
+HashEngine class, which serves digests from the cache and computes missing ones in
+a shared process pool. Any change to a file changes its size or modification time,
+so cached digests are reused only while the file is untouched, and unchanged files
+are never read twice.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Sequence, Union
+
+from .cache import cache_dir
+from .hashing import hash_file
+from .logger import Logger
+
+logger = Logger("hashCache").get_logger()
+
+# Files up to this size are hashed in the calling thread; a process round trip
+# would cost more than the hashing itself.
+INLINE_HASH_SIZE = 4 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns, kind)
+) WITHOUT ROWID
+"""
+
+
+def file_identity(stat: os.stat_result) -> tuple:
+    """Return the (dev, ino, size, mtime_ns) tuple identifying a file's contents."""
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def digest_kind(algorithm: str, part_size: Union[int, Sequence[int], None]) -> str:
+    """
+    Return the cache kind of a digest, e.g. 'md5' or 'md5:8388608'.
+    Uneven part layouts are keyed by a hash of their part sizes.
+    """
+    if part_size is None:
+        return algorithm
+    if isinstance(part_size, int):
+        return f"{algorithm}:{part_size}"
+    layout = ",".join(str(length) for length in part_size).encode("ascii")
+    return f"{algorithm}:parts-{hashlib.sha256(layout).hexdigest()[:32]}"
+
+
+class HashCache:
+    """Persistent map of file identity to digests, stored in SQLite."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open or create the cache database.
+        Args:
+            path (Optional[str]): Database file (defaults to hashes.sqlite in cache_dir()).
+        """
+        self.path = path or os.path.join(cache_dir(), "hashes.sqlite")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def get(self, identity: tuple, kind: str) -> Optional[str]:
+        """Return the cached digest of kind for a file identity, if any."""
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT digest FROM digests WHERE dev=? AND ino=? AND size=? "
+                    "AND mtime_ns=? AND kind=?",
+                    (*identity, kind),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Could not read hash cache '%s': %s", self.path, e)
+            return None
+        return row[0] if row else None
+
+    def put(self, identity: tuple, digests: Dict[str, str]) -> None:
+        """Store digests (kind -> digest) for a file identity."""
+        try:
+            with self._lock:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*identity, kind, digest) for kind, digest in digests.items()],
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Could not write hash cache '%s': %s", self.path, e)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+class HashEngine:
+    """Serves file digests from a HashCache and hashes misses in a process pool."""
+
+    def __init__(
+        self, cache: Optional[HashCache] = None, workers: Optional[int] = None
+    ):
+        """
+        Initialize the engine.
+        Args:
+            cache (Optional[HashCache]): Digest cache (no caching if None).
+            workers (Optional[int]): Hashing processes (defaults to CPU count).
+        """
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.hits = 0
+        self.misses = 0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def digests(
+        self,
+        filename: str,
+        part_size: Union[int, Sequence[int], None] = None,
+        algorithms: Iterable[str] = ("md5",),
+    ) -> Dict[str, str]:
+        """
+        Return remote-style digests of a file, hashing it only if not cached.
+        Safe to call from many threads; large files are hashed in worker processes.
+        Args:
+            filename (str): Local file path.
+            part_size (Union[int, Sequence[int], None]): Multipart part size, the
+                size of each part when they differ, or None for single-part.
+            algorithms (Iterable[str]): Any of 'md5', 'crc32' and 'sha256'.
+        Returns:
+            Dict[str, str]: Digest per algorithm, as returned by hash_file.
+        """
+        algorithms = list(algorithms)
+        stat = os.stat(filename)
+        identity = file_identity(stat)
+        result = {}
+        if self.cache:
+            for algorithm in algorithms:
+                digest = self.cache.get(identity, digest_kind(algorithm, part_size))
+                if digest is not None:
+                    result[algorithm] = digest
+        missing = [a for a in algorithms if a not in result]
+        if not missing:
+            self.hits += 1
+            return result
+        self.misses += 1
+        if stat.st_size <= INLINE_HASH_SIZE:
+            computed = hash_file(filename, part_size, missing, workers=1)
+        else:
+            computed = (
+                self._process_pool()
+                .submit(hash_file, filename, part_size, missing)
+                .result()
+            )
+        # Only cache digests of a file that did not change while it was read.
+        if self.cache and file_identity(os.stat(filename)) == identity:
+            self.cache.put(
+                identity,
+                {digest_kind(a, part_size): d for a, d in computed.items()},
+            )
+        result.update(computed)
+        return result
+
+    def matches(
+        self,
+        filename: str,
+        size: int,
+        etag: str,
+        part_layout: Callable[[], Union[int, Sequence[int], None]],
+    ) -> bool:
+        """
+        Return True if a local file has the given remote size and ETag.
+        Args:
+            filename (str): Local file path.
+            size (int): Remote object size.
+            etag (str): Remote ETag, with or without quotes.
+            part_layout (Callable[[], Union[int, Sequence[int], None]]): Returns the
+                object's part size or part sizes, or None if unknown, such as
+                S3Base.part_layout(); only called for multipart ETags.
+        Returns:
+            bool: True if the file is unchanged.
+        """
+        if not os.path.isfile(filename) or os.path.getsize(filename) != size:
+            return False
+        etag = etag.strip('"')
+        layout = None
+        if "-" in etag:
+            layout = part_layout()
+            if layout is None:
+                return False
+        return self.digests(filename, layout)["md5"] == etag
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """Return the shared hashing pool, starting it on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def close(self) -> None:
+        """Stop the hashing processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
@@ -0,0 +1,147 @@
+"""
+File Hashing Utility for R2Py CLI.
+
+This module computes the digests R2 reports for an object from a local file, so
+files can be checked against remote objects without downloading anything: the
+ETag (the MD5 of the file, or for multipart uploads the MD5 of the part MD5s
+followed by '-<parts>') and the CRC32 and SHA-256 checksums in the same full or
+composite form. The file is memory-mapped and every (part, algorithm) pair is
+hashed by its own thread; hashlib and zlib release the GIL on large buffers, so
+big files are hashed on all cores.
+"""
+
+import base64
+import hashlib
+import mmap
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+ALGORITHMS = ("md5", "crc32", "sha256")
+CHECKSUM_ALGORITHMS = ("crc32", "sha256")
+
+
+def _digest(algorithm: str, data) -> bytes:
+    """Return the raw digest of data."""
+    if algorithm == "md5":
+        return hashlib.md5(data).digest()
+    if algorithm == "sha256":
+        return hashlib.sha256(data).digest()
+    if algorithm == "crc32":
+        return zlib.crc32(data).to_bytes(4, "big")
+    raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+
+
+def etag_part_count(etag: str) -> Optional[int]:
+    """
+    Return the number of parts encoded in a multipart ETag.
+    Args:
+        etag (str): ETag, with or without quotes.
+    Returns:
+        Optional[int]: The '-<parts>' suffix, or None for a single-part ETag.
+    """
+    _, sep, count = etag.strip('"').rpartition("-")
+    return int(count) if sep and count.isdigit() else None
+
+
+def part_spans(size: int, part_size: Union[int, Sequence[int]]) -> list:
+    """
+    Return the (start, length) of each part of an object.
+    Args:
+        size (int): Object size in bytes.
+        part_size (Union[int, Sequence[int]]): Uniform part size, or the size of
+            each part in order.
+    Returns:
+        list: One (start, length) tuple per part.
+    """
+    if isinstance(part_size, int):
+        return [
+            (start, min(part_size, size - start)) for start in range(0, size, part_size)
+        ]
+    spans, start = [], 0
+    for length in part_size:
+        spans.append((start, length))
+        start += length
+    return spans
+
+
+def combine_digests(algorithm: str, digests: list, multipart: bool) -> str:
+    """
+    Combine per-part digests the way S3 reports them.
+    Args:
+        algorithm (str): 'md5', 'crc32' or 'sha256'.
+        digests (list): Raw digest of each part, in order.
+        multipart (bool): True if the object was uploaded in parts.
+    Returns:
+        str: A hex ETag for 'md5', a base64 checksum otherwise, with a
+            '-<parts>' suffix for multipart objects.
+    """
+    if multipart:
+        combined = _digest(algorithm, b"".join(digests))
+        suffix = f"-{len(digests)}"
+    else:
+        combined = digests[0]
+        suffix = ""
+    if algorithm == "md5":
+        return combined.hex() + suffix
+    return base64.b64encode(combined).decode("ascii") + suffix
+
+
+def hash_file(
+    filename: str,
+    part_size: Union[int, Sequence[int], None] = None,
+    algorithms: Iterable[str] = ("md5",),
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Compute the remote-style digests of a local file.
+    Args:
+        filename (str): Local file path.
+        part_size (Union[int, Sequence[int], None]): Part size of the multipart
+            upload the file is compared with, the size of each of its parts when
+            they differ, or None for an object stored with a single request.
+        algorithms (Iterable[str]): Any of 'md5', 'crc32' and 'sha256'.
+        workers (Optional[int]): Hashing threads (defaults to CPU count).
+    Returns:
+        Dict[str, str]: Digest per algorithm; 'md5' is the ETag without quotes.
+    Raises:
+        ValueError: If an algorithm is unsupported or the part sizes do not add up
+            to the file size.
+    """
+    algorithms = list(dict.fromkeys(algorithms))
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    size = os.path.getsize(filename)
+    multipart = part_size is not None
+    if not multipart or (isinstance(part_size, int) and part_size <= 0):
+        part_size = max(size, 1)
+    if size == 0:
+        return {a: combine_digests(a, [_digest(a, b"")], multipart) for a in algorithms}
+    spans = part_spans(size, part_size)
+    if sum(length for _, length in spans) != size:
+        raise ValueError(f"Part sizes do not add up to the size of '{filename}'.")
+    with open(filename, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    try:
+        tasks = [(a, span) for span in spans for a in algorithms]
+        with ThreadPoolExecutor(
+            max_workers=min(workers or os.cpu_count() or 1, len(tasks))
+        ) as pool:
+            futures = {
+                (a, start): pool.submit(_digest, a, view[start : start + length])
+                for a, (start, length) in tasks
+            }
+            digests = {task: future.result() for task, future in futures.items()}
+    finally:
+        view.release()
+        try:
+            mapping.close()
+        except BufferError:
+            pass
+    return {
+        a: combine_digests(a, [digests[(a, start)] for start, _ in spans], multipart)
+        for a in algorithms
+    }
@@ -0,0 +1,66 @@
+"""
+Listing Utility for R2Py CLI.
+
+This module walks the objects under a prefix in key order and merge-joins two such
+walks, which is how prefixes are compared without holding either listing in
+memory. list_objects_v2 returns keys already sorted, so a walk can start after any
+key with StartAfter and stop as soon as it passes the end of its range.
+"""
+
+from typing import Iterator, Optional, Tuple
+
+
+def list_range(
+    client,
+    bucket_name: str,
+    prefix: str,
+    after: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[tuple]:
+    """
+    Yield the objects in a key range of a prefix, page by page, in key order.
+    Args:
+        client: boto3 S3 client.
+        bucket_name (str): Bucket name.
+        prefix (str): Key prefix.
+        after (Optional[str]): Only keys greater than this, relative to prefix.
+        until (Optional[str]): Only keys not greater than this, relative to prefix.
+    Yields:
+        tuple: (key relative to prefix, size, ETag without quotes).
+    """
+    kwargs = {"Bucket": bucket_name, "Prefix": prefix}
+    if after is not None:
+        kwargs["StartAfter"] = prefix + after
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(**kwargs):
+        for obj in page.get("Contents", []):
+            relative = obj["Key"][len(prefix) :]
+            if until is not None and relative > until:
+                return
+            yield relative, obj["Size"], (obj.get("ETag") or "").strip('"')
+
+
+def merge_listings(
+    source: Iterator[tuple], target: Iterator[tuple]
+) -> Iterator[Tuple[str, Optional[tuple], Optional[tuple]]]:
+    """
+    Merge-join two listings from list_range() by relative key.
+    Args:
+        source (Iterator[tuple]): Source listing.
+        target (Iterator[tuple]): Target listing.
+    Yields:
+        tuple: (status, source object, target object), where status is 'added',
+            'removed', 'changed' or 'unchanged' and the missing side is None.
+    """
+    left, right = next(source, None), next(target, None)
+    while left is not None or right is not None:
+        if right is None or (left is not None and left[0] < right[0]):
+            yield "removed", left, None
+            left = next(source, None)
+        elif left is None or right[0] < left[0]:
+            yield "added", None, right
+            right = next(target, None)
+        else:
+            same = left[1] == right[1] and left[2] == right[2]
+            yield ("unchanged" if same else "changed"), left, right
+            left, right = next(source, None), next(target, None)
@@ -0,0 +1,221 @@
+"""
+Multipart Upload Engine for R2Py CLI.
+
+This module provides the MmapUpload class, which uploads a large local file as a
+multipart upload without copying its contents through Python buffers. The file is
+memory-mapped once and each part is sent as a memoryview slice of the mapping, so
+the kernel page cache is the only copy of the data. Parts are put in flight only
+when they fit in a ByteBudget, which caps memory by a configurable number of bytes
+rather than by part count times part size, and part workers are gated by the
+shared AdaptiveConcurrency controller.
+"""
+
+import io
+import math
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .budget import ByteBudget
+from .concurrency import AdaptiveConcurrency
+
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_IN_FLIGHT = 256 * 1024 * 1024
+MAX_PARTS = 10000
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+
+
+def part_size_for(total_size: int, part_size: int = DEFAULT_PART_SIZE) -> int:
+    """
+    Return a valid multipart part size for an object of total_size bytes.
+    Args:
+        total_size (int): Object size in bytes.
+        part_size (int): Preferred part size in bytes.
+    Returns:
+        int: Part size that respects the 5 MiB minimum and the 10,000 part limit.
+    """
+    return max(part_size, MIN_PART_SIZE, math.ceil(total_size / MAX_PARTS))
+
+
+class MemoryviewReader(io.RawIOBase):
+    """Read-only, seekable file object over a memoryview that never copies."""
+
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self._view = view
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> memoryview:
+        """Return the next size bytes as a slice of the underlying view."""
+        end = len(self._view) if size is None or size < 0 else self._position + size
+        chunk = self._view[self._position : end]
+        self._position += len(chunk)
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        chunk = self.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = min(max(offset, 0), len(self._view))
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class MmapUpload:
+    """Zero-copy multipart upload of a local file through a memory map."""
+
+    def __init__(
+        self,
+        client,
+        filename: str,
+        bucket_name: str,
+        object_key: str,
+        extra_args: Optional[dict] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        callback: Optional[Callable[[int], None]] = None,
+        logger=None,
+        budget=None,
+    ):
+        """
+        Initialize the upload engine.
+        Args:
+            client: boto3 S3 client.
+            filename (str): Local file path to upload.
+            bucket_name (str): Target bucket name.
+            object_key (str): S3 object key.
+            extra_args (Optional[dict]): Extra CreateMultipartUpload arguments.
+            controller (Optional[AdaptiveConcurrency]): Controller gating part workers.
+            part_size (int): Preferred part size in bytes.
+            max_in_flight (int): Maximum bytes of parts in flight at once.
+            callback (Optional[Callable[[int], None]]): Progress callback in bytes.
+            logger: Logger for engine messages.
+            budget: Shared budget to take parts from instead of max_in_flight, such
+                as a TransferScheduler.budget().
+        """
+        self.s3 = client
+        self.filename = filename
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.extra_args = extra_args or {}
+        self.controller = controller or AdaptiveConcurrency()
+        self.total_size = os.path.getsize(filename)
+        self.part_size = part_size_for(self.total_size, part_size)
+        self.budget = budget or ByteBudget(max(max_in_flight, self.part_size))
+        self.callback = callback
+        self.logger = logger
+        self._failed = threading.Event()
+
+    def run(self) -> dict:
+        """
+        Upload the file and complete the multipart upload.
+        Returns:
+            dict: The CompleteMultipartUpload response.
+        Raises:
+            Exception: Any part or API error; the multipart upload is aborted.
+        """
+        upload_id = self.s3.create_multipart_upload(
+            Bucket=self.bucket_name, Key=self.object_key, **self.extra_args
+        )["UploadId"]
+        try:
+            parts = self._upload_parts(upload_id)
+            response = self.s3.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self._abort(upload_id)
+            raise
+        if self.logger:
+            self.logger.info(
+                "Uploaded '%s' in %d parts (peak %.2f MB in flight).",
+                self.filename,
+                len(parts),
+                self.budget.peak / (1024 * 1024),
+            )
+        return response
+
+    def _upload_parts(self, upload_id: str) -> list:
+        """Map the file and upload each part as a slice of the mapping."""
+        with open(self.filename, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        try:
+            return self._submit_parts(upload_id, view)
+        finally:
+            view.release()
+            try:
+                mapping.close()
+            except BufferError:
+                # A slice is still referenced by a retried request; let GC unmap it.
+                pass
+
+    def _submit_parts(self, upload_id: str, view: memoryview) -> list:
+        """Put parts in flight as the byte budget allows and collect their ETags."""
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.controller.maximum) as pool:
+            for number, start in enumerate(
+                range(0, self.total_size, self.part_size), start=1
+            ):
+                if self._failed.is_set():
+                    break
+                chunk = view[start : start + self.part_size]
+                self.budget.acquire(len(chunk))
+                futures.append(pool.submit(self._upload_part, upload_id, number, chunk))
+        return [future.result() for future in futures]
+
+    def _upload_part(self, upload_id: str, number: int, chunk: memoryview) -> dict:
+        """Upload one part and release its share of the byte budget."""
+        try:
+            with self.controller.slot():
+                response = self.s3.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=self.object_key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=MemoryviewReader(chunk),
+                )
+            if self.callback:
+                self.callback(len(chunk))
+            return {"PartNumber": number, "ETag": response["ETag"]}
+        except BaseException:
+            self._failed.set()
+            raise
+        finally:
+            self.budget.release(len(chunk))
+            chunk.release()
+
+    def _abort(self, upload_id: str) -> None:
+        """Abort the multipart upload after a failure."""
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.object_key, UploadId=upload_id
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            if self.logger:
+                self.logger.error(
+                    "Failed to abort multipart upload %s: %s", upload_id, e
+                )
@@ -0,0 +1,259 @@
+"""
+Object Cache Utility for R2Py CLI.
+
+This module provides the ObjectCache class, a shared on-disk read-through cache of
+object contents keyed by endpoint, bucket, key and ETag. Hits are materialized by a
+reflink (copy-on-write clone) where the filesystem supports it and otherwise by a
+plain copy, so the served file is an independent, writable file. Hard links can be
+enabled instead of copies to save space and time, at the cost of read-only files
+that share their data with the cache entry. Entries are tracked in a SQLite index
+and evicted in least recently used order once the cache grows past its size limit.
+A lock file (flock) serializes insertions and eviction across processes, while hits
+share the lock. Entries are stored read-only, which keeps accidental writes through
+a hard link out of the cache.
+"""
+
+import contextlib
+import hashlib
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .cache import cache_dir
+from .logger import Logger
+
+logger = Logger("objectCache").get_logger()
+
+DEFAULT_MAX_SIZE = 10 * 1024**3
+# ioctl request that clones one file's extents into another (Linux, btrfs/XFS).
+FICLONE = 0x40049409
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def reflink(source: str, destination: str) -> bool:
+    """
+    Clone source into a new file at destination without copying its data.
+    Args:
+        source (str): Existing file.
+        destination (str): Path of the clone (must not exist).
+    Returns:
+        bool: True if cloned, False if the filesystem cannot clone.
+    """
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        return False
+    with open(source, "rb") as src:
+        try:
+            with open(destination, "xb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(destination)
+            return False
+
+
+class ObjectCache:
+    """Size-bounded LRU cache of object contents shared between processes."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        hard_links: bool = False,
+    ):
+        """
+        Open or create the cache.
+        Args:
+            directory (Optional[str]): Cache directory (defaults to objects/ in cache_dir()).
+            max_size (int): Maximum total size of cached objects in bytes.
+            hard_links (bool): Serve hits by hard link when reflinks are not
+                supported. The served files are read-only and share the entry's
+                data, so they must not be made writable and edited.
+        """
+        self.directory = directory or os.path.join(cache_dir(), "objects")
+        self.max_size = max_size
+        self.hard_links = hard_links
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.join(self.directory, "data"), exist_ok=True)
+        self._lock_path = os.path.join(self.directory, "lock")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.directory, "index.sqlite"),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    @staticmethod
+    def entry_name(endpoint_url: str, bucket_name: str, object_key: str, etag: str):
+        """Return the cache entry name of one version of an object."""
+        identity = "\0".join((endpoint_url or "", bucket_name, object_key, etag))
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def entry_path(self, name: str) -> str:
+        """Return the data file of a cache entry."""
+        return os.path.join(self.directory, "data", name[:2], name)
+
+    def fetch(self, name: str, filename: str, size: int) -> bool:
+        """
+        Materialize a cached object at filename, if the cache holds it.
+        Args:
+            name (str): Entry name from entry_name().
+            filename (str): Local destination path (replaced atomically).
+            size (int): Expected object size.
+        Returns:
+            bool: True on a hit, False if the object must be downloaded.
+        """
+        path = self.entry_path(name)
+        with self._file_lock(exclusive=False):
+            try:
+                if os.path.getsize(path) != size:
+                    raise FileNotFoundError(path)
+            except OSError:
+                self.misses += 1
+                return False
+            try:
+                method = self._materialize(path, filename)
+                self._execute(
+                    "UPDATE entries SET last_used=? WHERE name=?", (time.time(), name)
+                )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Could not serve '%s' from the cache: %s", filename, e)
+                self.misses += 1
+                return False
+        self.hits += 1
+        logger.info("Served '%s' from the object cache by %s.", filename, method)
+        return True
+
+    def store(self, name: str, filename: str) -> None:
+        """
+        Add a freshly downloaded file to the cache and evict old entries.
+        Failures are only logged; the download itself already succeeded.
+        Args:
+            name (str): Entry name from entry_name().
+            filename (str): Downloaded file.
+        """
+        path = self.entry_path(name)
+        try:
+            size = os.path.getsize(filename)
+            if size > self.max_size:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            os.close(fd)
+            os.unlink(temp_path)
+            try:
+                if not reflink(filename, temp_path):
+                    shutil.copyfile(filename, temp_path)
+                os.chmod(temp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                with self._file_lock(exclusive=True):
+                    os.replace(temp_path, path)
+                    self._execute(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                        (name, size, time.time()),
+                    )
+                    self._evict()
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_path)
+                raise
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Could not add '%s' to the object cache: %s", filename, e)
+
+    def total_size(self) -> int:
+        """Return the total size of the cached objects in bytes."""
+        with self._lock:
+            row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+            return row.fetchone()[0]
+
+    def close(self) -> None:
+        """Close the index."""
+        with self._lock:
+            self._db.close()
+
+    def _materialize(self, path: str, filename: str) -> str:
+        """Place a cache entry at filename by reflink, hard link if enabled, or copy."""
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        os.unlink(temp_path)
+        try:
+            if reflink(path, temp_path):
+                method = "reflink"
+            elif self.hard_links and self._link(path, temp_path):
+                method = "hard link"
+            else:
+                shutil.copyfile(path, temp_path)
+                method = "copy"
+            os.replace(temp_path, filename)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+        return method
+
+    @staticmethod
+    def _link(path: str, temp_path: str) -> bool:
+        """Hard-link a cache entry, or return False if the filesystem refuses."""
+        try:
+            os.link(path, temp_path)
+            return True
+        except OSError:
+            return False
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits (lock held)."""
+        total = self.total_size()
+        if total <= self.max_size:
+            return
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, size FROM entries ORDER BY last_used"
+            ).fetchall()
+        for name, size in rows:
+            if total <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.entry_path(name))
+            self._execute("DELETE FROM entries WHERE name=?", (name,))
+            total -= size
+            logger.debug("Evicted '%s' (%d bytes) from the object cache.", name, size)
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        """Run one write statement against the index."""
+        with self._lock:
+            self._db.execute(sql, params)
+            self._db.commit()
+
+    @contextlib.contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold the cross-process cache lock, shared or exclusive."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a+b") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,247 @@
+"""
+Pack Utility for R2Py CLI.
+
+This module bundles many small files into large shard objects, so uploading a tree
+of tiny files costs one multipart upload per few hundred megabytes instead of one
+PutObject per file. Shards are plain ustar/pax tar archives, readable by any tar
+tool, and every member's data offset is computed before the shard is written. The
+pack index maps each file to (shard, offset, length), so a single file can be read
+back with one ranged GET. TarShardReader produces a shard as a byte stream from the
+local files, so shards are never staged on disk or held in memory.
+"""
+
+import gzip
+import io
+import json
+import os
+import tarfile
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+PACK_DIR = ".r2pack/"
+INDEX_NAME = "index.json.gz"
+INDEX_VERSION = 1
+DEFAULT_SHARD_SIZE = 256 * 1024 * 1024
+BLOCK_SIZE = tarfile.BLOCKSIZE
+
+
+def pack_key(prefix: str, name: str) -> str:
+    """Return the key of a shard or of the index for a packed prefix."""
+    return f"{prefix}{PACK_DIR}{name}"
+
+
+def padding(size: int) -> int:
+    """Return the number of zero bytes that pad size bytes to a tar block."""
+    return -size % BLOCK_SIZE
+
+
+def tar_header(name: str, size: int, mtime: int = 0, mode: int = 0o644) -> bytes:
+    """
+    Return the tar header blocks of a regular file member.
+    Long names and large sizes use pax extended headers.
+    Args:
+        name (str): Member name.
+        size (int): Member size in bytes.
+        mtime (int): Modification time in seconds since the epoch.
+        mode (int): Permission bits.
+    Returns:
+        bytes: One or more 512-byte blocks preceding the member's data.
+    """
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = mtime
+    info.mode = mode
+    return info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+
+
+def plan_shards(
+    files: Iterable[Tuple[str, str, int]], shard_size: int = DEFAULT_SHARD_SIZE
+) -> Iterator[List[Tuple[str, str, int]]]:
+    """
+    Group files into shards of roughly shard_size bytes, in the given order.
+    Files are consumed lazily, so each shard is yielded as soon as it is full.
+    Args:
+        files (Iterable[Tuple[str, str, int]]): (path, member name, size) tuples.
+        shard_size (int): Target shard size in bytes.
+    Yields:
+        List[Tuple[str, str, int]]: Files of each shard.
+    """
+    current, current_size = [], 0
+    for path, name, size in files:
+        if current and current_size + size > shard_size:
+            yield current
+            current, current_size = [], 0
+        current.append((path, name, size))
+        current_size += size + BLOCK_SIZE + padding(size)
+    if current:
+        yield current
+
+
+class TarShardReader(io.RawIOBase):
+    """Readable stream of a tar archive built from local files on the fly."""
+
+    def __init__(self, files: List[Tuple[str, str, int]]):
+        """
+        Lay out the archive; files are opened only as the stream reaches them.
+        Args:
+            files (List[Tuple[str, str, int]]): (path, member name, size) tuples;
+                each file must still have at least size bytes when it is read.
+        """
+        super().__init__()
+        self.members: List[Tuple[str, int, int]] = []
+        self._segments = deque()
+        offset = 0
+        for path, name, size in files:
+            try:
+                stat = os.stat(path)
+                header = tar_header(
+                    name, size, int(stat.st_mtime), stat.st_mode & 0o7777
+                )
+            except OSError:
+                header = tar_header(name, size)
+            self._segments.append(header)
+            offset += len(header)
+            self.members.append((name, offset, size))
+            self._segments.append((path, size))
+            self._segments.append(bytes(padding(size)))
+            offset += size + padding(size)
+        self._segments.append(bytes(2 * BLOCK_SIZE))
+        self.size = offset + 2 * BLOCK_SIZE
+        self._current = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Fill buffer with the next bytes of the archive."""
+        view = memoryview(buffer).cast("B")
+        while True:
+            if self._current is None:
+                if not self._segments:
+                    return 0
+                segment = self._segments.popleft()
+                if isinstance(segment, bytes):
+                    self._current = (io.BytesIO(segment), len(segment), None)
+                else:
+                    path, size = segment
+                    self._current = (open(path, "rb"), size, path)
+            source, remaining, path = self._current
+            if remaining == 0:
+                source.close()
+                self._current = None
+                continue
+            read = source.readinto(view[: min(len(view), remaining)])
+            if not read:
+                source.close()
+                raise IOError(f"'{path}' shrank while it was being packed")
+            self._current = (source, remaining - read, path)
+            return read
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current[0].close()
+            self._current = None
+        super().close()
+
+
+class PackIndex:
+    """Map of packed file names to (shard, offset, length)."""
+
+    def __init__(self, shards: Optional[List[str]] = None, files=None):
+        """
+        Initialize the index.
+        Args:
+            shards (Optional[List[str]]): Shard names, relative to the pack directory.
+            files: Mapping of file name to (shard number, offset, length).
+        """
+        self.shards = list(shards or [])
+        self.files: Dict[str, Tuple[int, int, int]] = dict(files or {})
+
+    def add_shard(self, name: str, members: List[Tuple[str, int, int]]) -> None:
+        """Add a shard and its members, replacing earlier entries for the same names."""
+        number = len(self.shards)
+        self.shards.append(name)
+        for member, offset, size in members:
+            self.files[member] = (number, offset, size)
+
+    def locate(self, name: str) -> Tuple[str, int, int]:
+        """
+        Return (shard name, offset, length) of a packed file.
+        Raises:
+            KeyError: If the file is not in the index.
+        """
+        shard, offset, size = self.files[name]
+        return self.shards[shard], offset, size
+
+    def by_shard(self) -> Dict[str, List[Tuple[str, int, int]]]:
+        """Return the current members of each shard, sorted by offset."""
+        members: Dict[str, List[Tuple[str, int, int]]] = {}
+        for name, (shard, offset, size) in self.files.items():
+            members.setdefault(self.shards[shard], []).append((name, offset, size))
+        for entries in members.values():
+            entries.sort(key=lambda entry: entry[1])
+        return members
+
+    def unused_shards(self) -> List[str]:
+        """Return the shards no file entry refers to any more."""
+        used = {shard for shard, _, _ in self.files.values()}
+        return [name for number, name in enumerate(self.shards) if number not in used]
+
+    def to_bytes(self) -> bytes:
+        """Encode the index as gzip-compressed JSON."""
+        used = sorted({shard for shard, _, _ in self.files.values()})
+        renumber = {old: new for new, old in enumerate(used)}
+        document = {
+            "version": INDEX_VERSION,
+            "shards": [self.shards[number] for number in used],
+            "files": [
+                [name, renumber[shard], offset, size]
+                for name, (shard, offset, size) in sorted(self.files.items())
+            ],
+        }
+        return gzip.compress(json.dumps(document, separators=(",", ":")).encode())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PackIndex":
+        """
+        Decode an index written by to_bytes().
+        Raises:
+            ValueError: If the data is not a supported pack index.
+        """
+        document = json.loads(gzip.decompress(data))
+        if document.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported pack index version: {document.get('version')}"
+            )
+        return cls(
+            document["shards"],
+            {
+                name: (shard, offset, size)
+                for name, shard, offset, size in document["files"]
+            },
+        )
+
+
+def read_index(client, bucket_name: str, prefix: str) -> Optional[PackIndex]:
+    """
+    Fetch the pack index of a prefix.
+    Args:
+        client: boto3 S3 client.
+        bucket_name (str): Bucket name.
+        prefix (str): Key prefix the files were packed under.
+    Returns:
+        Optional[PackIndex]: The index, or None if the prefix has no packed files.
+    """
+    try:
+        body = client.get_object(Bucket=bucket_name, Key=pack_key(prefix, INDEX_NAME))[
+            "Body"
+        ]
+    except Exception as e:
+        code = getattr(e, "response", {}).get("Error", {}).get("Code")
+        if code in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    try:
+        return PackIndex.from_bytes(body.read())
+    finally:
+        body.close()
@@ -0,0 +1,157 @@
+"""
+Server-Side Copy Engine for R2Py CLI.
+
+This module provides the PartCopy class, which copies a large object inside R2 as a
+multipart upload whose parts are filled with parallel UploadPartCopy requests. Each
+part names a byte range of the source object, so no data crosses the client's
+network; the source is pinned by ETag so a concurrent overwrite fails the copy
+instead of producing a mixed object. Part workers are gated by the shared
+AdaptiveConcurrency controller and, when copying many objects, by the connection
+budget of a TransferScheduler.
+"""
+
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .concurrency import AdaptiveConcurrency
+from .multipart import part_size_for
+from .ranged import plan_parts
+
+DEFAULT_COPY_PART_SIZE = 64 * 1024 * 1024
+# Headers carried over from the source, since a multipart copy starts a new object.
+COPIED_HEADERS = (
+    "ContentType",
+    "ContentEncoding",
+    "ContentDisposition",
+    "ContentLanguage",
+    "CacheControl",
+    "Metadata",
+)
+
+
+class PartCopy:
+    """Parallel UploadPartCopy of one object to another key or bucket."""
+
+    def __init__(
+        self,
+        client,
+        source_bucket: str,
+        source_key: str,
+        bucket_name: str,
+        object_key: str,
+        head: dict,
+        controller: Optional[AdaptiveConcurrency] = None,
+        part_size: int = DEFAULT_COPY_PART_SIZE,
+        callback: Optional[Callable[[int], None]] = None,
+        logger=None,
+        budget=None,
+    ):
+        """
+        Initialize the copy engine.
+        Args:
+            client: boto3 S3 client.
+            source_bucket (str): Source bucket name.
+            source_key (str): Source object key.
+            bucket_name (str): Destination bucket name.
+            object_key (str): Destination object key.
+            head (dict): HeadObject response of the source object.
+            controller (Optional[AdaptiveConcurrency]): Controller gating part workers.
+            part_size (int): Preferred part size in bytes.
+            callback (Optional[Callable[[int], None]]): Progress callback in bytes.
+            logger: Logger for engine messages.
+            budget: Shared budget each part takes a connection from, such as a
+                TransferScheduler.budget(). Parts are copied server-side and hold
+                no local memory, so they take no bytes from it.
+        """
+        self.s3 = client
+        self.source = {"Bucket": source_bucket, "Key": source_key}
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.head = head
+        self.total_size = head["ContentLength"]
+        self.controller = controller or AdaptiveConcurrency()
+        self.parts = plan_parts(
+            self.total_size, part_size_for(self.total_size, part_size)
+        )
+        self.callback = callback
+        self.logger = logger
+        self.budget = budget
+        self._failed = threading.Event()
+
+    def run(self) -> dict:
+        """
+        Copy the object and complete the multipart upload.
+        Returns:
+            dict: The CompleteMultipartUpload response.
+        Raises:
+            Exception: Any part or API error; the multipart upload is aborted.
+        """
+        extra_args = {k: self.head[k] for k in COPIED_HEADERS if self.head.get(k)}
+        upload_id = self.s3.create_multipart_upload(
+            Bucket=self.bucket_name, Key=self.object_key, **extra_args
+        )["UploadId"]
+        try:
+            with ThreadPoolExecutor(max_workers=self.controller.maximum) as pool:
+                futures = [
+                    pool.submit(self._copy_part, upload_id, part) for part in self.parts
+                ]
+                parts = [future.result() for future in futures]
+            response = self.s3.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self._abort(upload_id)
+            raise
+        if self.logger:
+            self.logger.info(
+                "Copied '%s/%s' to '%s/%s' in %d parts.",
+                self.source["Bucket"],
+                self.source["Key"],
+                self.bucket_name,
+                self.object_key,
+                len(parts),
+            )
+        return response
+
+    def _copy_part(self, upload_id: str, part: tuple) -> dict:
+        """Copy one byte range of the source into the destination upload."""
+        index, start, end = part
+        if self._failed.is_set():
+            raise RuntimeError("Copy cancelled after an earlier part failed.")
+        kwargs = {
+            "Bucket": self.bucket_name,
+            "Key": self.object_key,
+            "UploadId": upload_id,
+            "PartNumber": index + 1,
+            "CopySource": self.source,
+            "CopySourceRange": f"bytes={start}-{end}",
+        }
+        if self.head.get("ETag"):
+            kwargs["CopySourceIfMatch"] = self.head["ETag"]
+        try:
+            with self.budget.part(0) if self.budget else nullcontext():
+                with self.controller.slot():
+                    response = self.s3.upload_part_copy(**kwargs)
+        except BaseException:
+            self._failed.set()
+            raise
+        if self.callback:
+            self.callback(end - start + 1)
+        return {"PartNumber": index + 1, "ETag": response["CopyPartResult"]["ETag"]}
+
+    def _abort(self, upload_id: str) -> None:
+        """Abort the multipart upload after a failure."""
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.object_key, UploadId=upload_id
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            if self.logger:
+                self.logger.error(
+                    "Failed to abort multipart upload %s: %s", upload_id, e
+                )
@@ -5,7 +5,8 @@ This module provides the TqdmProgress class, which integrates the tqdm library t
 a colored, real-time progress bar for file uploads and downloads to/from S3-compatible storage.
 The progress bar automatically scales units and provides clear feedback to users during
 long-running data transfers via the CLI. Use this for visual feedback in both uploads and downloads,
-optionally emitting detailed logs about the transfer process.
+optionally emitting detailed logs about the transfer process. Streams ('-' for
+stdin/stdout) are supported; an upload from stdin shows a bar of unknown length.
 """
 
 import os
@@ -14,58 +15,66 @@ from .logger import Logger
 
 
 class TqdmProgress:
-    """Progress bar callback for S3 downloads or uploads."""
+    """Progress bar callback for S3 downloads, uploads or server-side copies."""
+
+    COLOURS = {"upload": "green", "download": "blue", "copy": "cyan"}
+    VERBS = {"upload": "Uploaded", "download": "Downloaded", "copy": "Copied"}
 
     def __init__(
         self, filename: str, action: str, total_size: int = None, logger: Logger = None
     ):
         """
-        Initialize the progress bar for upload or download.
+        Initialize the progress bar for an upload, download or copy.
         Args:
-            filename (str): File being transferred.
-            action (str): 'upload' or 'download'.
-            total_size (int, optional): Total size in bytes (required for download).
+            filename (str): File being transferred, or '-' for stdin/stdout.
+            action (str): 'upload', 'download' or 'copy'.
+            total_size (int, optional): Total size in bytes (required for download
+                and copy, unknown for uploads from stdin).
             logger (Logger, optional): Logger for progress messages.
         """
         self._filename = filename
         self._action = action
         self.logger = logger
         if action == "upload":
-            self._size = (
-                float(os.path.getsize(filename))
-                if total_size is None
-                else float(total_size)
-            )
-        elif action == "download":
+            if total_size is not None:
+                self._size = float(total_size)
+            elif filename == "-":
+                self._size = None
+            else:
+                self._size = float(os.path.getsize(filename))
+        elif action in ("download", "copy"):
             if total_size is None:
-                raise ValueError("total_size must be provided for downloads")
+                raise ValueError(f"total_size must be provided for {action}s")
             self._size = float(total_size)
         else:
-            raise ValueError("action must be 'upload' or 'download'")
+            raise ValueError("action must be 'upload', 'download' or 'copy'")
         self._tqdm = tqdm(
             total=self._size,
             unit="B",
             unit_scale=True,
             unit_divisor=1024,
-            desc=os.path.basename(filename),
+            desc=self._description(filename, action),
             leave=True,
             dynamic_ncols=True,
-            colour="green" if action == "upload" else "blue",
+            colour=self.COLOURS[action],
         )
         self._seen_so_far = 0
         if self.logger:
-            if action == "upload":
-                self.logger.info(
-                    f"Starting upload for {self._filename} "
-                    f"({self._size / (1024 * 1024):.2f} MB)"
-                )
-            else:
-                self.logger.info(
-                    f"Starting download for {self._filename} "
-                    f"({self._size / (1024 * 1024):.2f} MB)"
-                )
+            size = (
+                "unknown size"
+                if self._size is None
+                else f"{self._size / (1024 * 1024):.2f} MB"
+            )
+            self.logger.info(f"Starting {action} for {self._filename} ({size})")
             self.logger.info(f"Progress bar initialized for {self._filename}")
-            self.logger.info(f"File size: {self._size / (1024 * 1024):.2f} MB")
+            self.logger.info(f"File size: {size}")
+
+    @staticmethod
+    def _description(filename: str, action: str) -> str:
+        """Return the progress bar label for filename."""
+        if filename == "-":
+            return "stdin" if action == "upload" else "stdout"
+        return os.path.basename(filename)
 
     def __call__(self, bytes_amount: int) -> None:
         """
@@ -76,7 +85,7 @@ class TqdmProgress:
         self._seen_so_far += bytes_amount
         self._tqdm.update(bytes_amount)
         if self.logger:
-            action_str = "Uploaded" if self._action == "upload" else "Downloaded"
+            action_str = self.VERBS[self._action]
             mb_seen = self._seen_so_far / (1024 * 1024)
             self.logger.debug(f"{action_str} {mb_seen:.2f} MB of {self._filename}")
 
@@ -0,0 +1,442 @@
+"""
+Ranged Download Engine for R2Py CLI.
+
+This module provides the RangedDownload class, which downloads a single object as
+parallel ranged GETs. Part workers are gated by the shared AdaptiveConcurrency
+controller. Optionally, the engine hedges slow parts: when a part has been running
+longer than a latency percentile computed from its already finished siblings, a
+duplicate request is issued for the same range, the first attempt to finish wins and
+the loser is cancelled by closing its response stream. Hedges are capped by a budget
+of extra requests. Every attempt is pinned to the object's ETag with IfMatch, so both
+attempts write identical bytes to the same offsets.
+
+On POSIX systems run_to_file() preallocates the target with posix_fallocate and each
+worker writes straight into its offset with os.pwrite from a per-thread buffer that is
+reused across parts, so no lock serializes the parts. Data lands in a temporary file
+next to the target, which is fsynced and renamed into place once every part is done.
+"""
+
+import io
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+
+from .concurrency import AdaptiveConcurrency
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+MAX_PARTS = 10000
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def plan_parts(total_size: int, part_size: int = DEFAULT_PART_SIZE) -> List[tuple]:
+    """
+    Split an object into byte ranges.
+    Args:
+        total_size (int): Object size in bytes.
+        part_size (int): Preferred part size in bytes.
+    Returns:
+        List[tuple]: (index, start, end) tuples with inclusive end offsets.
+    """
+    part_size = max(part_size, math.ceil(total_size / MAX_PARTS))
+    return [
+        (index, start, min(start + part_size, total_size) - 1)
+        for index, start in enumerate(range(0, total_size, part_size))
+    ]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Return the nearest-rank percentile of values.
+    Args:
+        values (List[float]): Samples (must not be empty).
+        fraction (float): Percentile as a fraction between 0 and 1.
+    Returns:
+        float: The percentile value.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class _Part:
+    """State shared by every attempt downloading the same byte range."""
+
+    def __init__(self, index: int, start: int, end: int):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.started_at = None
+        self.finished_at = None
+        self.done = False
+        self.hedged = False
+        self.attempts = 0
+        self.failures = 0
+        self.reported = 0
+        self.winner = None
+
+    @property
+    def length(self) -> int:
+        """Number of bytes in the range."""
+        return self.end - self.start + 1
+
+
+class RangedDownload:
+    """Parallel ranged-GET download of one object with optional request hedging."""
+
+    def __init__(
+        self,
+        client,
+        bucket_name: str,
+        object_key: str,
+        total_size: int,
+        etag: Optional[str] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_budget: float = 0.1,
+        hedge_min_samples: int = 4,
+        callback: Optional[Callable[[int], None]] = None,
+        logger=None,
+        budget=None,
+    ):
+        """
+        Initialize the download engine.
+        Args:
+            client: boto3 S3 client.
+            bucket_name (str): Source bucket name.
+            object_key (str): S3 object key to download.
+            total_size (int): Object size in bytes.
+            etag (Optional[str]): ETag pinned on every ranged GET with IfMatch.
+            controller (Optional[AdaptiveConcurrency]): Controller gating part workers.
+            part_size (int): Size of each ranged GET in bytes.
+            hedge (bool): Issue duplicate requests for slow parts.
+            hedge_percentile (float): Sibling latency percentile a part must exceed.
+            hedge_budget (float): Maximum extra requests as a fraction of the parts.
+            hedge_min_samples (int): Finished parts required before hedging starts.
+            callback (Optional[Callable[[int], None]]): Progress callback in bytes.
+            logger: Logger for engine messages.
+            budget: Shared budget each primary part is taken from before its GET,
+                such as a TransferScheduler.budget().
+        """
+        self.s3 = client
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.total_size = total_size
+        self.etag = etag
+        self.controller = controller or AdaptiveConcurrency()
+        self.parts = [_Part(*p) for p in plan_parts(total_size, part_size)]
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_limit = max(1, math.ceil(len(self.parts) * hedge_budget))
+        self.hedge_min_samples = hedge_min_samples
+        self.callback = callback
+        self.logger = logger
+        self.budget = budget
+        self.hedges_issued = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def run(self, fileobj) -> dict:
+        """
+        Download every part into a seekable, writable file object.
+        Args:
+            fileobj: Binary file object opened for writing.
+        Returns:
+            dict: Part count and hedging statistics.
+        Raises:
+            Exception: The last error of a part whose attempts all failed.
+        """
+        return self._run(_LockedFileSink(fileobj))
+
+    def run_to_file(self, filename: str) -> dict:
+        """
+        Download every part into filename with preallocated positional writes.
+        The data is written to a temporary file in the same directory, fsynced,
+        and atomically renamed over filename once all parts have completed.
+        Args:
+            filename (str): Local destination path.
+        Returns:
+            dict: Part count and hedging statistics.
+        Raises:
+            Exception: The last error of a part whose attempts all failed.
+        """
+        temp_name = temp_path_for(filename)
+        fd = os.open(temp_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            preallocate(fd, self.total_size)
+            stats = self._run(_PositionalSink(fd))
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            os.unlink(temp_name)
+            raise
+        os.close(fd)
+        os.replace(temp_name, filename)
+        fsync_directory(filename)
+        return stats
+
+    def _run(self, sink) -> dict:
+        """Download every part into sink, hedging slow parts if enabled."""
+        self._sink = sink
+        primary_pool = ThreadPoolExecutor(max_workers=self.controller.maximum)
+        hedge_pool = ThreadPoolExecutor(max_workers=min(self.hedge_limit, 8))
+        pending = set()
+        error = None
+        try:
+            for part in self.parts:
+                pending.add(primary_pool.submit(self._primary, part))
+            while pending:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    part, exc = future.result()
+                    if exc is not None and self._part_failed(part):
+                        error = exc
+                if error is not None:
+                    break
+                if self.hedge:
+                    pending |= self._issue_hedges(hedge_pool)
+        finally:
+            for part in self.parts:
+                # Tell any straggling attempt to close its stream and bail out.
+                part.done = True
+            primary_pool.shutdown(wait=True)
+            hedge_pool.shutdown(wait=True)
+        if error is not None:
+            raise error
+        if self.logger and self.hedge:
+            self.logger.info(
+                "Hedged %d of %d parts of '%s' (%d hedges won).",
+                self.hedges_issued,
+                len(self.parts),
+                self.object_key,
+                self.hedges_won,
+            )
+        return {
+            "parts": len(self.parts),
+            "hedges_issued": self.hedges_issued,
+            "hedges_won": self.hedges_won,
+        }
+
+    def _part_failed(self, part: _Part) -> bool:
+        """Return True when no attempt of the part can still succeed."""
+        with self._lock:
+            part.failures += 1
+            return not part.done and part.failures >= part.attempts
+
+    def _primary(self, part: _Part):
+        """Download a part under its share of the budget and a concurrency slot."""
+        if self.budget is None:
+            return self._primary_slot(part)
+        self.budget.acquire(part.length)
+        try:
+            return self._primary_slot(part)
+        finally:
+            self.budget.release(part.length)
+
+    def _primary_slot(self, part: _Part):
+        """Download a part under a concurrency slot."""
+        with self.controller.slot():
+            with self._lock:
+                if part.done:
+                    return part, None
+                part.attempts += 1
+                part.started_at = time.monotonic()
+            return part, self._attempt(part, hedge=False)
+
+    def _hedge(self, part: _Part):
+        """Download a duplicate of a slow part outside the concurrency gate."""
+        return part, self._attempt(part, hedge=True)
+
+    def _issue_hedges(self, pool: ThreadPoolExecutor) -> set:
+        """Submit duplicate requests for parts slower than their siblings."""
+        if self.hedges_issued >= self.hedge_limit:
+            return set()
+        with self._lock:
+            latencies = [
+                p.finished_at - p.started_at for p in self.parts if p.finished_at
+            ]
+            if len(latencies) < self.hedge_min_samples:
+                return set()
+            threshold = percentile(latencies, self.hedge_percentile)
+            now = time.monotonic()
+            slow = [
+                p
+                for p in self.parts
+                if p.started_at
+                and not p.done
+                and not p.hedged
+                and now - p.started_at > threshold
+            ]
+            slow.sort(key=lambda p: p.started_at)
+            slow = slow[: self.hedge_limit - self.hedges_issued]
+            for part in slow:
+                part.hedged = True
+                part.attempts += 1
+                self.hedges_issued += 1
+        if slow and self.logger:
+            self.logger.debug(
+                "Hedging %d part(s) of '%s' slower than %.3fs.",
+                len(slow),
+                self.object_key,
+                threshold,
+            )
+        return {pool.submit(self._hedge, part) for part in slow}
+
+    def _attempt(self, part: _Part, hedge: bool) -> Optional[Exception]:
+        """
+        Stream one ranged GET into the file, stopping early if another attempt won.
+        Returns:
+            Optional[Exception]: The error raised by the attempt, if any.
+        """
+        kwargs = {
+            "Bucket": self.bucket_name,
+            "Key": self.object_key,
+            "Range": f"bytes={part.start}-{part.end}",
+        }
+        if self.etag:
+            kwargs["IfMatch"] = self.etag
+        try:
+            body = self.s3.get_object(**kwargs)["Body"]
+            buffer = self._buffer()
+            try:
+                position = part.start
+                while position <= part.end:
+                    if part.done:
+                        return None
+                    size = min(len(buffer), part.end - position + 1)
+                    read = readinto(body, buffer[:size])
+                    if not read:
+                        raise IOError(
+                            f"Short read for bytes {part.start}-{part.end} "
+                            f"of '{self.object_key}'"
+                        )
+                    self._sink.write(position, buffer[:read])
+                    position += read
+                    self._report(part, position - part.start)
+            finally:
+                body.close()
+            with self._lock:
+                if not part.done:
+                    part.done = True
+                    part.finished_at = time.monotonic()
+                    part.winner = "hedge" if hedge else "primary"
+                    if hedge:
+                        self.hedges_won += 1
+            return None
+        except Exception as e:  # pylint: disable=broad-except
+            return e
+
+    def _buffer(self) -> memoryview:
+        """Return the calling thread's reusable read buffer."""
+        local = self._local
+        if not hasattr(local, "buffer"):
+            local.buffer = memoryview(bytearray(READ_CHUNK_SIZE))
+        return local.buffer
+
+    def _report(self, part: _Part, written: int) -> None:
+        """Report progress once per byte, whichever attempt got there first."""
+        if not self.callback:
+            return
+        with self._lock:
+            delta = written - part.reported
+            if delta <= 0:
+                return
+            part.reported = written
+        self.callback(delta)
+
+
+def readinto(body, view: memoryview) -> int:
+    """
+    Read from a response body straight into view, avoiding an intermediate copy.
+    A public readinto() is used where the body has one. botocore's StreamingBody
+    does not, so its urllib3 stream (the private _raw_stream) is read instead when
+    it is present; any other body, or a stream that cannot readinto, falls back to
+    the public read().
+    Args:
+        body: Response body stream.
+        view (memoryview): Destination buffer.
+    Returns:
+        int: Number of bytes read (0 at end of stream).
+    """
+    read_into = getattr(body, "readinto", None)
+    if read_into is None:
+        read_into = getattr(getattr(body, "_raw_stream", None), "readinto", None)
+    if read_into is not None:
+        try:
+            return read_into(view)
+        except (io.UnsupportedOperation, NotImplementedError):
+            pass
+    data = body.read(len(view))
+    view[: len(data)] = data
+    return len(data)
+
+
+def temp_path_for(filename: str) -> str:
+    """Return a temporary path next to filename for an in-progress download."""
+    directory, name = os.path.split(os.path.abspath(filename))
+    return os.path.join(directory, f".{name}.{os.getpid()}.r2py-part")
+
+
+def preallocate(fd: int, size: int) -> None:
+    """
+    Reserve size bytes for fd so parallel writers do not fragment the file.
+    Falls back to a sparse ftruncate where posix_fallocate is unavailable or
+    unsupported by the filesystem.
+    """
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+
+def fsync_directory(filename: str) -> None:
+    """Persist the rename of filename by fsyncing its directory, where supported."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _PositionalSink:
+    """Lock-free positioned writes into a file descriptor with os.pwrite."""
+
+    def __init__(self, fd: int):
+        self._fd = fd
+
+    def write(self, offset: int, data) -> None:
+        """Write data at offset, looping over short writes."""
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(self._fd, view, offset)
+            offset += written
+            view = view[written:]
+
+
+class _LockedFileSink:
+    """Serializes positioned writes into a seekable Python file object."""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._lock = threading.Lock()
+
+    def write(self, offset: int, data) -> None:
+        """Write data at offset."""
+        with self._lock:
+            self._fileobj.seek(offset)
+            self._fileobj.write(data)
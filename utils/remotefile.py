@@ -0,0 +1,249 @@
+"""
+Remote File Utility for R2Py CLI.
+
+This module provides the RemoteFile class, a read-only, seekable file object over
+an R2 object, so tools that read only part of a file (a zip central directory, a
+Parquet footer, an index at the end) can open objects in place. The object is read
+in fixed-size blocks kept in an LRU cache. Adjacent missing blocks needed by one read
+are coalesced into a single ranged GET, and once reads turn sequential the following
+blocks are prefetched in the background. Every GET is pinned to the object's ETag,
+so a file never mixes blocks of two versions of the object.
+"""
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .concurrency import AdaptiveConcurrency
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_CACHE_BLOCKS = 64
+DEFAULT_READAHEAD_BLOCKS = 8
+
+
+class RemoteFile(io.RawIOBase):
+    """Read-only seekable file object backed by ranged GETs and a block cache."""
+
+    def __init__(
+        self,
+        client,
+        bucket_name: str,
+        object_key: str,
+        size: int,
+        etag: Optional[str] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        readahead: int = DEFAULT_READAHEAD_BLOCKS,
+    ):
+        """
+        Initialize the file.
+        Args:
+            client: boto3 S3 client.
+            bucket_name (str): Bucket name.
+            object_key (str): Object key.
+            size (int): Object size in bytes.
+            etag (Optional[str]): ETag pinned on every ranged GET with IfMatch.
+            controller (Optional[AdaptiveConcurrency]): Controller gating requests.
+            block_size (int): Size of each cached block in bytes.
+            cache_blocks (int): Maximum number of blocks kept in memory.
+            readahead (int): Blocks prefetched ahead of sequential reads (0 disables).
+        """
+        super().__init__()
+        self.s3 = client
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.name = f"{bucket_name}/{object_key}"
+        self.size = size
+        self.etag = etag
+        self.controller = controller or AdaptiveConcurrency()
+        self.block_size = block_size
+        self.cache_blocks = max(cache_blocks, readahead + 1, 1)
+        self.readahead = readahead
+        self.requests = 0
+        self.bytes_fetched = 0
+        self._position = 0
+        self._last_end = None
+        self._blocks = OrderedDict()
+        self._pending = {}
+        # Reentrant: a prefetch that fails at once runs its done callback inline.
+        self._lock = threading.RLock()
+        self._pool = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move the read position, like io.IOBase.seek."""
+        self._check_open()
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        """
+        Read up to len(buffer) bytes at the current position into buffer.
+        Args:
+            buffer: Writable bytes-like object.
+        Returns:
+            int: Number of bytes read (0 at end of file).
+        """
+        self._check_open()
+        view = memoryview(buffer).cast("B")
+        start = self._position
+        length = min(len(view), self.size - start)
+        if length <= 0:
+            return 0
+        first = start // self.block_size
+        last = (start + length - 1) // self.block_size
+        blocks = self._get_blocks(first, last)
+        filled = 0
+        for index in range(first, last + 1):
+            block = blocks[index]
+            offset = start + filled - index * self.block_size
+            chunk = block[offset : offset + length - filled]
+            view[filled : filled + len(chunk)] = chunk
+            filled += len(chunk)
+        sequential = start == self._last_end
+        self._position = self._last_end = start + length
+        if sequential and self.readahead:
+            self._prefetch(last + 1)
+        return length
+
+    def readall(self) -> bytes:
+        """Read from the current position to the end with coalesced requests."""
+        return self.read(max(self.size - self._position, 0))
+
+    def close(self) -> None:
+        """Close the file and stop background prefetching."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._lock:
+            self._blocks.clear()
+        super().close()
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+    def _get_blocks(self, first: int, last: int) -> Dict[int, bytes]:
+        """Return blocks first..last, fetching missing runs with one GET each."""
+        blocks, waits, missing = {}, {}, []
+        with self._lock:
+            for index in range(first, last + 1):
+                if index in self._blocks:
+                    self._blocks.move_to_end(index)
+                    blocks[index] = self._blocks[index]
+                elif index in self._pending:
+                    waits[index] = self._pending[index]
+                else:
+                    missing.append(index)
+        for run in _runs(missing):
+            blocks.update(self._fetch(run[0], run[-1]))
+        for index, future in waits.items():
+            try:
+                blocks[index] = future.result()[index]
+            except Exception:  # pylint: disable=broad-except
+                # A failed prefetch is retried in the foreground.
+                blocks.update(self._fetch(index, index))
+        return blocks
+
+    def _prefetch(self, start: int) -> None:
+        """Fetch the blocks following a sequential read in the background."""
+        end = min(start + self.readahead, self._block_count())
+        with self._lock:
+            missing = [
+                index
+                for index in range(start, end)
+                if index not in self._blocks and index not in self._pending
+            ]
+            if not missing:
+                return
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="r2py-readahead"
+                )
+            for run in _runs(missing):
+                future = self._pool.submit(self._fetch, run[0], run[-1])
+                for index in run:
+                    self._pending[index] = future
+                future.add_done_callback(lambda f, run=run: self._settle(run, f))
+
+    def _settle(self, run: List[int], future: Future) -> None:
+        """Forget the pending entries of a finished prefetch."""
+        with self._lock:
+            for index in run:
+                if self._pending.get(index) is future:
+                    del self._pending[index]
+
+    def _fetch(self, first: int, last: int) -> Dict[int, bytes]:
+        """Fetch blocks first..last with a single ranged GET and cache them."""
+        start = first * self.block_size
+        end = min((last + 1) * self.block_size, self.size) - 1
+        kwargs = {
+            "Bucket": self.bucket_name,
+            "Key": self.object_key,
+            "Range": f"bytes={start}-{end}",
+        }
+        if self.etag:
+            kwargs["IfMatch"] = self.etag
+        with self.controller.slot():
+            body = self.s3.get_object(**kwargs)["Body"]
+            try:
+                data = body.read()
+            finally:
+                body.close()
+        if len(data) != end - start + 1:
+            raise IOError(
+                f"Short read of '{self.name}' bytes {start}-{end}: got {len(data)}"
+            )
+        blocks = {
+            index: data[
+                (index - first)
+                * self.block_size : (index - first + 1)
+                * self.block_size
+            ]
+            for index in range(first, last + 1)
+        }
+        with self._lock:
+            self.requests += 1
+            self.bytes_fetched += len(data)
+            for index, block in blocks.items():
+                self._blocks[index] = block
+                self._blocks.move_to_end(index)
+            while len(self._blocks) > self.cache_blocks:
+                self._blocks.popitem(last=False)
+        return blocks
+
+    def _block_count(self) -> int:
+        return -(-self.size // self.block_size)
+
+
+def _runs(indexes: List[int]) -> List[List[int]]:
+    """Split sorted block indexes into runs of consecutive indexes."""
+    runs = []
+    for index in indexes:
+        if runs and runs[-1][-1] == index - 1:
+            runs[-1].append(index)
+        else:
+            runs.append([index])
+    return runs
@@ -3,12 +3,23 @@ Base S3 Utility for R2Py CLI.
 
 S3Base manages a singleton S3 client for the CLI, supporting custom endpoints,
 credentials, and region selection (incl. 'auto'). Centralizes config and logging.
+Each client is paired with an AdaptiveConcurrency controller that observes its
+requests and sizes every worker pool and transfer built on top of it, and all
+actions share one HashEngine for comparing local files with remote objects.
 All S3 actions should inherit from this class for consistency.
 """
 
+import math
 import os
+from typing import Sequence, Union
+
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from utils import Region
+from .concurrency import AdaptiveConcurrency
+from .hashcache import HashCache, HashEngine
+from .hashing import etag_part_count
 from .logger import Logger
 
 logger = Logger("s3Client").get_logger()
@@ -29,6 +40,11 @@ class S3Base:
     """Base class for S3-compatible operations with Cloudflare R2."""
 
     _clients = {}
+    _controllers = {}
+    _hash_engine = None
+    # Objects up to this size skip s3transfer and progress bars entirely and
+    # are sent with a single PutObject/GetObject over the pooled connection.
+    small_object_threshold = 1024 * 1024
 
     def __init__(
         self,
@@ -54,14 +70,122 @@ class S3Base:
         self.logger.info("Creating or reusing S3 client...")
         key = (endpoint_url, access_key, secret_key, region)
         if key not in S3Base._clients:
-            S3Base._clients[key] = boto3.client(
+            controller = AdaptiveConcurrency(maximum=S3Base.max_concurrency())
+            client = boto3.client(
                 service_name="s3",
                 endpoint_url=endpoint_url,
                 aws_access_key_id=access_key,
                 aws_secret_access_key=secret_key,
                 region_name=region,
+                config=Config(
+                    retries={"max_attempts": 10, "mode": "adaptive"},
+                    max_pool_connections=controller.maximum,
+                ),
             )
+            controller.attach(client)
+            S3Base._clients[key] = client
+            S3Base._controllers[key] = controller
+        self.endpoint_url = endpoint_url
         self.s3 = S3Base._clients[key]
+        self.concurrency = S3Base._controllers[key]
+
+    def transfer_config(self, **kwargs) -> TransferConfig:
+        """
+        Build an s3transfer config sized by the adaptive concurrency controller.
+        s3transfer runs its requests on its own threads, which take no controller
+        slots, so max_concurrency is only the limit at the time the config is built
+        and does not follow later changes. The actions use this config only for
+        objects below one part, which s3transfer sends as a single request; larger
+        transfers go through engines that take a slot for every request.
+        Args:
+            **kwargs: Extra TransferConfig options.
+        Returns:
+            TransferConfig: Config whose max_concurrency is the current limit.
+        """
+        kwargs.setdefault("max_concurrency", self.concurrency.limit)
+        return TransferConfig(**kwargs)
+
+    @staticmethod
+    def hash_engine() -> HashEngine:
+        """
+        Return the shared hash engine, backed by the persistent hash cache.
+        Returns:
+            HashEngine: Engine used to compare local files with remote ETags.
+        """
+        if S3Base._hash_engine is None:
+            try:
+                cache = HashCache()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning("Hash cache unavailable, hashing without it: %s", e)
+                cache = None
+            S3Base._hash_engine = HashEngine(cache)
+        return S3Base._hash_engine
+
+    def part_layout(
+        self, bucket_name: str, object_key: str, size: int, etag: str
+    ) -> Union[int, Sequence[int], None]:
+        """
+        Find the part sizes a multipart object was uploaded with.
+        The first part's size is read with a HEAD request. If the part count in the
+        ETag matches parts of that size, the object has a uniform layout; otherwise
+        every part is read with its own HEAD request.
+        Args:
+            bucket_name (str): Bucket name.
+            object_key (str): Object key.
+            size (int): Object size.
+            etag (str): Multipart object ETag.
+        Returns:
+            Union[int, Sequence[int], None]: The uniform part size, the size of
+                each part, or None if the parts do not add up to the object.
+        """
+        count = etag_part_count(etag)
+        if not count:
+            return None
+
+        def part_length(number: int) -> int:
+            return self.s3.head_object(
+                Bucket=bucket_name, Key=object_key, PartNumber=number
+            )["ContentLength"]
+
+        first = part_length(1)
+        if first > 0 and math.ceil(size / first) == count:
+            return first
+        layout = [first] + [part_length(n) for n in range(2, count + 1)]
+        if sum(layout) != size:
+            logger.warning("Parts of '%s' do not add up to its size.", object_key)
+            return None
+        return tuple(layout)
+
+    def is_unchanged(
+        self, filename: str, bucket_name: str, object_key: str, size: int, etag: str
+    ) -> bool:
+        """
+        Check whether a local file has the same contents as a remote object.
+        Args:
+            filename (str): Local file path.
+            bucket_name (str): Bucket name.
+            object_key (str): Object key.
+            size (int): Remote object size.
+            etag (str): Remote object ETag.
+        Returns:
+            bool: True if sizes and ETags match; False if they differ or the
+                object's part layout cannot be determined.
+        """
+        return S3Base.hash_engine().matches(
+            filename,
+            size,
+            etag,
+            lambda: self.part_layout(bucket_name, object_key, size, etag),
+        )
+
+    @staticmethod
+    def get_stats() -> list:
+        """
+        Return the adaptive concurrency stats of every client created so far.
+        Returns:
+            list: One stats dictionary per client.
+        """
+        return [controller.stats() for controller in S3Base._controllers.values()]
 
     @staticmethod
     def get_env_var(name: str, default: str = None, required: bool = False) -> str:
@@ -83,6 +207,34 @@ class S3Base:
         logger.debug("Environment variable '%s' loaded successfully.", name)
         return value
 
+    @staticmethod
+    def max_concurrency(minimum: int = 1) -> int:
+        """
+        Read the upper concurrency bound from R2PY_MAX_CONCURRENCY.
+        Args:
+            minimum (int): Lowest accepted value; smaller values are raised to it.
+        Returns:
+            int: The concurrency bound (default 64).
+        Raises:
+            S3ActionError: If the variable is not an integer.
+        """
+        value = S3Base.get_env_var("R2PY_MAX_CONCURRENCY", default="64")
+        try:
+            maximum = int(value)
+        except ValueError:
+            raise S3ActionError(
+                f"R2PY_MAX_CONCURRENCY must be an integer, got '{value}'"
+            ) from None
+        if maximum < minimum:
+            logger.warning(
+                "R2PY_MAX_CONCURRENCY=%d is below %d; using %d.",
+                maximum,
+                minimum,
+                minimum,
+            )
+            maximum = minimum
+        return maximum
+
     @staticmethod
     def get_logger() -> Logger:
         """
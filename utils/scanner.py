@@ -0,0 +1,239 @@
+"""
+Directory Scanner Utility for R2Py CLI.
+
+This module walks local directory trees for the directory-based commands. It is
+built on os.scandir, whose entries already know whether they are files or
+directories, and keeps the stat result of each entry instead of calling os.stat
+again. Several directories are listed at once by a thread pool, which hides the
+per-request latency of network filesystems such as NFS, and the walk only runs a
+bounded number of directories ahead of its consumer, so files are yielded as they
+are found without holding the whole tree in memory. Files and directories matched
+by a '.r2ignore' file are skipped, with the same pattern syntax and precedence as
+'.gitignore': each ignore file applies to the directory holding it and everything
+below, later and deeper patterns override earlier ones, and '!' re-includes.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from .logger import Logger
+
+logger = Logger("scanner").get_logger()
+
+IGNORE_FILE = ".r2ignore"
+DEFAULT_SCAN_WORKERS = 16
+
+
+class ScanEntry(NamedTuple):
+    """A file or directory found by scan_tree()."""
+
+    path: str
+    relative: str
+    stat: Optional[os.stat_result]
+    is_dir: bool = False
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        return self.stat.st_size
+
+
+def walk_order(entry: ScanEntry) -> tuple:
+    """
+    Sort key ordering entries like a sorted top-down os.walk().
+    The files of a directory come before the contents of its subdirectories.
+    """
+    parts = entry.relative.split("/")
+    return tuple((1, part) for part in parts[:-1]) + (
+        (1 if entry.is_dir else 0, parts[-1]),
+    )
+
+
+def _translate(pattern: str) -> str:
+    """Translate the glob part of an ignore pattern into a regular expression."""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and i and pattern[i - 1] == "/":
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                parts.append(re.escape("["))
+                i += 1
+                continue
+            body = pattern[i + 1 : end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+def parse_ignore(text: str, base: str = "") -> List[tuple]:
+    """
+    Parse the lines of an ignore file into rules.
+    Args:
+        text (str): Contents of the ignore file.
+        base (str): Directory of the ignore file relative to the scan root, with a
+            trailing '/' (empty for the root itself).
+    Returns:
+        List[tuple]: (base, compiled pattern, negated, directories only) rules.
+    """
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip("\r")
+        # Trailing spaces are ignored unless escaped.
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+        directories_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but at the end anchors the pattern to the base.
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = _translate(line)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        rules.append((base, re.compile(regex, re.DOTALL), negated, directories_only))
+    return rules
+
+
+class IgnoreRules:
+    """Ordered ignore rules in effect for one directory of a scan."""
+
+    def __init__(self, rules: Tuple[tuple, ...] = ()):
+        """
+        Initialize the rules.
+        Args:
+            rules (Tuple[tuple, ...]): Rules from parse_ignore(), outermost first.
+        """
+        self.rules = rules
+
+    def extend(self, rules: List[tuple]) -> "IgnoreRules":
+        """Return the rules of a subdirectory with its own ignore file's rules."""
+        return IgnoreRules(self.rules + tuple(rules)) if rules else self
+
+    def ignored(self, relative: str, is_dir: bool) -> bool:
+        """
+        Return True if a path is excluded; the last matching rule decides.
+        Args:
+            relative (str): Path relative to the scan root, '/'-separated.
+            is_dir (bool): Whether the path is a directory.
+        """
+        result = False
+        for base, pattern, negated, directories_only in self.rules:
+            if directories_only and not is_dir:
+                continue
+            if not relative.startswith(base):
+                continue
+            if pattern.fullmatch(relative[len(base) :]):
+                result = not negated
+        return result
+
+
+def _read_ignore(path: str, base: str) -> List[tuple]:
+    """Parse an ignore file, or return no rules if it cannot be read."""
+    try:
+        with open(path, encoding="utf-8", errors="surrogateescape") as f:
+            return parse_ignore(f.read(), base)
+    except OSError as e:
+        logger.warning("Could not read ignore file '%s': %s", path, e)
+        return []
+
+
+def _scan_directory(
+    path: str, relative: str, rules: IgnoreRules, ignore_file: Optional[str]
+) -> Tuple[List[ScanEntry], List[Tuple[str, str, IgnoreRules]]]:
+    """List one directory; return its entries and the subdirectories to descend."""
+    try:
+        with os.scandir(path) as iterator:
+            listing = list(iterator)
+    except OSError as e:
+        logger.warning("Could not list directory '%s': %s", path, e)
+        return [], []
+    if ignore_file and any(entry.name == ignore_file for entry in listing):
+        rules = rules.extend(_read_ignore(os.path.join(path, ignore_file), relative))
+    entries, subdirectories = [], []
+    for entry in listing:
+        name = f"{relative}{entry.name}"
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if rules.ignored(name, is_dir):
+                continue
+            if is_dir:
+                entries.append(ScanEntry(entry.path, name, None, True))
+                subdirectories.append((entry.path, f"{name}/", rules))
+            elif entry.is_file():
+                entries.append(ScanEntry(entry.path, name, entry.stat()))
+        except OSError as e:
+            logger.warning("Could not stat '%s': %s", entry.path, e)
+    return entries, subdirectories
+
+
+def scan_tree(
+    directory: str,
+    workers: int = DEFAULT_SCAN_WORKERS,
+    ignore_file: Optional[str] = IGNORE_FILE,
+    directories: bool = False,
+) -> Iterator[ScanEntry]:
+    """
+    Yield the files below a directory, listing several directories at once.
+    Entries come in no particular order. Symbolic links to files are followed and
+    links to directories are not descended into, as with os.walk(). Unreadable
+    directories and files are logged and skipped.
+    Args:
+        directory (str): Root of the scan.
+        workers (int): Number of directories listed at once.
+        ignore_file (Optional[str]): Name of the ignore files to honour, or None.
+        directories (bool): Also yield an entry, without a stat, per directory.
+    Yields:
+        ScanEntry: One record per file, with its path relative to directory.
+    """
+    backlog = deque([(directory, "", IgnoreRules())])
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while backlog or pending:
+            # Listing depth-first keeps the backlog small; stay only a few
+            # directories ahead of the consumer.
+            while backlog and len(pending) < workers * 2:
+                path, relative, rules = backlog.pop()
+                pending.add(
+                    pool.submit(_scan_directory, path, relative, rules, ignore_file)
+                )
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, subdirectories = future.result()
+                backlog.extend(subdirectories)
+                for entry in entries:
+                    if directories or not entry.is_dir:
+                        yield entry
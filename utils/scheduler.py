@@ -0,0 +1,221 @@
+"""
+Transfer Scheduler Utility for R2Py CLI.
+
+This module provides the TransferScheduler class, which lets the multi-file commands
+move several large files at once without multiplying their memory use. Every part
+of every file takes its bytes from one global in-flight budget and one connection
+budget, so part size times concurrency is bounded once for the whole command rather
+than once per file. When parts of several files are waiting, the next slot goes to
+the file with the fewest parts in flight, so a file with many parts cannot starve
+the others. Files are started in a chosen order: largest first to shorten the total
+run time, or smallest first to finish as many files as early as possible.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from enum import Enum
+from itertools import count
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .multipart import DEFAULT_MAX_IN_FLIGHT
+
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_FILES = 4
+
+
+class TransferOrder(str, Enum):
+    """Orders in which the files of a multi-file transfer are started."""
+
+    LARGEST = "largest"
+    SMALLEST = "smallest"
+
+
+def order_transfers(
+    items: Iterable, order: TransferOrder, size: Callable[[object], int]
+) -> List:
+    """
+    Sort the items of a multi-file transfer by size.
+    Args:
+        items (Iterable): Work items.
+        order (TransferOrder): Largest or smallest first; ties keep their order.
+        size (Callable[[object], int]): Function returning an item's size in bytes.
+    Returns:
+        List: The items in the order they should be started.
+    """
+    return sorted(
+        items, key=size, reverse=TransferOrder(order) == TransferOrder.LARGEST
+    )
+
+
+class TransferBudget:
+    """One file's view of a TransferScheduler, usable wherever a ByteBudget is."""
+
+    def __init__(self, scheduler: "TransferScheduler", name: str):
+        """
+        Initialize the view.
+        Args:
+            scheduler (TransferScheduler): Scheduler granting the parts.
+            name (str): Name of the file in log messages.
+        """
+        self.scheduler = scheduler
+        self.name = name
+        self.parts = 0
+        self._in_flight = 0
+        self._peak = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Bytes this file currently has in flight."""
+        return self._in_flight
+
+    @property
+    def peak(self) -> int:
+        """Highest number of bytes this file had in flight at once."""
+        return self._peak
+
+    def acquire(self, nbytes: int) -> None:
+        """Block until the scheduler grants this file a part of nbytes."""
+        self.scheduler.acquire(self, nbytes)
+
+    def release(self, nbytes: int) -> None:
+        """Return a part of nbytes to the scheduler."""
+        self.scheduler.release(self, nbytes)
+
+    @contextmanager
+    def part(self, nbytes: int):
+        """Hold a part of nbytes for the duration of the block."""
+        self.acquire(nbytes)
+        try:
+            yield
+        finally:
+            self.release(nbytes)
+
+
+class TransferScheduler:
+    """Global byte and connection budget shared fairly by concurrent file transfers."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_IN_FLIGHT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_files: int = DEFAULT_MAX_FILES,
+    ):
+        """
+        Initialize the scheduler.
+        Args:
+            max_bytes (int): Maximum bytes of parts in flight across all files.
+            max_connections (int): Maximum parts in flight across all files.
+            max_files (int): Maximum files transferred at once by run().
+        """
+        if max_bytes <= 0 or max_connections <= 0 or max_files <= 0:
+            raise ValueError("scheduler budgets must be positive")
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.max_files = max_files
+        self._in_flight = 0
+        self._connections = 0
+        self._peak = 0
+        self._peak_connections = 0
+        self._waiting = []
+        self._tickets = count()
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """Bytes currently in flight across all files."""
+        return self._in_flight
+
+    @property
+    def peak(self) -> int:
+        """Highest number of bytes in flight at once across all files."""
+        return self._peak
+
+    @property
+    def peak_connections(self) -> int:
+        """Highest number of parts in flight at once across all files."""
+        return self._peak_connections
+
+    def budget(self, name: str) -> TransferBudget:
+        """Return the budget view through which one file acquires its parts."""
+        return TransferBudget(self, name)
+
+    def acquire(self, transfer: TransferBudget, nbytes: int) -> None:
+        """
+        Block until a part of nbytes may be put in flight for a file.
+        Among waiting parts, the one whose file has the fewest parts in flight goes
+        first, then the one that has waited longest. A part larger than the whole
+        byte budget is admitted once nothing else is in flight.
+        Args:
+            transfer (TransferBudget): File the part belongs to.
+            nbytes (int): Size of the part in bytes.
+        """
+        with self._cond:
+            waiter = [transfer, next(self._tickets), nbytes]
+            self._waiting.append(waiter)
+            try:
+                while not (self._is_next(waiter) and self._fits(nbytes)):
+                    self._cond.wait()
+            finally:
+                self._waiting.remove(waiter)
+            self._in_flight += nbytes
+            self._connections += 1
+            self._peak = max(self._peak, self._in_flight)
+            self._peak_connections = max(self._peak_connections, self._connections)
+            transfer.parts += 1
+            transfer._in_flight += nbytes
+            transfer._peak = max(transfer._peak, transfer._in_flight)
+            # The next waiter in line may fit as well.
+            self._cond.notify_all()
+
+    def release(self, transfer: TransferBudget, nbytes: int) -> None:
+        """
+        Return a part of nbytes taken by acquire().
+        Args:
+            transfer (TransferBudget): File the part belongs to.
+            nbytes (int): Size of the part in bytes.
+        """
+        with self._cond:
+            self._in_flight -= nbytes
+            self._connections -= 1
+            transfer.parts -= 1
+            transfer._in_flight -= nbytes
+            self._cond.notify_all()
+
+    def _is_next(self, waiter: list) -> bool:
+        """Return True if waiter is first in line for the next part."""
+        return waiter is min(self._waiting, key=lambda w: (w[0].parts, w[1]))
+
+    def _fits(self, nbytes: int) -> bool:
+        """Return True if a part of nbytes fits in both budgets."""
+        if not self._connections:
+            return True
+        return (
+            self._connections < self.max_connections
+            and self._in_flight + nbytes <= self.max_bytes
+        )
+
+    def run(
+        self, func: Callable, items: Iterable
+    ) -> Iterator[Tuple[object, object, Optional[Exception]]]:
+        """
+        Run func over items, up to max_files at once, in the order given.
+        func is expected to take its parts from a budget() of this scheduler, so no
+        concurrency slot is held per file while its parts wait for theirs.
+        Args:
+            func (Callable): Function called with each item.
+            items (Iterable): Work items, typically ordered by order_transfers().
+        Yields:
+            tuple: (item, result, error) in completion order; error is None on success.
+        """
+
+        def run(item):
+            try:
+                return item, func(item), None
+            except Exception as e:  # pylint: disable=broad-except
+                return item, None, e
+
+        with ThreadPoolExecutor(max_workers=self.max_files) as pool:
+            futures = [pool.submit(run, item) for item in items]
+            for future in as_completed(futures):
+                yield future.result()
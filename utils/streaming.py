@@ -0,0 +1,391 @@
+"""
+Streaming Transfer Engines for R2Py CLI.
+
+This module provides the StreamUpload and StreamDownload classes, which move data
+between pipes and R2 without temporary files. StreamUpload turns a stream of unknown
+length (e.g. stdin) into a multipart upload through a bounded ring of reused part
+buffers. StreamDownload fetches an object as ranged GETs with a bounded read-ahead
+window and writes the parts to a stream (e.g. stdout) in order. copy_body() streams
+a single response body to a stream with large buffered writes.
+"""
+
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .concurrency import AdaptiveConcurrency
+from .multipart import MAX_PARTS, MIN_PART_SIZE, MemoryviewReader
+from .ranged import plan_parts, readinto
+
+STDIO_PATH = "-"
+DEFAULT_STREAM_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_RING_SIZE = 8
+DEFAULT_READ_AHEAD = 8
+COPY_CHUNK_SIZE = 1024 * 1024
+# Stream parts double in size after each tenth of the part limit, up to this size.
+PART_SIZE_TIERS = 10
+MAX_STREAM_PART_SIZE = 1024 * 1024 * 1024
+
+
+def is_stdio(path: Optional[str]) -> bool:
+    """Return True if path designates stdin/stdout."""
+    return path == STDIO_PATH
+
+
+def stream_part_size(number: int, part_size: int) -> int:
+    """
+    Return the size of a part of a stream upload, which grows with its number.
+    The first parts keep part_size and each later tenth of the part limit doubles
+    it, up to MAX_STREAM_PART_SIZE. With the default 16 MiB start, the 10,000 parts
+    hold about 5 TiB, the largest object S3 allows.
+    Args:
+        number (int): Part number, starting at 1.
+        part_size (int): Size of the first parts in bytes.
+    Returns:
+        int: Part size in bytes.
+    """
+    tier = (number - 1) // max(MAX_PARTS // PART_SIZE_TIERS, 1)
+    return min(part_size << tier, max(part_size, MAX_STREAM_PART_SIZE))
+
+
+def fill_buffer(stream, view: memoryview) -> int:
+    """
+    Read from stream until view is full or the stream ends.
+    Args:
+        stream: Binary stream supporting readinto or read.
+        view (memoryview): Destination buffer.
+    Returns:
+        int: Number of bytes read.
+    """
+    filled = 0
+    while filled < len(view):
+        if hasattr(stream, "readinto"):
+            read = stream.readinto(view[filled:])
+        else:
+            data = stream.read(len(view) - filled)
+            read = len(data)
+            view[filled : filled + read] = data
+        if not read:
+            break
+        filled += read
+    return filled
+
+
+def copy_body(body, out, chunk_size: int = COPY_CHUNK_SIZE) -> int:
+    """
+    Copy a response body to a binary stream through one reused buffer.
+    Args:
+        body: Response body stream; closed when done.
+        out: Binary stream to write to.
+        chunk_size (int): Size of each read and write in bytes.
+    Returns:
+        int: Number of bytes copied.
+    """
+    view = memoryview(bytearray(chunk_size))
+    copied = 0
+    try:
+        while True:
+            read = readinto(body, view)
+            if not read:
+                break
+            out.write(view[:read])
+            copied += read
+    finally:
+        body.close()
+    out.flush()
+    return copied
+
+
+class StreamUpload:
+    """
+    Multipart upload of a stream of unknown length through a ring of buffers.
+    Parts are read into reused buffers while earlier parts upload, so memory stays
+    at ring size times the first part size however much data flows through. Parts
+    grow as the upload goes on (see stream_part_size()) and the ring shrinks to
+    keep that bound, down to two buffers of the largest part (2 GiB at most).
+    """
+
+    def __init__(
+        self,
+        client,
+        stream,
+        bucket_name: str,
+        object_key: str,
+        extra_args: Optional[dict] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        part_size: int = DEFAULT_STREAM_PART_SIZE,
+        ring_size: int = DEFAULT_RING_SIZE,
+        callback: Optional[Callable[[int], None]] = None,
+        logger=None,
+    ):
+        """
+        Initialize the streaming upload.
+        Args:
+            client: boto3 S3 client.
+            stream: Binary stream to read until EOF.
+            bucket_name (str): Target bucket name.
+            object_key (str): S3 object key.
+            extra_args (Optional[dict]): Extra PutObject/CreateMultipartUpload arguments.
+            controller (Optional[AdaptiveConcurrency]): Controller gating part workers.
+            part_size (int): Size of the first part buffers in bytes; later parts
+                grow as given by stream_part_size().
+            ring_size (int): Number of part buffers; bounds memory use.
+            callback (Optional[Callable[[int], None]]): Progress callback in bytes.
+            logger: Logger for engine messages.
+        """
+        self.s3 = client
+        self.stream = stream
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.extra_args = extra_args or {}
+        self.controller = controller or AdaptiveConcurrency()
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.ring_size = max(ring_size, 1)
+        self.callback = callback
+        self.logger = logger
+        self.total_bytes = 0
+        self._ring = None
+        self._failed = threading.Event()
+
+    @property
+    def peak_buffered(self) -> int:
+        """Highest number of bytes held in part buffers at once."""
+        return self._ring.peak if self._ring else 0
+
+    def run(self) -> dict:
+        """
+        Read the stream to EOF and store it as one object.
+        A stream shorter than one part is sent with a single PutObject.
+        Returns:
+            dict: The PutObject or CompleteMultipartUpload response.
+        Raises:
+            Exception: Any read or API error; a started multipart upload is aborted.
+        """
+        free = _BufferRing(self.ring_size, self.ring_size * self.part_size)
+        self._ring = free
+        first = free.get(self.part_size)
+        read = fill_buffer(self.stream, first)
+        self.total_bytes = read
+        if read < self.part_size:
+            response = self.s3.put_object(
+                Bucket=self.bucket_name,
+                Key=self.object_key,
+                Body=bytes(first[:read]),
+                **self.extra_args,
+            )
+            if self.callback:
+                self.callback(read)
+            return response
+        upload_id = self.s3.create_multipart_upload(
+            Bucket=self.bucket_name, Key=self.object_key, **self.extra_args
+        )["UploadId"]
+        try:
+            parts = self._upload_parts(upload_id, free, first, read)
+            return self.s3.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self._abort(upload_id)
+            raise
+
+    def _upload_parts(
+        self, upload_id: str, free: "_BufferRing", buffer: memoryview, read: int
+    ) -> list:
+        """Keep the ring full of parts until the stream ends."""
+        futures = []
+        number = 1
+        with ThreadPoolExecutor(max_workers=self.ring_size) as pool:
+            while read:
+                if number > MAX_PARTS:
+                    raise ValueError(
+                        f"Stream exceeds the largest object {MAX_PARTS} parts can hold."
+                    )
+                futures.append(
+                    pool.submit(
+                        self._upload_part, upload_id, number, buffer, read, free
+                    )
+                )
+                number += 1
+                # Blocks until a part finishes once every buffer in the ring is busy.
+                buffer = free.get(stream_part_size(number, self.part_size))
+                if self._failed.is_set():
+                    break
+                read = fill_buffer(self.stream, buffer)
+                self.total_bytes += read
+        return [future.result() for future in futures]
+
+    def _upload_part(
+        self,
+        upload_id: str,
+        number: int,
+        buffer: memoryview,
+        length: int,
+        free: "_BufferRing",
+    ) -> dict:
+        """Upload one buffered part, then hand its buffer back to the ring."""
+        try:
+            with self.controller.slot():
+                response = self.s3.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=self.object_key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=MemoryviewReader(buffer[:length]),
+                )
+            if self.callback:
+                self.callback(length)
+            return {"PartNumber": number, "ETag": response["ETag"]}
+        except BaseException:
+            self._failed.set()
+            raise
+        finally:
+            free.put(buffer)
+
+    def _abort(self, upload_id: str) -> None:
+        """Abort the multipart upload after a failure."""
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.object_key, UploadId=upload_id
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            if self.logger:
+                self.logger.error(
+                    "Failed to abort multipart upload %s: %s", upload_id, e
+                )
+
+
+class _BufferRing:
+    """Pool of reusable part buffers bounded by count and by total bytes."""
+
+    def __init__(self, size: int, budget: int):
+        """
+        Initialize the ring.
+        Args:
+            size (int): Maximum number of buffers.
+            budget (int): Bytes the buffers may hold; larger parts get fewer
+                buffers, but always at least two (or size, if smaller).
+        """
+        self._size = size
+        self._budget = budget
+        self._free = []
+        self._allocated = []
+        self._peak = 0
+        self._cond = threading.Condition()
+
+    @property
+    def peak(self) -> int:
+        """Highest number of bytes allocated at once."""
+        return self._peak
+
+    def get(self, nbytes: int) -> memoryview:
+        """
+        Return a free buffer of nbytes, blocking while the ring is full.
+        Free buffers of another size are dropped, which shrinks the ring as parts
+        grow.
+        """
+        limit = min(self._size, max(2, self._budget // nbytes))
+        with self._cond:
+            while True:
+                for buffer in [b for b in self._free if len(b) != nbytes]:
+                    self._free.remove(buffer)
+                    self._allocated.remove(len(buffer))
+                if self._free:
+                    return self._free.pop()
+                if len(self._allocated) < limit:
+                    self._allocated.append(nbytes)
+                    self._peak = max(self._peak, sum(self._allocated))
+                    return memoryview(bytearray(nbytes))
+                self._cond.wait()
+
+    def put(self, buffer: memoryview) -> None:
+        """Hand a buffer back to the ring."""
+        with self._cond:
+            self._free.append(buffer)
+            self._cond.notify_all()
+
+
+class StreamDownload:
+    """Ordered ranged-GET download of an object into a stream with read-ahead."""
+
+    def __init__(
+        self,
+        client,
+        bucket_name: str,
+        object_key: str,
+        total_size: int,
+        etag: Optional[str] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        part_size: int = DEFAULT_STREAM_PART_SIZE,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        callback: Optional[Callable[[int], None]] = None,
+        budget=None,
+    ):
+        """
+        Initialize the streaming download.
+        Args:
+            client: boto3 S3 client.
+            bucket_name (str): Source bucket name.
+            object_key (str): S3 object key.
+            total_size (int): Object size in bytes.
+            etag (Optional[str]): ETag pinned on every ranged GET with IfMatch.
+            controller (Optional[AdaptiveConcurrency]): Controller gating part workers.
+            part_size (int): Size of each ranged GET in bytes.
+            read_ahead (int): Parts fetched ahead of the writer; bounds memory use.
+            callback (Optional[Callable[[int], None]]): Progress callback in bytes.
+            budget: Shared budget each ranged GET takes its bytes and connection
+                from while it runs, such as a TransferScheduler.budget().
+        """
+        self.s3 = client
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self.etag = etag
+        self.controller = controller or AdaptiveConcurrency()
+        self.parts = plan_parts(total_size, part_size)
+        self.read_ahead = max(read_ahead, 1)
+        self.callback = callback
+        self.budget = budget
+
+    def run(self, out) -> None:
+        """
+        Write the object to out, part by part in order.
+        Args:
+            out: Binary stream to write to.
+        """
+        with ThreadPoolExecutor(max_workers=self.read_ahead) as pool:
+            window = []
+            parts = iter(self.parts)
+            for part in parts:
+                window.append(pool.submit(self._fetch, part))
+                if len(window) >= self.read_ahead:
+                    break
+            while window:
+                data = window.pop(0).result()
+                next_part = next(parts, None)
+                if next_part is not None:
+                    window.append(pool.submit(self._fetch, next_part))
+                out.write(data)
+                if self.callback:
+                    self.callback(len(data))
+        out.flush()
+
+    def _fetch(self, part: tuple) -> bytes:
+        """Fetch one byte range."""
+        _, start, end = part
+        kwargs = {
+            "Bucket": self.bucket_name,
+            "Key": self.object_key,
+            "Range": f"bytes={start}-{end}",
+        }
+        if self.etag:
+            kwargs["IfMatch"] = self.etag
+        with self.budget.part(end - start + 1) if self.budget else nullcontext():
+            with self.controller.slot():
+                body = self.s3.get_object(**kwargs)["Body"]
+                try:
+                    return body.read()
+                finally:
+                    body.close()
@@ -0,0 +1,73 @@
+"""
+Unit Parsing Utility for R2Py CLI.
+
+This module provides helpers to parse human-friendly sizes (e.g. '256MB', '8MiB'),
+durations (e.g. '90m', '24h', '7d') and byte ranges (e.g. '0-1023', '-64KB') given
+on the command line into byte counts, timedeltas and HTTP Range headers.
+"""
+
+import re
+from datetime import timedelta
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgtp]?)(i?b?)\s*$", re.IGNORECASE)
+_SIZE_FACTORS = {"": 0, "k": 1, "m": 2, "g": 3, "t": 4, "p": 5}
+_DURATION_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$", re.IGNORECASE)
+_DURATION_SECONDS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a human-friendly size into bytes. Units are powers of 1024.
+    Args:
+        value (str): Size such as '4096', '64KB', '256MB' or '1.5GiB'.
+    Returns:
+        int: Number of bytes.
+    Raises:
+        ValueError: If the size cannot be parsed.
+    """
+    match = _SIZE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid size: {value!r}")
+    number, unit, _ = match.groups()
+    return int(float(number) * 1024 ** _SIZE_FACTORS[unit.lower()])
+
+
+def parse_duration(value: str) -> timedelta:
+    """
+    Parse a human-friendly duration. A bare number is a number of seconds.
+    Args:
+        value (str): Duration such as '45s', '90m', '24h', '7d' or '2w'.
+    Returns:
+        timedelta: The duration.
+    Raises:
+        ValueError: If the duration cannot be parsed.
+    """
+    match = _DURATION_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r}")
+    number, unit = match.groups()
+    return timedelta(seconds=float(number) * _DURATION_SECONDS[unit.lower()])
+
+
+def parse_byte_range(value: str) -> str:
+    """
+    Parse a byte range into an HTTP Range header value. Offsets are inclusive and
+    may use size units.
+    Args:
+        value (str): 'start-end', 'start-' (to the end) or '-length' (the last
+            length bytes), e.g. '0-1023', '1MB-' or '-64KB'.
+    Returns:
+        str: Range header value such as 'bytes=0-1023'.
+    Raises:
+        ValueError: If the range cannot be parsed or is empty.
+    """
+    start, sep, end = str(value).strip().partition("-")
+    if not sep or not (start or end):
+        raise ValueError(f"Invalid byte range: {value!r}")
+    first = parse_size(start) if start else None
+    last = parse_size(end) if end else None
+    if first is None and last == 0:
+        raise ValueError(f"Empty byte range: {value!r}")
+    if first is not None and last is not None and last < first:
+        raise ValueError(f"Invalid byte range: {value!r}")
+    return f"bytes={'' if first is None else first}-{'' if last is None else last}"
@@ -0,0 +1,93 @@
+"""
+Usage Aggregation Utility for R2Py CLI.
+
+This module provides the PrefixUsage class, which accumulates object counts, byte
+totals and a size histogram for one key prefix as listing pages stream past. Only
+the running totals are kept, never the keys, so memory stays constant no matter
+how many objects a prefix holds.
+"""
+
+from typing import List, Tuple
+
+# Upper bounds (exclusive) of the histogram bins; the last bin is open-ended.
+HISTOGRAM_BOUNDS: Tuple[int, ...] = (
+    1024,
+    64 * 1024,
+    1024 * 1024,
+    16 * 1024 * 1024,
+    256 * 1024 * 1024,
+    1024 * 1024 * 1024,
+)
+HISTOGRAM_LABELS: Tuple[str, ...] = (
+    "<1KB",
+    "1KB-64KB",
+    "64KB-1MB",
+    "1MB-16MB",
+    "16MB-256MB",
+    "256MB-1GB",
+    ">=1GB",
+)
+
+
+def format_size(size: float) -> str:
+    """
+    Format a byte count for display with 1024-based units.
+    Args:
+        size (float): Number of bytes.
+    Returns:
+        str: Size such as '512 B', '1.5 KB' or '3.2 GB'.
+    """
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} PB"
+
+
+class PrefixUsage:
+    """Running object count, byte total and size histogram for one prefix."""
+
+    def __init__(self, prefix: str):
+        """
+        Initialize empty totals.
+        Args:
+            prefix (str): Key prefix being summarized.
+        """
+        self.prefix = prefix
+        self.objects = 0
+        self.bytes = 0
+        self.largest = 0
+        self.histogram: List[int] = [0] * len(HISTOGRAM_LABELS)
+
+    def add(self, size: int) -> None:
+        """Count one object of size bytes."""
+        self.objects += 1
+        self.bytes += size
+        self.largest = max(self.largest, size)
+        for index, bound in enumerate(HISTOGRAM_BOUNDS):
+            if size < bound:
+                self.histogram[index] += 1
+                return
+        self.histogram[-1] += 1
+
+    def add_page(self, contents: list) -> None:
+        """Count every object in a ListObjectsV2 'Contents' page."""
+        for obj in contents:
+            self.add(obj["Size"])
+
+    def merge(self, other: "PrefixUsage") -> None:
+        """Add another prefix's totals into this one."""
+        self.objects += other.objects
+        self.bytes += other.bytes
+        self.largest = max(self.largest, other.largest)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def to_dict(self) -> dict:
+        """Return the totals as a JSON-serializable dict."""
+        return {
+            "prefix": self.prefix,
+            "objects": self.objects,
+            "bytes": self.bytes,
+            "largest": self.largest,
+            "histogram": dict(zip(HISTOGRAM_LABELS, self.histogram)),
+        }